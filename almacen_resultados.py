@@ -0,0 +1,428 @@
+"""
+Almacén columnar de resultados para comparar corridas.
+
+Responsabilidades:
+    - Guardar cada corrida en un directorio propio cuyos archivos no se
+      vuelven a escribir: una columna int64 por métrica por proceso (-1 =
+      sin valor), los IDs (uno por línea) y los IDs descartados y
+      rechazados. La corrida se registra al final con una línea en
+      index.jsonl (configuración, huella de la traza y métricas globales),
+      así que una corrida a medio escribir nunca aparece en el índice.
+    - Abrir corridas guardadas con mmap: las columnas se leen como
+      memoryview sin copiarlas a listas de Python.
+    - Comparar dos o más corridas contra la primera: deltas de las métricas
+      globales (media y percentiles) y regresiones por proceso. Si las
+      corridas tienen los mismos IDs en el mismo orden (misma traza) se
+      comparan posición a posición; si no, se cruzan por ID.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import mmap
+import operator
+import os
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DIRECTORIO_DEFAULT = os.environ.get(
+    "SIMULADOR_ALMACEN_DIR",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "simulador-so", "corridas"),
+)
+INDICE = "index.jsonl"
+
+# Columnas por proceso, en el orden de FilaResultado.
+COLUMNAS = ("arribo", "inicio_cpu", "fin", "retorno", "espera", "respuesta", "rafaga")
+METRICAS = ("espera", "retorno", "respuesta")
+_EXTENSION = ".i64"
+_SIN_VALOR = -1
+
+
+# ---------------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------------
+
+
+def _nuevo_directorio(directorio: str) -> Tuple[str, str]:
+    """
+    Crea el directorio de la próxima corrida (c00001, c00002, ...) y
+    devuelve (id, ruta). mkdir es atómico: dos procesos que guardan a la
+    vez no eligen el mismo número.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    numeros = [
+        int(nombre[1:])
+        for nombre in os.listdir(directorio)
+        if nombre.startswith("c") and nombre[1:].isdigit()
+    ]
+    siguiente = max(numeros, default=0) + 1
+    while True:
+        id_corrida = f"c{siguiente:05d}"
+        ruta = os.path.join(directorio, id_corrida)
+        try:
+            os.mkdir(ruta)
+            return id_corrida, ruta
+        except FileExistsError:
+            siguiente += 1
+
+
+def _escribir_ids(ruta: str, ids: Sequence[str]) -> None:
+    with open(ruta, "wb") as f:
+        f.write("".join(f"{i}\n" for i in ids).encode("utf-8"))
+
+
+def guardar_corrida(
+    resultado: Any,
+    traza: str,
+    config: Dict[str, Any],
+    directorio: str = DIRECTORIO_DEFAULT,
+    etiqueta: Optional[str] = None,
+) -> str:
+    """
+    Guarda un ResultadoSimulacion y devuelve el ID de la corrida.
+
+    traza:
+        Huella de la traza (io_metricas.huella_procesos).
+    config:
+        Configuración de la corrida (solo tipos JSON); compare muestra las
+        claves que cambian entre corridas.
+    """
+    if any("\n" in f.id for f in resultado.filas):
+        raise ValueError("Los IDs con saltos de línea no se pueden guardar en el almacén.")
+    id_corrida, ruta = _nuevo_directorio(directorio)
+
+    columnas = {nombre: array("q") for nombre in COLUMNAS}
+    for f in resultado.filas:
+        for nombre, columna in columnas.items():
+            valor = getattr(f, nombre)
+            columna.append(_SIN_VALOR if valor is None else valor)
+    for nombre, columna in columnas.items():
+        with open(os.path.join(ruta, nombre + _EXTENSION), "wb") as f:
+            columna.tofile(f)
+    _escribir_ids(os.path.join(ruta, "ids.txt"), [f.id for f in resultado.filas])
+    _escribir_ids(os.path.join(ruta, "descartados.txt"), resultado.descartados)
+    _escribir_ids(os.path.join(ruta, "rechazados.txt"), getattr(resultado, "rechazados", []))
+
+    entrada = {
+        "id": id_corrida,
+        "etiqueta": etiqueta,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "traza": traza,
+        "config": config,
+        "filas": len(resultado.filas),
+        "descartados": len(resultado.descartados),
+        "rechazados": len(getattr(resultado, "rechazados", [])),
+        "throughput": resultado.throughput,
+        "tiempo_total": resultado.tiempo_total,
+    }
+    # Una sola escritura con O_APPEND: las líneas de procesos que guardan a
+    # la vez no se intercalan.
+    linea = (json.dumps(entrada, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(os.path.join(directorio, INDICE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, linea)
+    finally:
+        os.close(fd)
+    return id_corrida
+
+
+# ---------------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------------
+
+
+def listar_corridas(directorio: str = DIRECTORIO_DEFAULT) -> List[Dict[str, Any]]:
+    """
+    Entradas de index.jsonl, en orden de guardado.
+    """
+    try:
+        with open(os.path.join(directorio, INDICE), encoding="utf-8") as f:
+            return [json.loads(linea) for linea in f if linea.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def buscar_corrida(referencia: str, directorio: str = DIRECTORIO_DEFAULT) -> Dict[str, Any]:
+    """
+    Entrada de una corrida por ID o etiqueta (la más reciente con esa
+    etiqueta). KeyError si no existe.
+    """
+    for entrada in reversed(listar_corridas(directorio)):
+        if referencia in (entrada["id"], entrada.get("etiqueta")):
+            return entrada
+    raise KeyError(f"No hay corrida '{referencia}' en {directorio}")
+
+
+class CorridaGuardada:
+    """
+    Corrida abierta (solo lectura). Las columnas son memoryview de int64
+    sobre archivos mapeados; close() libera los mapas.
+    """
+
+    def __init__(self, entrada: Dict[str, Any], directorio: str = DIRECTORIO_DEFAULT) -> None:
+        self.entrada = entrada
+        self.id: str = entrada["id"]
+        self.filas: int = entrada["filas"]
+        self._ruta = os.path.join(directorio, self.id)
+        self._mapas: Dict[str, mmap.mmap] = {}
+        self._vistas: Dict[str, memoryview] = {}
+
+    def _mapear(self, nombre: str) -> mmap.mmap:
+        # mmap no acepta archivos vacíos: los llamadores resuelven filas == 0.
+        if nombre not in self._mapas:
+            with open(os.path.join(self._ruta, nombre), "rb") as f:
+                self._mapas[nombre] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mapas[nombre]
+
+    def columna(self, nombre: str) -> memoryview:
+        if nombre not in COLUMNAS:
+            raise KeyError(f"Columna desconocida: '{nombre}' (opciones: {', '.join(COLUMNAS)})")
+        if nombre not in self._vistas:
+            if self.filas == 0:
+                return memoryview(array("q"))
+            vista = memoryview(self._mapear(nombre + _EXTENSION)).cast("q")
+            if len(vista) != self.filas:
+                vista.release()
+                raise ValueError(f"Corrida {self.id}: columna '{nombre}' truncada")
+            self._vistas[nombre] = vista
+        return self._vistas[nombre]
+
+    def ids_crudos(self) -> bytes:
+        return bytes(self._mapear("ids.txt")) if self.filas else b""
+
+    def ids(self) -> List[str]:
+        # split y no splitlines: un ID puede contener separadores como \x1c.
+        return self.ids_crudos().decode("utf-8").split("\n")[:-1]
+
+    def close(self) -> None:
+        for vista in self._vistas.values():
+            vista.release()
+        self._vistas = {}
+        for mapa in self._mapas.values():
+            mapa.close()
+        self._mapas = {}
+
+    def __enter__(self) -> "CorridaGuardada":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Comparación
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ResumenMetrica:
+    media: float
+    p50: int
+    p95: int
+    p99: int
+    maximo: int
+
+
+def resumir(columna: memoryview) -> Optional[ResumenMetrica]:
+    """
+    Media y percentiles de una columna (ignora los -1). None si no hay
+    valores.
+    """
+    ordenados = sorted(columna)
+    inicio = 0
+    while inicio < len(ordenados) and ordenados[inicio] < 0:
+        inicio += 1
+    n = len(ordenados) - inicio
+    if n == 0:
+        return None
+
+    def percentil(p: float) -> int:
+        return ordenados[inicio + max(0, math.ceil(n * p) - 1)]
+
+    return ResumenMetrica(
+        media=sum(ordenados[inicio:]) / n,
+        p50=percentil(0.50),
+        p95=percentil(0.95),
+        p99=percentil(0.99),
+        maximo=ordenados[-1],
+    )
+
+
+@dataclass
+class ComparacionProcesos:
+    metrica: str
+    en_comun: int
+    peores: int
+    mejores: int
+    # (id, valor en la base, valor en la corrida), de mayor a menor aumento
+    regresiones: List[Tuple[str, int, int]]
+
+
+def _pares(base: CorridaGuardada, otra: CorridaGuardada) -> Tuple[Optional[List[int]], List[int]]:
+    """
+    (posiciones en base, posiciones en otra) de los procesos en común.
+    Con los mismos IDs en el mismo orden devuelve (None, []): se comparan
+    posición a posición sin armar listas.
+    """
+    if base.filas == otra.filas and base.ids_crudos() == otra.ids_crudos():
+        return None, []
+    posicion = {id_: i for i, id_ in enumerate(base.ids())}
+    en_base, en_otra = [], []
+    for j, id_ in enumerate(otra.ids()):
+        i = posicion.get(id_)
+        if i is not None:
+            en_base.append(i)
+            en_otra.append(j)
+    return en_base, en_otra
+
+
+def comparar_procesos(
+    base: CorridaGuardada,
+    otra: CorridaGuardada,
+    metrica: str = "espera",
+    top: int = 10,
+) -> ComparacionProcesos:
+    columna_base = base.columna(metrica)
+    columna_otra = otra.columna(metrica)
+    en_base, en_otra = _pares(base, otra)
+    if en_base is None:
+        valores_base: Sequence[int] = columna_base
+        valores_otra: Sequence[int] = columna_otra
+    else:
+        valores_base = [columna_base[i] for i in en_base]
+        valores_otra = [columna_otra[j] for j in en_otra]
+
+    # map(operator.sub) recorre las dos columnas en C.
+    deltas = array("q", map(operator.sub, valores_otra, valores_base))
+    peores = sum(1 for d in deltas if d > 0)
+    mejores = sum(1 for d in deltas if d < 0)
+    indices = [k for k in heapq.nlargest(top, range(len(deltas)), key=deltas.__getitem__) if deltas[k] > 0]
+
+    ids = otra.ids() if indices else []
+    regresiones = [
+        (ids[k if en_base is None else en_otra[k]], valores_base[k], valores_otra[k])
+        for k in indices
+    ]
+    return ComparacionProcesos(
+        metrica=metrica,
+        en_comun=len(deltas),
+        peores=peores,
+        mejores=mejores,
+        regresiones=regresiones,
+    )
+
+
+def _variacion(base: float, valor: float) -> str:
+    if base == valor:
+        return "="
+    if base == 0:
+        return "nuevo"
+    return f"{(valor - base) / abs(base):+.1%}"
+
+
+def _config_variable(entradas: Sequence[Dict[str, Any]]) -> List[str]:
+    claves = sorted({k for e in entradas for k in e.get("config", {})})
+    return [
+        k for k in claves
+        if len({json.dumps(e.get("config", {}).get(k), sort_keys=True) for e in entradas}) > 1
+    ]
+
+
+def _lineas_globales(corridas: Sequence[CorridaGuardada]) -> Iterator[str]:
+    """
+    Una columna de valores por corrida y, desde la segunda, su variación
+    relativa respecto de la primera.
+    """
+    resumenes = [{m: resumir(c.columna(m)) for m in METRICAS} for c in corridas]
+    cabecera = f"  {'Métrica':<18}{corridas[0].id:>12}"
+    for c in corridas[1:]:
+        cabecera += f"{c.id:>12}{'Δ':>9}"
+    yield cabecera
+
+    def fila(nombre: str, valores: List[Optional[float]], formato: str) -> str:
+        texto = f"  {nombre:<18}"
+        for k, v in enumerate(valores):
+            texto += f"{'-' if v is None else format(v, formato):>12}"
+            if k > 0:
+                base = valores[0]
+                variacion = "-" if v is None or base is None else _variacion(base, v)
+                texto += f"{variacion:>9}"
+        return texto
+
+    for metrica in METRICAS:
+        for campo, formato in (("media", ".2f"), ("p50", ".0f"), ("p95", ".0f"), ("p99", ".0f"), ("maximo", ".0f")):
+            valores = [
+                None if r[metrica] is None else float(getattr(r[metrica], campo))
+                for r in resumenes
+            ]
+            yield fila(f"{metrica} {campo}", valores, formato)
+    yield fila("throughput", [float(c.entrada["throughput"]) for c in corridas], ".4f")
+    for clave in ("tiempo_total", "filas", "descartados", "rechazados"):
+        yield fila(clave, [float(c.entrada.get(clave, 0)) for c in corridas], ".0f")
+
+
+def imprimir_comparacion(
+    referencias: Sequence[str],
+    directorio: str = DIRECTORIO_DEFAULT,
+    metrica: str = "espera",
+    top: int = 10,
+) -> None:
+    """
+    Compara las corridas indicadas (ID o etiqueta) contra la primera.
+    """
+    if len(referencias) < 2:
+        raise ValueError("compare necesita al menos dos corridas")
+    if metrica not in COLUMNAS:
+        raise ValueError(f"Métrica desconocida: '{metrica}' (opciones: {', '.join(COLUMNAS)})")
+    corridas = [CorridaGuardada(buscar_corrida(r, directorio), directorio) for r in referencias]
+    try:
+        print("\n===== COMPARACIÓN DE CORRIDAS =====")
+        variables = _config_variable([c.entrada for c in corridas])
+        for c in corridas:
+            e = c.entrada
+            config = ", ".join(
+                f"{k}={json.dumps(e.get('config', {}).get(k), ensure_ascii=False)}" for k in variables
+            )
+            etiqueta = f" [{e['etiqueta']}]" if e.get("etiqueta") else ""
+            print(f"{c.id}{etiqueta}  {e['fecha']}  traza {e['traza'][:12]}  {config}")
+        if len({c.entrada["traza"] for c in corridas}) > 1:
+            print("Aviso: las corridas no usan la misma traza; se comparan los IDs en común.")
+
+        print()
+        for linea in _lineas_globales(corridas):
+            print(linea)
+
+        base = corridas[0]
+        for otra in corridas[1:]:
+            comparacion = comparar_procesos(base, otra, metrica, top)
+            print(
+                f"\n{metrica} por proceso, {otra.id} vs {base.id}: {comparacion.en_comun} en común, "
+                f"{comparacion.peores} peor, {comparacion.mejores} mejor"
+            )
+            for id_, antes, despues in comparacion.regresiones:
+                print(f"  {id_:<16}{antes:>10} -> {despues:<10}({despues - antes:+d})")
+        print("===================================\n")
+    finally:
+        for c in corridas:
+            c.close()
+
+
+def imprimir_listado(directorio: str = DIRECTORIO_DEFAULT) -> None:
+    entradas = listar_corridas(directorio)
+    if not entradas:
+        print(f"No hay corridas guardadas en {directorio}")
+        return
+    variables = _config_variable(entradas)
+    for e in entradas:
+        etiqueta = f" [{e['etiqueta']}]" if e.get("etiqueta") else ""
+        config = ", ".join(
+            f"{k}={json.dumps(e.get('config', {}).get(k), ensure_ascii=False)}" for k in variables
+        )
+        print(
+            f"{e['id']}{etiqueta}  {e['fecha']}  traza {e['traza'][:12]}  "
+            f"{e['filas']} procesos  {config}"
+        )
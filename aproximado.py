@@ -0,0 +1,468 @@
+"""
+Simulación aproximada por muestreo estratificado de tajadas de tiempo.
+
+Responsabilidades:
+    - Dividir el lapso de arribos de la traza en estratos de igual
+      duración y, en cada uno, simular una tajada [desde, desde + tajada)
+      elegida al azar, con calentamiento antes (procesos que ya ocupan el
+      sistema) y enfriamiento después (arribos que le siguen compitiendo a
+      los medidos). Cada tajada se carga con el índice de la traza
+      (indice_traza.cargar_ventana), sin leer el resto del archivo.
+    - Extrapolar las METRICAS de replicas.py: cada proceso medido del
+      estrato h pesa N_h / a_h (procesos del estrato sobre procesos
+      arribados en sus tajadas); medias y percentiles son los del conjunto
+      ponderado. El throughput usa los completados estimados sobre el
+      último arribo (o el fin observado, si una tajada llega al final), así
+      que ignora el drenaje final salvo en ese caso.
+    - Acotar el error con grupos aleatorios: cada grupo tiene una tajada
+      por estrato (con su propio sorteo) y da una estimación completa e
+      independiente; el semiancho es el del intervalo t entre grupos. Se
+      agregan grupos hasta que las métricas objetivo alcanzan la precisión
+      pedida (semiancho relativo al valor estimado).
+    - Estimar la carga ofrecida a la CPU (ráfaga que arriba por unidad de
+      tiempo). Con carga >= 1 la cola crece durante toda la traza y ninguna
+      tajada con calentamiento finito la representa: se avisa en lugar de
+      confiar en los intervalos.
+    - validar: corre la traza completa con Simulador y compara.
+
+Reproducibilidad:
+    Como en replicas.py, los grupos se simulan en lotes pero el corte se
+    revisa grupo por grupo en orden: el resultado es el mismo con 1 o con
+    N workers.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from indice_traza import abrir_indice, cargar_ventana
+from memoria import TAMANIOS_USUARIO_DEFAULT, GestorMemoria
+from replicas import METRICAS, Intervalo, intervalo_confianza, valores_resultado
+from simulacion import Simulador
+from tiempo_real import crear_scheduler
+
+TIEMPOS = ("espera", "retorno", "respuesta")
+# Con el default, cada grupo cubre el 1% del lapso de la traza.
+TAJADAS_POR_ESTRATO = 100
+# Carga ofrecida a partir de la cual se avisa que el sistema no es estable.
+CARGA_SATURACION = 1.0
+
+
+@dataclass(frozen=True)
+class ConfigAproximada:
+    grado: int = 5
+    particiones: Tuple[int, ...] = TAMANIOS_USUARIO_DEFAULT
+    politica_espera: str = "fifo"
+    planificador: str = "srtf"
+
+
+@dataclass
+class Tajada:
+    """
+    Lo medido en una tajada: procesos con arribo en [desde, hasta).
+    """
+
+    estrato: int
+    desde: int
+    hasta: int
+    arribados: int
+    simulados: int
+    fin: int
+    # Ráfaga total de los arribados
+    trabajo: int
+    tiempos: Dict[str, array]
+
+    @property
+    def completados(self) -> int:
+        return len(self.tiempos["espera"])
+
+
+@dataclass
+class ResultadoAproximado:
+    config: ConfigAproximada
+    ruta: str
+    procesos: int
+    estratos: int
+    tajada: int
+    calentamiento: int
+    confianza: float
+    precision: float
+    objetivos: Tuple[str, ...]
+    grupos: List[List[Tajada]] = field(default_factory=list)
+    intervalos: List[Intervalo] = field(default_factory=list)
+    convergio: bool = False
+    carga: float = 0.0
+    segundos: float = 0.0
+
+    def intervalo(self, metrica: str) -> Intervalo:
+        for i in self.intervalos:
+            if i.metrica == metrica:
+                return i
+        raise KeyError(metrica)
+
+    @property
+    def simulados(self) -> int:
+        """
+        Procesos simulados en total (medidos + calentamiento + enfriamiento).
+        """
+        return sum(t.simulados for grupo in self.grupos for t in grupo)
+
+    def imprimir(self) -> None:
+        print("\n===== SIMULACIÓN APROXIMADA =====")
+        print(
+            f"{len(self.grupos)} grupos x {self.estratos} estratos, tajadas de {self.tajada} "
+            f"(+{self.calentamiento} de calentamiento y enfriamiento)"
+        )
+        print(
+            f"Procesos simulados: {self.simulados} ({self.simulados / self.procesos:.1%} "
+            f"de {self.procesos}) en {self.segundos:.2f} s"
+        )
+        estado = "alcanzada" if self.convergio else "NO alcanzada"
+        print(
+            f"Precisión ±{self.precision:.1%} en {', '.join(self.objetivos)}: {estado} "
+            f"(confianza {self.confianza:.0%})"
+        )
+        if not self.convergio and self.simulados >= self.procesos:
+            print("Se simularon tantos procesos como tiene la traza: conviene la corrida completa.")
+        print(f"Carga ofrecida a la CPU: {self.carga:.3f}")
+        if self.carga >= CARGA_SATURACION:
+            print(
+                "AVISO: con la CPU saturada la cola crece durante toda la traza; las tajadas "
+                "no la representan y los valores (e intervalos) subestiman las esperas. "
+                "Usar la corrida completa."
+            )
+
+        print(f"\n  {'Métrica':<18}{'Estimado':>12}{'± Semiancho':>14}{'Relativo':>10}")
+        for i in self.intervalos:
+            marca = "*" if i.metrica in self.objetivos else " "
+            relativo = f"{i.relativo:>10.2%}" if math.isfinite(i.relativo) else f"{'-':>10}"
+            print(f"{marca} {i.metrica:<18}{i.media:>12.4f}{i.semiancho:>14.4f}{relativo}")
+        print("=================================\n")
+
+
+# ---------------------------------------------------------------------------
+# Tajadas (en el proceso actual o en trabajadores)
+# ---------------------------------------------------------------------------
+
+
+def _simular_tajada(tarea: Tuple[str, int, int, int, int, ConfigAproximada]) -> Tajada:
+    ruta, estrato, desde, hasta, margen, config = tarea
+    procesos, _ = cargar_ventana(ruta, desde, hasta + margen, margen)
+    tiempos = {nombre: array("q") for nombre in TIEMPOS}
+    medidos = [p for p in procesos if desde <= p.arribo < hasta]
+    trabajo = sum(int(p.rafaga_cpu) for p in medidos)
+    if not medidos:
+        return Tajada(estrato, desde, hasta, 0, len(procesos), 0, 0, tiempos)
+
+    gestor = GestorMemoria(
+        grado_multiprogramacion_max=config.grado,
+        politica_espera=config.politica_espera,
+        silencioso=True,
+        tamanios_usuario=config.particiones,
+    )
+    resultado = Simulador(
+        procesos,
+        gestor,
+        scheduler=crear_scheduler(config.planificador),
+        registrar_linea_tiempo=False,
+        metricas_desde=desde,
+    ).simular()
+
+    fin = 0
+    for f in resultado.filas:
+        if f.arribo >= hasta or f.fin is None:
+            continue
+        fin = max(fin, f.fin)
+        for nombre in TIEMPOS:
+            tiempos[nombre].append(getattr(f, nombre))
+    return Tajada(estrato, desde, hasta, len(medidos), len(procesos), fin, trabajo, tiempos)
+
+
+# ---------------------------------------------------------------------------
+# Estimación
+# ---------------------------------------------------------------------------
+
+
+def _percentil_ponderado(pares: List[Tuple[int, float]], p: float) -> float:
+    """
+    Menor valor cuyo peso acumulado alcanza p del total (con pesos iguales,
+    el mismo criterio que replicas._percentil).
+    """
+    if not pares:
+        return 0.0
+    pares.sort()
+    objetivo = p * math.fsum(w for _, w in pares)
+    acumulado = 0.0
+    for valor, peso in pares:
+        acumulado += peso
+        # Tolerancia relativa para no pasarse por redondeo.
+        if acumulado >= objetivo * (1 - 1e-12):
+            return float(valor)
+    return float(pares[-1][0])
+
+
+def _pesos(tajadas: Sequence[Tajada], por_estrato: Sequence[int]) -> List[float]:
+    arribados = [0] * len(por_estrato)
+    for t in tajadas:
+        arribados[t.estrato] += t.arribados
+    return [n / a if a else 0.0 for n, a in zip(por_estrato, arribados)]
+
+
+def estimar_carga(tajadas: Sequence[Tajada], por_estrato: Sequence[int], lapso: int) -> float:
+    """
+    Ráfaga total estimada de la traza sobre el lapso de sus arribos.
+    """
+    pesos = _pesos(tajadas, por_estrato)
+    return math.fsum(pesos[t.estrato] * t.trabajo for t in tajadas) / lapso
+
+
+def estimar(
+    tajadas: Sequence[Tajada],
+    por_estrato: Sequence[int],
+    fin_arribos: int,
+    metricas: Sequence[str] = METRICAS,
+) -> Dict[str, float]:
+    """
+    'metricas' extrapoladas desde 'tajadas'; por_estrato[h] es la cantidad
+    de procesos de la traza en el estrato h. Los estratos sin arribos en
+    sus tajadas no aportan (ni pesan).
+    """
+    pesos = _pesos(tajadas, por_estrato)
+    fin = fin_arribos
+    completados = 0.0
+    for t in tajadas:
+        completados += pesos[t.estrato] * t.completados
+        if t.hasta > fin_arribos:
+            fin = max(fin, t.fin)
+
+    valores: Dict[str, float] = {}
+    if "throughput" in metricas:
+        valores["throughput"] = completados / fin if fin > 0 else 0.0
+    for nombre in TIEMPOS:
+        pedidas = [m for m in metricas if m.startswith(nombre + "_")]
+        if not pedidas:
+            continue
+        if f"{nombre}_media" in pedidas:
+            suma = math.fsum(pesos[t.estrato] * sum(t.tiempos[nombre]) for t in tajadas)
+            valores[f"{nombre}_media"] = suma / completados if completados else 0.0
+        colas = [m for m in pedidas if not m.endswith("_media")]
+        if colas:
+            pares = [
+                (v, pesos[t.estrato]) for t in tajadas if pesos[t.estrato] for v in t.tiempos[nombre]
+            ]
+            for m in colas:
+                valores[m] = _percentil_ponderado(pares, int(m[-2:]) / 100)
+    return valores
+
+
+def _intervalos(
+    grupos: Sequence[List[Tajada]],
+    por_estrato: Sequence[int],
+    fin_arribos: int,
+    confianza: float,
+    metricas: Sequence[str],
+) -> List[Intervalo]:
+    """
+    Estimación con todas las tajadas y semiancho t entre las estimaciones
+    de cada grupo.
+    """
+    todas = [t for grupo in grupos for t in grupo]
+    combinada = estimar(todas, por_estrato, fin_arribos, metricas)
+    por_grupo = [estimar(g, por_estrato, fin_arribos, metricas) for g in grupos]
+    intervalos = []
+    for metrica in metricas:
+        _, semiancho = intervalo_confianza([v[metrica] for v in por_grupo], confianza)
+        intervalos.append(Intervalo(metrica=metrica, media=combinada[metrica], semiancho=semiancho))
+    return intervalos
+
+
+# ---------------------------------------------------------------------------
+# Muestreo
+# ---------------------------------------------------------------------------
+
+
+def aproximar(
+    ruta: str,
+    config: ConfigAproximada = ConfigAproximada(),
+    estratos: int = 10,
+    tajada: Optional[int] = None,
+    calentamiento: Optional[int] = None,
+    semilla: int = 0,
+    confianza: float = 0.95,
+    precision: float = 0.05,
+    objetivos: Sequence[str] = ("espera_media",),
+    min_grupos: int = 4,
+    max_grupos: int = 50,
+    workers: int = 1,
+    al_terminar_lote: Optional[Callable[[int, List[Intervalo]], None]] = None,
+) -> ResultadoAproximado:
+    """
+    Agrega grupos de tajadas hasta que todas las métricas de 'objetivos'
+    tengan un semiancho <= precision * |estimado| (con al menos
+    'min_grupos'), hasta 'max_grupos' o hasta que lo simulado iguale a la
+    traza (ahí conviene la corrida completa).
+
+    tajada:
+        Duración de cada tajada (default: 1/TAJADAS_POR_ESTRATO del estrato).
+    calentamiento:
+        Duración simulada antes y después de cada tajada sin medirla
+        (default: la de la tajada).
+    """
+    if estratos <= 0:
+        raise ValueError("La cantidad de estratos debe ser > 0")
+    if not 0 < confianza < 1:
+        raise ValueError("La confianza debe estar en (0, 1)")
+    if precision <= 0:
+        raise ValueError("La precisión debe ser > 0")
+    if min_grupos < 2 or max_grupos < min_grupos:
+        raise ValueError("Se requiere 2 <= min_grupos <= max_grupos")
+    desconocidas = [m for m in objetivos if m not in METRICAS]
+    if desconocidas or not objetivos:
+        raise ValueError(
+            f"Métricas objetivo inválidas: {', '.join(desconocidas) or '(ninguna)'} "
+            f"(opciones: {', '.join(METRICAS)})"
+        )
+
+    inicio_reloj = time.perf_counter()
+    with abrir_indice(ruta) as indice:
+        rango = indice.rango_arribos()
+        if rango is None:
+            raise ValueError(f"La traza '{ruta}' no contiene procesos.")
+        primero, ultimo = rango
+        ancho = max(1, math.ceil((ultimo + 1 - primero) / estratos))
+        limites = [primero + h * ancho for h in range(estratos + 1)]
+        por_estrato = [indice.contar_en(limites[h], limites[h + 1]) for h in range(estratos)]
+        total = len(indice)
+
+    if tajada is None:
+        tajada = max(1, ancho // TAJADAS_POR_ESTRATO)
+    if not 0 < tajada <= ancho:
+        raise ValueError(f"La tajada debe estar en [1, {ancho}] (duración de cada estrato)")
+    if calentamiento is None:
+        calentamiento = tajada
+    if calentamiento < 0:
+        raise ValueError("calentamiento debe ser >= 0")
+
+    resultado = ResultadoAproximado(
+        config=config,
+        ruta=ruta,
+        procesos=total,
+        estratos=estratos,
+        tajada=tajada,
+        calentamiento=calentamiento,
+        confianza=confianza,
+        precision=precision,
+        objetivos=tuple(objetivos),
+    )
+
+    def tareas_grupo(g: int) -> List[Tuple[str, int, int, int, int, ConfigAproximada]]:
+        azar = random.Random(f"{semilla}:grupo:{g}")
+        tareas = []
+        for h in range(estratos):
+            desde = limites[h] + azar.randrange(ancho - tajada + 1)
+            tareas.append((ruta, h, desde, desde + tajada, calentamiento, config))
+        return tareas
+
+    def alcanzada(intervalos: List[Intervalo]) -> bool:
+        return all(i.relativo <= precision for i in intervalos)
+
+    parciales: List[Intervalo] = []
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while (
+            len(resultado.grupos) < max_grupos
+            and not resultado.convergio
+            and resultado.simulados < total
+        ):
+            hechos = len(resultado.grupos)
+            lote = max(min_grupos - hechos, math.ceil(workers / estratos), 1)
+            lote = min(lote, max_grupos - hechos)
+            tareas = [t for g in range(hechos, hechos + lote) for t in tareas_grupo(g)]
+            if pool is None:
+                tajadas = list(map(_simular_tajada, tareas))
+            else:
+                tajadas = list(pool.map(_simular_tajada, tareas))
+
+            for k in range(lote):
+                resultado.grupos.append(tajadas[k * estratos:(k + 1) * estratos])
+                if len(resultado.grupos) >= min_grupos or resultado.simulados >= total:
+                    parciales = _intervalos(
+                        resultado.grupos, por_estrato, ultimo, confianza, resultado.objetivos
+                    )
+                    if alcanzada(parciales):
+                        resultado.convergio = True
+                        break
+                    if resultado.simulados >= total:
+                        break
+            if al_terminar_lote is not None and parciales:
+                al_terminar_lote(len(resultado.grupos), parciales)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    resultado.intervalos = _intervalos(resultado.grupos, por_estrato, ultimo, confianza, METRICAS)
+    resultado.carga = estimar_carga(
+        [t for grupo in resultado.grupos for t in grupo], por_estrato, ultimo + 1 - primero
+    )
+    resultado.segundos = time.perf_counter() - inicio_reloj
+    return resultado
+
+
+# ---------------------------------------------------------------------------
+# Validación contra la corrida completa
+# ---------------------------------------------------------------------------
+
+
+def validar(resultado: ResultadoAproximado) -> Tuple[Dict[str, float], float]:
+    """
+    Corre la traza completa con la misma configuración y devuelve
+    (valores exactos de METRICAS, segundos de la corrida).
+    """
+    from io_metricas import cargar_procesos
+
+    inicio_reloj = time.perf_counter()
+    config = resultado.config
+    gestor = GestorMemoria(
+        grado_multiprogramacion_max=config.grado,
+        politica_espera=config.politica_espera,
+        silencioso=True,
+        tamanios_usuario=config.particiones,
+    )
+    exacto = Simulador(
+        cargar_procesos(resultado.ruta),
+        gestor,
+        scheduler=crear_scheduler(config.planificador),
+        registrar_linea_tiempo=False,
+    ).simular()
+    return valores_resultado(exacto), time.perf_counter() - inicio_reloj
+
+
+def imprimir_validacion(
+    resultado: ResultadoAproximado, exactos: Dict[str, float], segundos: float
+) -> int:
+    """
+    Tabla estimado / exacto; devuelve cuántos exactos quedaron fuera del
+    intervalo.
+    """
+    print("===== VALIDACIÓN CONTRA LA CORRIDA COMPLETA =====")
+    print(f"Corrida completa: {segundos:.2f} s (aproximada: {resultado.segundos:.2f} s)")
+    print(f"\n  {'Métrica':<18}{'Estimado':>12}{'± Semiancho':>14}{'Exacto':>12}{'Error':>9}  Cubre")
+    fuera = 0
+    for i in resultado.intervalos:
+        exacto = exactos[i.metrica]
+        error = (i.media - exacto) / exacto if exacto else 0.0
+        cubre = abs(i.media - exacto) <= i.semiancho
+        fuera += not cubre
+        print(
+            f"  {i.metrica:<18}{i.media:>12.4f}{i.semiancho:>14.4f}{exacto:>12.4f}"
+            f"{error:>+9.2%}  {'sí' if cubre else 'NO'}"
+        )
+    print(f"\n{len(resultado.intervalos) - fuera} de {len(resultado.intervalos)} intervalos cubren el valor exacto.")
+    print("=================================================\n")
+    return fuera
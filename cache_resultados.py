@@ -0,0 +1,181 @@
+"""
+Caché en disco de resultados de simulación, direccionada por contenido.
+
+Responsabilidades:
+    - Calcular una clave a partir de la traza parseada, la configuración de
+      GestorMemoria (particiones, grado de multiprogramación y política de
+      espera), el tipo de scheduler y la versión del código de simulación.
+    - Guardar / recuperar ResultadoSimulacion por clave.
+    - Acotar el tamaño total con desalojo LRU (por fecha de último uso).
+
+La versión del código es el hash de los módulos que determinan el
+resultado, así que cualquier cambio en ellos invalida la caché.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import zlib
+from typing import Any, List, Optional, Tuple
+
+# Módulos cuyo código fuente forma parte de la clave.
+MODULOS_SIMULACION = (
+    "procesos",
+    "memoria",
+    "politicas_espera",
+    "planificador_srtf",
+    "simulacion",
+    "srtf_analitico",
+    "tiempo_real",
+    "fair_share",
+    "control_carga",
+)
+
+DIRECTORIO_DEFAULT = os.environ.get(
+    "SIMULADOR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "simulador-so"),
+)
+TAMANIO_MAXIMO_DEFAULT = 256 * 1024 * 1024
+
+_EXTENSION = ".res"
+_version_codigo: Optional[str] = None
+
+
+def version_codigo() -> str:
+    """
+    Hash del código fuente de MODULOS_SIMULACION (se calcula una vez).
+    """
+    global _version_codigo
+    if _version_codigo is None:
+        h = hashlib.sha256()
+        for nombre in MODULOS_SIMULACION:
+            modulo = sys.modules.get(nombre) or __import__(nombre)
+            with open(modulo.__file__, "rb") as f:  # type: ignore[arg-type]
+                h.update(nombre.encode() + b"\0" + f.read())
+        _version_codigo = h.hexdigest()
+    return _version_codigo
+
+
+def clave_simulacion(simulador: Any, traza: Optional[str] = None) -> str:
+    """
+    Clave de caché de un Simulador listo para correr. 'traza' reemplaza la
+    huella de la traza completa (instantaneas.py usa la de un prefijo).
+    """
+    gestor = simulador.gestor_memoria
+    scheduler = simulador.scheduler
+    descripcion = {
+        "traza": simulador.huella_traza() if traza is None else traza,
+        "particiones": [
+            [p.id_particion, p.base, p.tamanio, p.es_so] for p in gestor.particiones
+        ],
+        "grado_max": gestor.grado_multiprogramacion_max,
+        "politica_espera": getattr(gestor, "politica_espera", "fifo"),
+        "control_carga": (
+            None
+            if getattr(gestor, "control_carga", None) is None
+            else gestor.control_carga.configuracion()
+        ),
+        "metricas_desde": getattr(simulador, "metricas_desde", 0),
+        # Las instantáneas llevan la línea de tiempo solo si se registra.
+        "linea_tiempo": getattr(simulador, "linea_tiempo", None) is not None,
+        "scheduler": f"{type(scheduler).__module__}.{type(scheduler).__qualname__}",
+        "scheduler_config": (
+            scheduler.configuracion() if hasattr(scheduler, "configuracion") else None
+        ),
+        "codigo": version_codigo(),
+    }
+    texto = json.dumps(descripcion, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+class CacheResultados:
+    """
+    Directorio de resultados serializados (pickle + zlib), uno por clave.
+
+    El orden LRU se lleva con la fecha de modificación de cada archivo,
+    que se actualiza en cada acierto.
+    """
+
+    def __init__(
+        self,
+        directorio: str = DIRECTORIO_DEFAULT,
+        tamanio_maximo: int = TAMANIO_MAXIMO_DEFAULT,
+    ) -> None:
+        if tamanio_maximo <= 0:
+            raise ValueError("tamanio_maximo debe ser > 0")
+        self._directorio = directorio
+        self._tamanio_maximo = tamanio_maximo
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self._directorio, clave + _EXTENSION)
+
+    def obtener(self, clave: str) -> Optional[Any]:
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as f:
+                resultado = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError):
+            # Entrada corrupta o de una versión incompatible: se descarta.
+            self._borrar(ruta)
+            return None
+
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        return resultado
+
+    def guardar(self, clave: str, resultado: Any) -> None:
+        os.makedirs(self._directorio, exist_ok=True)
+        datos = zlib.compress(pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL))
+        if len(datos) > self._tamanio_maximo:
+            return
+
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(datos)
+        os.replace(temporal, ruta)
+        self._desalojar()
+
+    def _entradas(self) -> List[Tuple[float, int, str]]:
+        entradas = []
+        try:
+            nombres = os.listdir(self._directorio)
+        except FileNotFoundError:
+            return []
+        for nombre in nombres:
+            if not nombre.endswith(_EXTENSION):
+                continue
+            ruta = os.path.join(self._directorio, nombre)
+            try:
+                st = os.stat(ruta)
+            except FileNotFoundError:
+                continue
+            entradas.append((st.st_mtime, st.st_size, ruta))
+        return entradas
+
+    def _desalojar(self) -> None:
+        """
+        Borra las entradas menos usadas hasta respetar el tamaño máximo.
+        """
+        entradas = sorted(self._entradas())
+        total = sum(tamanio for _, tamanio, _ in entradas)
+        for _, tamanio, ruta in entradas:
+            if total <= self._tamanio_maximo:
+                break
+            self._borrar(ruta)
+            total -= tamanio
+
+    @staticmethod
+    def _borrar(ruta: str) -> None:
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
@@ -0,0 +1,127 @@
+"""
+Checkpoints periódicos y reanudación de una simulación en curso.
+
+Responsabilidades:
+    - Serializar el estado completo del ciclo de eventos (Simulador,
+      SrtfScheduler y GestorMemoria) en un formato binario compacto.
+    - Guardar checkpoints cada N eventos y/o cada T segundos de reloj real.
+    - Restaurar un checkpoint sobre un Simulador recién construido, de modo
+      que la corrida reanudada produzca exactamente los mismos resultados.
+
+Formato del archivo:
+    MAGIA (8 bytes) | versión (1 byte) | huella de la traza (32 bytes)
+    | estado serializado con pickle y comprimido con zlib.
+
+La huella (SHA-256 de la traza ordenada) impide reanudar sobre otro CSV.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+MAGIA = b"SIMSOCKP"
+# 2: el estado del planificador lleva su nombre y no el historial.
+VERSION = 2
+_LARGO_CABECERA = len(MAGIA) + 1 + 32
+
+
+def guardar_checkpoint(simulador: Any, ruta: str) -> None:
+    """
+    Escribe el estado actual del simulador en 'ruta'.
+
+    La escritura es atómica: se escribe a un temporal y luego se reemplaza,
+    así una interrupción a mitad de escritura no deja un checkpoint roto.
+    """
+    estado = simulador.exportar_estado()
+    cuerpo = zlib.compress(pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL))
+    cabecera = MAGIA + bytes([VERSION]) + bytes.fromhex(simulador.huella_traza())
+
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(cabecera)
+        f.write(cuerpo)
+    os.replace(temporal, ruta)
+
+
+def leer_checkpoint(ruta: str) -> Dict[str, Any]:
+    """
+    Lee un checkpoint y devuelve {"huella": str, "estado": dict}.
+    """
+    with open(ruta, "rb") as f:
+        datos = f.read()
+
+    if len(datos) < _LARGO_CABECERA or not datos.startswith(MAGIA):
+        raise ValueError(f"'{ruta}' no es un checkpoint del simulador.")
+
+    version = datos[len(MAGIA)]
+    if version != VERSION:
+        raise ValueError(
+            f"Checkpoint versión {version} no soportada (se esperaba {VERSION})."
+        )
+
+    huella = datos[len(MAGIA) + 1 : _LARGO_CABECERA].hex()
+    estado = pickle.loads(zlib.decompress(datos[_LARGO_CABECERA:]))
+    return {"huella": huella, "estado": estado}
+
+
+def cargar_checkpoint(ruta: str, simulador: Any) -> None:
+    """
+    Restaura en 'simulador' el estado guardado en 'ruta'.
+    La traza del simulador debe ser la misma que la del checkpoint.
+    """
+    contenido = leer_checkpoint(ruta)
+    if contenido["huella"] != simulador.huella_traza():
+        raise ValueError(
+            f"El checkpoint '{ruta}' corresponde a otra traza de procesos."
+        )
+    simulador.restaurar_estado(contenido["estado"])
+
+
+class CheckpointPeriodico:
+    """
+    Observador del Simulador que guarda checkpoints periódicos.
+
+    Configuración:
+        ruta: archivo destino (se sobrescribe en cada guardado).
+        cada_eventos: guarda cada N eventos procesados (None = desactivado).
+        cada_segundos: guarda cada T segundos de reloj real (None = desactivado).
+    """
+
+    def __init__(
+        self,
+        ruta: str,
+        cada_eventos: Optional[int] = None,
+        cada_segundos: Optional[float] = None,
+    ) -> None:
+        if cada_eventos is not None and cada_eventos <= 0:
+            raise ValueError("cada_eventos debe ser > 0")
+        if cada_segundos is not None and cada_segundos <= 0:
+            raise ValueError("cada_segundos debe ser > 0")
+
+        self._ruta = ruta
+        self._cada_eventos = cada_eventos
+        self._cada_segundos = cada_segundos
+        self._eventos_desde_ultimo = 0
+        self._ultimo_guardado = time.monotonic()
+        self.guardados = 0
+
+    def despues_de_evento(self, simulador: Any, evento: str, tiempo: int) -> None:
+        self._eventos_desde_ultimo += 1
+
+        por_eventos = (
+            self._cada_eventos is not None
+            and self._eventos_desde_ultimo >= self._cada_eventos
+        )
+        por_tiempo = (
+            self._cada_segundos is not None
+            and time.monotonic() - self._ultimo_guardado >= self._cada_segundos
+        )
+        if por_eventos or por_tiempo:
+            guardar_checkpoint(simulador, self._ruta)
+            self._eventos_desde_ultimo = 0
+            self._ultimo_guardado = time.monotonic()
+            self.guardados += 1
@@ -0,0 +1,460 @@
+"""
+Simulación de un cluster: N nodos (GestorMemoria + SrtfScheduler cada uno)
+alimentados por un despachador global.
+
+Responsabilidades:
+    - Despachar cada arribo a un nodo: round-robin, menos-cargado,
+      mejor-ajuste (partición libre más ajustada de todo el cluster) o
+      potencia-de-dos (el menos cargado de dos nodos al azar).
+    - Avanzar los nodos en ventanas de tiempo conservadoras: el despachador
+      asigna los arribos de [T, T+W) con la carga informada por los nodos en
+      T (más lo que él mismo asignó en la ventana) y luego cada nodo simula
+      hasta T+W. Los nodos no interactúan entre sí, así que cada uno es
+      exacto dado lo que recibe; W solo acota qué tan vieja es la carga que
+      ve el despachador.
+    - Repartir los nodos entre procesos trabajadores (Pipe por trabajador)
+      que simulan cada ventana en paralelo.
+    - Reportar métricas por nodo y del cluster completo.
+
+Los nodos pliegan los procesos terminados en histogramas
+(SimuladorEnLinea), así que la memoria queda acotada por los procesos
+presentes en el sistema y la traza puede leerse en streaming.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import multiprocessing
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Type
+
+from memoria import GestorMemoria
+from metricas_streaming import AgregadoTiempos
+from procesos import Proceso
+from simulacion_en_linea import SimuladorEnLinea
+
+VENTANA_DEFAULT = 100
+
+# (id, arribo, rafaga, memoria): forma compacta para mandar por el Pipe.
+FilaProceso = Tuple[str, int, int, int]
+
+
+# ---------------------------------------------------------------------------
+# Nodo
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CargaNodo:
+    """
+    Lo que un nodo informa al despachador al cerrar cada ventana.
+    """
+
+    en_sistema: int
+    libres: List[int]
+
+
+@dataclass
+class ResumenNodo:
+    indice: int
+    asignados: int
+    descartados: int
+    agregado: AgregadoTiempos
+
+    @property
+    def completados(self) -> int:
+        return self.agregado.completados
+
+
+class NodoCluster(SimuladorEnLinea):
+    """
+    SimuladorEnLinea cuya fuente es un buffer que el despachador llena
+    ventana a ventana.
+    """
+
+    def __init__(self, indice: int, politica_espera: str = "fifo") -> None:
+        super().__init__(
+            fuente=(),
+            gestor_memoria=GestorMemoria(politica_espera=politica_espera, silencioso=True),
+        )
+        self.indice = indice
+        self._buffer: Deque[Proceso] = deque()
+
+    def recibir(self, filas: Iterable[FilaProceso]) -> None:
+        self._buffer.extend(Proceso(*fila) for fila in filas)
+
+    def _espiar(self) -> Optional[Proceso]:
+        if self._proximo is None and self._buffer:
+            self._proximo = self._buffer.popleft()
+        return self._proximo
+
+    def carga(self) -> CargaNodo:
+        return CargaNodo(
+            en_sistema=len(self._estado_metricas) + len(self._buffer),
+            libres=[
+                p.tamanio
+                for p in self._gestor_memoria.particiones
+                if not p.es_so and p.esta_libre
+            ],
+        )
+
+    def resumen(self) -> ResumenNodo:
+        self._calcular_metricas_finales()
+        return ResumenNodo(
+            indice=self.indice,
+            asignados=self._arribados,
+            descartados=self._descartados,
+            agregado=self._agregado,
+        )
+
+
+class _GrupoNodos:
+    """
+    Nodos simulados en este proceso.
+    """
+
+    def __init__(self, indices: List[int], politica_espera: str) -> None:
+        self.nodos = {i: NodoCluster(i, politica_espera) for i in indices}
+
+    def ventana(self, horizonte: int, lotes: Dict[int, List[FilaProceso]]) -> Dict[int, CargaNodo]:
+        for i, filas in lotes.items():
+            self.nodos[i].recibir(filas)
+        cargas = {}
+        for i, nodo in self.nodos.items():
+            nodo.ejecutar_hasta(horizonte)
+            cargas[i] = nodo.carga()
+        return cargas
+
+    def fin(self) -> Dict[int, ResumenNodo]:
+        resumenes = {}
+        for i, nodo in self.nodos.items():
+            nodo.ejecutar_hasta(None)
+            resumenes[i] = nodo.resumen()
+        return resumenes
+
+
+def _trabajador(conexion: Any, indices: List[int], politica_espera: str) -> None:
+    grupo = _GrupoNodos(indices, politica_espera)
+    try:
+        while True:
+            mensaje = conexion.recv()
+            if mensaje[0] == "ventana":
+                conexion.send(("ok", grupo.ventana(mensaje[1], mensaje[2])))
+            else:
+                conexion.send(("ok", grupo.fin()))
+                return
+    except Exception as e:  # noqa: BLE001
+        conexion.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conexion.close()
+
+
+class _GrupoRemoto:
+    """
+    Nodos simulados en un proceso trabajador; misma interfaz que
+    _GrupoNodos pero separada en enviar / recibir para solapar trabajadores.
+    """
+
+    def __init__(self, indices: List[int], politica_espera: str) -> None:
+        self.indices = indices
+        self._conexion, extremo = multiprocessing.Pipe()
+        self._proceso = multiprocessing.Process(
+            target=_trabajador, args=(extremo, indices, politica_espera), daemon=True
+        )
+        self._proceso.start()
+        extremo.close()
+
+    def enviar(self, mensaje: Tuple[Any, ...]) -> None:
+        self._conexion.send(mensaje)
+
+    def recibir(self) -> Any:
+        estado, datos = self._conexion.recv()
+        if estado == "error":
+            raise RuntimeError(f"Falló un trabajador del cluster: {datos}")
+        return datos
+
+    def cerrar(self) -> None:
+        self._conexion.close()
+        self._proceso.join(timeout=5)
+        if self._proceso.is_alive():
+            self._proceso.terminate()
+
+
+# ---------------------------------------------------------------------------
+# Despachadores
+# ---------------------------------------------------------------------------
+
+
+class Despachador:
+    """
+    Base: elige el nodo de cada arribo. 'actualizar' recibe las cargas
+    informadas al cerrar cada ventana.
+    """
+
+    nombre = ""
+
+    def __init__(self, nodos: int, semilla: int = 0) -> None:
+        if nodos <= 0:
+            raise ValueError("La cantidad de nodos debe ser > 0")
+        self.nodos = nodos
+
+    def actualizar(self, cargas: Dict[int, CargaNodo]) -> None:
+        pass
+
+    def elegir(self, proceso: FilaProceso) -> int:
+        raise NotImplementedError
+
+
+class DespachadorRoundRobin(Despachador):
+    nombre = "round-robin"
+
+    def __init__(self, nodos: int, semilla: int = 0) -> None:
+        super().__init__(nodos, semilla)
+        self._siguiente = 0
+
+    def elegir(self, proceso: FilaProceso) -> int:
+        nodo = self._siguiente
+        self._siguiente = (nodo + 1) % self.nodos
+        return nodo
+
+
+class DespachadorMenosCargado(Despachador):
+    """
+    Heap de (carga, nodo); cada asignación suma uno a la carga del elegido
+    hasta la próxima actualización.
+    """
+
+    nombre = "menos-cargado"
+
+    def __init__(self, nodos: int, semilla: int = 0) -> None:
+        super().__init__(nodos, semilla)
+        self._heap: List[Tuple[int, int]] = [(0, i) for i in range(nodos)]
+
+    def actualizar(self, cargas: Dict[int, CargaNodo]) -> None:
+        self._heap = [(c.en_sistema, i) for i, c in cargas.items()]
+        heapq.heapify(self._heap)
+
+    def elegir(self, proceso: FilaProceso) -> int:
+        carga, nodo = self._heap[0]
+        heapq.heapreplace(self._heap, (carga + 1, nodo))
+        return nodo
+
+
+class DespachadorMejorAjuste(Despachador):
+    """
+    Manda el proceso al nodo con la partición libre más chica donde cabe
+    (Best-Fit sobre todo el cluster). Si no hay ninguna, al menos cargado.
+    """
+
+    nombre = "mejor-ajuste"
+
+    def __init__(self, nodos: int, semilla: int = 0) -> None:
+        super().__init__(nodos, semilla)
+        self._libres: List[Tuple[int, int]] = []
+        self._menos_cargado = DespachadorMenosCargado(nodos, semilla)
+
+    def actualizar(self, cargas: Dict[int, CargaNodo]) -> None:
+        self._libres = sorted(
+            (tamanio, i) for i, c in cargas.items() for tamanio in c.libres
+        )
+        self._menos_cargado.actualizar(cargas)
+
+    def elegir(self, proceso: FilaProceso) -> int:
+        j = bisect.bisect_left(self._libres, (proceso[3], -1))
+        if j < len(self._libres):
+            return self._libres.pop(j)[1]
+        return self._menos_cargado.elegir(proceso)
+
+
+class DespachadorPotenciaDeDos(Despachador):
+    """
+    Power-of-two-choices: dos nodos al azar, gana el menos cargado.
+    """
+
+    nombre = "potencia-de-dos"
+
+    def __init__(self, nodos: int, semilla: int = 0) -> None:
+        super().__init__(nodos, semilla)
+        self._rng = random.Random(semilla)
+        self._cargas = [0] * nodos
+
+    def actualizar(self, cargas: Dict[int, CargaNodo]) -> None:
+        for i, c in cargas.items():
+            self._cargas[i] = c.en_sistema
+
+    def elegir(self, proceso: FilaProceso) -> int:
+        if self.nodos == 1:
+            return 0
+        a, b = self._rng.sample(range(self.nodos), 2)
+        nodo = a if self._cargas[a] <= self._cargas[b] else b
+        self._cargas[nodo] += 1
+        return nodo
+
+
+DESPACHADORES: Dict[str, Type[Despachador]] = {
+    d.nombre: d
+    for d in (
+        DespachadorRoundRobin,
+        DespachadorMenosCargado,
+        DespachadorMejorAjuste,
+        DespachadorPotenciaDeDos,
+    )
+}
+
+
+def crear_despachador(nombre: str, nodos: int, semilla: int = 0) -> Despachador:
+    try:
+        return DESPACHADORES[nombre](nodos, semilla)
+    except KeyError:
+        opciones = ", ".join(DESPACHADORES)
+        raise ValueError(
+            f"Despachador desconocido: '{nombre}' (opciones: {opciones})"
+        ) from None
+
+
+# ---------------------------------------------------------------------------
+# Corrida
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ResultadoCluster:
+    nodos: List[ResumenNodo]
+    total: AgregadoTiempos = field(default_factory=AgregadoTiempos)
+
+    @property
+    def completados(self) -> int:
+        return self.total.completados
+
+    @property
+    def descartados(self) -> int:
+        return sum(n.descartados for n in self.nodos)
+
+    @property
+    def throughput(self) -> float:
+        fin = self.total.ultimo_fin
+        return self.completados / fin if fin > 0 else 0.0
+
+    def imprimir(self) -> None:
+        print("\n===== RESUMEN POR NODO =====")
+        print(f"{'Nodo':>5}{'Asignados':>11}{'Completados':>13}{'Descartados':>13}"
+              f"{'Espera media':>14}{'Espera p99':>12}")
+        for n in self.nodos:
+            espera = n.agregado.histogramas["espera"]
+            print(
+                f"{n.indice:>5}{n.asignados:>11}{n.completados:>13}{n.descartados:>13}"
+                f"{espera.media:>14.2f}{espera.percentil(99):>12}"
+            )
+
+        print("\n===== RESUMEN DEL CLUSTER =====")
+        print(f"Nodos              : {len(self.nodos)}")
+        print(f"Completados        : {self.completados}")
+        print(f"Descartados        : {self.descartados}")
+        if self.completados:
+            print("-------------------------------")
+            for linea in self.total.lineas_resumen():
+                print(linea)
+            print(f"Throughput         : {self.throughput:.3f} procesos/unidad de tiempo")
+            completados = [n.completados for n in self.nodos]
+            media = sum(completados) / len(completados)
+            print(f"Desbalance         : max/media = {max(completados) / media:.3f}")
+        print("===============================\n")
+
+
+def _repartir(nodos: int, workers: int) -> List[List[int]]:
+    workers = max(1, min(workers, nodos))
+    return [list(range(i, nodos, workers)) for i in range(workers)]
+
+
+def simular_cluster(
+    procesos: Iterable[Proceso],
+    nodos: int,
+    despacho: str = "menos-cargado",
+    ventana: int = VENTANA_DEFAULT,
+    workers: int = 1,
+    semilla: int = 0,
+    politica_espera: str = "fifo",
+) -> ResultadoCluster:
+    """
+    Simula 'procesos' (ordenados por arribo) sobre 'nodos' nodos.
+
+    Con workers > 1 los nodos se reparten entre procesos trabajadores; el
+    resultado no depende de la cantidad de trabajadores.
+    """
+    if ventana <= 0:
+        raise ValueError("ventana debe ser > 0")
+    despachador = crear_despachador(despacho, nodos, semilla)
+    reparto = _repartir(nodos, workers)
+
+    remotos: List[_GrupoRemoto] = []
+    local: Optional[_GrupoNodos] = None
+    if len(reparto) == 1:
+        local = _GrupoNodos(reparto[0], politica_espera)
+    else:
+        remotos = [_GrupoRemoto(indices, politica_espera) for indices in reparto]
+    grupo_de = {i: g for g, indices in enumerate(reparto) for i in indices}
+
+    def correr_ventana(horizonte: int, lotes: Dict[int, List[FilaProceso]]) -> None:
+        if local is not None:
+            despachador.actualizar(local.ventana(horizonte, lotes))
+            return
+        por_grupo: List[Dict[int, List[FilaProceso]]] = [{} for _ in remotos]
+        for i, filas in lotes.items():
+            por_grupo[grupo_de[i]][i] = filas
+        for remoto, parte in zip(remotos, por_grupo):
+            remoto.enviar(("ventana", horizonte, parte))
+        cargas: Dict[int, CargaNodo] = {}
+        for remoto in remotos:
+            cargas.update(remoto.recibir())
+        despachador.actualizar(cargas)
+
+    try:
+        horizonte: Optional[int] = None
+        ultimo_arribo: Optional[int] = None
+        lotes: Dict[int, List[FilaProceso]] = {}
+        for proceso in procesos:
+            if ultimo_arribo is not None and proceso.arribo < ultimo_arribo:
+                raise ValueError(
+                    f"Arribos desordenados: {proceso.id} arriba en {proceso.arribo} "
+                    f"después de t={ultimo_arribo}"
+                )
+            ultimo_arribo = proceso.arribo
+
+            if horizonte is None:
+                horizonte = proceso.arribo + ventana
+            elif proceso.arribo >= horizonte:
+                correr_ventana(horizonte, lotes)
+                lotes = {}
+                if proceso.arribo >= horizonte + ventana:
+                    # Ventanas sin arribos: se saltan de una vez, pero los
+                    # nodos avanzan hasta el inicio de la nueva ventana para
+                    # que el despachador vea la carga de ese instante.
+                    horizonte += (proceso.arribo - horizonte) // ventana * ventana
+                    correr_ventana(horizonte, {})
+                horizonte += ventana
+
+            fila = (proceso.id, proceso.arribo, proceso.rafaga_cpu, proceso.memoria)
+            lotes.setdefault(despachador.elegir(fila), []).append(fila)
+
+        if horizonte is not None:
+            correr_ventana(horizonte, lotes)
+
+        resumenes: Dict[int, ResumenNodo] = {}
+        if local is not None:
+            resumenes = local.fin()
+        else:
+            for remoto in remotos:
+                remoto.enviar(("fin",))
+            for remoto in remotos:
+                resumenes.update(remoto.recibir())
+    finally:
+        for remoto in remotos:
+            remoto.cerrar()
+
+    resultado = ResultadoCluster(nodos=[resumenes[i] for i in range(nodos)])
+    for n in resultado.nodos:
+        resultado.total.combinar(n.agregado)
+    return resultado
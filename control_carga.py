@@ -0,0 +1,249 @@
+"""
+Control de carga: cola de espera de memoria acotada con descarte.
+
+Responsabilidades:
+    - ControlCarga: decide, cuando un proceso tendría que esperar memoria,
+      si entra a la cola o a quién se rechaza para acotarla:
+        nuevo     Con la cola llena se rechaza al que llega (drop-newest).
+        antiguo   Se rechaza al que más tiempo lleva esperando (drop-oldest).
+        mayor     Se rechaza al que más memoria pide, contando al que llega
+                  (drop-largest).
+        red       Random Early Detection: con el promedio móvil de la
+                  longitud de la cola entre los umbrales se rechaza al que
+                  llega con probabilidad creciente; con la cola llena, siempre.
+      Los rechazados se informan aparte de los descartados por
+      NO_CABE_EN_NINGUNA.
+    - curva_goodput: goodput frente a carga ofrecida, comprimiendo o
+      estirando los interarribos de una traza por distintos factores.
+
+La cola de listos de CPU no necesita cota propia: cada proceso listo ocupa
+una partición, así que ya la acota el grado de multiprogramación.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from memoria import TAMANIOS_USUARIO_DEFAULT
+from procesos import Proceso
+
+DESCARTES = ("nuevo", "antiguo", "mayor", "red")
+
+# Parámetros de RED: umbrales como fracción del límite, probabilidad máxima
+# entre umbrales y peso del promedio móvil exponencial.
+RED_UMBRAL_MIN = 0.25
+RED_UMBRAL_MAX = 0.75
+RED_PROBABILIDAD_MAX = 0.1
+RED_PESO = 0.02
+
+
+class ControlCarga:
+    """
+    Cota de la cola de espera de memoria y política de descarte.
+
+    limite:
+        Máximo de procesos en espera (0 = no se espera: quien no entra
+        directo se rechaza).
+    """
+
+    def __init__(self, limite: int, descarte: str = "nuevo", semilla: int = 0) -> None:
+        if limite < 0:
+            raise ValueError("El límite de la cola de espera debe ser >= 0")
+        if descarte not in DESCARTES:
+            raise ValueError(
+                f"Política de descarte desconocida: '{descarte}' (opciones: {', '.join(DESCARTES)})"
+            )
+        self.limite = limite
+        self.descarte = descarte
+        self.semilla = semilla
+        self._azar = random.Random(semilla)
+        self._promedio = 0.0
+        # Arribos aceptados desde el último descarte de RED (-1: bajo el umbral)
+        self._cuenta = -1
+
+    def configuracion(self) -> Dict[str, Any]:
+        return {"limite": self.limite, "descarte": self.descarte, "semilla": self.semilla}
+
+    def elegir_rechazado(self, proceso: Any, cola: Any) -> Optional[Any]:
+        """
+        Proceso a rechazar antes de encolar 'proceso' en 'cola'
+        (politicas_espera.PoliticaEspera): el mismo 'proceso', uno que ya
+        esperaba (se quita de la cola) o None si se encola sin rechazos.
+        """
+        largo = len(cola)
+        if self.descarte == "red":
+            return proceso if self._rechazo_temprano(largo) else None
+        if largo < self.limite:
+            return None
+        if self.limite == 0 or self.descarte == "nuevo":
+            return proceso
+        if self.descarte == "antiguo":
+            return cola.quitar_mas_antiguo()
+        mayor = cola.mayor()
+        if int(proceso.memoria) >= int(mayor.memoria):
+            return proceso
+        return cola.quitar(mayor)
+
+    def _rechazo_temprano(self, largo: int) -> bool:
+        self._promedio += RED_PESO * (largo - self._promedio)
+        if largo >= self.limite:
+            self._cuenta = 0
+            return True
+        minimo = self.limite * RED_UMBRAL_MIN
+        maximo = self.limite * RED_UMBRAL_MAX
+        if self._promedio < minimo:
+            self._cuenta = -1
+            return False
+        if self._promedio >= maximo:
+            self._cuenta = 0
+            return True
+
+        self._cuenta += 1
+        pb = RED_PROBABILIDAD_MAX * (self._promedio - minimo) / (maximo - minimo)
+        # Espaciado uniforme de los descartes (Floyd y Jacobson, 1993).
+        pa = 1.0 if self._cuenta * pb >= 1 else pb / (1 - self._cuenta * pb)
+        if self._azar.random() < pa:
+            self._cuenta = 0
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Estado serializable (checkpoints)
+    # ------------------------------------------------------------------
+
+    def exportar_estado(self) -> Dict[str, Any]:
+        return {
+            **self.configuracion(),
+            "promedio": self._promedio,
+            "cuenta": self._cuenta,
+            "azar": self._azar.getstate(),
+        }
+
+    def restaurar_estado(self, estado: Dict[str, Any]) -> None:
+        if (estado["limite"], estado["descarte"]) != (self.limite, self.descarte):
+            raise ValueError("El estado guardado usa otra configuración de control de carga.")
+        self._promedio = estado["promedio"]
+        self._cuenta = estado["cuenta"]
+        self._azar.setstate(estado["azar"])
+
+
+# ---------------------------------------------------------------------------
+# Goodput frente a carga ofrecida
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ConfigCurva:
+    grado: int = 5
+    particiones: Tuple[int, ...] = TAMANIOS_USUARIO_DEFAULT
+    politica_espera: str = "fifo"
+    limite_espera: Optional[int] = None
+    descarte: str = "nuevo"
+    semilla: int = 0
+
+
+@dataclass
+class PuntoCurva:
+    factor: float
+    ofrecidos: int
+    completados: int
+    rechazados: int
+    descartados: int
+    # Trabajo (ráfaga total) que llega / trabajo útil completado, por unidad
+    # de tiempo. Útil: terminado y, si tiene plazo, dentro del plazo.
+    carga_ofrecida: float
+    goodput: float
+    espera_media: float
+    espera_p95: int
+
+
+def escalar_arribos(procesos: Sequence[Proceso], factor: float) -> List[Proceso]:
+    """
+    Copia de la traza con los arribos divididos por 'factor' (factor 2 =
+    el doble de arribos por unidad de tiempo con las mismas ráfagas).
+    """
+    if factor <= 0:
+        raise ValueError("Los factores de carga deben ser > 0")
+    return [replace(p, arribo=int(p.arribo / factor)) for p in procesos]
+
+
+def _punto(tarea: Tuple[Sequence[Proceso], float, ConfigCurva]) -> PuntoCurva:
+    # main.py importa este módulo al arrancar (DESCARTES): el simulador, al usarlo.
+    from memoria import GestorMemoria
+    from simulacion import Simulador
+
+    procesos, factor, config = tarea
+    escalados = escalar_arribos(procesos, factor)
+    control = None
+    if config.limite_espera is not None:
+        control = ControlCarga(config.limite_espera, config.descarte, config.semilla)
+    gestor = GestorMemoria(
+        grado_multiprogramacion_max=config.grado,
+        politica_espera=config.politica_espera,
+        silencioso=True,
+        tamanios_usuario=config.particiones,
+        control_carga=control,
+    )
+    resultado = Simulador(escalados, gestor, registrar_linea_tiempo=False).simular()
+
+    arribos = [p.arribo for p in escalados]
+    lapso = max(arribos) - min(arribos)
+    duracion = resultado.tiempo_total - min(arribos)
+    trabajo = sum(int(p.rafaga_cpu) for p in escalados)
+    util = sum(
+        f.rafaga
+        for f in resultado.filas
+        if f.vencimiento is None or (f.fin is not None and f.fin <= f.vencimiento)
+    )
+    esperas = sorted(f.espera for f in resultado.filas if f.espera is not None)
+    return PuntoCurva(
+        factor=factor,
+        ofrecidos=len(escalados),
+        completados=len(resultado.filas),
+        rechazados=len(resultado.rechazados),
+        descartados=len(resultado.descartados),
+        carga_ofrecida=trabajo / lapso if lapso > 0 else math.inf,
+        goodput=util / duracion if duracion > 0 else 0.0,
+        espera_media=sum(esperas) / len(esperas) if esperas else 0.0,
+        espera_p95=esperas[max(0, math.ceil(len(esperas) * 0.95) - 1)] if esperas else 0,
+    )
+
+
+def curva_goodput(
+    procesos: Sequence[Proceso],
+    factores: Sequence[float],
+    config: ConfigCurva = ConfigCurva(),
+    workers: int = 1,
+) -> List[PuntoCurva]:
+    """
+    Un punto por factor de carga (ver escalar_arribos), en el orden de
+    'factores'. Con workers > 1 los puntos se simulan en paralelo.
+    """
+    if not procesos:
+        raise ValueError("La traza no tiene procesos")
+    tareas = [(procesos, f, config) for f in factores]
+    if workers <= 1:
+        return [_punto(t) for t in tareas]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_punto, tareas))
+
+
+def imprimir_curva(puntos: Sequence[PuntoCurva]) -> None:
+    print("\n===== GOODPUT vs CARGA OFRECIDA =====")
+    print(
+        f"{'Factor':>7}{'Carga':>9}{'Goodput':>9}{'Completados':>13}{'Rechazados':>12}"
+        f"{'Descartados':>13}{'Espera media':>14}{'Espera p95':>12}"
+    )
+    for p in puntos:
+        print(
+            f"{p.factor:>7.2f}{p.carga_ofrecida:>9.3f}{p.goodput:>9.3f}{p.completados:>13}"
+            f"{p.rechazados:>12}{p.descartados:>13}{p.espera_media:>14.2f}{p.espera_p95:>12}"
+        )
+    print("Carga y goodput en unidades de CPU por unidad de tiempo (1 = CPU saturada);")
+    print("el goodput cuenta solo lo terminado dentro de su plazo, si tiene.")
+    print("=====================================\n")
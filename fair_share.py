@@ -0,0 +1,430 @@
+"""
+Planificación fair-share jerárquica entre grupos (tenants).
+
+Responsabilidades:
+    - Repartir la CPU entre grupos según pesos, con una jerarquía dada por
+      los nombres ('org/equipo' es un subgrupo de 'org'): cada nodo reparte
+      entre sus hijos activos en proporción a sus pesos.
+    - Dentro de cada grupo, SRTF (menor tiempo restante) o FCFS.
+    - Cada decisión cuesta O(profundidad · log hijos + log procesos): un
+      heap de hijos activos por nodo, ordenado por tiempo virtual, y un
+      heap de procesos listos por grupo.
+
+Tiempo virtual:
+    Cada nodo acumula CPU recibida / peso. Para elegir se baja desde la
+    raíz tomando en cada nivel el hijo activo de menor tiempo virtual. El
+    camino en CPU sale de los heaps (como en CFS) y se le cobra el tiempo a
+    medida que avanza; vuelve a entrar en la siguiente decisión. Un nodo
+    que estaba inactivo entra con max(propio, reloj del padre) para no
+    acumular crédito mientras no tenía trabajo.
+
+Las decisiones ocurren en cada arribo (con desalojo, si el grupo del
+proceso en CPU ya se adelantó), en cada fin de CPU y en el instante en que
+el camino en CPU supera en tiempo virtual a su mejor hermano
+(proximo_desalojo): el Simulador lo trata como un evento más y llama a
+replanificar, así un proceso largo no retiene la CPU mientras los arribos
+de otro grupo esperan memoria.
+
+Los procesos de un grupo que además tiene subgrupos compiten con ellos
+como un subgrupo más de peso 1.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from planificador_srtf import ProcesoLike, verificar_planificador
+
+# Grupo de los procesos sin columna 'Grupo'.
+SIN_GRUPO = "-"
+INTRA_GRUPO = ("srtf", "fcfs")
+
+
+class _Nodo:
+    """
+    Nodo del árbol de grupos. Las hojas (nombre terminado en '/') guardan
+    los procesos listos del grupo; los demás, el heap de hijos activos.
+    """
+
+    __slots__ = (
+        "nombre", "peso", "padre", "indice", "hijos", "activos", "listos",
+        "virtual", "reloj", "pendientes", "en_heap",
+    )
+
+    def __init__(self, nombre: str, peso: float, padre: Optional["_Nodo"], indice: int) -> None:
+        self.nombre = nombre
+        self.peso = peso
+        self.padre = padre
+        self.indice = indice
+        self.hijos: Dict[str, _Nodo] = {}
+        # (tiempo virtual, índice del nodo, nodo)
+        self.activos: List[Tuple[float, int, _Nodo]] = []
+        # (clave intra-grupo, secuencia de llegada, proceso)
+        self.listos: List[Tuple[int, int, ProcesoLike]] = []
+        self.virtual = 0.0
+        # Tiempo virtual del último hijo elegido
+        self.reloj = 0.0
+        # Procesos del subárbol, listos o en CPU
+        self.pendientes = 0
+        self.en_heap = False
+
+
+class FairShareScheduler:
+    """
+    Fair-share jerárquico con desalojo. Implementa la interfaz de
+    planificador_srtf.Scheduler (incluidos agregar_lote y el estado para
+    checkpoints).
+
+    pesos:
+        Peso por grupo o subgrupo ('org', 'org/equipo'); default 1.
+    intra:
+        Orden dentro de cada grupo: 'srtf' o 'fcfs'.
+    """
+
+    nombre = "fair"
+
+    def __init__(self, pesos: Optional[Dict[str, float]] = None, intra: str = "srtf") -> None:
+        if intra not in INTRA_GRUPO:
+            raise ValueError(
+                f"Orden dentro del grupo desconocido: '{intra}' (opciones: {', '.join(INTRA_GRUPO)})"
+            )
+        pesos = dict(pesos or {})
+        invalidos = [g for g, p in pesos.items() if not p > 0]
+        if invalidos:
+            raise ValueError(f"Los pesos deben ser > 0: {', '.join(invalidos)}")
+
+        self._pesos = pesos
+        self._intra = intra
+        self._raiz = _Nodo("", 1.0, None, 0)
+        self._nodos: List[_Nodo] = [self._raiz]
+        self._hojas: Dict[Optional[str], _Nodo] = {}
+        self._listos = 0
+
+        self._proceso_actual: Optional[ProcesoLike] = None
+        self._hoja_actual: Optional[_Nodo] = None
+        self._secuencia_actual = 0
+        self._tiempo_actual: int = 0
+        self._secuencia: int = 0
+        self._historial_cambios: List[Tuple[int, str, str]] = []
+
+    def configuracion(self) -> Dict[str, Any]:
+        """
+        Parámetros que cambian el resultado (forman parte de la clave de
+        caché).
+        """
+        return {"pesos": sorted(self._pesos.items()), "intra": self._intra}
+
+    # ------------------------------------------------------------------
+    # API principal
+    # ------------------------------------------------------------------
+
+    def agregar_proceso(self, proceso: ProcesoLike, tiempo_actual: int) -> None:
+        self._decidir([proceso], tiempo_actual)
+
+    def agregar_lote(
+        self,
+        procesos: Sequence[ProcesoLike],
+        tiempo_actual: int,
+    ) -> List[ProcesoLike]:
+        """
+        Ingresa los procesos y decide una sola vez quién queda en CPU.
+        Devuelve el proceso que entró a la CPU (lista vacía si sigue el
+        mismo).
+        """
+        return self._decidir(procesos, tiempo_actual)
+
+    def _decidir(
+        self,
+        procesos: Sequence[ProcesoLike],
+        tiempo_actual: int,
+    ) -> List[ProcesoLike]:
+        self._tiempo_actual = tiempo_actual
+        anterior = self._proceso_actual
+        self._devolver_actual()
+
+        for proceso in procesos:
+            if not hasattr(proceso, "tiempo_restante"):
+                proceso.tiempo_restante = int(proceso.rafaga_cpu)
+            hoja = self._hoja(getattr(proceso, "grupo", None))
+            nodo = hoja
+            while nodo.padre is not None:
+                nodo.pendientes += 1
+                if nodo.pendientes == 1:
+                    nodo.virtual = max(nodo.virtual, nodo.padre.reloj)
+                nodo = nodo.padre
+            self._secuencia += 1
+            self._encolar(proceso, self._secuencia, hoja)
+
+        self._elegir()
+        actual = self._proceso_actual
+        if anterior is not None and actual is not anterior:
+            self._registrar_evento("DESALOJADO", getattr(anterior, "id", "??"))
+        for proceso in procesos:
+            if proceso is not actual:
+                self._registrar_evento("EN_COLA", getattr(proceso, "id", "??"))
+        if actual is None or actual is anterior:
+            return []
+        self._registrar_evento("ENTRA_CPU", getattr(actual, "id", "??"))
+        return [actual]
+
+    def avanzar_tiempo(self, delta: int) -> None:
+        """
+        Avanza el tiempo, descuenta CPU del proceso actual y le cobra el
+        tiempo virtual a su camino en el árbol.
+        """
+        if self._proceso_actual is None:
+            return
+        if delta < 0:
+            raise ValueError("delta no puede ser negativo")
+
+        self._tiempo_actual += delta
+        self._proceso_actual.tiempo_restante -= delta
+        if self._proceso_actual.tiempo_restante < 0:
+            self._proceso_actual.tiempo_restante = 0
+
+        nodo = self._hoja_actual
+        while nodo is not None and nodo.padre is not None:
+            nodo.virtual += delta / nodo.peso
+            nodo = nodo.padre
+
+    def proceso_en_cpu(self) -> Optional[ProcesoLike]:
+        return self._proceso_actual
+
+    def sacar_proceso_actual(self) -> Optional[ProcesoLike]:
+        """
+        Marca fin de CPU del proceso actual y elige el siguiente.
+        """
+        terminado = self._proceso_actual
+        if terminado is not None:
+            self._registrar_evento("SALE_CPU", getattr(terminado, "id", "??"))
+            hoja = self._hoja_actual
+            assert hoja is not None
+            nodo = hoja
+            while nodo.padre is not None:
+                nodo.pendientes -= 1
+                nodo = nodo.padre
+            self._proceso_actual = None
+            self._hoja_actual = None
+            self._activar_camino(hoja)
+
+        self._elegir()
+        if self._proceso_actual is not None:
+            self._registrar_evento("ENTRA_CPU", getattr(self._proceso_actual, "id", "??"))
+        return terminado
+
+    def hay_listos(self) -> bool:
+        return self._listos > 0
+
+    def proximo_desalojo(self) -> Optional[int]:
+        """
+        Primer instante en que algún nodo del camino en CPU supera en
+        tiempo virtual al hermano activo de menor tiempo virtual (None si
+        no compite con nadie). Cuesta O(profundidad).
+        """
+        nodo = self._hoja_actual
+        delta: Optional[int] = None
+        while nodo is not None and nodo.padre is not None:
+            activos = nodo.padre.activos
+            if activos:
+                # El nodo avanza 1 / peso por unidad de tiempo.
+                d = max(1, math.floor((activos[0][0] - nodo.virtual) * nodo.peso) + 1)
+                if delta is None or d < delta:
+                    delta = d
+            nodo = nodo.padre
+        return None if delta is None else self._tiempo_actual + delta
+
+    def replanificar(self, tiempo_actual: int) -> List[ProcesoLike]:
+        """
+        Vuelve a decidir sin arribos nuevos (en el instante de
+        proximo_desalojo). Devuelve lo mismo que agregar_lote.
+        """
+        return self._decidir([], tiempo_actual)
+
+    # ------------------------------------------------------------------
+    # Árbol de grupos
+    # ------------------------------------------------------------------
+
+    def _nuevo_nodo(self, nombre: str, peso: float, padre: _Nodo) -> _Nodo:
+        nodo = _Nodo(nombre, peso, padre, len(self._nodos))
+        self._nodos.append(nodo)
+        padre.hijos[nombre] = nodo
+        return nodo
+
+    def _hoja(self, grupo: Optional[str]) -> _Nodo:
+        hoja = self._hojas.get(grupo)
+        if hoja is not None:
+            return hoja
+        nodo = self._raiz
+        ruta = ""
+        for parte in (SIN_GRUPO if grupo is None else grupo).split("/"):
+            ruta = f"{ruta}/{parte}" if ruta else parte
+            hijo = nodo.hijos.get(ruta)
+            if hijo is None:
+                hijo = self._nuevo_nodo(ruta, float(self._pesos.get(ruta, 1.0)), nodo)
+            nodo = hijo
+        hoja = nodo.hijos.get(ruta + "/") or self._nuevo_nodo(ruta + "/", 1.0, nodo)
+        self._hojas[grupo] = hoja
+        return hoja
+
+    def _clave(self, proceso: ProcesoLike) -> int:
+        return int(proceso.tiempo_restante) if self._intra == "srtf" else 0
+
+    def _activar_camino(self, nodo: _Nodo) -> None:
+        """
+        Devuelve a los heaps de sus padres los nodos del camino que tienen
+        trabajo pendiente y no están encolados.
+        """
+        while nodo.padre is not None:
+            if nodo.pendientes > 0 and not nodo.en_heap:
+                heapq.heappush(nodo.padre.activos, (nodo.virtual, nodo.indice, nodo))
+                nodo.en_heap = True
+            nodo = nodo.padre
+
+    def _encolar(self, proceso: ProcesoLike, secuencia: int, hoja: _Nodo) -> None:
+        heapq.heappush(hoja.listos, (self._clave(proceso), secuencia, proceso))
+        self._listos += 1
+        self._activar_camino(hoja)
+
+    def _devolver_actual(self) -> None:
+        if self._proceso_actual is None:
+            return
+        assert self._hoja_actual is not None
+        self._encolar(self._proceso_actual, self._secuencia_actual, self._hoja_actual)
+        self._proceso_actual = None
+        self._hoja_actual = None
+
+    def _elegir(self) -> None:
+        """
+        Baja desde la raíz por el hijo de menor tiempo virtual y pone en
+        CPU al primero de esa hoja. El camino elegido queda fuera de los
+        heaps mientras ejecuta.
+        """
+        if not self._listos:
+            return
+        nodo = self._raiz
+        while nodo.activos:
+            virtual, _, hijo = heapq.heappop(nodo.activos)
+            hijo.en_heap = False
+            nodo.reloj = virtual
+            nodo = hijo
+        _, secuencia, proceso = heapq.heappop(nodo.listos)
+        self._listos -= 1
+        self._proceso_actual = proceso
+        self._hoja_actual = nodo
+        self._secuencia_actual = secuencia
+
+    # ------------------------------------------------------------------
+    # Snapshot de la cola de listos
+    # ------------------------------------------------------------------
+
+    def listar_listos(self) -> List[Tuple[str, int]]:
+        """
+        [(id_proceso, tiempo_restante), ...] de todos los grupos, en el
+        orden de sus heaps.
+        """
+        return [
+            (getattr(p, "id", "??"), int(p.tiempo_restante))
+            for hoja in self._hojas.values()
+            for _, _, p in hoja.listos
+        ]
+
+    # ------------------------------------------------------------------
+    # Estado serializable (checkpoints)
+    # ------------------------------------------------------------------
+
+    def exportar_estado(self, indice_de: Callable[[ProcesoLike], int]) -> Dict[str, Any]:
+        """
+        Árbol, heaps (en su orden físico) y proceso en CPU como tipos
+        primitivos; los procesos se referencian por índice. Como en SRTF,
+        el historial de depuración queda afuera.
+        """
+        actual = self._proceso_actual
+        return {
+            "nombre": self.nombre,
+            "pesos": dict(self._pesos),
+            "intra": self._intra,
+            "nodos": [
+                (
+                    n.nombre,
+                    n.peso,
+                    None if n.padre is None else n.padre.indice,
+                    n.virtual,
+                    n.reloj,
+                    n.pendientes,
+                    n.en_heap,
+                    [(v, i) for v, i, _ in n.activos],
+                    [(c, s, indice_de(p), int(p.tiempo_restante)) for c, s, p in n.listos],
+                )
+                for n in self._nodos
+            ],
+            "hojas": [(grupo, hoja.indice) for grupo, hoja in self._hojas.items()],
+            "actual": None if actual is None else indice_de(actual),
+            "actual_restante": None if actual is None else int(actual.tiempo_restante),
+            "hoja_actual": None if self._hoja_actual is None else self._hoja_actual.indice,
+            "secuencia_actual": self._secuencia_actual,
+            "tiempo_actual": self._tiempo_actual,
+            "secuencia": self._secuencia,
+        }
+
+    def restaurar_estado(
+        self,
+        estado: Dict[str, Any],
+        procesos: Sequence[ProcesoLike],
+    ) -> None:
+        """
+        Inverso de exportar_estado. Los pesos y el orden dentro del grupo
+        deben coincidir con los de este planificador; el historial de
+        depuración arranca vacío.
+        """
+        verificar_planificador(estado, self.nombre)
+        if dict(estado["pesos"]) != self._pesos or estado["intra"] != self._intra:
+            raise ValueError(
+                "El estado guardado corresponde a otra configuración de fair-share."
+            )
+        self._nodos = []
+        for nombre, peso, padre, virtual, reloj, pendientes, en_heap, _, _ in estado["nodos"]:
+            nodo = _Nodo(nombre, peso, None if padre is None else self._nodos[padre], len(self._nodos))
+            if nodo.padre is not None:
+                nodo.padre.hijos[nombre] = nodo
+            nodo.virtual, nodo.reloj = virtual, reloj
+            nodo.pendientes, nodo.en_heap = pendientes, en_heap
+            self._nodos.append(nodo)
+        self._raiz = self._nodos[0]
+
+        self._listos = 0
+        for nodo, (*_, activos, listos) in zip(self._nodos, estado["nodos"]):
+            nodo.activos = [(v, i, self._nodos[i]) for v, i in activos]
+            for clave, secuencia, indice, restante in listos:
+                proceso = procesos[indice]
+                proceso.tiempo_restante = restante
+                nodo.listos.append((clave, secuencia, proceso))
+            self._listos += len(listos)
+        self._hojas = {grupo: self._nodos[i] for grupo, i in estado["hojas"]}
+
+        self._proceso_actual = None
+        self._hoja_actual = None
+        if estado["actual"] is not None:
+            self._proceso_actual = procesos[estado["actual"]]
+            self._proceso_actual.tiempo_restante = estado["actual_restante"]
+            self._hoja_actual = self._nodos[estado["hoja_actual"]]
+        self._secuencia_actual = estado["secuencia_actual"]
+        self._tiempo_actual = estado["tiempo_actual"]
+        self._secuencia = estado["secuencia"]
+        self._historial_cambios = []
+
+    # ------------------------------------------------------------------
+    # Historial de planificación (opcional, para debug)
+    # ------------------------------------------------------------------
+
+    def _registrar_evento(self, evento: str, id_proceso: str) -> None:
+        self._historial_cambios.append((self._tiempo_actual, evento, id_proceso))
+
+    @property
+    def tiempo_actual(self) -> int:
+        return self._tiempo_actual
+
+    @property
+    def historial_cambios(self) -> List[Tuple[int, str, str]]:
+        return list(self._historial_cambios)
@@ -0,0 +1,226 @@
+"""
+Exportación del diagrama de Gantt de la CPU a SVG / HTML.
+
+Responsabilidades:
+    - Convertir una LineaTiempoCPU en rectángulos SVG.
+    - Submuestrear por ancho en píxeles: nunca se dibuja más de un
+      rectángulo por píxel y carril, así que una línea de tiempo de millones
+      de tramos produce un archivo chico que el navegador abre rápido.
+
+Con pocos procesos (MAX_FILAS_POR_PROCESO) se dibuja una fila por proceso;
+con más, un único carril "CPU" donde cada píxel toma el color del proceso
+que más tiempo ocupó la CPU en ese píxel.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from html import escape
+from typing import Dict, List, Tuple
+
+from linea_tiempo import LineaTiempoCPU
+
+MAX_FILAS_POR_PROCESO = 50
+ANCHO_DEFAULT = 1200
+
+_ALTO_FILA = 20
+_ALTO_CARRIL_UNICO = 40
+_MARGEN_IZQ = 70
+_MARGEN_SUP = 10
+_ALTO_EJE = 30
+
+# (x desde, x hasta, fila, índice de proceso, t desde, t hasta)
+Rectangulo = Tuple[int, int, int, int, int, int]
+
+
+def _color(indice: int) -> str:
+    return f"hsl({(indice * 137.508) % 360:.0f},65%,55%)"
+
+
+# ---------------------------------------------------------------------------
+# Submuestreo
+# ---------------------------------------------------------------------------
+
+
+def _rectangulos_por_proceso(linea: LineaTiempoCPU, escala: float) -> List[Rectangulo]:
+    """
+    Una fila por proceso; tramos que caen en píxeles contiguos o en el
+    mismo píxel se fusionan en un rectángulo.
+    """
+    abiertos: Dict[int, List[int]] = {}
+    rectangulos: List[Rectangulo] = []
+    for a, b, p in zip(linea.inicio, linea.fin, linea.pid):
+        x0 = int(a * escala)
+        x1 = max(x0 + 1, math.ceil(b * escala))
+        actual = abiertos.get(p)
+        if actual is not None and x0 <= actual[1]:
+            actual[1] = max(actual[1], x1)
+            actual[3] = b
+            continue
+        if actual is not None:
+            rectangulos.append((actual[0], actual[1], p, p, actual[2], actual[3]))
+        abiertos[p] = [x0, x1, a, b]
+
+    for p, (x0, x1, a, b) in abiertos.items():
+        rectangulos.append((x0, x1, p, p, a, b))
+    return rectangulos
+
+
+def _rectangulos_carril_unico(
+    linea: LineaTiempoCPU, escala: float, ancho: int
+) -> List[Rectangulo]:
+    """
+    Un solo carril: cada píxel se asigna al proceso con más ocupación en él.
+
+    Los tramos no se solapan, así que los píxeles cubiertos por completo se
+    recorren una sola vez en total (O(tramos + ancho)). Por píxel se guarda
+    también el primer y el último tramo del dueño, para que el rectángulo
+    informe los tiempos reales y no los redondeados al píxel.
+    """
+    dueno = array("i", [-1]) * ancho
+    primero = array("i", [-1]) * ancho
+    ultimo = array("i", [-1]) * ancho
+    # píxel -> proceso -> (ocupación, primer tramo, último tramo)
+    parciales: Dict[int, Dict[int, Tuple[float, int, int]]] = {}
+
+    def ocupar_parcial(x: int, p: int, cantidad: float, i: int) -> None:
+        if 0 <= x < ancho and cantidad > 0:
+            ocupacion = parciales.setdefault(x, {})
+            previa = ocupacion.get(p)
+            if previa is None:
+                ocupacion[p] = (cantidad, i, i)
+            else:
+                ocupacion[p] = (previa[0] + cantidad, previa[1], i)
+
+    for i, (a, b, p) in enumerate(zip(linea.inicio, linea.fin, linea.pid)):
+        fx0 = a * escala
+        fx1 = b * escala
+        x0 = int(fx0)
+        x1 = int(fx1)
+        if x0 == x1:
+            ocupar_parcial(x0, p, fx1 - fx0, i)
+            continue
+        ocupar_parcial(x0, p, x0 + 1 - fx0, i)
+        for x in range(x0 + 1, min(x1, ancho)):
+            dueno[x] = p
+            primero[x] = i
+            ultimo[x] = i
+        ocupar_parcial(x1, p, fx1 - x1, i)
+
+    for x, ocupacion in parciales.items():
+        if dueno[x] < 0:
+            p, (_, i0, i1) = max(ocupacion.items(), key=lambda item: item[1][0])
+            dueno[x] = p
+            primero[x] = i0
+            ultimo[x] = i1
+
+    rectangulos: List[Rectangulo] = []
+    x = 0
+    while x < ancho:
+        p = dueno[x]
+        desde = x
+        while x < ancho and dueno[x] == p:
+            x += 1
+        if p >= 0:
+            rectangulos.append(
+                (desde, x, 0, p, linea.inicio[primero[desde]], linea.fin[ultimo[x - 1]])
+            )
+    return rectangulos
+
+
+# ---------------------------------------------------------------------------
+# SVG
+# ---------------------------------------------------------------------------
+
+
+def _paso_eje(tiempo_total: int) -> int:
+    crudo = max(1.0, tiempo_total / 10)
+    magnitud = 10 ** int(math.floor(math.log10(crudo)))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitud >= crudo:
+            return factor * magnitud
+    return 10 * magnitud
+
+
+def generar_svg(linea: LineaTiempoCPU, ancho: int = ANCHO_DEFAULT) -> str:
+    """
+    SVG del Gantt con 'ancho' píxeles totales (incluye el margen de etiquetas).
+    """
+    ancho_util = ancho - _MARGEN_IZQ
+    if ancho_util <= 0:
+        raise ValueError(f"ancho debe ser > {_MARGEN_IZQ}")
+
+    tiempo_total = max(1, linea.tiempo_total)
+    escala = ancho_util / tiempo_total
+    por_proceso = len(linea.ids) <= MAX_FILAS_POR_PROCESO
+
+    if por_proceso:
+        filas = linea.ids
+        alto_fila = _ALTO_FILA
+        rectangulos = _rectangulos_por_proceso(linea, escala)
+    else:
+        filas = ["CPU"]
+        alto_fila = _ALTO_CARRIL_UNICO
+        rectangulos = _rectangulos_carril_unico(linea, escala, ancho_util)
+
+    alto_grafico = max(1, len(filas)) * alto_fila
+    alto = _MARGEN_SUP + alto_grafico + _ALTO_EJE
+    partes: List[str] = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{ancho}" height="{alto}" '
+        f'font-family="monospace" font-size="11">'
+    ]
+
+    for i, nombre in enumerate(filas):
+        y = _MARGEN_SUP + i * alto_fila
+        partes.append(
+            f'<text x="{_MARGEN_IZQ - 6}" y="{y + alto_fila * 0.7:.0f}" '
+            f'text-anchor="end">{escape(nombre)}</text>'
+        )
+
+    ids = linea.ids
+    for x0, x1, fila, p, a, b in rectangulos:
+        y = _MARGEN_SUP + fila * alto_fila + 2
+        partes.append(
+            f'<rect x="{_MARGEN_IZQ + x0}" y="{y}" width="{x1 - x0}" '
+            f'height="{alto_fila - 4}" fill="{_color(p)}">'
+            f"<title>{escape(ids[p])} [{a}, {b})</title></rect>"
+        )
+
+    y_eje = _MARGEN_SUP + alto_grafico
+    partes.append(
+        f'<line x1="{_MARGEN_IZQ}" y1="{y_eje}" x2="{ancho}" y2="{y_eje}" stroke="black"/>'
+    )
+    paso = _paso_eje(tiempo_total)
+    for t in range(0, tiempo_total + 1, paso):
+        x = _MARGEN_IZQ + t * escala
+        partes.append(
+            f'<line x1="{x:.1f}" y1="{y_eje}" x2="{x:.1f}" y2="{y_eje + 4}" stroke="black"/>'
+            f'<text x="{x:.1f}" y="{y_eje + 16}" text-anchor="middle">{t}</text>'
+        )
+
+    partes.append("</svg>")
+    return "\n".join(partes)
+
+
+def exportar_gantt(
+    linea: LineaTiempoCPU,
+    ruta: str,
+    ancho: int = ANCHO_DEFAULT,
+) -> None:
+    """
+    Escribe el Gantt en 'ruta': HTML si termina en .html/.htm, SVG si no.
+    """
+    svg = generar_svg(linea, ancho=ancho)
+    if ruta.lower().endswith((".html", ".htm")):
+        contenido = (
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            "<title>Gantt de CPU</title></head><body>\n"
+            f"<p>{len(linea)} tramos, {len(linea.ids)} procesos, "
+            f"t=0..{linea.tiempo_total}</p>\n{svg}\n</body></html>\n"
+        )
+    else:
+        contenido = svg + "\n"
+
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(contenido)
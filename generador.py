@@ -0,0 +1,393 @@
+"""
+Generador determinístico de trazas sintéticas de procesos.
+
+Responsabilidades:
+    - Generar arribos con proceso de Poisson o MMPP de dos estados.
+    - Generar ráfagas de CPU exponenciales, Pareto o lognormales.
+    - Generar memoria requerida desde una distribución empírica
+      (valores con pesos, o la columna Memoria de un CSV existente).
+    - Escribir en streaming (CSV con CSV_HEADERS o binario) sin armar listas
+      con toda la traza en memoria.
+    - Generar en bloques independientes repartidos entre varios procesos.
+    - Producir las mismas filas en memoria (iterar_filas), para quien
+      simula muchas trazas sin escribirlas.
+
+Reproducibilidad:
+    La traza depende solo de (semilla, cantidad, especificaciones, tam_bloque).
+    Cada bloque tiene sus propios generadores aleatorios derivados de la
+    semilla, así que la salida es la misma con 1 o con N workers.
+
+Especificaciones (strings, para poder pasarlas tal cual desde la CLI):
+    arribos:  "poisson:TASA"
+              "mmpp:TASA0,TASA1:CAMBIO01,CAMBIO10"
+    rafagas:  "exponencial:MEDIA"
+              "pareto:ALFA,MINIMO"
+              "lognormal:MU,SIGMA"
+    memoria:  "empirica:VALOR=PESO,VALOR=PESO,..."
+              "csv:RUTA"
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import os
+import random
+import shutil
+import sys
+from typing import IO, Callable, Iterator, List, Optional, Tuple
+
+from io_metricas import CSV_HEADERS, MAGIA_BINARIO, REGISTRO_BINARIO
+
+ARRIBOS_DEFAULT = "poisson:0.5"
+RAFAGAS_DEFAULT = "exponencial:6"
+MEMORIA_DEFAULT = "empirica:50=1,80=1,90=1,100=1,240=1,300=1"
+
+# Filas que se acumulan antes de cada write().
+_LOTE_ESCRITURA = 65_536
+
+
+# ---------------------------------------------------------------------------
+# Parseo de especificaciones
+# ---------------------------------------------------------------------------
+
+
+def _separar_spec(spec: str) -> Tuple[str, str]:
+    nombre, _, parametros = spec.partition(":")
+    if not parametros:
+        raise ValueError(f"Especificación sin parámetros: {spec!r}")
+    return nombre.strip().lower(), parametros
+
+
+def _floats(texto: str, cantidad: int, spec: str) -> List[float]:
+    try:
+        valores = [float(v) for v in texto.split(",")]
+    except ValueError as exc:
+        raise ValueError(f"Parámetros no numéricos en {spec!r}") from exc
+    if len(valores) != cantidad:
+        raise ValueError(f"{spec!r}: se esperaban {cantidad} parámetros")
+    return valores
+
+
+def _generador_gaps(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Devuelve una función sin argumentos que produce el próximo
+    tiempo entre arribos.
+    """
+    nombre, parametros = _separar_spec(spec)
+
+    if nombre == "poisson":
+        (tasa,) = _floats(parametros, 1, spec)
+        if tasa <= 0:
+            raise ValueError(f"{spec!r}: la tasa debe ser > 0")
+        return lambda: rng.expovariate(tasa)
+
+    if nombre == "mmpp":
+        tasas_txt, _, cambios_txt = parametros.partition(":")
+        tasas = _floats(tasas_txt, 2, spec)
+        cambios = _floats(cambios_txt, 2, spec)
+        if min(tasas) <= 0 or min(cambios) <= 0:
+            raise ValueError(f"{spec!r}: tasas y tasas de cambio deben ser > 0")
+
+        # Estado inicial desde la distribución estacionaria de la cadena.
+        prob_estado1 = cambios[0] / (cambios[0] + cambios[1])
+        estado = [1 if rng.random() < prob_estado1 else 0]
+
+        def gap_mmpp() -> float:
+            acumulado = 0.0
+            while True:
+                s = estado[0]
+                hasta_arribo = rng.expovariate(tasas[s])
+                hasta_cambio = rng.expovariate(cambios[s])
+                if hasta_arribo <= hasta_cambio:
+                    return acumulado + hasta_arribo
+                acumulado += hasta_cambio
+                estado[0] = 1 - s
+
+        return gap_mmpp
+
+    raise ValueError(f"Distribución de arribos desconocida: {nombre!r}")
+
+
+def _generador_rafagas(spec: str, rng: random.Random) -> Callable[[], int]:
+    nombre, parametros = _separar_spec(spec)
+
+    if nombre == "exponencial":
+        (media,) = _floats(parametros, 1, spec)
+        if media <= 0:
+            raise ValueError(f"{spec!r}: la media debe ser > 0")
+        tasa = 1.0 / media
+        muestra = lambda: rng.expovariate(tasa)  # noqa: E731
+    elif nombre == "pareto":
+        alfa, minimo = _floats(parametros, 2, spec)
+        if alfa <= 0 or minimo <= 0:
+            raise ValueError(f"{spec!r}: alfa y mínimo deben ser > 0")
+        muestra = lambda: minimo * rng.paretovariate(alfa)  # noqa: E731
+    elif nombre == "lognormal":
+        mu, sigma = _floats(parametros, 2, spec)
+        muestra = lambda: rng.lognormvariate(mu, sigma)  # noqa: E731
+    else:
+        raise ValueError(f"Distribución de ráfagas desconocida: {nombre!r}")
+
+    return lambda: max(1, round(muestra()))
+
+
+def _tabla_empirica(spec: str) -> Tuple[List[int], List[float]]:
+    """
+    Devuelve (valores, pesos acumulados) para muestrear con random.choices.
+    """
+    nombre, parametros = _separar_spec(spec)
+
+    if nombre == "empirica":
+        valores: List[int] = []
+        pesos: List[float] = []
+        for par in parametros.split(","):
+            valor, _, peso = par.partition("=")
+            try:
+                valores.append(int(valor))
+                pesos.append(float(peso) if peso else 1.0)
+            except ValueError as exc:
+                raise ValueError(f"Par inválido {par!r} en {spec!r}") from exc
+    elif nombre == "csv":
+        conteo: dict = {}
+        with open(parametros, newline="", encoding="utf-8") as f:
+            for fila in csv.DictReader(f):
+                memoria = int(fila["Memoria"])
+                conteo[memoria] = conteo.get(memoria, 0) + 1
+        valores = sorted(conteo)
+        pesos = [float(conteo[v]) for v in valores]
+    else:
+        raise ValueError(f"Distribución de memoria desconocida: {nombre!r}")
+
+    if not valores or min(valores) <= 0 or min(pesos) < 0 or sum(pesos) <= 0:
+        raise ValueError(f"{spec!r}: valores deben ser > 0 y pesos no negativos")
+
+    return valores, list(itertools.accumulate(pesos))
+
+
+def validar_especificaciones(arribos: str, rafagas: str, memoria: str) -> None:
+    """
+    Falla temprano (ValueError) si alguna especificación es inválida.
+    """
+    rng = random.Random(0)
+    _generador_gaps(arribos, rng)
+    _generador_rafagas(rafagas, rng)
+    _tabla_empirica(memoria)
+
+
+# ---------------------------------------------------------------------------
+# Bloques
+# ---------------------------------------------------------------------------
+
+
+def _rngs_bloque(semilla: int, bloque: int) -> Tuple[random.Random, random.Random]:
+    """
+    Generadores independientes para arribos y para atributos del bloque.
+    """
+    return (
+        random.Random(f"{semilla}:{bloque}:arribos"),
+        random.Random(f"{semilla}:{bloque}:atributos"),
+    )
+
+
+def _duracion_bloque(tarea: Tuple[int, int, int, str]) -> float:
+    """
+    Primera pasada: suma de gaps de un bloque (mismo RNG que la escritura).
+    """
+    semilla, bloque, cantidad, arribos = tarea
+    rng_arribos, _ = _rngs_bloque(semilla, bloque)
+    gap = _generador_gaps(arribos, rng_arribos)
+    total = 0.0
+    for _ in range(cantidad):
+        total += gap()
+    return total
+
+
+def _filas_bloque(
+    semilla: int,
+    bloque: int,
+    primer_numero: int,
+    cantidad: int,
+    inicio: float,
+    arribos: str,
+    rafagas: str,
+    memoria: str,
+) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Filas (número, arribo, ráfaga, memoria) de un bloque. Única fuente de
+    las filas generadas: la escritura (_escribir_bloque) y iterar_filas
+    las toman de acá, así que el orden de consumo de los RNG es uno solo.
+    """
+    rng_arribos, rng_atributos = _rngs_bloque(semilla, bloque)
+    gap = _generador_gaps(arribos, rng_arribos)
+    rafaga = _generador_rafagas(rafagas, rng_atributos)
+    valores, acumulados = _tabla_empirica(memoria)
+
+    t = inicio
+    numero = primer_numero
+    restantes = cantidad
+    while restantes > 0:
+        lote = min(restantes, _LOTE_ESCRITURA)
+        for mem in rng_atributos.choices(valores, cum_weights=acumulados, k=lote):
+            t += gap()
+            yield numero, int(t), rafaga(), mem
+            numero += 1
+        restantes -= lote
+
+
+def _escribir_bloque(
+    salida: IO,
+    semilla: int,
+    bloque: int,
+    primer_numero: int,
+    cantidad: int,
+    inicio: float,
+    arribos: str,
+    rafagas: str,
+    memoria: str,
+    binario: bool,
+) -> None:
+    filas = _filas_bloque(
+        semilla, bloque, primer_numero, cantidad, inicio, arribos, rafagas, memoria
+    )
+    empaquetar = REGISTRO_BINARIO.pack
+    while True:
+        lote = list(itertools.islice(filas, _LOTE_ESCRITURA))
+        if not lote:
+            break
+        if binario:
+            salida.write(b"".join([empaquetar(*fila) for fila in lote]))
+        else:
+            salida.write("".join([f"P{n},{a},{r},{m}\n" for n, a, r, m in lote]))
+
+
+def _escribir_bloque_a_archivo(tarea: tuple) -> str:
+    ruta_parte = tarea[0]
+    binario = tarea[-1]
+    modo = "wb" if binario else "w"
+    kwargs = {} if binario else {"encoding": "utf-8", "newline": ""}
+    with open(ruta_parte, modo, **kwargs) as f:
+        _escribir_bloque(f, *tarea[1:])
+    return ruta_parte
+
+
+# ---------------------------------------------------------------------------
+# API principal
+# ---------------------------------------------------------------------------
+
+
+def generar_traza(
+    ruta: str,
+    cantidad: int,
+    semilla: int = 0,
+    arribos: str = ARRIBOS_DEFAULT,
+    rafagas: str = RAFAGAS_DEFAULT,
+    memoria: str = MEMORIA_DEFAULT,
+    binario: bool = False,
+    workers: int = 1,
+    tam_bloque: int = 1_000_000,
+) -> None:
+    """
+    Genera 'cantidad' procesos y los escribe en 'ruta' ("-" = stdout).
+
+    Con workers > 1 cada bloque se escribe a un archivo parcial en paralelo
+    y luego se concatenan en orden; stdout solo admite workers = 1.
+    """
+    if cantidad < 0:
+        raise ValueError("cantidad debe ser >= 0")
+    if tam_bloque <= 0:
+        raise ValueError("tam_bloque debe ser > 0")
+    validar_especificaciones(arribos, rafagas, memoria)
+
+    bloques = [
+        (b, min(tam_bloque, cantidad - b * tam_bloque))
+        for b in range((cantidad + tam_bloque - 1) // tam_bloque)
+    ]
+    workers = max(1, min(workers, len(bloques) or 1))
+    if ruta == "-" and workers > 1:
+        raise ValueError("La salida por stdout no admite workers > 1")
+
+    tareas_duracion = [(semilla, b, n, arribos) for b, n in bloques]
+    duraciones: List[float]
+    if workers > 1:
+        import multiprocessing
+
+        with multiprocessing.Pool(workers) as pool:
+            duraciones = pool.map(_duracion_bloque, tareas_duracion)
+    else:
+        duraciones = [_duracion_bloque(t) for t in tareas_duracion]
+
+    inicios = [0.0] + list(itertools.accumulate(duraciones))[:-1]
+
+    def tarea_bloque(b: int, n: int, destino: Optional[str] = None) -> tuple:
+        args = (semilla, b, b * tam_bloque, n, inicios[b], arribos, rafagas, memoria, binario)
+        return args if destino is None else (destino,) + args
+
+    if ruta == "-":
+        salida = sys.stdout.buffer if binario else sys.stdout
+        _escribir_cabecera(salida, binario)
+        for b, n in bloques:
+            _escribir_bloque(salida, *tarea_bloque(b, n))
+        salida.flush()
+        return
+
+    modo = "wb" if binario else "w"
+    kwargs = {} if binario else {"encoding": "utf-8", "newline": ""}
+
+    if workers == 1:
+        with open(ruta, modo, **kwargs) as f:
+            _escribir_cabecera(f, binario)
+            for b, n in bloques:
+                _escribir_bloque(f, *tarea_bloque(b, n))
+        return
+
+    import multiprocessing
+
+    tareas = [tarea_bloque(b, n, f"{ruta}.parte{b:06d}") for b, n in bloques]
+    try:
+        with open(ruta, "wb") as f:
+            f.write(MAGIA_BINARIO if binario else (",".join(CSV_HEADERS) + "\n").encode())
+            with multiprocessing.Pool(workers) as pool:
+                for ruta_parte in pool.imap(_escribir_bloque_a_archivo, tareas):
+                    with open(ruta_parte, "rb") as parte:
+                        shutil.copyfileobj(parte, f)
+                    os.remove(ruta_parte)
+    finally:
+        for tarea in tareas:
+            if os.path.exists(tarea[0]):
+                os.remove(tarea[0])
+
+
+def _escribir_cabecera(salida: IO, binario: bool) -> None:
+    if binario:
+        salida.write(MAGIA_BINARIO)
+    else:
+        salida.write(",".join(CSV_HEADERS) + "\n")
+
+
+def iterar_filas(
+    cantidad: int,
+    semilla: int = 0,
+    arribos: str = ARRIBOS_DEFAULT,
+    rafagas: str = RAFAGAS_DEFAULT,
+    memoria: str = MEMORIA_DEFAULT,
+    tam_bloque: int = 1_000_000,
+) -> Iterator[Tuple[str, int, int, int]]:
+    """
+    Filas (id, arribo, rafaga, memoria) idénticas a las que generar_traza
+    escribiría con los mismos parámetros, en orden y sin tocar disco.
+    """
+    if cantidad < 0:
+        raise ValueError("cantidad debe ser >= 0")
+    if tam_bloque <= 0:
+        raise ValueError("tam_bloque debe ser > 0")
+    validar_especificaciones(arribos, rafagas, memoria)
+
+    inicio = 0.0
+    for b in range((cantidad + tam_bloque - 1) // tam_bloque):
+        n = min(tam_bloque, cantidad - b * tam_bloque)
+        for numero, arribo, rafaga, mem in _filas_bloque(
+            semilla, b, b * tam_bloque, n, inicio, arribos, rafagas, memoria
+        ):
+            yield f"P{numero}", arribo, rafaga, mem
+        inicio += _duracion_bloque((semilla, b, n, arribos))
@@ -0,0 +1,424 @@
+"""
+Importador de trazas reales del scheduler de Linux (perf sched / ftrace).
+
+Responsabilidades:
+    - Parsear volcados de texto de 'perf sched script' y de ftrace
+      (eventos sched_switch, sched_wakeup[_new], sched_process_exit y
+      rss_stat) en cualquiera de los dos formatos de línea.
+    - Reconstruir trabajos: cada episodio de una tarea desde que despierta
+      hasta que se bloquea (o termina) es un Proceso con arribo = instante
+      del wakeup, ráfaga = tiempo en CPU durante el episodio y memoria = el
+      último RSS conocido de la tarea.
+    - Entregar los procesos en orden de arribo y en streaming, con memoria
+      acotada por las tareas vivas y los episodios abiertos (no por el
+      tamaño del archivo).
+    - Con workers > 1, un pre-pase paralelo parsea el archivo por bloques y
+      reparte los eventos en archivos temporales por CPU; luego se mezclan
+      por timestamp con heapq.merge.
+
+Los tiempos se expresan en unidades de 'resolucion_us' microsegundos,
+relativos al primer evento.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from io_metricas import _cortes_por_linea
+from procesos import Proceso
+
+MEMORIA_DEFAULT_KB = 64
+RESOLUCION_US_DEFAULT = 1000
+# Un episodio abierto más que esto (en tiempo de traza) se corta, para que
+# una tarea que nunca se bloquea no retenga la salida indefinidamente.
+HORIZONTE_REORDEN_S = 10.0
+
+# Evento normalizado: (timestamp_ns, tipo, campos...)
+#   "S": prev_pid, prev_comm, prev_state, next_pid, next_comm
+#   "W": pid, comm
+#   "X": pid
+#   "M": pid, bytes de RSS
+Evento = Tuple
+
+_LINEA = re.compile(
+    r"^(?P<cabecera>.*?)\s*\[(?P<cpu>\d+)\]\s+(?:[\w.]{4,5}\s+)?"
+    r"(?P<seg>\d+)\.(?P<frac>\d+):\s+(?:[\w-]+:)?(?P<evento>\w+):\s*(?P<resto>.*)$"
+)
+_CAMPOS = re.compile(r"(\w+)=(.*?)(?=\s+\w+=|\s+==>|\s*$)")
+_SWITCH_COMPACTO = re.compile(
+    r"^(?P<pc>.+?):(?P<pp>\d+)\s+\[-?\d+\]\s+(?P<ps>\S+)\s+==>\s+(?P<nc>.+?):(?P<np>\d+)\s+\["
+)
+_PID_CABECERA = re.compile(r"[-\s](\d+)(?:/\d+)?\s*(?:\(\s*[\d-]+\s*\))?\s*$")
+_NO_ID = re.compile(r"[^\w.:/+-]")
+
+
+def _timestamp_ns(segundos: str, fraccion: str) -> int:
+    return int(segundos) * 1_000_000_000 + int(fraccion[:9].ljust(9, "0"))
+
+
+def parsear_linea(linea: str) -> Optional[Tuple[int, Evento]]:
+    """
+    Devuelve (cpu, evento) o None si la línea no es un evento de interés.
+    """
+    m = _LINEA.match(linea)
+    if m is None:
+        return None
+    evento = m.group("evento")
+    ts = _timestamp_ns(m.group("seg"), m.group("frac"))
+    resto = m.group("resto")
+    cpu = int(m.group("cpu"))
+
+    if evento == "sched_switch":
+        campos = dict(_CAMPOS.findall(resto))
+        if "prev_pid" in campos:
+            return cpu, (
+                ts, "S",
+                int(campos["prev_pid"]), campos.get("prev_comm", ""), campos.get("prev_state", "R"),
+                int(campos["next_pid"]), campos.get("next_comm", ""),
+            )
+        c = _SWITCH_COMPACTO.match(resto)
+        if c is None:
+            return None
+        return cpu, (ts, "S", int(c["pp"]), c["pc"], c["ps"], int(c["np"]), c["nc"])
+
+    if evento in ("sched_wakeup", "sched_wakeup_new", "sched_waking"):
+        if evento == "sched_waking":
+            return None
+        campos = dict(_CAMPOS.findall(resto))
+        if "pid" not in campos:
+            return None
+        return cpu, (ts, "W", int(campos["pid"]), campos.get("comm", ""))
+
+    if evento == "sched_process_exit":
+        campos = dict(_CAMPOS.findall(resto))
+        if "pid" not in campos:
+            return None
+        return cpu, (ts, "X", int(campos["pid"]))
+
+    if evento == "rss_stat":
+        campos = dict(_CAMPOS.findall(resto))
+        tamanio = campos.get("size", "").rstrip("B")
+        pid = _PID_CABECERA.search(m.group("cabecera"))
+        if not tamanio.isdigit() or pid is None:
+            return None
+        return cpu, (ts, "M", int(pid.group(1)), int(tamanio))
+
+    return None
+
+
+def iterar_eventos(lineas: Iterable[str]) -> Iterator[Evento]:
+    """
+    Eventos en el orden del archivo (perf sched script y el archivo 'trace'
+    de ftrace ya vienen ordenados por tiempo).
+    """
+    for linea in lineas:
+        resultado = parsear_linea(linea)
+        if resultado is not None:
+            yield resultado[1]
+
+
+# ---------------------------------------------------------------------------
+# Pre-pase paralelo por CPU
+# ---------------------------------------------------------------------------
+
+
+def _serializar(evento: Evento) -> str:
+    return "\t".join(str(v) for v in evento) + "\n"
+
+
+def _deserializar(linea: str) -> Evento:
+    p = linea.rstrip("\n").split("\t")
+    ts, tipo = int(p[0]), p[1]
+    if tipo == "S":
+        return (ts, tipo, int(p[2]), p[3], p[4], int(p[5]), p[6])
+    if tipo == "W":
+        return (ts, tipo, int(p[2]), p[3])
+    if tipo == "X":
+        return (ts, tipo, int(p[2]))
+    return (ts, tipo, int(p[2]), int(p[3]))
+
+
+def _repartir_bloque(ruta: str, inicio: int, fin: int, bloque: int, directorio: str) -> List[int]:
+    """
+    Parsea [inicio, fin) y escribe cada evento en el temporal de su CPU.
+    Devuelve las CPUs vistas.
+    """
+    salidas: Dict[int, TextIO] = {}
+    try:
+        with open(ruta, "rb") as f:
+            f.seek(inicio)
+            while f.tell() < fin:
+                crudo = f.readline()
+                if not crudo:
+                    break
+                resultado = parsear_linea(crudo.decode("utf-8", errors="replace"))
+                if resultado is None:
+                    continue
+                cpu, evento = resultado
+                salida = salidas.get(cpu)
+                if salida is None:
+                    salida = open(
+                        os.path.join(directorio, f"cpu{cpu:05d}_b{bloque:06d}.tsv"),
+                        "w",
+                        encoding="utf-8",
+                    )
+                    salidas[cpu] = salida
+                salida.write(_serializar(evento))
+    finally:
+        for salida in salidas.values():
+            salida.close()
+    return sorted(salidas)
+
+
+def _leer_cpu(archivos: List[str]) -> Iterator[Evento]:
+    for archivo in archivos:
+        with open(archivo, "r", encoding="utf-8") as f:
+            for linea in f:
+                yield _deserializar(linea)
+
+
+def iterar_eventos_paralelo(ruta: str, workers: int) -> Iterator[Evento]:
+    """
+    Parsea 'ruta' en 'workers' bloques en paralelo, separando por CPU en
+    archivos temporales, y mezcla los flujos por CPU en orden de tiempo.
+    """
+    tamanio = os.path.getsize(ruta)
+    cortes = _cortes_por_linea(ruta, 0, tamanio, workers)
+    directorio = tempfile.mkdtemp(prefix="simso-sched-")
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(
+                _repartir_bloque,
+                itertools.repeat(ruta),
+                cortes[:-1],
+                cortes[1:],
+                range(len(cortes) - 1),
+                itertools.repeat(directorio),
+            ))
+
+        por_cpu: Dict[str, List[str]] = {}
+        for nombre in sorted(os.listdir(directorio)):
+            por_cpu.setdefault(nombre.split("_")[0], []).append(os.path.join(directorio, nombre))
+
+        yield from heapq.merge(
+            *(_leer_cpu(archivos) for archivos in por_cpu.values()),
+            key=lambda e: e[0],
+        )
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Reconstrucción de trabajos
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Tarea:
+    comm: str
+    episodio: int = 0
+    arribo_ns: Optional[int] = None
+    cpu_ns: int = 0
+    corriendo_desde: Optional[int] = None
+    rss_kb: Optional[int] = None
+
+
+class ReconstructorTrabajos:
+    """
+    Máquina de estados por tarea que convierte eventos en Procesos
+    ordenados por arribo.
+
+    Un trabajo se emite recién cuando ningún episodio abierto tiene un
+    arribo anterior (marca de agua), usando un heap de reordenamiento.
+    """
+
+    def __init__(
+        self,
+        resolucion_us: int = RESOLUCION_US_DEFAULT,
+        memoria_default_kb: int = MEMORIA_DEFAULT_KB,
+        horizonte_s: float = HORIZONTE_REORDEN_S,
+    ) -> None:
+        if resolucion_us <= 0:
+            raise ValueError("resolucion_us debe ser > 0")
+        if memoria_default_kb <= 0:
+            raise ValueError("memoria_default_kb debe ser > 0")
+        self._unidad_ns = resolucion_us * 1000
+        self._memoria_default = memoria_default_kb
+        self._horizonte_ns = int(horizonte_s * 1e9)
+        self._tareas: Dict[int, _Tarea] = {}
+        self._abiertos: List[Tuple[int, int, int]] = []
+        self._listos: List[Tuple[int, int, Proceso]] = []
+        self._secuencia = 0
+        self._t0: Optional[int] = None
+        self._ultimo_ns = 0
+
+    # ------------------------------------------------------------------
+    # Episodios
+    # ------------------------------------------------------------------
+
+    def _tarea(self, pid: int, comm: str) -> _Tarea:
+        tarea = self._tareas.get(pid)
+        if tarea is None:
+            tarea = _Tarea(comm=comm)
+            self._tareas[pid] = tarea
+        elif comm:
+            tarea.comm = comm
+        return tarea
+
+    def _abrir(self, pid: int, tarea: _Tarea, ts: int) -> None:
+        tarea.episodio += 1
+        tarea.arribo_ns = ts
+        tarea.cpu_ns = 0
+        heapq.heappush(self._abiertos, (ts, pid, tarea.episodio))
+
+    def _cerrar(self, pid: int, tarea: _Tarea, ts: int) -> None:
+        if tarea.corriendo_desde is not None:
+            tarea.cpu_ns += ts - tarea.corriendo_desde
+            tarea.corriendo_desde = None
+        if tarea.arribo_ns is None:
+            return
+
+        assert self._t0 is not None
+        arribo = (tarea.arribo_ns - self._t0) // self._unidad_ns
+        rafaga = max(1, math.ceil(tarea.cpu_ns / self._unidad_ns))
+        proceso = Proceso(
+            id=f"{_NO_ID.sub('_', tarea.comm) or 'tarea'}-{pid}.{tarea.episodio}",
+            arribo=arribo,
+            rafaga_cpu=rafaga,
+            memoria=tarea.rss_kb or self._memoria_default,
+        )
+        heapq.heappush(self._listos, (arribo, self._secuencia, proceso))
+        self._secuencia += 1
+        tarea.arribo_ns = None
+
+    def _marca_de_agua(self) -> Optional[int]:
+        """
+        Arribo (ns) del episodio abierto más antiguo, o None si no hay.
+        """
+        while self._abiertos:
+            ts, pid, episodio = self._abiertos[0]
+            tarea = self._tareas.get(pid)
+            if tarea is not None and tarea.episodio == episodio and tarea.arribo_ns is not None:
+                return ts
+            heapq.heappop(self._abiertos)
+        return None
+
+    def _cortar_viejos(self, ts: int) -> None:
+        while True:
+            marca = self._marca_de_agua()
+            if marca is None or ts - marca <= self._horizonte_ns:
+                return
+            _, pid, _ = heapq.heappop(self._abiertos)
+            tarea = self._tareas[pid]
+            seguia_corriendo = tarea.corriendo_desde is not None
+            self._cerrar(pid, tarea, ts)
+            self._abrir(pid, tarea, ts)
+            if seguia_corriendo:
+                tarea.corriendo_desde = ts
+
+    def _liberar(self) -> Iterator[Proceso]:
+        marca = self._marca_de_agua()
+        limite = None
+        if marca is not None:
+            assert self._t0 is not None
+            limite = (marca - self._t0) // self._unidad_ns
+        while self._listos and (limite is None or self._listos[0][0] < limite):
+            yield heapq.heappop(self._listos)[2]
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def procesar(self, evento: Evento) -> Iterator[Proceso]:
+        ts, tipo = evento[0], evento[1]
+        if self._t0 is None:
+            self._t0 = ts
+        ts = max(ts, self._ultimo_ns)
+        self._ultimo_ns = ts
+
+        if tipo == "S":
+            _, _, prev_pid, prev_comm, prev_estado, next_pid, next_comm = evento
+            if prev_pid != 0:
+                tarea = self._tarea(prev_pid, prev_comm)
+                if tarea.corriendo_desde is not None:
+                    tarea.cpu_ns += ts - tarea.corriendo_desde
+                    tarea.corriendo_desde = None
+                if not prev_estado.startswith("R"):
+                    self._cerrar(prev_pid, tarea, ts)
+                    if prev_estado[:1] in ("X", "Z", "x"):
+                        del self._tareas[prev_pid]
+            if next_pid != 0:
+                tarea = self._tarea(next_pid, next_comm)
+                if tarea.arribo_ns is None:
+                    self._abrir(next_pid, tarea, ts)
+                tarea.corriendo_desde = ts
+
+        elif tipo == "W":
+            _, _, pid, comm = evento
+            tarea = self._tarea(pid, comm)
+            if tarea.arribo_ns is None:
+                self._abrir(pid, tarea, ts)
+
+        elif tipo == "X":
+            tarea = self._tareas.pop(evento[2], None)
+            if tarea is not None:
+                self._cerrar(evento[2], tarea, ts)
+
+        elif tipo == "M":
+            tarea = self._tareas.get(evento[2])
+            if tarea is not None:
+                tarea.rss_kb = max(1, math.ceil(evento[3] / 1024))
+
+        self._cortar_viejos(ts)
+        yield from self._liberar()
+
+    def terminar(self) -> Iterator[Proceso]:
+        """
+        Cierra los episodios abiertos al final de la traza.
+        """
+        for pid, tarea in list(self._tareas.items()):
+            if tarea.arribo_ns is not None:
+                self._cerrar(pid, tarea, self._ultimo_ns)
+        self._abiertos.clear()
+        yield from self._liberar()
+
+
+def importar_traza_sched(
+    ruta: str,
+    workers: int = 1,
+    resolucion_us: int = RESOLUCION_US_DEFAULT,
+    memoria_default_kb: int = MEMORIA_DEFAULT_KB,
+    horizonte_s: float = HORIZONTE_REORDEN_S,
+) -> Iterator[Proceso]:
+    """
+    Procesos reconstruidos de un volcado perf sched / ftrace, en orden de
+    arribo ('-' = stdin, siempre secuencial).
+    """
+    reconstructor = ReconstructorTrabajos(resolucion_us, memoria_default_kb, horizonte_s)
+
+    if ruta == "-":
+        import sys
+
+        eventos: Iterable[Evento] = iterar_eventos(sys.stdin)
+    elif workers > 1:
+        eventos = iterar_eventos_paralelo(ruta, workers)
+    else:
+        eventos = _iterar_archivo(ruta)
+
+    for evento in eventos:
+        yield from reconstructor.procesar(evento)
+    yield from reconstructor.terminar()
+
+
+def _iterar_archivo(ruta: str) -> Iterator[Evento]:
+    with open(ruta, "r", encoding="utf-8", errors="replace") as f:
+        yield from iterar_eventos(f)
@@ -0,0 +1,390 @@
+"""
+Índice de acceso aleatorio para trazas grandes (archivo "<traza>.idx").
+
+Responsabilidades:
+    - Recorrer la traza una sola vez (CSV o binaria) y guardar, para cada
+      proceso, su arribo y el offset en bytes de su fila, ordenados por
+      arribo; y el hash de su ID con el mismo offset, ordenados por hash.
+    - Detectar IDs duplicados al construirlo (el simulador los indexa por
+      ID, así que dos filas con el mismo ID se pisarían).
+    - Cargar solo los procesos con arribo en una ventana [desde, hasta)
+      haciendo seek directo a sus filas, sin parsear el resto del archivo.
+    - Buscar un proceso por ID.
+
+El índice se invalida solo si cambia el tamaño o la fecha de modificación
+de la traza. Las secciones se leen con mmap, así que abrirlo no carga el
+índice completo en memoria.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from io_metricas import (
+    CSV_HEADERS,
+    MAGIA_BINARIO,
+    REGISTRO_BINARIO,
+    _convertir_fila,
+    _convertir_opcionales,
+    _posiciones_opcionales,
+    _validar_fila,
+)
+from procesos import Proceso
+
+MAGIA_INDICE = b"SIMSOIX1"
+# magia, tamaño de la traza, mtime_ns, cantidad, formato (0 = CSV, 1 = binario)
+CABECERA_INDICE = struct.Struct("<8sqqqq")
+EXTENSION_INDICE = ".idx"
+
+FORMATO_CSV = 0
+FORMATO_BINARIO = 1
+
+# Secciones del archivo, en orden; cada una es un arreglo de 'cantidad' int64.
+SECCIONES = ("arribos", "offsets", "lineas", "hashes", "offsets_por_id")
+
+
+def ruta_indice(ruta_traza: str) -> str:
+    return ruta_traza + EXTENSION_INDICE
+
+
+def hash_id(id_: str) -> int:
+    """
+    Hash estable de 64 bits (con signo, para caber en un arreglo 'q').
+    """
+    return int.from_bytes(
+        hashlib.blake2b(id_.encode("utf-8"), digest_size=8).digest(), "little", signed=True
+    )
+
+
+# ---------------------------------------------------------------------------
+# Lectura de filas sueltas
+# ---------------------------------------------------------------------------
+
+
+def _posiciones_csv(linea_cabecera: bytes) -> Tuple[Tuple[int, ...], Tuple[Optional[int], ...]]:
+    """
+    (posiciones de CSV_HEADERS, posiciones de CSV_OPCIONALES).
+    """
+    nombres = next(csv.reader([linea_cabecera.decode("utf-8")]), [])
+    faltantes = [h for h in CSV_HEADERS if h not in nombres]
+    if faltantes:
+        raise KeyError(f"CSV sin columnas requeridas: faltan {faltantes}")
+    posicion = {nombre: i for i, nombre in enumerate(nombres)}
+    return tuple(posicion[h] for h in CSV_HEADERS), _posiciones_opcionales(nombres)
+
+
+def _parsear_linea_csv(
+    crudo: bytes,
+    posiciones: Tuple[Tuple[int, ...], Tuple[Optional[int], ...]],
+    linea: int,
+) -> Proceso:
+    texto = crudo.decode("utf-8").rstrip("\r\n")
+    row = next(csv.reader([texto])) if '"' in texto else texto.split(",")
+    largo = len(row)
+    valores = [row[p] if p < largo else None for p in posiciones[0]]
+    id_, arribo, rafaga, memoria = _convertir_fila(*valores, linea=linea)  # type: ignore[arg-type]
+    return Proceso(
+        id=id_, arribo=arribo, rafaga_cpu=rafaga, memoria=memoria,
+        **_convertir_opcionales(row, posiciones[1], linea),
+    )
+
+
+def _parsear_registro(datos: bytes, linea: int) -> Proceso:
+    numero, arribo, rafaga, memoria = REGISTRO_BINARIO.unpack(datos)
+    id_ = f"P{numero}"
+    _validar_fila(id_, arribo, rafaga, memoria, linea)
+    return Proceso(id=id_, arribo=arribo, rafaga_cpu=rafaga, memoria=memoria)
+
+
+# ---------------------------------------------------------------------------
+# Construcción
+# ---------------------------------------------------------------------------
+
+
+def _recorrer_traza(ruta: str, formato: int) -> Tuple[array, array, array, array]:
+    """
+    Devuelve columnas (arribos, offsets, lineas, hashes) en orden de archivo.
+    """
+    arribos, offsets, lineas, hashes = array("q"), array("q"), array("q"), array("q")
+
+    with open(ruta, "rb") as f:
+        if formato == FORMATO_BINARIO:
+            offset = len(MAGIA_BINARIO)
+            f.seek(offset)
+            linea = 1
+            while True:
+                datos = f.read(REGISTRO_BINARIO.size)
+                if not datos:
+                    break
+                if len(datos) < REGISTRO_BINARIO.size:
+                    raise ValueError(f"Traza binaria truncada: {ruta}")
+                linea += 1
+                proceso = _parsear_registro(datos, linea)
+                arribos.append(proceso.arribo)
+                offsets.append(offset)
+                lineas.append(linea)
+                hashes.append(hash_id(proceso.id))
+                offset += REGISTRO_BINARIO.size
+        else:
+            cabecera = f.readline()
+            posiciones = _posiciones_csv(cabecera)
+            offset = len(cabecera)
+            linea = 1
+            for crudo in f:
+                linea += 1
+                if crudo.strip():
+                    proceso = _parsear_linea_csv(crudo, posiciones, linea)
+                    arribos.append(proceso.arribo)
+                    offsets.append(offset)
+                    lineas.append(linea)
+                    hashes.append(hash_id(proceso.id))
+                offset += len(crudo)
+
+    return arribos, offsets, lineas, hashes
+
+
+def _buscar_duplicados(
+    ruta: str,
+    formato: int,
+    hashes: Sequence[int],
+    offsets: Sequence[int],
+    offsets_archivo: Sequence[int],
+    lineas_archivo: Sequence[int],
+) -> List[Tuple[str, int, int]]:
+    """
+    Confirma (leyendo las filas) los hashes repetidos adyacentes.
+    Devuelve (id, línea original, línea repetida).
+    """
+    candidatos = [
+        i for i in range(1, len(hashes)) if hashes[i] == hashes[i - 1]
+    ]
+    if not candidatos:
+        return []
+
+    lineas_por_offset: Dict[int, int] = dict(zip(offsets_archivo, lineas_archivo))
+    duplicados: List[Tuple[str, int, int]] = []
+    with _LectorFilas(ruta, formato) as lector:
+        for i in candidatos:
+            a = lector.leer(offsets[i - 1], lineas_por_offset[offsets[i - 1]])
+            b = lector.leer(offsets[i], lineas_por_offset[offsets[i]])
+            if a.id == b.id:
+                duplicados.append(
+                    (a.id, lineas_por_offset[offsets[i - 1]], lineas_por_offset[offsets[i]])
+                )
+    return duplicados
+
+
+def construir_indice(ruta: str) -> "IndiceTraza":
+    """
+    Recorre la traza, valida las filas, verifica que no haya IDs
+    duplicados y escribe el sidecar. Devuelve el índice abierto.
+    """
+    with open(ruta, "rb") as f:
+        formato = FORMATO_BINARIO if f.read(len(MAGIA_BINARIO)) == MAGIA_BINARIO else FORMATO_CSV
+
+    info = os.stat(ruta)
+    arribos, offsets, lineas, hashes = _recorrer_traza(ruta, formato)
+    cantidad = len(arribos)
+
+    if any(arribos[i] < arribos[i - 1] for i in range(1, cantidad)):
+        orden = sorted(range(cantidad), key=arribos.__getitem__)
+        arribos = array("q", (arribos[i] for i in orden))
+        offsets_arribo = array("q", (offsets[i] for i in orden))
+        lineas_arribo = array("q", (lineas[i] for i in orden))
+    else:
+        offsets_arribo, lineas_arribo = offsets, lineas
+
+    orden_id = sorted(range(cantidad), key=lambda i: (hashes[i], offsets[i]))
+    hashes_ordenados = array("q", (hashes[i] for i in orden_id))
+    offsets_por_id = array("q", (offsets[i] for i in orden_id))
+
+    duplicados = _buscar_duplicados(
+        ruta, formato, hashes_ordenados, offsets_por_id, offsets, lineas
+    )
+    if duplicados:
+        detalle = "; ".join(
+            f"'{id_}' (líneas {a} y {b})" for id_, a, b in duplicados[:5]
+        )
+        extra = f" y {len(duplicados) - 5} más" if len(duplicados) > 5 else ""
+        raise ValueError(f"IDs de proceso duplicados en '{ruta}': {detalle}{extra}")
+
+    destino = ruta_indice(ruta)
+    temporal = destino + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA_INDICE.pack(MAGIA_INDICE, info.st_size, info.st_mtime_ns, cantidad, formato))
+        for columna in (arribos, offsets_arribo, lineas_arribo, hashes_ordenados, offsets_por_id):
+            columna.tofile(f)
+    os.replace(temporal, destino)
+
+    return IndiceTraza(ruta)
+
+
+def abrir_indice(ruta: str, reconstruir: bool = True) -> "IndiceTraza":
+    """
+    Abre el índice de 'ruta'; si falta o quedó viejo y 'reconstruir' es
+    True lo construye.
+    """
+    try:
+        return IndiceTraza(ruta)
+    except (OSError, ValueError):
+        if not reconstruir:
+            raise
+    return construir_indice(ruta)
+
+
+# ---------------------------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------------------------
+
+
+class _LectorFilas:
+    """
+    Lee procesos sueltos de la traza a partir de su offset.
+    """
+
+    def __init__(self, ruta: str, formato: int) -> None:
+        self._archivo = open(ruta, "rb")
+        self._formato = formato
+        self._posiciones: Optional[Tuple[Tuple[int, ...], Tuple[Optional[int], ...]]] = None
+        if formato == FORMATO_CSV:
+            self._posiciones = _posiciones_csv(self._archivo.readline())
+
+    def leer(self, offset: int, linea: int) -> Proceso:
+        self._archivo.seek(offset)
+        if self._formato == FORMATO_BINARIO:
+            return _parsear_registro(self._archivo.read(REGISTRO_BINARIO.size), linea)
+        assert self._posiciones is not None
+        return _parsear_linea_csv(self._archivo.readline(), self._posiciones, linea)
+
+    def close(self) -> None:
+        self._archivo.close()
+
+    def __enter__(self) -> "_LectorFilas":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class IndiceTraza:
+    """
+    Índice abierto (solo lectura). Lanza ValueError si el sidecar no existe
+    como índice válido o no corresponde a la traza actual.
+    """
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta = ruta
+        info = os.stat(ruta)
+        with open(ruta_indice(ruta), "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._mapa) < CABECERA_INDICE.size:
+                raise ValueError(f"Índice inválido: {ruta_indice(ruta)}")
+            magia, tamanio, mtime, cantidad, formato = CABECERA_INDICE.unpack_from(self._mapa)
+            if magia != MAGIA_INDICE:
+                raise ValueError(f"Índice inválido: {ruta_indice(ruta)}")
+            if (tamanio, mtime) != (info.st_size, info.st_mtime_ns):
+                raise ValueError(f"El índice de '{ruta}' está desactualizado.")
+            if len(self._mapa) != CABECERA_INDICE.size + 8 * cantidad * len(SECCIONES):
+                raise ValueError(f"Índice truncado: {ruta_indice(ruta)}")
+        except ValueError:
+            self._mapa.close()
+            raise
+
+        self.cantidad: int = cantidad
+        self.formato: int = formato
+        self._vista = memoryview(self._mapa)[CABECERA_INDICE.size:].cast("q")
+        self._columnas = {
+            nombre: self._vista[k * cantidad:(k + 1) * cantidad]
+            for k, nombre in enumerate(SECCIONES)
+        }
+
+    def close(self) -> None:
+        for columna in self._columnas.values():
+            columna.release()
+        self._columnas = {}
+        self._vista.release()
+        self._mapa.close()
+
+    def __enter__(self) -> "IndiceTraza":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.cantidad
+
+    def rango_arribos(self) -> Optional[Tuple[int, int]]:
+        arribos = self._columnas["arribos"]
+        return (arribos[0], arribos[-1]) if self.cantidad else None
+
+    def contar_en(self, desde: int, hasta: Optional[int]) -> int:
+        inicio, fin = self._limites(desde, hasta)
+        return fin - inicio
+
+    def _limites(self, desde: int, hasta: Optional[int]) -> Tuple[int, int]:
+        arribos = self._columnas["arribos"]
+        inicio = bisect.bisect_left(arribos, desde)
+        fin = self.cantidad if hasta is None else bisect.bisect_left(arribos, hasta)
+        return inicio, max(inicio, fin)
+
+    def procesos_en(self, desde: int, hasta: Optional[int] = None) -> List[Proceso]:
+        """
+        Procesos con arribo en [desde, hasta) en orden de arribo (hasta=None:
+        hasta el final). Las filas se leen en orden de offset.
+        """
+        inicio, fin = self._limites(desde, hasta)
+        offsets = self._columnas["offsets"]
+        lineas = self._columnas["lineas"]
+        posiciones = sorted(range(inicio, fin), key=offsets.__getitem__)
+
+        procesos: List[Optional[Proceso]] = [None] * (fin - inicio)
+        with _LectorFilas(self.ruta, self.formato) as lector:
+            for i in posiciones:
+                procesos[i - inicio] = lector.leer(offsets[i], lineas[i])
+        return procesos  # type: ignore[return-value]
+
+    def buscar_id(self, id_: str) -> Optional[Proceso]:
+        hashes = self._columnas["hashes"]
+        offsets = self._columnas["offsets_por_id"]
+        h = hash_id(id_)
+        i = bisect.bisect_left(hashes, h)
+        with _LectorFilas(self.ruta, self.formato) as lector:
+            while i < self.cantidad and hashes[i] == h:
+                proceso = lector.leer(offsets[i], 0)
+                if proceso.id == id_:
+                    return proceso
+                i += 1
+        return None
+
+
+def cargar_ventana(
+    ruta: str,
+    desde: int,
+    hasta: Optional[int],
+    calentamiento: int = 0,
+) -> Tuple[List[Proceso], int]:
+    """
+    Procesos con arribo en [desde - calentamiento, hasta) usando (y si hace
+    falta construyendo) el índice. Devuelve (procesos, cantidad de ellos que
+    son de calentamiento, es decir, con arribo < desde).
+    """
+    if calentamiento < 0:
+        raise ValueError("calentamiento debe ser >= 0")
+    if hasta is not None and hasta <= desde:
+        raise ValueError("La ventana está vacía: 'hasta' debe ser mayor que 'desde'.")
+
+    with abrir_indice(ruta) as indice:
+        inicio = max(0, desde - calentamiento)
+        procesos = indice.procesos_en(inicio, hasta)
+        previos = indice.contar_en(inicio, desde)
+    return procesos, previos
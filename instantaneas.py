@@ -0,0 +1,113 @@
+"""
+Re-simulación incremental: instantáneas en límites de arribo.
+
+Responsabilidades:
+    - Durante una corrida, guardar el estado del Simulador (el mismo de los
+      checkpoints) justo antes de procesar los arribos de ciertos
+      instantes, bajo la huella del prefijo de la traza que ya arribó y la
+      configuración de la corrida.
+    - Al volver a correr una traza editada o extendida, reanudar desde la
+      última instantánea cuyo prefijo coincide y simular solo el resto.
+
+Por qué alcanza con el prefijo:
+    Antes de procesar los arribos del instante T (ejecutar_hasta(T)) se
+    procesaron solo eventos anteriores a T, que dependen únicamente de los
+    procesos con arribo < T; los FIN_CPU en T todavía no se procesaron.
+    Dos trazas que coinciden hasta ese prefijo tienen el mismo estado.
+
+Dónde se guarda:
+    Las instantáneas se toman en el primer límite de arribo a partir de
+    cada múltiplo de 'cada' procesos. La grilla depende solo de la
+    posición en la traza, así que un cambio en el proceso i conserva todas
+    las instantáneas anteriores a i. Se guardan en una CacheResultados
+    propia (pickle + zlib, desalojo LRU por tamaño), separada de la de
+    resultados: la clave de un prefijo podría coincidir con la de una
+    traza completa igual a ese prefijo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from typing import Any, List, Optional, Sequence, Tuple
+
+from cache_resultados import CacheResultados, clave_simulacion
+from io_metricas import linea_huella
+from procesos import Proceso
+
+CADA_DEFAULT = 100_000
+SUBDIRECTORIO = "instantaneas"
+
+
+def puntos_de_corte(procesos: Sequence[Proceso], cada: int) -> List[Tuple[int, str]]:
+    """
+    (i, huella de procesos[:i]) para cada punto de la grilla, con procesos
+    ordenados por arribo: i es el primer índice >= k * cada (k >= 1) que
+    empieza un instante de arribo nuevo.
+
+    La huella se lleva de forma incremental (mismo formato que
+    io_metricas.huella_procesos) y solo se cierra en los puntos.
+    """
+    if cada <= 0:
+        raise ValueError("El intervalo entre instantáneas debe ser > 0")
+    puntos: List[Tuple[int, str]] = []
+    h = hashlib.sha256()
+    proximo = cada
+    anterior: Optional[int] = None
+    for i, proceso in enumerate(procesos):
+        if i >= proximo and proceso.arribo != anterior:
+            puntos.append((i, h.copy().hexdigest()))
+            proximo = (i // cada + 1) * cada
+        h.update(linea_huella(proceso))
+        anterior = proceso.arribo
+    return puntos
+
+
+class InstantaneasPrefijo:
+    """
+    Instantáneas de prefijos para un directorio de caché.
+
+    Uso: correr(simulador) en lugar de simulador.run(), con un Simulador
+    recién construido (sin verbose ni observadores que dependan de ver
+    todos los eventos).
+    """
+
+    def __init__(
+        self,
+        directorio: str,
+        tamanio_maximo: int,
+        cada: int = CADA_DEFAULT,
+    ) -> None:
+        if cada <= 0:
+            raise ValueError("El intervalo entre instantáneas debe ser > 0")
+        self._cache = CacheResultados(os.path.join(directorio, SUBDIRECTORIO), tamanio_maximo)
+        self._cada = cada
+        # Índice del arribo desde el que se reanudó la última corrida (0 = desde el inicio)
+        self.reanudado_en = 0
+        self.guardadas = 0
+
+    def correr(self, simulador: Any) -> None:
+        procesos = simulador.procesos
+        puntos = puntos_de_corte(procesos, self._cada)
+        claves = [clave_simulacion(simulador, traza=huella) for _, huella in puntos]
+
+        pendientes = 0
+        for k in range(len(puntos) - 1, -1, -1):
+            estado = self._cache.obtener(claves[k])
+            if estado is not None:
+                simulador.restaurar_estado(estado)
+                self.reanudado_en = puntos[k][0]
+                pendientes = k + 1
+                sys.stderr.write(
+                    f"Reanudado desde la instantánea del arribo {procesos[puntos[k][0]].arribo} "
+                    f"({puntos[k][0]} de {len(procesos)} procesos ya simulados).\n"
+                )
+                break
+
+        for (i, _), clave in zip(puntos[pendientes:], claves[pendientes:]):
+            simulador.ejecutar_hasta(procesos[i].arribo)
+            self._cache.guardar(clave, simulador.exportar_estado())
+            self.guardadas += 1
+
+        simulador.run()
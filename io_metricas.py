@@ -10,13 +10,27 @@ Utilidades de E/S para el simulador de SO:
 
 from __future__ import annotations
 
-from typing import List
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 import csv
+import io
+import os
+import struct
 
 from procesos import Proceso
 
 # Cabeceras esperadas en el CSV
 CSV_HEADERS = ("ID", "Arribo", "RafagaCPU", "Memoria")
+# Columnas opcionales y el campo de Proceso que completan: plazo relativo y
+# período (tiempo real, enteros > 0) y grupo / tenant (texto).
+CSV_OPCIONALES = ("Deadline", "Periodo", "Grupo")
+_CAMPOS_OPCIONALES = {"Deadline": "deadline", "Periodo": "periodo", "Grupo": "grupo"}
+
+# Formato binario equivalente al CSV: cabecera MAGIA_BINARIO y registros de
+# tamaño fijo (número, arribo, ráfaga, memoria). El ID es "P<número>".
+MAGIA_BINARIO = b"SIMSOTR1"
+REGISTRO_BINARIO = struct.Struct("<qqqq")
 
 
 # ---------------------------------------------------------------------------
@@ -56,6 +70,58 @@ def _validar_fila(
         raise ValueError(f"CSV línea {linea}: 'Memoria' debe ser > 0.")
 
 
+def _convertir_fila(
+    id_crudo: str,
+    arribo_crudo: str,
+    rafaga_crudo: str,
+    memoria_crudo: str,
+    linea: int,
+) -> Tuple[str, int, int, int]:
+    """
+    Parseo + validación de una fila. Única fuente de los mensajes de error,
+    compartida por el cargador secuencial y el paralelo.
+    """
+    id_ = id_crudo.strip()
+    arribo = _parse_int("Arribo", arribo_crudo, linea)
+    rafaga = _parse_int("RafagaCPU", rafaga_crudo, linea)
+    memoria = _parse_int("Memoria", memoria_crudo, linea)
+
+    _validar_fila(id_, arribo, rafaga, memoria, linea)
+    return id_, arribo, rafaga, memoria
+
+
+def _posiciones_opcionales(nombres: Sequence[str]) -> Tuple[Optional[int], ...]:
+    """
+    Posición de cada columna de CSV_OPCIONALES en la cabecera (None si falta).
+    """
+    posicion = {nombre: i for i, nombre in enumerate(nombres)}
+    return tuple(posicion.get(h) for h in CSV_OPCIONALES)
+
+
+def _convertir_opcionales(
+    row: Sequence[str],
+    posiciones: Tuple[Optional[int], ...],
+    linea: int,
+) -> Dict[str, Any]:
+    """
+    Campos opcionales de Proceso presentes en la fila (celdas ausentes o
+    vacías se omiten), listos para Proceso(**...).
+    """
+    valores: Dict[str, Any] = {}
+    for columna, p in zip(CSV_OPCIONALES, posiciones):
+        crudo = row[p].strip() if p is not None and p < len(row) and row[p] else ""
+        if not crudo:
+            continue
+        if columna == "Grupo":
+            valores["grupo"] = crudo
+            continue
+        valor = _parse_int(columna, crudo, linea)
+        if valor <= 0:
+            raise ValueError(f"CSV línea {linea}: '{columna}' debe ser > 0.")
+        valores[_CAMPOS_OPCIONALES[columna]] = valor
+    return valores
+
+
 # ---------------------------------------------------------------------------
 # Carga de procesos desde CSV (API principal usada por main.py)
 # ---------------------------------------------------------------------------
@@ -63,41 +129,408 @@ def _validar_fila(
 
 def cargar_procesos_desde_csv(path: str) -> List[Proceso]:
     """
-    Lee un CSV con cabecera (ID, Arribo, RafagaCPU, Memoria)
-    y devuelve una lista de Proceso.
+    Lee un CSV con cabecera (ID, Arribo, RafagaCPU, Memoria), más las
+    columnas opcionales Deadline y Periodo, y devuelve una lista de Proceso.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        return leer_procesos_csv(f)
+
+
+def leer_procesos_csv(archivo: TextIO) -> List[Proceso]:
+    """
+    Igual que cargar_procesos_desde_csv sobre un archivo ya abierto (o un
+    io.StringIO con la traza en memoria).
     """
     procesos: List[Proceso] = []
+    reader = csv.DictReader(archivo)
 
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
-        if reader.fieldnames is None:
-            raise KeyError("CSV sin cabecera. Se esperaban columnas con nombres.")
-
-        faltantes = [h for h in CSV_HEADERS if h not in reader.fieldnames]
-        if faltantes:
-            raise KeyError(f"CSV sin columnas requeridas: faltan {faltantes}")
-
-        for i, row in enumerate(reader, start=2):
-            id_ = row["ID"].strip()
-            arribo = _parse_int("Arribo", row["Arribo"], i)
-            rafaga = _parse_int("RafagaCPU", row["RafagaCPU"], i)
-            memoria = _parse_int("Memoria", row["Memoria"], i)
-
-            _validar_fila(id_, arribo, rafaga, memoria, i)
-
-            procesos.append(
-                Proceso(
-                    id=id_,
-                    arribo=arribo,
-                    rafaga_cpu=rafaga,
-                    memoria=memoria,
-                )
+    if reader.fieldnames is None:
+        raise KeyError("CSV sin cabecera. Se esperaban columnas con nombres.")
+
+    faltantes = [h for h in CSV_HEADERS if h not in reader.fieldnames]
+    if faltantes:
+        raise KeyError(f"CSV sin columnas requeridas: faltan {faltantes}")
+
+    opcionales = [h for h in CSV_OPCIONALES if h in reader.fieldnames]
+    for i, row in enumerate(reader, start=2):
+        id_, arribo, rafaga, memoria = _convertir_fila(
+            row["ID"], row["Arribo"], row["RafagaCPU"], row["Memoria"], i
+        )
+        extra: Dict[str, Any] = {}
+        if opcionales:
+            extra = _convertir_opcionales(
+                [row.get(h) or "" for h in CSV_OPCIONALES],
+                tuple(range(len(CSV_OPCIONALES))),
+                i,
+            )
+
+        procesos.append(
+            Proceso(
+                id=id_,
+                arribo=arribo,
+                rafaga_cpu=rafaga,
+                memoria=memoria,
+                **extra,
             )
+        )
 
     return procesos
 
 
+def iterar_procesos_csv(archivo: TextIO) -> Iterator[Proceso]:
+    """
+    Lee procesos de un archivo de texto de a una fila (apto para pipes).
+
+    La cabecera es opcional: si la primera fila contiene las columnas de
+    CSV_HEADERS se usa para ubicarlas; si no, se asume ese mismo orden.
+    Los arribos deben venir en orden no decreciente, porque la simulación
+    en línea no puede reordenar lo que todavía no leyó.
+    """
+    reader = csv.reader(archivo)
+    posiciones: Optional[Tuple[int, ...]] = None
+    opcionales: Tuple[Optional[int], ...] = (None,) * len(CSV_OPCIONALES)
+    hay_opcionales = False
+    linea = 0
+    ultimo_arribo: Optional[int] = None
+
+    for row in reader:
+        if not row:
+            continue
+        linea += 1
+
+        if posiciones is None:
+            if all(h in row for h in CSV_HEADERS):
+                posicion = {nombre: i for i, nombre in enumerate(row)}
+                posiciones = tuple(posicion[h] for h in CSV_HEADERS)
+                opcionales = _posiciones_opcionales(row)
+                hay_opcionales = any(p is not None for p in opcionales)
+                continue
+            posiciones = tuple(range(len(CSV_HEADERS)))
+
+        largo = len(row)
+        valores = [row[p] if p < largo else None for p in posiciones]
+        id_, arribo, rafaga, memoria = _convertir_fila(*valores, linea=linea)  # type: ignore[arg-type]
+
+        if ultimo_arribo is not None and arribo < ultimo_arribo:
+            raise ValueError(
+                f"CSV línea {linea}: 'Arribo' fuera de orden ({arribo} < {ultimo_arribo})."
+            )
+        ultimo_arribo = arribo
+
+        if hay_opcionales:
+            yield Proceso(
+                id=id_, arribo=arribo, rafaga_cpu=rafaga, memoria=memoria,
+                **_convertir_opcionales(row, opcionales, linea),
+            )
+        else:
+            yield Proceso(id=id_, arribo=arribo, rafaga_cpu=rafaga, memoria=memoria)
+
+
+# ---------------------------------------------------------------------------
+# Carga paralela por bloques
+# ---------------------------------------------------------------------------
+
+# Por debajo de este tamaño el costo de levantar el pool no se amortiza.
+TAMANIO_MINIMO_PARALELO = 4 * 1024 * 1024
+
+
+@dataclass
+class ColumnasProcesos:
+    """
+    Traza en formato columnar: un arreglo tipado por columna.
+    """
+
+    ids: List[str] = field(default_factory=list)
+    arribo: array = field(default_factory=lambda: array("q"))
+    rafaga: array = field(default_factory=lambda: array("q"))
+    memoria: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def extender(self, otra: "ColumnasProcesos") -> None:
+        self.ids.extend(otra.ids)
+        self.arribo.extend(otra.arribo)
+        self.rafaga.extend(otra.rafaga)
+        self.memoria.extend(otra.memoria)
+
+    def a_procesos(self) -> List[Proceso]:
+        return [
+            Proceso(id=id_, arribo=a, rafaga_cpu=r, memoria=m)
+            for id_, a, r, m in zip(self.ids, self.arribo, self.rafaga, self.memoria)
+        ]
+
+
+@dataclass
+class _ResultadoBloque:
+    columnas: ColumnasProcesos
+    filas: int
+    # Fila (0-based, sin contar filas vacías) del primer error del bloque.
+    fila_error: Optional[int] = None
+    valores_error: Optional[Tuple[Optional[str], ...]] = None
+    # El bloque tiene comillas: podría haber campos con saltos de línea.
+    requiere_secuencial: bool = False
+
+
+def _parsear_bloque_csv(
+    tarea: Tuple[str, int, int, Tuple[int, int, int, int]]
+) -> _ResultadoBloque:
+    """
+    Worker: parsea las filas de [inicio, fin) a columnas tipadas.
+
+    No conoce su número de línea global; ante el primer error devuelve la
+    fila local y sus valores para que el proceso principal lo reproduzca.
+    """
+    path, inicio, fin, posiciones = tarea
+    with open(path, "rb") as f:
+        f.seek(inicio)
+        datos = f.read(fin - inicio)
+
+    columnas = ColumnasProcesos()
+    if b'"' in datos:
+        return _ResultadoBloque(columnas, 0, requiere_secuencial=True)
+
+    texto = datos.decode("utf-8")
+    ids = columnas.ids
+    arribos = columnas.arribo
+    rafagas = columnas.rafaga
+    memorias = columnas.memoria
+
+    p_id, p_arribo, p_rafaga, p_memoria = posiciones
+    filas = 0
+    for row in csv.reader(io.StringIO(texto, newline="")):
+        if not row:
+            continue
+        # Camino rápido con las mismas reglas que _convertir_fila; ante
+        # cualquier problema se delega el mensaje exacto al proceso principal.
+        try:
+            id_ = row[p_id].strip()
+            arribo = int(row[p_arribo])
+            rafaga = int(row[p_rafaga])
+            memoria = int(row[p_memoria])
+            valida = bool(id_) and arribo >= 0 and rafaga > 0 and memoria > 0
+            if valida:
+                arribos.append(arribo)
+                rafagas.append(rafaga)
+                memorias.append(memoria)
+        except Exception:  # noqa: BLE001 - se reproduce en el proceso principal
+            valida = False
+
+        if not valida:
+            largo = len(row)
+            valores = tuple(row[p] if p < largo else None for p in posiciones)
+            return _ResultadoBloque(columnas, filas, fila_error=filas, valores_error=valores)
+
+        ids.append(id_)
+        filas += 1
+
+    return _ResultadoBloque(columnas, filas)
+
+
+def _cabecera_csv(path: str) -> Tuple[List[str], int, bool]:
+    """
+    Devuelve (nombres de columna, offset del primer byte de datos,
+    cabecera con comillas).
+    """
+    with open(path, "rb") as f:
+        linea = f.readline()
+        inicio_datos = f.tell()
+
+    nombres = next(csv.reader([linea.decode("utf-8")]), [])
+    return nombres, inicio_datos, b'"' in linea
+
+
+def _cortes_por_linea(path: str, inicio: int, fin: int, partes: int) -> List[int]:
+    """
+    Offsets de corte alineados al comienzo de una línea.
+    """
+    cortes = [inicio]
+    paso = max(1, (fin - inicio) // partes)
+    with open(path, "rb") as f:
+        for k in range(1, partes):
+            objetivo = inicio + k * paso
+            if objetivo <= cortes[-1]:
+                continue
+            f.seek(objetivo - 1)
+            f.readline()
+            corte = f.tell()
+            if corte >= fin:
+                break
+            if corte > cortes[-1]:
+                cortes.append(corte)
+    cortes.append(fin)
+    return cortes
+
+
+def cargar_columnas_desde_csv(
+    path: str,
+    workers: Optional[int] = None,
+) -> ColumnasProcesos:
+    """
+    Carga paralela de un CSV a columnas tipadas.
+
+    El archivo se corta en límites de línea, cada bloque se parsea en un
+    pool de procesos y los resultados se concatenan en orden. Los errores
+    conservan exactamente el mensaje del cargador secuencial ('CSV línea i'),
+    con la línea recalculada sumando las filas de los bloques anteriores.
+
+    Si el archivo es chico, usa comillas (podría haber saltos de línea
+    dentro de un campo) o trae columnas de CSV_OPCIONALES (las columnas
+    tipadas no las guardan) se usa el cargador secuencial.
+    """
+    workers = workers or os.cpu_count() or 1
+    tamanio = os.path.getsize(path)
+    nombres, inicio_datos, cabecera_con_comillas = _cabecera_csv(path)
+
+    def secuencial() -> ColumnasProcesos:
+        columnas = ColumnasProcesos()
+        for p in cargar_procesos_desde_csv(path):
+            columnas.ids.append(p.id)
+            columnas.arribo.append(p.arribo)
+            columnas.rafaga.append(p.rafaga_cpu)
+            columnas.memoria.append(p.memoria)
+        return columnas
+
+    if (
+        workers <= 1
+        or tamanio < TAMANIO_MINIMO_PARALELO
+        or cabecera_con_comillas
+        or any(h in nombres for h in CSV_OPCIONALES)
+    ):
+        return secuencial()
+
+    faltantes = [h for h in CSV_HEADERS if h not in nombres]
+    if faltantes:
+        # Mismo mensaje que el cargador secuencial.
+        return secuencial()
+
+    # Igual que DictReader: ante nombres repetidos gana la última columna.
+    posicion: Dict[str, int] = {nombre: i for i, nombre in enumerate(nombres)}
+    posiciones = tuple(posicion[h] for h in CSV_HEADERS)
+
+    cortes = _cortes_por_linea(path, inicio_datos, tamanio, workers * 4)
+    tareas = [(path, a, b, posiciones) for a, b in zip(cortes, cortes[1:])]
+
+    import multiprocessing
+
+    columnas = ColumnasProcesos()
+    filas_previas = 0
+    with multiprocessing.Pool(workers) as pool:
+        for resultado in pool.imap(_parsear_bloque_csv, tareas):
+            if resultado.requiere_secuencial:
+                pool.terminate()
+                return secuencial()
+
+            if resultado.fila_error is not None:
+                pool.terminate()
+                linea = 2 + filas_previas + resultado.fila_error
+                _convertir_fila(*resultado.valores_error, linea=linea)  # type: ignore[arg-type, misc]
+                raise ValueError(f"CSV línea {linea}: valor fuera de rango.")
+
+            columnas.extender(resultado.columnas)
+            filas_previas += resultado.filas
+
+    return columnas
+
+
+def cargar_procesos_desde_csv_paralelo(
+    path: str,
+    workers: Optional[int] = None,
+) -> List[Proceso]:
+    """
+    Equivalente a cargar_procesos_desde_csv usando cargar_columnas_desde_csv.
+    """
+    return cargar_columnas_desde_csv(path, workers).a_procesos()
+
+
+def cargar_procesos_desde_binario(path: str) -> List[Proceso]:
+    """
+    Lee una traza en formato binario (ver MAGIA_BINARIO / REGISTRO_BINARIO).
+    Aplica las mismas validaciones que el CSV; 'línea' es el número de
+    registro contando la cabecera como línea 1, igual que en el CSV.
+    """
+    procesos: List[Proceso] = []
+
+    with open(path, "rb") as f:
+        if f.read(len(MAGIA_BINARIO)) != MAGIA_BINARIO:
+            raise ValueError(f"'{path}' no es una traza binaria del simulador.")
+
+        datos = f.read()
+
+    if len(datos) % REGISTRO_BINARIO.size:
+        raise ValueError(f"Traza binaria truncada: {path}")
+
+    for i, (numero, arribo, rafaga, memoria) in enumerate(
+        REGISTRO_BINARIO.iter_unpack(datos), start=2
+    ):
+        id_ = f"P{numero}"
+        _validar_fila(id_, arribo, rafaga, memoria, i)
+        procesos.append(
+            Proceso(id=id_, arribo=arribo, rafaga_cpu=rafaga, memoria=memoria)
+        )
+
+    return procesos
+
+
+def cargar_procesos(path: str, workers: int = 1) -> List[Proceso]:
+    """
+    Carga una traza detectando el formato (binario o CSV) por su cabecera.
+    Con workers > 1 los CSV se parsean en paralelo.
+    """
+    with open(path, "rb") as f:
+        es_binario = f.read(len(MAGIA_BINARIO)) == MAGIA_BINARIO
+
+    if es_binario:
+        return cargar_procesos_desde_binario(path)
+    if workers > 1:
+        return cargar_procesos_desde_csv_paralelo(path, workers)
+    return cargar_procesos_desde_csv(path)
+
+
+def iterar_procesos_binario(path: str, registros_por_lectura: int = 65536) -> Iterator[Proceso]:
+    """
+    Versión en streaming de cargar_procesos_desde_binario: lee la traza
+    por bloques y exige arribos en orden no decreciente.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIA_BINARIO)) != MAGIA_BINARIO:
+            raise ValueError(f"'{path}' no es una traza binaria del simulador.")
+
+        linea = 1
+        ultimo_arribo: Optional[int] = None
+        while True:
+            datos = f.read(REGISTRO_BINARIO.size * registros_por_lectura)
+            if not datos:
+                return
+            if len(datos) % REGISTRO_BINARIO.size:
+                raise ValueError(f"Traza binaria truncada: {path}")
+
+            for numero, arribo, rafaga, memoria in REGISTRO_BINARIO.iter_unpack(datos):
+                linea += 1
+                id_ = f"P{numero}"
+                _validar_fila(id_, arribo, rafaga, memoria, linea)
+                if ultimo_arribo is not None and arribo < ultimo_arribo:
+                    raise ValueError(
+                        f"Registro {linea}: 'Arribo' fuera de orden ({arribo} < {ultimo_arribo})."
+                    )
+                ultimo_arribo = arribo
+                yield Proceso(id=id_, arribo=arribo, rafaga_cpu=rafaga, memoria=memoria)
+
+
+def iterar_procesos(path: str) -> Iterator[Proceso]:
+    """
+    Lee una traza ordenada por arribo en streaming (CSV o binaria).
+    """
+    with open(path, "rb") as f:
+        es_binario = f.read(len(MAGIA_BINARIO)) == MAGIA_BINARIO
+
+    if es_binario:
+        yield from iterar_procesos_binario(path)
+        return
+    with open(path, "r", encoding="utf-8", newline="") as archivo:
+        yield from iterar_procesos_csv(archivo)
+
+
 def cargar_procesos_csv(path: str) -> List[Proceso]:
     """
     Alias de compatibilidad hacia atrás.
@@ -105,6 +538,41 @@ def cargar_procesos_csv(path: str) -> List[Proceso]:
     return cargar_procesos_desde_csv(path)
 
 
+# ---------------------------------------------------------------------------
+# Huella de una traza
+# ---------------------------------------------------------------------------
+
+
+def huella_procesos(procesos: Iterable[Proceso]) -> str:
+    """
+    Hash SHA-256 (hex) de una traza ya parseada.
+
+    Depende solo de (ID, Arribo, RafagaCPU, Memoria), de Deadline/Periodo
+    y Grupo cuando están presentes y del orden recibido, por lo que conviene pasar
+    los procesos ya ordenados por arribo. Las filas sin columnas opcionales
+    dan la misma huella que antes de que existieran.
+    """
+    import hashlib
+
+    h = hashlib.sha256()
+    for p in procesos:
+        h.update(linea_huella(p))
+    return h.hexdigest()
+
+
+def linea_huella(p: Proceso) -> bytes:
+    """
+    Aporte de un proceso a huella_procesos; sirve para llevar la huella de
+    cada prefijo de la traza (ver instantaneas.py).
+    """
+    linea = f"{p.id}\x1f{p.arribo}\x1f{p.rafaga_cpu}\x1f{p.memoria}"
+    if p.deadline is not None or p.periodo is not None:
+        linea += f"\x1f{p.deadline}\x1f{p.periodo}"
+    if p.grupo is not None:
+        linea += f"\x1eG{p.grupo}"
+    return f"{linea}\n".encode()
+
+
 # ---------------------------------------------------------------------------
 # Utilidades de logging / snapshots (opcionales)
 # ---------------------------------------------------------------------------
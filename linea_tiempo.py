@@ -0,0 +1,85 @@
+"""
+Línea de tiempo de la CPU codificada por tramos (run-length).
+
+Responsabilidades:
+    - Registrar qué proceso ocupó la CPU en cada intervalo [inicio, fin).
+    - Fusionar intervalos contiguos del mismo proceso, de modo que los
+      eventos que no cambian al dueño de la CPU no agregan tramos.
+    - Guardar los tramos en arreglos tipados (int64 para tiempos, int32
+      para el índice de proceso) en lugar de tuplas de Python.
+
+Los procesos se identifican por un índice denso; 'ids' traduce índice → ID.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class LineaTiempoCPU:
+    """
+    Tramos (inicio, fin, índice de proceso) ordenados por tiempo.
+    """
+
+    def __init__(self) -> None:
+        self.inicio = array("q")
+        self.fin = array("q")
+        self.pid = array("i")
+        self.ids: List[str] = []
+        self._indices: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.inicio)
+
+    def indice_de(self, id_proceso: str) -> int:
+        indice = self._indices.get(id_proceso)
+        if indice is None:
+            indice = len(self.ids)
+            self._indices[id_proceso] = indice
+            self.ids.append(id_proceso)
+        return indice
+
+    def registrar(self, inicio: int, fin: int, id_proceso: str) -> None:
+        """
+        Agrega el tramo [inicio, fin) de id_proceso, o extiende el último si
+        es del mismo proceso y empieza donde aquel terminó.
+        """
+        if fin <= inicio:
+            return
+        indice = self.indice_de(id_proceso)
+        n = len(self.inicio)
+        if n and self.pid[n - 1] == indice and self.fin[n - 1] == inicio:
+            self.fin[n - 1] = fin
+            return
+        self.inicio.append(inicio)
+        self.fin.append(fin)
+        self.pid.append(indice)
+
+    def tramos(self) -> Iterator[Tuple[int, int, str]]:
+        ids = self.ids
+        for a, b, p in zip(self.inicio, self.fin, self.pid):
+            yield a, b, ids[p]
+
+    @property
+    def tiempo_total(self) -> int:
+        return self.fin[-1] if len(self.fin) else 0
+
+    # ------------------------------------------------------------------
+    # Estado serializable (checkpoints)
+    # ------------------------------------------------------------------
+
+    def exportar_estado(self) -> Dict[str, Any]:
+        return {
+            "inicio": self.inicio.tobytes(),
+            "fin": self.fin.tobytes(),
+            "pid": self.pid.tobytes(),
+            "ids": list(self.ids),
+        }
+
+    def restaurar_estado(self, estado: Dict[str, Any]) -> None:
+        self.inicio = array("q", estado["inicio"])
+        self.fin = array("q", estado["fin"])
+        self.pid = array("i", estado["pid"])
+        self.ids = list(estado["ids"])
+        self._indices = {id_proceso: i for i, id_proceso in enumerate(self.ids)}
@@ -8,41 +8,1237 @@ from __future__ import annotations
 import argparse
 import os
 import sys
-from typing import List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
-from memoria import GestorMemoria
-from procesos import Proceso
-from simulacion import ejecutar_simulacion
-from io_metricas import cargar_procesos_desde_csv
+from memoria import TAMANIOS_USUARIO_DEFAULT, GestorMemoria
+from politicas_espera import POLITICAS_ESPERA
+from control_carga import DESCARTES
+from fair_share import INTRA_GRUPO
+from tiempo_real import PLANIFICADORES, crear_scheduler
 
+# Lo que solo usa la corrida (o un subcomando) se importa al usarlo: el
+# arranque de 'main.py' paga únicamente argparse y la configuración.
+if TYPE_CHECKING:
+    from cache_resultados import CacheResultados
+    from procesos import Proceso
 
-def parse_args() -> argparse.Namespace:
+
+def _pesos_grupos(texto: str) -> Dict[str, float]:
+    pesos = {}
+    for item in texto.split(","):
+        grupo, _, peso = item.partition("=")
+        try:
+            pesos[grupo.strip()] = float(peso)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"se esperaba GRUPO=PESO,...: '{texto}'"
+            ) from None
+    return pesos
+
+
+def _lista_enteros(texto: str) -> List[int]:
+    try:
+        return [int(v) for v in texto.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba una lista de enteros: '{texto}'") from None
+
+
+def _agregar_opciones_carga(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max-espera",
+        type=int,
+        metavar="N",
+        help="Máximo de procesos en la cola de espera de memoria; el resto se rechaza (default: sin límite)",
+    )
+    parser.add_argument(
+        "--descarte",
+        choices=DESCARTES,
+        default="nuevo",
+        help=(
+            "Con --max-espera, a quién se rechaza: nuevo (el que llega), antiguo "
+            "(el que más espera), mayor (el que más memoria pide) o red (descarte "
+            "temprano aleatorio); default: nuevo"
+        ),
+    )
+    parser.add_argument(
+        "--descarte-semilla",
+        type=int,
+        default=0,
+        metavar="S",
+        help="Semilla de --descarte red (default: 0)",
+    )
+
+
+def _agregar_opcion_tablero(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--tablero",
+        metavar="[HOST:]PUERTO",
+        help=(
+            "Sirve un tablero en vivo de la corrida en http://HOST:PUERTO/ "
+            "(HOST default 127.0.0.1; PUERTO 0 = uno libre)"
+        ),
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     """
     Define la CLI:
       --csv <ruta>    Ruta al CSV de procesos (default: procesos.csv)
       --verbose       Imprime eventos y snapshots de memoria
+      --workers <N>   Parsea el CSV en paralelo con N procesos
+      --politica-espera <P>          Política de la cola de espera de memoria
+      --particiones <T1,T2,...>      Tamaños de las particiones de usuario
+      --grado <N>                    Grado máximo de multiprogramación
+      --max-espera <N>               Cota de la cola de espera de memoria
+      --descarte <P>                 nuevo, antiguo, mayor o red (con --max-espera)
+      --stdin         Modo en línea: procesos desde stdin (p. ej. tail -f)
+      --ventana <N>   Métricas por ventana de N unidades (modo en línea)
+      --sched <ruta>  Modo en línea desde un volcado perf sched / ftrace
+      --sched-resolucion <us>        Microsegundos por unidad de tiempo
+      --checkpoint <ruta>            Guarda checkpoints periódicos
+      --checkpoint-eventos <N>       ... cada N eventos
+      --checkpoint-segundos <T>      ... cada T segundos de reloj real
+      --resume <ruta>                Reanuda desde un checkpoint
+      --profile                      Perfil por fases (llamadas / tiempo)
+      --profile-pstats <ruta>        Perfil cProfile guardado en formato pstats
+      --no-cache                     Desactiva la caché de resultados
+      --gantt <ruta>                 Exporta el Gantt de CPU (.svg o .html)
+      --from <T> / --to <T>          Simula solo la ventana de arribos [T, T')
+      --calentamiento <N>            ... precedida por N unidades de calentamiento
+      --planificador <P>             srtf, edf (Earliest Deadline First), rm o fair
+      --pesos <G=P,...>              Pesos por grupo para fair (default 1)
+      --intra-grupo <srtf|fcfs>      Orden dentro de cada grupo para fair
+      --horizonte <T>                Libera instancias periódicas hasta T
+      --guardar [--etiqueta E]       Guarda la corrida en el almacén (ver compare)
+      --incremental                  Reanuda desde el prefijo ya simulado de la traza
     """
     parser = argparse.ArgumentParser(
         prog="simulador-so",
         description=(
-            "Simulador de SO — SRTF con desalojo + memoria con particiones "
-            "fijas y Best-Fit."
+            "Simulador de SO — SRTF con desalojo (o EDF / Rate-Monotonic) + "
+            "memoria con particiones fijas y Best-Fit."
         ),
     )
     parser.add_argument(
         "--csv",
         default="procesos.csv",
-        help="Ruta al archivo CSV con columnas: ID,Arribo,RafagaCPU,Memoria",
+        help=(
+            "Ruta al archivo CSV con columnas: ID,Arribo,RafagaCPU,Memoria "
+            "(también acepta la traza binaria de 'generate')"
+        ),
     )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Muestra eventos y snapshots durante la ejecución",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Modo en línea: lee los procesos de stdin a medida que el reloj los necesita",
+    )
+    parser.add_argument(
+        "--ventana",
+        type=int,
+        metavar="N",
+        help="En modo en línea, imprime métricas cada N unidades de tiempo simulado",
+    )
+    parser.add_argument(
+        "--sched",
+        metavar="RUTA",
+        help=(
+            "Modo en línea: reconstruye los procesos de un volcado de "
+            "'perf sched script' o de ftrace ('-' = stdin)"
+        ),
+    )
+    parser.add_argument(
+        "--sched-resolucion",
+        type=int,
+        default=1000,
+        metavar="US",
+        help="Con --sched, microsegundos por unidad de tiempo simulado (default: 1000)",
+    )
+    parser.add_argument(
+        "--sched-memoria",
+        type=int,
+        default=64,
+        metavar="K",
+        help="Con --sched, memoria de las tareas sin rss_stat (default: 64)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Procesos para parsear el CSV (o el volcado de --sched) en paralelo (default: 1)",
+    )
+    parser.add_argument(
+        "--politica-espera",
+        choices=tuple(POLITICAS_ESPERA),
+        default="fifo",
+        help="Orden de admisión desde la cola de espera de memoria (default: fifo)",
+    )
+    parser.add_argument(
+        "--particiones",
+        type=_lista_enteros,
+        default=list(TAMANIOS_USUARIO_DEFAULT),
+        metavar="T1,T2,...",
+        help="Tamaños (K) de las particiones de usuario (default: 250,150,50)",
+    )
+    parser.add_argument(
+        "--grado",
+        type=int,
+        default=5,
+        help="Grado máximo de multiprogramación (default: 5)",
+    )
+    _agregar_opciones_carga(parser)
+    _agregar_opcion_tablero(parser)
+    parser.add_argument(
+        "--checkpoint",
+        metavar="RUTA",
+        help="Archivo donde guardar checkpoints periódicos de la simulación",
+    )
+    parser.add_argument(
+        "--checkpoint-eventos",
+        type=int,
+        metavar="N",
+        help="Guarda un checkpoint cada N eventos (default: 100000 si no se indica T)",
+    )
+    parser.add_argument(
+        "--checkpoint-segundos",
+        type=float,
+        metavar="T",
+        help="Guarda un checkpoint cada T segundos de reloj real",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Reporta llamadas y tiempo por fase y eventos/segundo",
+    )
+    parser.add_argument(
+        "--profile-pstats",
+        metavar="RUTA",
+        help="Corre además bajo cProfile y guarda las estadísticas (pstats)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="No consulta ni guarda resultados en la caché en disco",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directorio de la caché (default: $SIMULADOR_CACHE_DIR o ~/.cache/simulador-so)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=256,
+        help="Tamaño máximo de la caché en MB; se desalojan las entradas menos usadas",
+    )
+    parser.add_argument(
+        "--gantt",
+        metavar="RUTA",
+        help="Exporta el diagrama de Gantt de la CPU (SVG, o HTML si termina en .html)",
+    )
+    parser.add_argument(
+        "--gantt-ancho",
+        type=int,
+        default=1200,
+        metavar="PX",
+        help="Ancho del Gantt en píxeles; los tramos se agrupan por píxel (default: 1200)",
+    )
+    parser.add_argument(
+        "--from",
+        dest="desde",
+        type=int,
+        metavar="T",
+        help="Simula solo los arribos desde T, usando el índice <csv>.idx (se crea si falta)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="hasta",
+        type=int,
+        metavar="T",
+        help="Simula solo los arribos anteriores a T (ver --from)",
+    )
+    parser.add_argument(
+        "--calentamiento",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "Con --from/--to, simula además los arribos de las N unidades previas "
+            "para reconstruir el estado de las colas; no cuentan en las métricas"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUTA",
+        help="Reanuda la simulación desde un checkpoint (requiere el mismo CSV)",
+    )
+    parser.add_argument(
+        "--planificador",
+        choices=tuple(PLANIFICADORES),
+        default="srtf",
+        help=(
+            "Planificador de CPU: srtf, edf (plazo más cercano), rm (período más corto) "
+            "o fair (fair-share jerárquico por la columna Grupo)"
+        ),
+    )
+    parser.add_argument(
+        "--pesos",
+        type=_pesos_grupos,
+        default={},
+        metavar="G=P,...",
+        help="Con --planificador fair, peso de cada grupo o subgrupo ('org/equipo'); default 1",
+    )
+    parser.add_argument(
+        "--intra-grupo",
+        choices=INTRA_GRUPO,
+        default="srtf",
+        help="Con --planificador fair, orden dentro de cada grupo (default: srtf)",
+    )
+    parser.add_argument(
+        "--horizonte",
+        type=int,
+        metavar="T",
+        help=(
+            "Con tareas periódicas (columna Periodo), libera instancias con arribo < T "
+            "(default: un hiperperíodo, o max desfasaje + 2 hiperperíodos)"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Guarda instantáneas del estado en la caché y, si la traza comparte un "
+            "prefijo con una corrida anterior, simula solo lo que cambió"
+        ),
+    )
+    parser.add_argument(
+        "--incremental-cada",
+        type=int,
+        default=100_000,
+        metavar="N",
+        help="Con --incremental, una instantánea cada N procesos (default: 100000)",
+    )
+    parser.add_argument(
+        "--guardar",
+        action="store_true",
+        help="Guarda las métricas por proceso en el almacén de corridas (ver 'compare')",
+    )
+    parser.add_argument(
+        "--almacen",
+        metavar="DIR",
+        help="Directorio del almacén (default: $SIMULADOR_ALMACEN_DIR o ~/.local/share/simulador-so/corridas)",
+    )
+    parser.add_argument(
+        "--etiqueta",
+        help="Con --guardar, nombre para referirse a la corrida en 'compare'",
+    )
+    return parser.parse_args(argv)
+
+
+# -----------------------------------------------------------
+# Subcomandos
+# -----------------------------------------------------------
+
+
+def _main_generate(argv: List[str]) -> int:
+    """
+    python main.py generate -n N -o salida.csv [--seed S] [--arribos ...]
+    """
+    import generador
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so generate",
+        description="Genera una traza sintética reproducible (CSV o binaria).",
+    )
+    parser.add_argument("-n", "--cantidad", type=int, required=True, help="Cantidad de procesos")
+    parser.add_argument("-o", "--salida", required=True, help="Archivo destino ('-' = stdout)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla (default: 0)")
+    parser.add_argument(
+        "--arribos",
+        default=generador.ARRIBOS_DEFAULT,
+        help="poisson:TASA | mmpp:TASA0,TASA1:CAMBIO01,CAMBIO10",
+    )
+    parser.add_argument(
+        "--rafagas",
+        default=generador.RAFAGAS_DEFAULT,
+        help="exponencial:MEDIA | pareto:ALFA,MINIMO | lognormal:MU,SIGMA",
+    )
+    parser.add_argument(
+        "--memoria",
+        default=generador.MEMORIA_DEFAULT,
+        help="empirica:VALOR=PESO,... | csv:RUTA",
+    )
+    parser.add_argument(
+        "--formato", choices=("csv", "bin"), default="csv", help="Formato de salida"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Procesos en paralelo (default: 1)"
+    )
+    parser.add_argument(
+        "--tam-bloque",
+        type=int,
+        default=1_000_000,
+        help="Filas por bloque; forma parte de la semilla efectiva",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        generador.generar_traza(
+            ruta=args.salida,
+            cantidad=args.cantidad,
+            semilla=args.seed,
+            arribos=args.arribos,
+            rafagas=args.rafagas,
+            memoria=args.memoria,
+            binario=args.formato == "bin",
+            workers=args.workers,
+            tam_bloque=args.tam_bloque,
+        )
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    return 0
+
+
+def _main_cluster(argv: List[str]) -> int:
+    """
+    python main.py cluster --csv traza.csv --nodos N [--despacho ...]
+    """
+    import cluster
+    from io_metricas import iterar_procesos
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so cluster",
+        description="Simula N nodos (memoria + SRTF) detrás de un despachador global.",
+    )
+    parser.add_argument("--csv", default="procesos.csv", help="Traza ordenada por arribo (CSV o binaria)")
+    parser.add_argument("--nodos", type=int, required=True, help="Cantidad de nodos")
+    parser.add_argument(
+        "--despacho",
+        choices=tuple(cluster.DESPACHADORES),
+        default="menos-cargado",
+        help="Política del despachador (default: menos-cargado)",
+    )
+    parser.add_argument(
+        "--ventana",
+        type=int,
+        default=cluster.VENTANA_DEFAULT,
+        help="Ancho de la ventana de sincronización en unidades de tiempo simulado",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Procesos trabajadores (default: 1)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Semilla (potencia-de-dos)")
+    parser.add_argument(
+        "--politica-espera",
+        choices=tuple(POLITICAS_ESPERA),
+        default="fifo",
+        help="Política de la cola de espera de cada nodo (default: fifo)",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.csv):
+        sys.stderr.write(f"Error: no se encontró el archivo: {args.csv}\n")
+        return 1
+
+    try:
+        resultado = cluster.simular_cluster(
+            procesos=iterar_procesos(args.csv),
+            nodos=args.nodos,
+            despacho=args.despacho,
+            ventana=args.ventana,
+            workers=args.workers,
+            semilla=args.seed,
+            politica_espera=args.politica_espera,
+        )
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    resultado.imprimir()
+    return 0
+
+
+def _main_tune(argv: List[str]) -> int:
+    """
+    python main.py tune --csv traza.csv [--objetivo espera-media] [--workers N]
+    """
+    import tuner
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so tune",
+        description=(
+            "Busca el grado de multiprogramación y las particiones que optimizan "
+            "un objetivo (successive halving sobre prefijos de la traza)."
+        ),
+    )
+    parser.add_argument("--csv", default="procesos.csv", help="Traza (CSV o binaria)")
+    parser.add_argument("--objetivo", choices=tuner.OBJETIVOS, default="espera-media")
+    parser.add_argument(
+        "--memoria-total",
+        type=int,
+        default=sum(TAMANIOS_USUARIO_DEFAULT),
+        help="Memoria de usuario total a repartir en K (default: 450)",
+    )
+    parser.add_argument("--paso", type=int, default=50, help="Granularidad de las particiones en K")
+    parser.add_argument("--max-particiones", type=int, default=4, help="Máximo de particiones de usuario")
+    parser.add_argument("--grado-max", type=int, default=5, help="Máximo grado de multiprogramación a probar")
+    parser.add_argument("--eta", type=int, default=3, help="Factor de reducción por ronda (default: 3)")
+    parser.add_argument(
+        "--prefijo-minimo",
+        type=int,
+        default=500,
+        help="Procesos mínimos en la primera ronda (default: 500)",
+    )
+    parser.add_argument(
+        "--candidatas",
+        type=int,
+        default=0,
+        help="Muestra al azar N configuraciones del espacio (0 = todas)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del muestreo")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos en paralelo (default: 1)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.csv):
+        sys.stderr.write(f"Error: no se encontró el archivo: {args.csv}\n")
+        return 1
+
+    def informar(procesos: int, evaluaciones: List["tuner.Evaluacion"]) -> None:
+        sys.stderr.write(
+            f"Ronda sobre {procesos} procesos: {len(evaluaciones)} candidatas evaluadas\n"
+        )
+
+    try:
+        candidatas = tuner.muestrear(
+            tuner.espacio_configuraciones(
+                memoria_total=args.memoria_total,
+                paso=args.paso,
+                max_particiones=args.max_particiones,
+                grado_max=args.grado_max,
+            ),
+            args.candidatas,
+            args.seed,
+        )
+        resultado = tuner.ajustar(
+            ruta=args.csv,
+            candidatas=candidatas,
+            objetivo=args.objetivo,
+            eta=args.eta,
+            prefijo_minimo=args.prefijo_minimo,
+            workers=args.workers,
+            al_terminar_ronda=informar,
+        )
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    resultado.imprimir()
+    return 0
+
+
+def _main_replicate(argv: List[str]) -> int:
+    """
+    python main.py replicate -n N [--arribos ...] [--precision 0.05] [--workers N]
+    """
+    import generador
+    import replicas
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so replicate",
+        description=(
+            "Simula réplicas independientes de una carga sintética y reporta "
+            "intervalos de confianza; corta al alcanzar la precisión pedida."
+        ),
+    )
+    parser.add_argument("-n", "--cantidad", type=int, default=1000, help="Procesos por réplica (default: 1000)")
+    parser.add_argument("--arribos", default=generador.ARRIBOS_DEFAULT, help="Igual que en 'generate'")
+    parser.add_argument("--rafagas", default=generador.RAFAGAS_DEFAULT, help="Igual que en 'generate'")
+    parser.add_argument("--memoria", default=generador.MEMORIA_DEFAULT, help="Igual que en 'generate'")
+    parser.add_argument(
+        "--particiones",
+        type=_lista_enteros,
+        default=list(TAMANIOS_USUARIO_DEFAULT),
+        metavar="T1,T2,...",
+        help="Tamaños (K) de las particiones de usuario (default: 250,150,50)",
+    )
+    parser.add_argument("--grado", type=int, default=5, help="Grado máximo de multiprogramación (default: 5)")
+    parser.add_argument(
+        "--politica-espera",
+        choices=tuple(POLITICAS_ESPERA),
+        default="fifo",
+        help="Política de la cola de espera de memoria (default: fifo)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Semilla base de las réplicas (default: 0)")
+    parser.add_argument("--confianza", type=float, default=0.95, help="Nivel de confianza (default: 0.95)")
+    parser.add_argument(
+        "--precision",
+        type=float,
+        default=0.05,
+        help="Semiancho objetivo relativo a la media (default: 0.05)",
+    )
+    parser.add_argument(
+        "--objetivo",
+        action="append",
+        choices=replicas.METRICAS,
+        help="Métrica que debe alcanzar la precisión; repetible (default: espera_media)",
+    )
+    parser.add_argument("--min-replicas", type=int, default=5, help="Réplicas mínimas (default: 5)")
+    parser.add_argument("--max-replicas", type=int, default=100, help="Réplicas máximas (default: 100)")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos en paralelo (default: 1)")
+    args = parser.parse_args(argv)
+
+    def informar(hechas: int, intervalos: List["replicas.Intervalo"]) -> None:
+        objetivos = ", ".join(
+            f"{i.metrica}={i.media:.3f}±{i.semiancho:.3f}"
+            for i in intervalos
+            if i.metrica in (args.objetivo or ["espera_media"])
+        )
+        sys.stderr.write(f"{hechas} réplicas: {objetivos}\n")
+
+    try:
+        resultado = replicas.replicar(
+            replicas.ConfigReplica(
+                cantidad=args.cantidad,
+                arribos=args.arribos,
+                rafagas=args.rafagas,
+                memoria=args.memoria,
+                grado=args.grado,
+                particiones=tuple(args.particiones),
+                politica_espera=args.politica_espera,
+            ),
+            semilla=args.seed,
+            confianza=args.confianza,
+            precision=args.precision,
+            objetivos=args.objetivo or ["espera_media"],
+            min_replicas=args.min_replicas,
+            max_replicas=args.max_replicas,
+            workers=args.workers,
+            al_terminar_lote=informar,
+        )
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    resultado.imprimir()
+    return 0 if resultado.convergio else 2
 
 
-def main() -> int:
+def _main_approx(argv: List[str]) -> int:
+    """
+    python main.py approx --csv traza.csv [--accuracy 0.05] [--estratos 10] [--workers N] [--validar]
+    """
+    import aproximado
+    import replicas
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so approx",
+        description=(
+            "Estima las métricas de una traza grande simulando tajadas de tiempo "
+            "estratificadas, con calentamiento, e informa intervalos de error."
+        ),
+    )
+    parser.add_argument("--csv", default="procesos.csv", help="Traza de procesos (CSV o binaria)")
+    parser.add_argument(
+        "--particiones",
+        type=_lista_enteros,
+        default=list(TAMANIOS_USUARIO_DEFAULT),
+        metavar="T1,T2,...",
+        help="Tamaños (K) de las particiones de usuario (default: 250,150,50)",
+    )
+    parser.add_argument("--grado", type=int, default=5, help="Grado máximo de multiprogramación (default: 5)")
+    parser.add_argument(
+        "--politica-espera",
+        choices=tuple(POLITICAS_ESPERA),
+        default="fifo",
+        help="Política de la cola de espera de memoria (default: fifo)",
+    )
+    parser.add_argument(
+        "--planificador",
+        choices=tuple(PLANIFICADORES),
+        default="srtf",
+        help="Planificador de CPU (default: srtf)",
+    )
+    parser.add_argument("--estratos", type=int, default=10, help="Estratos de tiempo (default: 10)")
+    parser.add_argument(
+        "--tajada",
+        type=int,
+        metavar="T",
+        help="Duración de cada tajada simulada (default: 1/100 de un estrato)",
+    )
+    parser.add_argument(
+        "--calentamiento",
+        type=int,
+        metavar="T",
+        help="Tiempo simulado sin medir antes y después de cada tajada (default: el de la tajada)",
+    )
+    parser.add_argument(
+        "--precision",
+        "--accuracy",
+        type=float,
+        default=0.05,
+        help=(
+            "Semiancho objetivo relativo al valor estimado (default: 0.05); más chico "
+            "simula más grupos de tajadas"
+        ),
+    )
+    parser.add_argument(
+        "--objetivo",
+        action="append",
+        choices=replicas.METRICAS,
+        help="Métrica que debe alcanzar la precisión; repetible (default: espera_media)",
+    )
+    parser.add_argument("--confianza", type=float, default=0.95, help="Nivel de confianza (default: 0.95)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del sorteo de tajadas (default: 0)")
+    parser.add_argument("--min-grupos", type=int, default=4, help="Grupos de tajadas mínimos (default: 4)")
+    parser.add_argument("--max-grupos", type=int, default=50, help="Grupos de tajadas máximos (default: 50)")
+    parser.add_argument("--workers", type=int, default=1, help="Tajadas simuladas en paralelo (default: 1)")
+    parser.add_argument(
+        "--validar",
+        action="store_true",
+        help="Corre además la traza completa y compara (sale con 3 si algún intervalo no la cubre)",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.csv):
+        sys.stderr.write(f"Error: no se encontró el archivo CSV: {args.csv}\n")
+        return 1
+
+    objetivos = args.objetivo or ["espera_media"]
+
+    def informar(hechos: int, intervalos: List["replicas.Intervalo"]) -> None:
+        estado = ", ".join(f"{i.metrica}={i.media:.3f}±{i.semiancho:.3f}" for i in intervalos)
+        sys.stderr.write(f"{hechos} grupos: {estado}\n")
+
+    try:
+        resultado = aproximado.aproximar(
+            args.csv,
+            aproximado.ConfigAproximada(
+                grado=args.grado,
+                particiones=tuple(args.particiones),
+                politica_espera=args.politica_espera,
+                planificador=args.planificador,
+            ),
+            estratos=args.estratos,
+            tajada=args.tajada,
+            calentamiento=args.calentamiento,
+            semilla=args.seed,
+            confianza=args.confianza,
+            precision=args.precision,
+            objetivos=objetivos,
+            min_grupos=args.min_grupos,
+            max_grupos=args.max_grupos,
+            workers=args.workers,
+            al_terminar_lote=informar,
+        )
+        resultado.imprimir()
+        if args.validar:
+            exactos, segundos = aproximado.validar(resultado)
+            if aproximado.imprimir_validacion(resultado, exactos, segundos):
+                return 3
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    return 0 if resultado.convergio else 2
+
+
+def _main_overload(argv: List[str]) -> int:
+    """
+    python main.py overload --csv traza.csv [--factores 0.5,1,2,4] [--max-espera N]
+    """
+    import control_carga
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so overload",
+        description=(
+            "Goodput frente a carga ofrecida: simula la traza con los interarribos "
+            "comprimidos por cada factor, con o sin cota en la cola de espera."
+        ),
+    )
+    parser.add_argument("--csv", default="procesos.csv", help="Traza de procesos (CSV o binaria)")
+    parser.add_argument(
+        "--factores",
+        type=lambda t: [float(v) for v in t.split(",")],
+        default=[0.5, 1.0, 2.0, 4.0, 8.0],
+        metavar="F1,F2,...",
+        help="Multiplicadores de la tasa de arribos (default: 0.5,1,2,4,8)",
+    )
+    parser.add_argument(
+        "--particiones",
+        type=_lista_enteros,
+        default=list(TAMANIOS_USUARIO_DEFAULT),
+        metavar="T1,T2,...",
+        help="Tamaños (K) de las particiones de usuario (default: 250,150,50)",
+    )
+    parser.add_argument("--grado", type=int, default=5, help="Grado máximo de multiprogramación (default: 5)")
+    parser.add_argument(
+        "--politica-espera",
+        choices=tuple(POLITICAS_ESPERA),
+        default="fifo",
+        help="Política de la cola de espera de memoria (default: fifo)",
+    )
+    _agregar_opciones_carga(parser)
+    parser.add_argument("--workers", type=int, default=1, help="Factores simulados en paralelo (default: 1)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.csv):
+        sys.stderr.write(f"Error: no se encontró el archivo CSV: {args.csv}\n")
+        return 1
+
+    from io_metricas import cargar_procesos
+
+    try:
+        puntos = control_carga.curva_goodput(
+            cargar_procesos(args.csv),
+            args.factores,
+            control_carga.ConfigCurva(
+                grado=args.grado,
+                particiones=tuple(args.particiones),
+                politica_espera=args.politica_espera,
+                limite_espera=args.max_espera,
+                descarte=args.descarte,
+                semilla=args.descarte_semilla,
+            ),
+            workers=args.workers,
+        )
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    control_carga.imprimir_curva(puntos)
+    return 0
+
+
+def _main_compare(argv: List[str]) -> int:
+    """
+    python main.py compare [CORRIDA ...] [--metrica espera] [--top 10]
+    """
+    import almacen_resultados
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so compare",
+        description=(
+            "Compara corridas guardadas con --guardar contra la primera: métricas "
+            "globales y regresiones por proceso. Sin corridas, lista las guardadas."
+        ),
+    )
+    parser.add_argument("corridas", nargs="*", metavar="CORRIDA", help="ID (c00001) o etiqueta")
+    parser.add_argument("--almacen", metavar="DIR", help="Directorio del almacén")
+    parser.add_argument(
+        "--metrica",
+        choices=almacen_resultados.COLUMNAS,
+        default="espera",
+        help="Métrica para las regresiones por proceso (default: espera)",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Regresiones a listar por corrida (default: 10)")
+    args = parser.parse_args(argv)
+    directorio = args.almacen or almacen_resultados.DIRECTORIO_DEFAULT
+
+    try:
+        if not args.corridas:
+            almacen_resultados.imprimir_listado(directorio)
+        else:
+            almacen_resultados.imprimir_comparacion(args.corridas, directorio, args.metrica, args.top)
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    return 0
+
+
+def _main_serve(argv: List[str]) -> int:
+    """
+    python main.py serve [--port P | --unix RUTA] [--workers N] [--max-cola N]
+    """
+    import servicio
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so serve",
+        description="Servicio local de simulación (HTTP) con pool de procesos calentado.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=servicio.PUERTO_DEFAULT, help="Puerto TCP (default: 8765)")
+    parser.add_argument("--unix", metavar="RUTA", help="Escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos simuladores (default: 1)")
+    parser.add_argument(
+        "--max-cola",
+        type=int,
+        default=16,
+        help="Pedidos en espera antes de responder 503 (default: 16)",
+    )
+    parser.add_argument(
+        "--cache-procesos",
+        type=int,
+        default=2_000_000,
+        help="Procesos (sumando todas las trazas) en el LRU de trazas parseadas",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        servicio.servir(
+            host=args.host,
+            puerto=args.port,
+            socket_unix=args.unix,
+            workers=args.workers,
+            max_cola=args.max_cola,
+            cache_procesos=args.cache_procesos,
+        )
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    return 0
+
+
+def _main_client(argv: List[str]) -> int:
+    """
+    python main.py client [--direccion HOST:PUERTO | RUTA.sock] --csv traza.csv
+    """
+    import json
+
+    import servicio
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so client",
+        description="Envía una traza al servicio local (serve) e imprime el resultado.",
+    )
+    parser.add_argument(
+        "--direccion",
+        default=f"127.0.0.1:{servicio.PUERTO_DEFAULT}",
+        help="HOST:PUERTO o ruta del socket Unix",
+    )
+    parser.add_argument("--csv", default="procesos.csv", help="Traza CSV a enviar")
+    parser.add_argument(
+        "--por-ruta",
+        action="store_true",
+        help="Enviar solo la ruta (el servicio lee el archivo; admite trazas binarias)",
+    )
+    parser.add_argument("--grado", type=int, default=5, help="Grado máximo de multiprogramación")
+    parser.add_argument(
+        "--particiones",
+        type=_lista_enteros,
+        default=list(TAMANIOS_USUARIO_DEFAULT),
+        metavar="T1,T2,...",
+        help="Tamaños (K) de las particiones de usuario",
+    )
+    parser.add_argument(
+        "--politica-espera", choices=tuple(POLITICAS_ESPERA), default="fifo"
+    )
+    parser.add_argument("--estado", action="store_true", help="Solo mostrar los contadores del servicio")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.estado:
+            print(json.dumps(servicio.estado_servicio(args.direccion), indent=2))
+            return 0
+        config = {
+            "grado": args.grado,
+            "particiones": args.particiones,
+            "politica_espera": args.politica_espera,
+        }
+        if args.por_ruta:
+            mensajes = servicio.solicitar(args.direccion, ruta=os.path.abspath(args.csv), config=config)
+        else:
+            with open(args.csv, encoding="utf-8", newline="") as f:
+                mensajes = servicio.solicitar(args.direccion, traza=f.read(), config=config)
+        resultado = servicio.resultado_desde_mensajes(mensajes)
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    except (OSError, RuntimeError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    resultado.imprimir()
+    return 0
+
+
+def _main_startup(argv: List[str]) -> int:
+    """
+    python main.py startup [--corridas N] [--presupuesto modulo=ms ...]
+    """
+    import presupuesto_arranque
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so startup",
+        description=(
+            "Mide con -X importtime el costo de importar main y presentacion "
+            "y falla si supera el presupuesto o carga módulos diferibles."
+        ),
+    )
+    parser.add_argument(
+        "modulos",
+        nargs="*",
+        default=list(presupuesto_arranque.PRESUPUESTOS_MS),
+        help="Módulos a medir (default: main presentacion)",
+    )
+    parser.add_argument("--corridas", type=int, default=5, help="Intérpretes nuevos por módulo (default: 5)")
+    parser.add_argument(
+        "--presupuesto",
+        action="append",
+        default=[],
+        metavar="MODULO=MS",
+        help="Reemplaza el presupuesto de un módulo; repetible",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        presupuestos = {}
+        for par in args.presupuesto:
+            modulo, _, ms = par.partition("=")
+            presupuestos[modulo] = float(ms)
+        mediciones = presupuesto_arranque.verificar(args.modulos, args.corridas, presupuestos)
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    presupuesto_arranque.imprimir(mediciones)
+    return 0 if all(m.ok for m in mediciones) else 1
+
+
+def _main_index(argv: List[str]) -> int:
+    """
+    Construye (o reconstruye) el índice <traza>.idx de una traza.
+    """
+    import indice_traza
+
+    parser = argparse.ArgumentParser(
+        prog="simulador-so index",
+        description=(
+            "Construye el índice de arribos e IDs de una traza para correr "
+            "ventanas con --from/--to; falla si hay IDs duplicados."
+        ),
+    )
+    parser.add_argument("--csv", default="procesos.csv", help="Traza (CSV o binaria)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.csv):
+        sys.stderr.write(f"Error: no se encontró el archivo CSV: {args.csv}\n")
+        return 1
+    try:
+        with indice_traza.construir_indice(args.csv) as indice:
+            rango = indice.rango_arribos()
+            sys.stderr.write(
+                f"{indice_traza.ruta_indice(args.csv)}: {len(indice)} procesos"
+                + (f", arribos {rango[0]}..{rango[1]}" if rango else "")
+                + "\n"
+            )
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    return 0
+
+
+def _crear_control_carga(args: argparse.Namespace) -> Any:
+    if args.max_espera is None:
+        return None
+    from control_carga import ControlCarga
+
+    return ControlCarga(args.max_espera, args.descarte, args.descarte_semilla)
+
+
+def _crear_gestor(args: argparse.Namespace) -> GestorMemoria:
+    return GestorMemoria(
+        grado_multiprogramacion_max=args.grado,
+        politica_espera=args.politica_espera,
+        tamanios_usuario=args.particiones,
+        control_carga=_crear_control_carga(args),
+    )
+
+
+def _crear_cache(args: argparse.Namespace) -> "CacheResultados":
+    from cache_resultados import DIRECTORIO_DEFAULT, CacheResultados
+
+    return CacheResultados(
+        directorio=args.cache_dir or DIRECTORIO_DEFAULT,
+        tamanio_maximo=args.cache_max_mb * 1024 * 1024,
+    )
+
+
+def _crear_instantaneas(args: argparse.Namespace) -> Any:
+    if not args.incremental:
+        return None
+    from cache_resultados import DIRECTORIO_DEFAULT
+    from instantaneas import InstantaneasPrefijo
+
+    return InstantaneasPrefijo(
+        directorio=args.cache_dir or DIRECTORIO_DEFAULT,
+        tamanio_maximo=args.cache_max_mb * 1024 * 1024,
+        cada=args.incremental_cada,
+    )
+
+
+def _iniciar_tablero(args: argparse.Namespace) -> Any:
+    """
+    Tablero en vivo ya escuchando (None sin --tablero). Quien lo pide debe
+    llamar a finalizar() al terminar la corrida.
+    """
+    if args.tablero is None:
+        return None
+    from tablero import Tablero, direccion_tablero
+
+    host, puerto = direccion_tablero(args.tablero)
+    tablero = Tablero(host=host, puerto=puerto)
+    tablero.iniciar()
+    return tablero
+
+
+def _guardar_corrida(args: argparse.Namespace, procesos: List[Proceso], resultado: Any) -> None:
+    from almacen_resultados import DIRECTORIO_DEFAULT, guardar_corrida
+    from io_metricas import huella_procesos
+
+    config = {
+        "csv": os.path.abspath(args.csv),
+        "planificador": args.planificador,
+        "politica_espera": args.politica_espera,
+        "grado": args.grado,
+        "particiones": list(args.particiones),
+        "max_espera": args.max_espera,
+        "descarte": args.descarte if args.max_espera is not None else None,
+        "desde": args.desde,
+        "hasta": args.hasta,
+    }
+    if args.planificador == "fair":
+        config["pesos"] = args.pesos
+        config["intra_grupo"] = args.intra_grupo
+    id_corrida = guardar_corrida(
+        resultado,
+        traza=huella_procesos(sorted(procesos, key=lambda p: p.arribo)),
+        config=config,
+        directorio=args.almacen or DIRECTORIO_DEFAULT,
+        etiqueta=args.etiqueta,
+    )
+    sys.stderr.write(f"Corrida guardada: {id_corrida}\n")
+
+
+def _main_en_linea(args: argparse.Namespace) -> int:
+    """
+    Simulación alimentada desde stdin (o desde un volcado del scheduler,
+    con --sched) con memoria acotada.
+    """
+    from io_metricas import iterar_procesos_csv
+    from simulacion_en_linea import ejecutar_simulacion_en_linea
+
+    if args.guardar or args.incremental:
+        opcion = "--guardar" if args.guardar else "--incremental"
+        sys.stderr.write(f"Error: {opcion} necesita la traza completa; no aplica en modo en línea\n")
+        return 1
+
+    if args.sched is not None:
+        from importador_sched import importar_traza_sched
+
+        if args.sched != "-" and not os.path.isfile(args.sched):
+            sys.stderr.write(f"Error: no se encontró el volcado: {args.sched}\n")
+            return 1
+        fuente = importar_traza_sched(
+            args.sched,
+            workers=args.workers,
+            resolucion_us=args.sched_resolucion,
+            memoria_default_kb=args.sched_memoria,
+        )
+    else:
+        from tiempo_real import expandir_periodicos
+
+        fuente = expandir_periodicos(iterar_procesos_csv(sys.stdin), args.horizonte)
+
+    tablero = None
+    try:
+        tablero = _iniciar_tablero(args)
+        ejecutar_simulacion_en_linea(
+            fuente=fuente,
+            gestor_memoria=_crear_gestor(args),
+            verbose=bool(args.verbose),
+            ventana=args.ventana,
+            scheduler=_crear_scheduler(args),
+            observadores=() if tablero is None else (tablero,),
+        )
+        return 0
+    except (KeyError, ValueError) as e:
+        sys.stderr.write(f"Error de datos: {e}\n")
+        return 1
+    except OSError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    except KeyboardInterrupt:
+        sys.stderr.write("Interrumpido.\n")
+        return 130
+    finally:
+        if tablero is not None:
+            tablero.finalizar()
+
+
+def _crear_scheduler(args: argparse.Namespace) -> Any:
+    if args.planificador == "fair":
+        return crear_scheduler("fair", pesos=args.pesos, intra=args.intra_grupo)
+    return crear_scheduler(args.planificador)
+
+
+def _main_periodico(
+    args: argparse.Namespace,
+    procesos: List[Proceso],
+    gestor_memoria: GestorMemoria,
+) -> int:
+    """
+    Traza con tareas periódicas: las instancias se generan a medida que el
+    simulador en línea las consume. Lanza ValueError (lo reporta main) si se
+    combinan con opciones que necesitan la lista completa de procesos.
+    """
+    from simulacion_en_linea import ejecutar_simulacion_en_linea
+    from tiempo_real import expandir_periodicos, horizonte_por_defecto
+
+    incompatibles = [
+        opcion
+        for opcion, valor in (
+            ("--from/--to", args.desde is not None or args.hasta is not None),
+            ("--checkpoint", args.checkpoint),
+            ("--resume", args.resume),
+            ("--gantt", args.gantt),
+            ("--profile", args.profile or args.profile_pstats),
+            ("--guardar", args.guardar),
+            ("--incremental", args.incremental),
+        )
+        if valor
+    ]
+    if incompatibles:
+        raise ValueError(
+            f"las tareas periódicas no se pueden combinar con {', '.join(incompatibles)}"
+        )
+
+    procesos = sorted(procesos, key=lambda p: p.arribo)
+    horizonte = args.horizonte
+    if horizonte is None:
+        horizonte = horizonte_por_defecto(procesos)
+    periodicas = sum(1 for p in procesos if p.periodo is not None)
+    sys.stderr.write(f"{periodicas} tareas periódicas: instancias con arribo < {horizonte}\n")
+
+    tablero = _iniciar_tablero(args)
+    try:
+        ejecutar_simulacion_en_linea(
+            fuente=expandir_periodicos(procesos, horizonte),
+            gestor_memoria=gestor_memoria,
+            verbose=bool(args.verbose),
+            ventana=args.ventana,
+            scheduler=_crear_scheduler(args),
+            observadores=() if tablero is None else (tablero,),
+        )
+    finally:
+        if tablero is not None:
+            tablero.finalizar()
+    return 0
+
+
+SUBCOMANDOS: Dict[str, Callable[[List[str]], int]] = {
+    "generate": _main_generate,
+    "cluster": _main_cluster,
+    "tune": _main_tune,
+    "replicate": _main_replicate,
+    "approx": _main_approx,
+    "overload": _main_overload,
+    "compare": _main_compare,
+    "serve": _main_serve,
+    "client": _main_client,
+    "index": _main_index,
+    "startup": _main_startup,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """
     Orquesta:
       1) Lee args.
@@ -50,36 +1246,110 @@ def main() -> int:
       3) Carga procesos.
       4) Construye GestorMemoria.
       5) Ejecuta la simulación.
+
+    Si el primer argumento es un subcomando (ver SUBCOMANDOS) delega en él.
     """
-    args = parse_args()
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMANDOS:
+        return SUBCOMANDOS[argv[0]](argv[1:])
+
+    args = parse_args(argv)
+
+    if args.stdin or args.sched is not None:
+        return _main_en_linea(args)
 
     if not os.path.isfile(args.csv):
         sys.stderr.write(f"Error: no se encontró el archivo CSV: {args.csv}\n")
         return 1
 
+    from io_metricas import cargar_procesos
+    from simulacion import ejecutar_simulacion
+
+    tablero = None
     try:
-        procesos: List[Proceso] = cargar_procesos_desde_csv(args.csv)
+        procesos: List[Proceso]
+        metricas_desde = 0
+        if args.desde is not None or args.hasta is not None:
+            from indice_traza import cargar_ventana
+
+            metricas_desde = args.desde or 0
+            procesos, previos = cargar_ventana(
+                args.csv, metricas_desde, args.hasta, args.calentamiento
+            )
+            sys.stderr.write(
+                f"Ventana [{metricas_desde}, {'fin' if args.hasta is None else args.hasta}): "
+                f"{len(procesos) - previos} procesos + {previos} de calentamiento\n"
+            )
+        else:
+            procesos = cargar_procesos(args.csv, workers=args.workers)
         if not procesos:
             sys.stderr.write(
                 f"Error de datos: el CSV '{args.csv}' no contiene procesos.\n"
             )
             return 1
 
-        gestor_memoria = GestorMemoria()
+        gestor_memoria = _crear_gestor(args)
 
-        ejecutar_simulacion(
+        if any(p.periodo is not None for p in procesos):
+            return _main_periodico(args, procesos, gestor_memoria)
+
+        checkpoint = None
+        if args.checkpoint:
+            cada_eventos = args.checkpoint_eventos
+            if cada_eventos is None and args.checkpoint_segundos is None:
+                cada_eventos = 100_000
+            from checkpoint import CheckpointPeriodico
+
+            checkpoint = CheckpointPeriodico(
+                ruta=args.checkpoint,
+                cada_eventos=cada_eventos,
+                cada_segundos=args.checkpoint_segundos,
+            )
+
+        if args.resume and not os.path.isfile(args.resume):
+            sys.stderr.write(f"Error: no se encontró el checkpoint: {args.resume}\n")
+            return 1
+
+        perfilador = None
+        if args.profile:
+            from perfilado import Perfilador
+
+            perfilador = Perfilador()
+
+        tablero = _iniciar_tablero(args)
+        resultado = ejecutar_simulacion(
             procesos=procesos,
             gestor_memoria=gestor_memoria,
             verbose=bool(args.verbose),
+            checkpoint=checkpoint,
+            reanudar_desde=args.resume,
+            perfilador=perfilador,
+            ruta_pstats=args.profile_pstats,
+            cache=None if args.no_cache else _crear_cache(args),
+            ruta_gantt=args.gantt,
+            ancho_gantt=args.gantt_ancho,
+            metricas_desde=metricas_desde,
+            scheduler=_crear_scheduler(args),
+            instantaneas=_crear_instantaneas(args),
+            observadores=() if tablero is None else (tablero,),
         )
+        if args.guardar and resultado is not None:
+            _guardar_corrida(args, procesos, resultado)
         return 0
 
     except (KeyError, ValueError) as e:
         sys.stderr.write(f"Error de datos: {e}\n")
         return 1
+    except OSError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
     except Exception as e:  # noqa: BLE001
         sys.stderr.write(f"Error inesperado: {e}\n")
         return 1
+    finally:
+        if tablero is not None:
+            tablero.finalizar()
 
 
 if __name__ == "__main__":
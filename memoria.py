@@ -4,10 +4,11 @@ Gestor de memoria con particiones fijas + Best-Fit + grado de multiprogramación
 
 from __future__ import annotations
 
+import bisect
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
-from prettytable import PrettyTable
+from politicas_espera import PoliticaEspera, crear_politica
 
 
 @dataclass
@@ -39,27 +40,57 @@ class Particion:
         return self.tamanio - self.memoria_ocupada
 
 
+TAMANIO_SO = 100
+TAMANIOS_USUARIO_DEFAULT: Tuple[int, ...] = (250, 150, 50)
+
+
 class GestorMemoria:
     """
     Encapsula TODA la lógica de gestión de memoria con particiones fijas.
 
     Configuración:
         - 100K SO.
-        - 250K, 150K, 50K usuario.
+        - 250K, 150K, 50K usuario (configurable con tamanios_usuario; las
+          particiones se llaman U1..Un y quedan contiguas tras el SO).
         - Grado de multiprogramación máximo = 5.
+        - Política de la cola de espera (ver politicas_espera.py),
+          por defecto "fifo".
+        - silencioso=True omite los mensajes de asignación y liberación
+          (p. ej. para los nodos de un cluster).
+        - control_carga (control_carga.ControlCarga) acota la cola de espera;
+          los rechazados se retiran con tomar_rechazados().
     """
 
-    def __init__(self, grado_multiprogramacion_max: int = 5) -> None:
+    def __init__(
+        self,
+        grado_multiprogramacion_max: int = 5,
+        politica_espera: Union[str, PoliticaEspera] = "fifo",
+        silencioso: bool = False,
+        tamanios_usuario: Sequence[int] = TAMANIOS_USUARIO_DEFAULT,
+        control_carga: Optional[Any] = None,
+    ) -> None:
+        if grado_multiprogramacion_max <= 0:
+            raise ValueError("El grado de multiprogramación debe ser > 0")
+        if not tamanios_usuario or any(t <= 0 for t in tamanios_usuario):
+            raise ValueError("Las particiones de usuario deben tener tamaño > 0")
+
         self._particiones: List[Particion] = [
-            Particion(id_particion="SO", base=0, tamanio=100, es_so=True),
-            Particion(id_particion="U1", base=100, tamanio=250),
-            Particion(id_particion="U2", base=350, tamanio=150),
-            Particion(id_particion="U3", base=500, tamanio=50),
+            Particion(id_particion="SO", base=0, tamanio=TAMANIO_SO, es_so=True)
         ]
+        base = TAMANIO_SO
+        for i, tamanio in enumerate(tamanios_usuario, start=1):
+            self._particiones.append(Particion(id_particion=f"U{i}", base=base, tamanio=tamanio))
+            base += tamanio
 
         self._grado_max = grado_multiprogramacion_max
+        self._silencioso = silencioso
         self._en_memoria_usuario = 0
-        self._cola_espera: List[Any] = []
+        if isinstance(politica_espera, str):
+            politica_espera = crear_politica(politica_espera)
+        self._cola_espera: PoliticaEspera = politica_espera
+        self._cola_espera.configurar([p.tamanio for p in self._particiones_usuario()])
+        self._control_carga = control_carga
+        self._rechazados: List[Any] = []
 
     @property
     def particiones(self) -> List[Particion]:
@@ -67,7 +98,26 @@ class GestorMemoria:
 
     @property
     def cola_espera(self) -> List[Any]:
-        return list(self._cola_espera)
+        """
+        Procesos en espera, en orden de llegada.
+        """
+        return self._cola_espera.procesos()
+
+    @property
+    def cantidad_en_espera(self) -> int:
+        return len(self._cola_espera)
+
+    @property
+    def politica_espera(self) -> str:
+        return self._cola_espera.nombre
+
+    @property
+    def control_carga(self) -> Optional[Any]:
+        return self._control_carga
+
+    @property
+    def silencioso(self) -> bool:
+        return self._silencioso
 
     @property
     def grado_multiprogramacion_actual(self) -> int:
@@ -90,75 +140,154 @@ class GestorMemoria:
             False, "NO_CABE_EN_NINGUNA"
             False, "GRADO_MAXIMO"
             False, "SIN_PARTICION_LIBRE_ADECUADA"
+            False, "ESPERA_EN_ORDEN"  (la política no permite adelantarse)
+            False, "RECHAZADO_SOBRECARGA"  (no entra a la cola de espera acotada)
         """
         tamanio_proceso = int(proceso.memoria)
 
         if not self._puede_caber_en_alguna_particion(tamanio_proceso):
             return False, "NO_CABE_EN_NINGUNA"
 
+        if not self._cola_espera.permite_ingreso_directo():
+            return self._esperar(proceso, tiempo, "ESPERA_EN_ORDEN")
+
         if self._en_memoria_usuario >= self._grado_max:
-            self._cola_espera.append(proceso)
-            return False, "GRADO_MAXIMO"
+            return self._esperar(proceso, tiempo, "GRADO_MAXIMO")
 
         particion = self._buscar_best_fit_libre(tamanio_proceso)
         if particion is None:
-            self._cola_espera.append(proceso)
-            return False, "SIN_PARTICION_LIBRE_ADECUADA"
+            return self._esperar(proceso, tiempo, "SIN_PARTICION_LIBRE_ADECUADA")
 
         self._asignar_particion(particion, proceso)
-        print(
+        self._informar(
             f"[t={tiempo}] Proceso {proceso.id} asignado a partición {particion.id_particion} "
             f"(tamaño={particion.tamanio}K, pedido={tamanio_proceso}K)"
         )
 
         return True, "ASIGNADO"
 
-    def liberar_y_reintentar(
+    def intentar_admitir_lote(
         self,
-        proceso_terminado: Any,
+        procesos: Sequence[Any],
         tiempo: int,
-    ) -> List[Any]:
+    ) -> List[Tuple[bool, str]]:
         """
-        Libera memoria del proceso terminado y reintenta cola de espera (FIFO).
+        Admite un grupo de arribos simultáneos en una sola pasada.
+
+        Equivale a llamar intentar_admitir_proceso para cada uno en orden
+        (mismos resultados, motivos y mensajes), pero calcula una sola vez
+        el tamaño máximo y la lista de particiones libres ordenada por
+        tamaño, y resuelve cada Best-Fit con bisect.
         """
-        self._liberar_particion_de(proceso_terminado, tiempo)
+        max_tamanio = max(p.tamanio for p in self._particiones_usuario())
 
-        admitidos: List[Any] = []
-        cola_original = list(self._cola_espera)
-        self._cola_espera.clear()
+        # Libres ordenadas por (tamaño, orden original): el primer elemento
+        # con tamaño >= pedido es exactamente el Best-Fit de la versión lineal.
+        libres = sorted(
+            (p for p in self._particiones_usuario() if p.esta_libre),
+            key=lambda p: p.tamanio,
+        )
+        tamanios_libres = [p.tamanio for p in libres]
 
-        for proceso in cola_original:
-            if self._en_memoria_usuario >= self._grado_max:
-                self._cola_espera.append(proceso)
+        resultados: List[Tuple[bool, str]] = []
+        for proceso in procesos:
+            tamanio_proceso = int(proceso.memoria)
+
+            if tamanio_proceso > max_tamanio:
+                resultados.append((False, "NO_CABE_EN_NINGUNA"))
                 continue
 
-            tamanio_proceso = int(proceso.memoria)
+            if not self._cola_espera.permite_ingreso_directo():
+                resultados.append(self._esperar(proceso, tiempo, "ESPERA_EN_ORDEN"))
+                continue
 
-            if not self._puede_caber_en_alguna_particion(tamanio_proceso):
-                print(
-                    f"[t={tiempo}] Proceso {proceso.id} descartado de espera: "
-                    f"no cabe en ninguna partición."
-                )
+            if self._en_memoria_usuario >= self._grado_max:
+                resultados.append(self._esperar(proceso, tiempo, "GRADO_MAXIMO"))
                 continue
 
-            particion = self._buscar_best_fit_libre(tamanio_proceso)
-            if particion is None:
-                self._cola_espera.append(proceso)
+            j = bisect.bisect_left(tamanios_libres, tamanio_proceso)
+            if j == len(libres):
+                resultados.append(self._esperar(proceso, tiempo, "SIN_PARTICION_LIBRE_ADECUADA"))
                 continue
 
+            particion = libres.pop(j)
+            tamanios_libres.pop(j)
+            self._asignar_particion(particion, proceso)
+            self._informar(
+                f"[t={tiempo}] Proceso {proceso.id} asignado a partición {particion.id_particion} "
+                f"(tamaño={particion.tamanio}K, pedido={tamanio_proceso}K)"
+            )
+            resultados.append((True, "ASIGNADO"))
+
+        return resultados
+
+    def liberar_y_reintentar(
+        self,
+        proceso_terminado: Any,
+        tiempo: int,
+    ) -> List[Any]:
+        """
+        Libera memoria del proceso terminado y reintenta la cola de espera
+        según la política configurada.
+
+        Cada vuelta le pide a la política el próximo proceso que entra en
+        la partición libre más grande; la cola no se recorre entera.
+        """
+        self._liberar_particion_de(proceso_terminado, tiempo)
+
+        admitidos: List[Any] = []
+        while len(self._cola_espera) and self._en_memoria_usuario < self._grado_max:
+            libres = [p.tamanio for p in self._particiones_usuario() if p.esta_libre]
+            if not libres:
+                break
+
+            proceso = self._cola_espera.extraer_admisible(
+                self._cola_espera.clase_maxima(max(libres)), self, tiempo
+            )
+            if proceso is None:
+                break
+
+            particion = self._buscar_best_fit_libre(int(proceso.memoria))
+            assert particion is not None
             self._asignar_particion(particion, proceso)
             admitidos.append(proceso)
-            print(
+            self._informar(
                 f"[t={tiempo}] Proceso {proceso.id} admitido desde cola de espera "
                 f"a partición {particion.id_particion} (tamaño={particion.tamanio}K)"
             )
 
         return admitidos
 
+    def tomar_rechazados(self) -> List[Any]:
+        """
+        Procesos rechazados por sobrecarga desde la última llamada: los que
+        no entraron a la cola de espera y los que se sacaron de ella.
+        """
+        rechazados, self._rechazados = self._rechazados, []
+        return rechazados
+
     # ------------------------------------------------------------------
     # Lógica interna
     # ------------------------------------------------------------------
 
+    def _informar(self, mensaje: str) -> None:
+        if not self._silencioso:
+            print(mensaje)
+
+    def _esperar(self, proceso: Any, tiempo: int, motivo: str) -> Tuple[bool, str]:
+        if self._control_carga is not None:
+            rechazado = self._control_carga.elegir_rechazado(proceso, self._cola_espera)
+            if rechazado is not None:
+                self._rechazados.append(rechazado)
+                self._informar(
+                    f"[t={tiempo}] Proceso {rechazado.id} rechazado por sobrecarga "
+                    f"(en espera: {len(self._cola_espera)}, límite {self._control_carga.limite})"
+                )
+                if rechazado is proceso:
+                    return False, "RECHAZADO_SOBRECARGA"
+        self._cola_espera.agregar(proceso)
+        return False, motivo
+
     def _particiones_usuario(self) -> List[Particion]:
         return [p for p in self._particiones if not p.es_so]
 
@@ -166,6 +295,15 @@ class GestorMemoria:
         max_tamanio = max(p.tamanio for p in self._particiones_usuario())
         return tamanio_proceso <= max_tamanio
 
+    def cabe_en_alguna_particion(self, tamanio_proceso: int) -> bool:
+        return self._puede_caber_en_alguna_particion(tamanio_proceso)
+
+    def best_fit_libre(self, tamanio_proceso: int) -> Optional[Particion]:
+        """
+        Partición libre donde iría un proceso de ese tamaño (o None).
+        """
+        return self._buscar_best_fit_libre(tamanio_proceso)
+
     def _buscar_best_fit_libre(self, tamanio_proceso: int) -> Optional[Particion]:
         mejor: Optional[Particion] = None
         mejor_sobrante: Optional[int] = None
@@ -196,7 +334,7 @@ class GestorMemoria:
     def _liberar_particion_de(self, proceso: Any, tiempo: int) -> None:
         for particion in self._particiones_usuario():
             if particion.proceso is proceso:
-                print(
+                self._informar(
                     f"[t={tiempo}] Proceso {proceso.id} libera partición {particion.id_particion} "
                     f"(tamaño={particion.tamanio}K)"
                 )
@@ -206,16 +344,85 @@ class GestorMemoria:
                     self._en_memoria_usuario = 0
                 return
 
-        print(
+        self._informar(
             f"[t={tiempo}] Aviso: se intentó liberar memoria de {getattr(proceso, 'id', '?')} "
             f"pero no se encontró partición asignada."
         )
 
+    # ------------------------------------------------------------------
+    # Estado serializable (checkpoints)
+    # ------------------------------------------------------------------
+
+    def exportar_estado(self, indice_de: Callable[[Any], int]) -> Dict[str, Any]:
+        """
+        Devuelve particiones, ocupación y cola de espera como tipos primitivos.
+        Los procesos se referencian por índice (indice_de).
+        """
+        return {
+            "grado_max": self._grado_max,
+            "politica_espera": self._cola_espera.nombre,
+            "en_memoria_usuario": self._en_memoria_usuario,
+            "particiones": [
+                (
+                    p.id_particion,
+                    p.base,
+                    p.tamanio,
+                    p.es_so,
+                    None if p.proceso is None else indice_de(p.proceso),
+                )
+                for p in self._particiones
+            ],
+            "cola_espera": [indice_de(p) for p in self._cola_espera.procesos()],
+            "control_carga": (
+                None if self._control_carga is None else self._control_carga.exportar_estado()
+            ),
+        }
+
+    def restaurar_estado(self, estado: Dict[str, Any], procesos: Sequence[Any]) -> None:
+        """
+        Inverso de exportar_estado. La configuración de particiones y el
+        grado máximo deben coincidir con los de este gestor.
+        """
+        config_guardada = [tuple(p[:4]) for p in estado["particiones"]]
+        config_actual = [
+            (p.id_particion, p.base, p.tamanio, p.es_so) for p in self._particiones
+        ]
+        if config_guardada != config_actual or estado["grado_max"] != self._grado_max:
+            raise ValueError(
+                "El estado guardado corresponde a otra configuración de memoria."
+            )
+        politica = estado.get("politica_espera", "fifo")
+        if politica != self._cola_espera.nombre:
+            raise ValueError(
+                f"El estado guardado usa la política de espera '{politica}', "
+                f"no '{self._cola_espera.nombre}'."
+            )
+        # Sin la clave: estado de srtf_analitico, que nunca llega a encolar.
+        control = estado.get("control_carga")
+        if "control_carga" in estado and (control is None) != (self._control_carga is None):
+            raise ValueError("El estado guardado usa otra configuración de control de carga.")
+
+        for particion, guardada in zip(self._particiones, estado["particiones"]):
+            indice = guardada[4]
+            particion.proceso = None if indice is None else procesos[indice]
+
+        self._en_memoria_usuario = estado["en_memoria_usuario"]
+        self._cola_espera = type(self._cola_espera)()
+        self._cola_espera.configurar([p.tamanio for p in self._particiones_usuario()])
+        for i in estado["cola_espera"]:
+            self._cola_espera.agregar(procesos[i])
+
+        if self._control_carga is not None and control is not None:
+            self._control_carga.restaurar_estado(control)
+
     # ------------------------------------------------------------------
     # Visualización
     # ------------------------------------------------------------------
 
     def imprimir_estado(self) -> None:
+        # Solo se usa en modo verbose: no pagar el import en cada arranque.
+        from prettytable import PrettyTable
+
         tabla = PrettyTable()
         tabla.field_names = [
             "Partición",
@@ -0,0 +1,352 @@
+"""
+Métricas en streaming con memoria acotada.
+
+Responsabilidades:
+    - HistogramaHDR: histograma log-lineal al estilo HdrHistogram para
+      enteros no negativos. Conteos exactos para valores chicos y error
+      relativo acotado (2^-bits) para los grandes; media, mínimo y máximo
+      exactos.
+    - AgregadoTiempos: retorno / espera / respuesta de procesos terminados,
+      plegados en histogramas sin guardar registros por proceso.
+    - HistogramaConSigno / AgregadoVencimientos: tasa de incumplimiento de
+      plazos y distribución de la tardanza (fin - vencimiento, negativa si
+      terminó antes del plazo).
+    - AgregadoPorGrupo: AgregadoTiempos por grupo (tenant) y el índice de
+      Jain sobre el estiramiento de cada grupo.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+
+class HistogramaHDR:
+    """
+    Histograma log-lineal de enteros >= 0.
+
+    Con 'bits' de precisión los valores < 2^bits se cuentan exactos y el
+    resto cae en cubetas de ancho 2^e con error relativo < 2^-(bits-1).
+    """
+
+    def __init__(self, bits: int = 7) -> None:
+        if not 1 <= bits <= 16:
+            raise ValueError("bits debe estar entre 1 y 16")
+        self._bits = bits
+        self._mitad = 1 << (bits - 1)
+        self._exactos = 1 << bits
+        self._conteos: List[int] = []
+        self.cantidad = 0
+        self.suma = 0
+        self.minimo: Optional[int] = None
+        self.maximo: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Cubetas
+    # ------------------------------------------------------------------
+
+    def _indice(self, valor: int) -> int:
+        if valor < self._exactos:
+            return valor
+        e = valor.bit_length() - self._bits
+        return self._exactos + (e - 1) * self._mitad + ((valor >> e) - self._mitad)
+
+    def _limites(self, indice: int) -> Tuple[int, int]:
+        """
+        Rango [desde, hasta] de valores que caen en la cubeta.
+        """
+        if indice < self._exactos:
+            return indice, indice
+        e = (indice - self._exactos) // self._mitad + 1
+        mantisa = (indice - self._exactos) % self._mitad + self._mitad
+        desde = mantisa << e
+        return desde, desde + (1 << e) - 1
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def registrar(self, valor: int, veces: int = 1) -> None:
+        valor = int(valor)
+        if valor < 0:
+            raise ValueError(f"HistogramaHDR solo admite valores >= 0 (recibió {valor})")
+        indice = self._indice(valor)
+        if indice >= len(self._conteos):
+            self._conteos.extend([0] * (indice + 1 - len(self._conteos)))
+        self._conteos[indice] += veces
+        self.cantidad += veces
+        self.suma += valor * veces
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+
+    def combinar(self, otro: "HistogramaHDR") -> None:
+        if otro._bits != self._bits:
+            raise ValueError("No se pueden combinar histogramas de distinta precisión")
+        if len(otro._conteos) > len(self._conteos):
+            self._conteos.extend([0] * (len(otro._conteos) - len(self._conteos)))
+        for i, c in enumerate(otro._conteos):
+            self._conteos[i] += c
+        self.cantidad += otro.cantidad
+        self.suma += otro.suma
+        if otro.minimo is not None and (self.minimo is None or otro.minimo < self.minimo):
+            self.minimo = otro.minimo
+        if otro.maximo is not None and (self.maximo is None or otro.maximo > self.maximo):
+            self.maximo = otro.maximo
+
+    def reiniciar(self) -> None:
+        self._conteos = []
+        self.cantidad = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = None
+
+    @property
+    def media(self) -> float:
+        return self.suma / self.cantidad if self.cantidad else 0.0
+
+    def percentil(self, p: float) -> int:
+        """
+        Valor en el percentil p (0-100). Devuelve el extremo superior de la
+        cubeta, acotado por el máximo observado.
+        """
+        if not self.cantidad:
+            return 0
+        return self.valor_en_orden(max(1, -(-self.cantidad * p // 100)))
+
+    def valor_en_orden(self, k: int) -> int:
+        """
+        k-ésimo valor más chico (1 <= k <= cantidad), con la misma
+        aproximación que percentil.
+        """
+        acumulado = 0
+        for indice, conteo in enumerate(self._conteos):
+            acumulado += conteo
+            if acumulado >= k:
+                return min(self._limites(indice)[1], self.maximo or 0)
+        return self.maximo or 0
+
+
+class AgregadoTiempos:
+    """
+    Histogramas de retorno, espera y respuesta de procesos terminados.
+    """
+
+    METRICAS = ("retorno", "espera", "respuesta")
+
+    def __init__(self, bits: int = 7) -> None:
+        self.histogramas: Dict[str, HistogramaHDR] = {
+            m: HistogramaHDR(bits) for m in self.METRICAS
+        }
+        self.ultimo_fin: int = 0
+
+    @property
+    def completados(self) -> int:
+        return self.histogramas["retorno"].cantidad
+
+    def registrar(
+        self,
+        arribo: int,
+        inicio_cpu: Optional[int],
+        fin: int,
+        rafaga: int,
+    ) -> None:
+        retorno = fin - arribo
+        self.histogramas["retorno"].registrar(retorno)
+        self.histogramas["espera"].registrar(retorno - rafaga)
+        if inicio_cpu is not None:
+            self.histogramas["respuesta"].registrar(inicio_cpu - arribo)
+        if fin > self.ultimo_fin:
+            self.ultimo_fin = fin
+
+    def combinar(self, otro: "AgregadoTiempos") -> None:
+        for m in self.METRICAS:
+            self.histogramas[m].combinar(otro.histogramas[m])
+        self.ultimo_fin = max(self.ultimo_fin, otro.ultimo_fin)
+
+    def reiniciar(self) -> None:
+        for h in self.histogramas.values():
+            h.reiniciar()
+
+    def lineas_resumen(self) -> List[str]:
+        lineas = []
+        for m in self.METRICAS:
+            h = self.histogramas[m]
+            lineas.append(
+                f"{m.capitalize():<10}: media={h.media:.2f} p50={h.percentil(50)} "
+                f"p95={h.percentil(95)} p99={h.percentil(99)} max={h.maximo}"
+            )
+        return lineas
+
+
+class HistogramaConSigno:
+    """
+    Histograma de enteros con signo: un HistogramaHDR para los valores >= 0
+    y otro para el módulo de los negativos.
+    """
+
+    def __init__(self, bits: int = 7) -> None:
+        self._positivos = HistogramaHDR(bits)
+        self._negativos = HistogramaHDR(bits)
+
+    @property
+    def cantidad(self) -> int:
+        return self._positivos.cantidad + self._negativos.cantidad
+
+    @property
+    def media(self) -> float:
+        n = self.cantidad
+        return (self._positivos.suma - self._negativos.suma) / n if n else 0.0
+
+    @property
+    def minimo(self) -> Optional[int]:
+        if self._negativos.maximo is not None:
+            return -self._negativos.maximo
+        return self._positivos.minimo
+
+    @property
+    def maximo(self) -> Optional[int]:
+        if self._positivos.maximo is not None:
+            return self._positivos.maximo
+        return None if self._negativos.minimo is None else -self._negativos.minimo
+
+    def registrar(self, valor: int) -> None:
+        valor = int(valor)
+        if valor < 0:
+            self._negativos.registrar(-valor)
+        else:
+            self._positivos.registrar(valor)
+
+    def combinar(self, otro: "HistogramaConSigno") -> None:
+        self._positivos.combinar(otro._positivos)
+        self._negativos.combinar(otro._negativos)
+
+    def reiniciar(self) -> None:
+        self._positivos.reiniciar()
+        self._negativos.reiniciar()
+
+    def percentil(self, p: float) -> int:
+        if not self.cantidad:
+            return 0
+        k = max(1, -(-self.cantidad * p // 100))
+        negativos = self._negativos.cantidad
+        if k <= negativos:
+            # Los negativos ordenados de menor a mayor son los módulos de
+            # mayor a menor.
+            return -self._negativos.valor_en_orden(negativos - k + 1)
+        return self._positivos.valor_en_orden(k - negativos)
+
+
+class AgregadoVencimientos:
+    """
+    Procesos con plazo terminados: cuántos lo incumplieron (fin posterior al
+    vencimiento) y distribución de la tardanza.
+    """
+
+    def __init__(self, bits: int = 7) -> None:
+        self.tardanza = HistogramaConSigno(bits)
+        self.incumplidos = 0
+
+    @property
+    def con_plazo(self) -> int:
+        return self.tardanza.cantidad
+
+    @property
+    def tasa_incumplimiento(self) -> float:
+        return self.incumplidos / self.con_plazo if self.con_plazo else 0.0
+
+    def registrar(self, fin: int, vencimiento: Optional[int]) -> None:
+        if vencimiento is None:
+            return
+        tardanza = fin - vencimiento
+        self.tardanza.registrar(tardanza)
+        if tardanza > 0:
+            self.incumplidos += 1
+
+    def combinar(self, otro: "AgregadoVencimientos") -> None:
+        self.tardanza.combinar(otro.tardanza)
+        self.incumplidos += otro.incumplidos
+
+    def reiniciar(self) -> None:
+        self.tardanza.reiniciar()
+        self.incumplidos = 0
+
+    def lineas_resumen(self) -> List[str]:
+        if not self.con_plazo:
+            return []
+        t = self.tardanza
+        return [
+            f"Plazos    : {self.con_plazo} con plazo, {self.incumplidos} incumplidos "
+            f"({self.tasa_incumplimiento:.2%})",
+            f"Tardanza  : media={t.media:.2f} min={t.minimo} p50={t.percentil(50)} "
+            f"p95={t.percentil(95)} p99={t.percentil(99)} max={t.maximo}",
+        ]
+
+
+def indice_jain(valores: List[float]) -> float:
+    """
+    Índice de equidad de Jain: (Σx)² / (n · Σx²). Vale 1 si todos los
+    valores son iguales y 1/n si uno solo acapara todo.
+    """
+    if not valores:
+        return 1.0
+    cuadrados = sum(x * x for x in valores)
+    if cuadrados == 0:
+        return 1.0
+    return sum(valores) ** 2 / (len(valores) * cuadrados)
+
+
+class AgregadoPorGrupo:
+    """
+    Tiempos de los procesos terminados separados por grupo.
+
+    El estiramiento de un grupo es Σ retorno / Σ ráfaga de sus procesos
+    (1 = nunca esperaron). El índice de Jain se calcula sobre 1 /
+    estiramiento: 1 si todos los grupos fueron igual de demorados.
+    """
+
+    def __init__(self, bits: int = 7) -> None:
+        self._bits = bits
+        self.grupos: Dict[str, AgregadoTiempos] = {}
+
+    def registrar(
+        self,
+        grupo: str,
+        arribo: int,
+        inicio_cpu: Optional[int],
+        fin: int,
+        rafaga: int,
+    ) -> None:
+        agregado = self.grupos.get(grupo)
+        if agregado is None:
+            agregado = self.grupos[grupo] = AgregadoTiempos(self._bits)
+        agregado.registrar(arribo, inicio_cpu, fin, rafaga)
+
+    def reiniciar(self) -> None:
+        self.grupos = {}
+
+    @staticmethod
+    def estiramiento(agregado: AgregadoTiempos) -> float:
+        retorno = agregado.histogramas["retorno"].suma
+        servicio = retorno - agregado.histogramas["espera"].suma
+        return retorno / servicio if servicio > 0 else 1.0
+
+    def jain(self) -> float:
+        return indice_jain([1 / self.estiramiento(a) for a in self.grupos.values()])
+
+    def lineas_resumen(self) -> List[str]:
+        if not self.grupos:
+            return []
+        lineas = [
+            f"{'Grupo':<16}{'Procesos':>9}{'Espera media':>14}{'Espera p95':>12}"
+            f"{'Retorno medio':>15}{'Estiramiento':>14}"
+        ]
+        for nombre in sorted(self.grupos):
+            a = self.grupos[nombre]
+            espera = a.histogramas["espera"]
+            lineas.append(
+                f"{nombre:<16}{a.completados:>9}{espera.media:>14.2f}{espera.percentil(95):>12}"
+                f"{a.histogramas['retorno'].media:>15.2f}{self.estiramiento(a):>14.2f}"
+            )
+        lineas.append(f"Índice de Jain (1/estiramiento por grupo): {self.jain():.4f}")
+        return lineas
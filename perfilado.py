@@ -0,0 +1,161 @@
+"""
+Instrumentación opcional para perfilar una simulación.
+
+Responsabilidades:
+    - Medir cantidad de llamadas y tiempo (perf_counter_ns) de las fases
+      principales: admisión y liberación de memoria, operaciones del
+      scheduler, procesamiento de eventos y métricas finales.
+    - Reportar totales, promedios y eventos/segundo.
+    - Opcionalmente correr bajo cProfile y guardar/mostrar estadísticas pstats.
+
+La instrumentación reemplaza métodos a nivel de instancia solo cuando se
+pide; sin Perfilador no hay wrappers ni chequeos en el ciclo de eventos.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# (atributo del simulador, método, etiqueta)
+FASES = (
+    ("_gestor_memoria", "intentar_admitir_proceso", "memoria.intentar_admitir_proceso"),
+    ("_gestor_memoria", "liberar_y_reintentar", "memoria.liberar_y_reintentar"),
+    ("_gestor_memoria", "intentar_admitir_lote", "memoria.intentar_admitir_lote"),
+    ("_scheduler", "agregar_proceso", "scheduler.agregar_proceso"),
+    ("_scheduler", "agregar_lote", "scheduler.agregar_lote"),
+    ("_scheduler", "sacar_proceso_actual", "scheduler.sacar_proceso_actual"),
+    ("_scheduler", "replanificar", "scheduler.replanificar"),
+    (None, "_procesar_arribos_en_instante", "simulador._procesar_arribos_en_instante"),
+    (None, "_procesar_fin_cpu", "simulador._procesar_fin_cpu"),
+    (None, "_calcular_metricas_finales", "simulador.metricas"),
+    (None, "_imprimir_resumen_final", "simulador.resumen"),
+)
+
+# Fases que cuentan como un evento del ciclo de simulación.
+_FASES_EVENTO = (
+    "simulador._procesar_arribos_en_instante",
+    "simulador._procesar_fin_cpu",
+    # Las decisiones por tiempo (fair-share) son eventos sin fase propia.
+    "scheduler.replanificar",
+)
+
+
+class Perfilador:
+    """
+    Contadores de llamadas y tiempo por fase.
+    """
+
+    def __init__(self) -> None:
+        self._llamadas: Dict[str, int] = {}
+        self._total_ns: Dict[str, int] = {}
+        self._duracion_corrida_ns: int = 0
+
+    # ------------------------------------------------------------------
+    # Instrumentación
+    # ------------------------------------------------------------------
+
+    def instrumentar(self, objeto: Any, metodo: str, etiqueta: str) -> None:
+        """
+        Reemplaza objeto.metodo por un wrapper que acumula llamadas y tiempo.
+        """
+        original: Callable[..., Any] = getattr(objeto, metodo)
+        llamadas = self._llamadas
+        total_ns = self._total_ns
+        llamadas.setdefault(etiqueta, 0)
+        total_ns.setdefault(etiqueta, 0)
+        reloj = time.perf_counter_ns
+
+        def medido(*args: Any, **kwargs: Any) -> Any:
+            inicio = reloj()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                total_ns[etiqueta] += reloj() - inicio
+                llamadas[etiqueta] += 1
+
+        setattr(objeto, metodo, medido)
+
+    def instrumentar_simulador(self, simulador: Any) -> None:
+        """
+        Instrumenta las fases de FASES que existan en el simulador y sus
+        componentes (un scheduler alternativo puede no tener alguna).
+        Desactiva el camino analítico para que las fases se ejecuten.
+        """
+        simulador.usar_camino_analitico = False
+        for atributo, metodo, etiqueta in FASES:
+            objeto = simulador if atributo is None else getattr(simulador, atributo)
+            if hasattr(objeto, metodo):
+                self.instrumentar(objeto, metodo, etiqueta)
+
+    def medir_corrida(self, funcion: Callable[[], Any]) -> Any:
+        """
+        Ejecuta funcion() registrando su duración total.
+        """
+        inicio = time.perf_counter_ns()
+        try:
+            return funcion()
+        finally:
+            self._duracion_corrida_ns += time.perf_counter_ns() - inicio
+
+    # ------------------------------------------------------------------
+    # Reporte
+    # ------------------------------------------------------------------
+
+    @property
+    def eventos(self) -> int:
+        return sum(self._llamadas.get(f, 0) for f in _FASES_EVENTO)
+
+    def filas(self) -> List[Dict[str, Any]]:
+        resultado = []
+        for etiqueta, llamadas in self._llamadas.items():
+            total = self._total_ns[etiqueta]
+            resultado.append(
+                {
+                    "fase": etiqueta,
+                    "llamadas": llamadas,
+                    "total_ms": total / 1e6,
+                    "media_us": (total / llamadas / 1e3) if llamadas else 0.0,
+                }
+            )
+        return resultado
+
+    def imprimir_reporte(self) -> None:
+        duracion_s = self._duracion_corrida_ns / 1e9
+        print("\n===== PERFIL DE LA SIMULACIÓN =====")
+        print(f"{'Fase':<42}{'Llamadas':>10}{'Total(ms)':>12}{'Media(us)':>12}{'%':>7}")
+        for f in self.filas():
+            porcentaje = (
+                100.0 * f["total_ms"] / (duracion_s * 1e3) if duracion_s > 0 else 0.0
+            )
+            print(
+                f"{f['fase']:<42}{f['llamadas']:>10}"
+                f"{f['total_ms']:>12.2f}{f['media_us']:>12.2f}{porcentaje:>7.1f}"
+            )
+        print("-----------------------------------")
+        print(f"Duración total     : {duracion_s:.3f} s")
+        print(f"Eventos procesados : {self.eventos}")
+        if duracion_s > 0:
+            print(f"Eventos/segundo    : {self.eventos / duracion_s:,.0f}")
+        print("===================================\n")
+
+
+def correr_con_cprofile(
+    funcion: Callable[[], Any],
+    ruta_pstats: Optional[str] = None,
+    top: int = 25,
+) -> Any:
+    """
+    Ejecuta funcion() bajo cProfile, guarda las estadísticas en ruta_pstats
+    (si se indica) e imprime las 'top' entradas por tiempo acumulado.
+    """
+    import cProfile
+    import pstats
+
+    perfil = cProfile.Profile()
+    try:
+        return perfil.runcall(funcion)
+    finally:
+        if ruta_pstats:
+            perfil.dump_stats(ruta_pstats)
+        pstats.Stats(perfil).sort_stats("cumulative").print_stats(top)
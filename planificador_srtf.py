@@ -11,26 +11,44 @@ from __future__ import annotations
 
 import heapq
 from dataclasses import dataclass, field
-from typing import Optional, Protocol, List, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
 
 ProcesoLike = Any
 
 
 class Scheduler(Protocol):
     def agregar_proceso(self, proceso: ProcesoLike, tiempo_actual: int) -> None: ...
+    # Opcional: agregar_lote(procesos, tiempo_actual) ingresa varios
+    # procesos del mismo instante de una vez (ver SrtfScheduler); el
+    # Simulador lo usa solo si el planificador lo tiene.
+    # Opcional: proximo_desalojo() da un instante de decisión que no es un
+    # arribo ni un fin de CPU; el Simulador lo procesa como un evento más
+    # llamando a replanificar(tiempo_actual) (ver fair_share.py).
     def avanzar_tiempo(self, delta: int) -> None: ...
     def proceso_en_cpu(self) -> Optional[ProcesoLike]: ...
     def sacar_proceso_actual(self) -> Optional[ProcesoLike]: ...
     def hay_listos(self) -> bool: ...
 
 
+def verificar_planificador(estado: Dict[str, Any], nombre: str) -> None:
+    """
+    ValueError si un estado exportado (checkpoint, instantánea) lo escribió
+    otro planificador.
+    """
+    guardado = estado.get("nombre")
+    if guardado != nombre:
+        raise ValueError(
+            f"El estado guardado es del planificador '{guardado}', no '{nombre}'."
+        )
+
+
 @dataclass(order=True)
 class _EntradaCola:
     """
     Entrada interna del heap de SRTF.
 
     Orden:
-        - tiempo_restante (ascendente)
+        - tiempo_restante (ascendente; en subclases, la clave de _clave)
         - orden_llegada
         - secuencia (para estabilidad)
     """
@@ -51,6 +69,8 @@ class SrtfScheduler(Scheduler):
         - _historial_cambios: log de eventos de planificación (opcional).
     """
 
+    nombre = "srtf"
+
     def __init__(self) -> None:
         self._cola_listos: List[_EntradaCola] = []
         self._proceso_actual: Optional[ProcesoLike] = None
@@ -67,7 +87,8 @@ class SrtfScheduler(Scheduler):
         Ingresa un proceso al sistema de planificación.
 
         Si no hay nadie en CPU, entra directo.
-        Si hay alguien, se decide si hay desalojo por SRTF.
+        Si hay alguien, se decide si hay desalojo por SRTF (o por la
+        clave de la subclase: ver _clave).
         """
         self._tiempo_actual = tiempo_actual
 
@@ -79,8 +100,8 @@ class SrtfScheduler(Scheduler):
             self._registrar_evento("ENTRA_CPU", getattr(proceso, "id", "??"))
             return
 
-        tiempo_actual_restante = int(self._proceso_actual.tiempo_restante)
-        nuevo_restante = int(proceso.tiempo_restante)
+        tiempo_actual_restante = self._clave(self._proceso_actual)
+        nuevo_restante = self._clave(proceso)
 
         if nuevo_restante < tiempo_actual_restante:
             # Desalojo
@@ -92,6 +113,61 @@ class SrtfScheduler(Scheduler):
             # Solo entra en cola de listos
             self._encolar(proceso, nuevo_restante, tiempo_actual)
 
+    def agregar_lote(
+        self,
+        procesos: Sequence[ProcesoLike],
+        tiempo_actual: int,
+    ) -> List[ProcesoLike]:
+        """
+        Ingresa varios procesos del mismo instante.
+
+        Produce el mismo estado que llamar agregar_proceso para cada uno en
+        orden (mismo ganador de CPU, mismas claves y secuencias en el heap,
+        mismo historial), pero las entradas nuevas se incorporan al heap de
+        una vez: heapify en O(n + k) cuando conviene, heappush si el lote es
+        chico frente a la cola existente.
+
+        Devuelve los procesos que pasaron por la CPU durante el lote, en
+        orden (incluye a los desalojados dentro del mismo instante).
+        """
+        self._tiempo_actual = tiempo_actual
+        entraron: List[ProcesoLike] = []
+        nuevas: List[_EntradaCola] = []
+
+        for proceso in procesos:
+            if not hasattr(proceso, "tiempo_restante"):
+                proceso.tiempo_restante = int(proceso.rafaga_cpu)
+
+            if self._proceso_actual is None:
+                self._proceso_actual = proceso
+                self._registrar_evento("ENTRA_CPU", getattr(proceso, "id", "??"))
+                entraron.append(proceso)
+                continue
+
+            tiempo_actual_restante = self._clave(self._proceso_actual)
+            nuevo_restante = self._clave(proceso)
+
+            if nuevo_restante < tiempo_actual_restante:
+                nuevas.append(
+                    self._nueva_entrada(self._proceso_actual, tiempo_actual_restante, tiempo_actual)
+                )
+                self._registrar_evento("DESALOJADO", getattr(self._proceso_actual, "id", "??"))
+                self._proceso_actual = proceso
+                self._registrar_evento("ENTRA_CPU", getattr(proceso, "id", "??"))
+                entraron.append(proceso)
+            else:
+                nuevas.append(self._nueva_entrada(proceso, nuevo_restante, tiempo_actual))
+
+        total = len(self._cola_listos) + len(nuevas)
+        if len(nuevas) * total.bit_length() >= total:
+            self._cola_listos.extend(nuevas)
+            heapq.heapify(self._cola_listos)
+        else:
+            for entrada in nuevas:
+                heapq.heappush(self._cola_listos, entrada)
+
+        return entraron
+
     def avanzar_tiempo(self, delta: int) -> None:
         """
         Avanza el tiempo global y descuenta CPU del proceso actual.
@@ -137,12 +213,32 @@ class SrtfScheduler(Scheduler):
     # Internos de cola
     # ------------------------------------------------------------------
 
+    def _clave(self, proceso: ProcesoLike) -> int:
+        """
+        Prioridad del proceso (menor = más urgente): decide los desalojos y
+        es la primera componente del orden del heap. En SRTF, el tiempo
+        restante; las subclases (tiempo_real.py) la redefinen.
+        """
+        return int(proceso.tiempo_restante)
+
     def _encolar(
         self,
         proceso: ProcesoLike,
         tiempo_restante: int,
         tiempo_actual: int,
     ) -> None:
+        entrada = self._nueva_entrada(proceso, tiempo_restante, tiempo_actual)
+        heapq.heappush(self._cola_listos, entrada)
+
+    def _nueva_entrada(
+        self,
+        proceso: ProcesoLike,
+        tiempo_restante: int,
+        tiempo_actual: int,
+    ) -> _EntradaCola:
+        """
+        Crea la entrada del heap (y registra EN_COLA) sin insertarla.
+        """
         self._secuencia += 1
         entrada = _EntradaCola(
             tiempo_restante=tiempo_restante,
@@ -150,8 +246,8 @@ class SrtfScheduler(Scheduler):
             secuencia=self._secuencia,
             proceso=proceso,
         )
-        heapq.heappush(self._cola_listos, entrada)
         self._registrar_evento("EN_COLA", getattr(proceso, "id", "??"))
+        return entrada
 
     def _siguiente_de_cola(self) -> Optional[ProcesoLike]:
         if not self._cola_listos:
@@ -179,6 +275,71 @@ class SrtfScheduler(Scheduler):
             resultado.append((pid, int(tr)))
         return resultado
 
+    # ------------------------------------------------------------------
+    # Estado serializable (checkpoints)
+    # ------------------------------------------------------------------
+
+    def exportar_estado(self, indice_de: Callable[[ProcesoLike], int]) -> Dict[str, Any]:
+        """
+        Devuelve el estado interno como tipos primitivos.
+
+        Los procesos se referencian por índice (indice_de) y el heap se
+        exporta en su orden físico para que la restauración sea exacta. El
+        historial de depuración no es parte del estado: crece con cada
+        evento y los checkpoints periódicos lo reescribirían entero.
+        """
+        actual = self._proceso_actual
+        return {
+            "nombre": self.nombre,
+            "actual": None if actual is None else indice_de(actual),
+            "actual_restante": None if actual is None else int(actual.tiempo_restante),
+            "cola": [
+                (
+                    e.tiempo_restante,
+                    e.orden_llegada,
+                    e.secuencia,
+                    indice_de(e.proceso),
+                    int(e.proceso.tiempo_restante),
+                )
+                for e in self._cola_listos
+            ],
+            "tiempo_actual": self._tiempo_actual,
+            "secuencia": self._secuencia,
+        }
+
+    def restaurar_estado(
+        self,
+        estado: Dict[str, Any],
+        procesos: Sequence[ProcesoLike],
+    ) -> None:
+        """
+        Inverso de exportar_estado: reconstruye CPU, heap y contadores. El
+        historial de depuración arranca vacío. El estado debe ser de este
+        mismo planificador (EDF y RM comparten el formato de SRTF).
+        """
+        verificar_planificador(estado, self.nombre)
+        self._proceso_actual = None
+        if estado["actual"] is not None:
+            self._proceso_actual = procesos[estado["actual"]]
+            self._proceso_actual.tiempo_restante = estado["actual_restante"]
+
+        self._cola_listos = []
+        for clave, orden, secuencia, indice, restante in estado["cola"]:
+            proceso = procesos[indice]
+            proceso.tiempo_restante = restante
+            self._cola_listos.append(
+                _EntradaCola(
+                    tiempo_restante=clave,
+                    orden_llegada=orden,
+                    secuencia=secuencia,
+                    proceso=proceso,
+                )
+            )
+
+        self._tiempo_actual = estado["tiempo_actual"]
+        self._secuencia = estado["secuencia"]
+        self._historial_cambios = []
+
     # ------------------------------------------------------------------
     # Historial de planificación (opcional, para debug)
     # ------------------------------------------------------------------
@@ -0,0 +1,280 @@
+"""
+Políticas de admisión desde la cola de espera de memoria.
+
+Responsabilidades:
+    - Guardar los procesos en espera indexados por clase de tamaño (la
+      partición más chica en la que caben), con un heap por clase.
+    - Decidir, cada vez que se libera memoria, qué proceso en espera entra
+      a continuación. Cada decisión mira solo las cabezas de las clases
+      que caben en la partición libre más grande: O(clases + log n) en
+      lugar de recorrer y reconstruir toda la cola.
+
+Políticas (POLITICAS_ESPERA):
+    fifo            Orden de llegada; los que caben pasan por delante de los
+                    que no (comportamiento histórico del simulador).
+    fifo-estricta   Orden de llegada sin adelantamientos: si la cabeza no
+                    entra, no entra nadie (tampoco un arribo nuevo).
+    menor-memoria   Primero el que pide menos memoria.
+    menor-rafaga    Primero el de ráfaga más corta.
+    easy            Backfilling EASY: la cabeza reserva la partición que se
+                    estima que se libera antes; los demás pueden adelantarse
+                    mientras no retrasen esa reserva.
+
+Cualquiera de ellas, aplicada repetidamente, equivale a recorrer la cola en
+su orden y admitir a cada proceso que entra en la mejor partición libre.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+# (clave de prioridad, secuencia de llegada, proceso)
+_Entrada = Tuple[int, int, Any]
+
+
+class PoliticaEspera:
+    """
+    Base: cola de espera FIFO con adelantamiento.
+
+    Las subclases cambian la clave de prioridad (clave) y/o la regla de
+    selección (extraer_admisible).
+    """
+
+    nombre = "fifo"
+
+    def __init__(self) -> None:
+        self._tamanios: List[int] = []
+        self._colas: List[List[_Entrada]] = []
+        self._secuencia = 0
+        self._cantidad = 0
+
+    def configurar(self, tamanios_usuario: Sequence[int]) -> None:
+        """
+        Define las clases de tamaño a partir de las particiones de usuario.
+        Debe llamarse con la cola vacía.
+        """
+        if self._cantidad:
+            raise RuntimeError("No se puede reconfigurar una cola de espera no vacía.")
+        self._tamanios = sorted(set(tamanios_usuario))
+        self._colas = [[] for _ in self._tamanios]
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    # ------------------------------------------------------------------
+    # Clases de tamaño
+    # ------------------------------------------------------------------
+
+    def clase_de(self, memoria: int) -> int:
+        """
+        Índice de la partición más chica (por tamaño) donde cabe 'memoria'.
+        """
+        return bisect.bisect_left(self._tamanios, memoria)
+
+    def clase_maxima(self, tamanio_libre: int) -> int:
+        """
+        Clase más alta que entra en una partición de 'tamanio_libre'
+        (-1 si no entra ninguna).
+        """
+        return bisect.bisect_right(self._tamanios, tamanio_libre) - 1
+
+    # ------------------------------------------------------------------
+    # Cola
+    # ------------------------------------------------------------------
+
+    def clave(self, proceso: Any) -> int:
+        return 0
+
+    def agregar(self, proceso: Any) -> None:
+        clase = self.clase_de(int(proceso.memoria))
+        if clase >= len(self._colas):
+            raise ValueError(f"Proceso {proceso.id} no cabe en ninguna partición.")
+        heapq.heappush(self._colas[clase], (self.clave(proceso), self._secuencia, proceso))
+        self._secuencia += 1
+        self._cantidad += 1
+
+    def procesos(self) -> List[Any]:
+        """
+        Procesos en espera en orden de llegada.
+        """
+        entradas = sorted(
+            (secuencia, proceso)
+            for cola in self._colas
+            for _, secuencia, proceso in cola
+        )
+        return [proceso for _, proceso in entradas]
+
+    # Descarte (control_carga.py): recorren la cola, que en ese uso está
+    # acotada, y no el camino de admisión.
+
+    def mayor(self) -> Optional[Any]:
+        """
+        Proceso en espera que más memoria pide (a igualdad, el más nuevo).
+        """
+        for cola in reversed(self._colas):
+            if cola:
+                return max(cola, key=lambda e: (int(e[2].memoria), e[1]))[2]
+        return None
+
+    def quitar_mas_antiguo(self) -> Optional[Any]:
+        entradas = [e for cola in self._colas for e in cola]
+        if not entradas:
+            return None
+        return self.quitar(min(entradas, key=lambda e: e[1])[2])
+
+    def quitar(self, proceso: Any) -> Any:
+        """
+        Saca 'proceso' de la cola (ValueError si no está).
+        """
+        cola = self._colas[self.clase_de(int(proceso.memoria))]
+        for i, entrada in enumerate(cola):
+            if entrada[2] is proceso:
+                cola[i] = cola[-1]
+                cola.pop()
+                heapq.heapify(cola)
+                self._cantidad -= 1
+                return proceso
+        raise ValueError(f"Proceso {proceso.id} no está en la cola de espera.")
+
+    def permite_ingreso_directo(self) -> bool:
+        """
+        Si un arribo puede ocupar una partición libre sin pasar por la cola.
+
+        Tras cada reintento ningún proceso en espera entra en las
+        particiones libres, así que un arribo que sí entra no le quita lugar
+        a nadie; solo la política estricta lo impide.
+        """
+        return True
+
+    def _mejor_cabeza(self, clase_max: int) -> Optional[int]:
+        mejor: Optional[int] = None
+        for clase in range(min(clase_max, len(self._colas) - 1) + 1):
+            cola = self._colas[clase]
+            if cola and (mejor is None or cola[0] < self._colas[mejor][0]):
+                mejor = clase
+        return mejor
+
+    def _sacar(self, clase: int) -> Any:
+        self._cantidad -= 1
+        return heapq.heappop(self._colas[clase])[2]
+
+    def extraer_admisible(self, clase_max: int, gestor: Any, tiempo: int) -> Optional[Any]:
+        """
+        Saca y devuelve el próximo proceso a admitir entre los de clase
+        <= clase_max, o None si no corresponde admitir a nadie.
+        """
+        clase = self._mejor_cabeza(clase_max)
+        return None if clase is None else self._sacar(clase)
+
+
+class PoliticaFifoEstricta(PoliticaEspera):
+    nombre = "fifo-estricta"
+
+    def permite_ingreso_directo(self) -> bool:
+        return self._cantidad == 0
+
+    def extraer_admisible(self, clase_max: int, gestor: Any, tiempo: int) -> Optional[Any]:
+        cabeza = self._mejor_cabeza(len(self._colas) - 1)
+        if cabeza is None or cabeza > clase_max:
+            return None
+        return self._sacar(cabeza)
+
+
+class PoliticaMenorMemoria(PoliticaEspera):
+    nombre = "menor-memoria"
+
+    def clave(self, proceso: Any) -> int:
+        return int(proceso.memoria)
+
+
+class PoliticaMenorRafaga(PoliticaEspera):
+    nombre = "menor-rafaga"
+
+    def clave(self, proceso: Any) -> int:
+        return int(proceso.rafaga_cpu)
+
+
+class PoliticaEasy(PoliticaEspera):
+    """
+    Backfilling EASY sobre particiones fijas.
+
+    Si la cabeza (el más antiguo) no entra, se le reserva la partición donde
+    cabe cuyo ocupante tiene menos tiempo restante; ese instante estimado es
+    el "shadow time". Un proceso posterior puede adelantarse si no usa esa
+    partición y, cuando ocuparía el último lugar del grado de
+    multiprogramación, si su ráfaga termina antes del shadow time.
+
+    Dentro de cada clase de tamaño solo se considera la cabeza.
+    """
+
+    nombre = "easy"
+
+    def extraer_admisible(self, clase_max: int, gestor: Any, tiempo: int) -> Optional[Any]:
+        cabeza = self._mejor_cabeza(len(self._colas) - 1)
+        if cabeza is None:
+            return None
+        if cabeza <= clase_max:
+            return self._sacar(cabeza)
+
+        proceso_cabeza = self._colas[cabeza][0][2]
+        reservada, shadow = self._reserva(proceso_cabeza, gestor, tiempo)
+        ultimo_lugar = (
+            gestor.grado_multiprogramacion_actual + 1 >= gestor.grado_multiprogramacion_max
+        )
+
+        candidatas = sorted(
+            (
+                clase
+                for clase in range(min(clase_max, len(self._colas) - 1) + 1)
+                if self._colas[clase]
+            ),
+            key=lambda c: self._colas[c][0],
+        )
+        for clase in candidatas:
+            proceso = self._colas[clase][0][2]
+            destino = gestor.best_fit_libre(int(proceso.memoria))
+            if destino is None or destino is reservada:
+                continue
+            if ultimo_lugar and tiempo + int(proceso.rafaga_cpu) > shadow:
+                continue
+            return self._sacar(clase)
+        return None
+
+    @staticmethod
+    def _reserva(proceso: Any, gestor: Any, tiempo: int) -> Tuple[Optional[Any], int]:
+        reservada = None
+        shadow: Optional[int] = None
+        for particion in gestor.particiones:
+            if particion.es_so or particion.tamanio < int(proceso.memoria):
+                continue
+            ocupante = particion.proceso
+            fin_estimado = tiempo if ocupante is None else tiempo + int(
+                getattr(ocupante, "tiempo_restante", ocupante.rafaga_cpu)
+            )
+            if shadow is None or fin_estimado < shadow:
+                reservada, shadow = particion, fin_estimado
+        return reservada, tiempo if shadow is None else shadow
+
+
+POLITICAS_ESPERA: Dict[str, Type[PoliticaEspera]] = {
+    p.nombre: p
+    for p in (
+        PoliticaEspera,
+        PoliticaFifoEstricta,
+        PoliticaMenorMemoria,
+        PoliticaMenorRafaga,
+        PoliticaEasy,
+    )
+}
+
+
+def crear_politica(nombre: str) -> PoliticaEspera:
+    try:
+        return POLITICAS_ESPERA[nombre]()
+    except KeyError:
+        opciones = ", ".join(POLITICAS_ESPERA)
+        raise ValueError(
+            f"Política de espera desconocida: '{nombre}' (opciones: {opciones})"
+        ) from None
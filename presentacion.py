@@ -17,12 +17,13 @@
 
 from __future__ import annotations
 
+import contextlib
+import io
 import os
 import textwrap
 
-from io_metricas import cargar_procesos_desde_csv
-from memoria import GestorMemoria
-from simulacion import ejecutar_simulacion
+# El simulador se importa recién al elegir una opción que lo ejecuta, para
+# que el menú aparezca sin esperar la carga de memoria/simulacion.
 
 # -----------------------------------------------------------
 # Utilidades de presentación
@@ -189,6 +190,10 @@ def seccion_demo_simulacion() -> None:
 
     _esperar_enter("Presioná ENTER para ejecutar la simulación...")
 
+    from io_metricas import cargar_procesos_desde_csv
+    from memoria import GestorMemoria
+    from simulacion import ejecutar_simulacion
+
     # Ejecutar la simulación con el CSV por defecto (procesos.csv)
     procesos = cargar_procesos_desde_csv("procesos.csv")
     gestor = GestorMemoria()
@@ -197,6 +202,66 @@ def seccion_demo_simulacion() -> None:
     _esperar_enter("Simulación finalizada. Presioná ENTER para volver al menú...")
 
 
+def seccion_navegar_simulacion(ruta_csv: str = "procesos.csv") -> None:
+    """
+    Corre la simulación una vez registrando keyframes + deltas y permite
+    saltar a cualquier instante o evento, y avanzar o retroceder, sin
+    volver a simular.
+    """
+    _clear_screen()
+    _print_titulo("Navegar la simulación")
+
+    from io_metricas import cargar_procesos_desde_csv
+    from memoria import GestorMemoria
+    from registro_estados import RegistroEstados
+    from simulacion import Simulador
+
+    registro = RegistroEstados()
+    simulador = Simulador(
+        procesos=cargar_procesos_desde_csv(ruta_csv),
+        gestor_memoria=GestorMemoria(),
+    )
+    simulador.agregar_observador(registro)
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulador.run()
+
+    if registro.cantidad_eventos == 0:
+        _esperar_enter("La simulación no generó eventos. Presioná ENTER para volver...")
+        return
+
+    _print_bloque(
+        """
+    Comandos:
+        ENTER / n    siguiente evento
+        p            evento anterior
+        t <T>        ir al instante T
+        e <N>        ir al evento N
+        q            volver al menú
+    """
+    )
+
+    indice = 0
+    while True:
+        registro.imprimir_foto(registro.estado_en_evento(indice))
+        comando = input("\n[n/p/t T/e N/q] > ").strip().split()
+
+        try:
+            if not comando or comando[0] == "n":
+                indice = min(indice + 1, registro.cantidad_eventos - 1)
+            elif comando[0] == "p":
+                indice = max(indice - 1, 0)
+            elif comando[0] == "t" and len(comando) == 2:
+                indice = registro.indice_en_tiempo(int(comando[1]))
+            elif comando[0] == "e" and len(comando) == 2:
+                indice = min(max(int(comando[1]) - 1, 0), registro.cantidad_eventos - 1)
+            elif comando[0] == "q":
+                break
+            else:
+                print("Comando inválido.")
+        except ValueError:
+            print("Se esperaba un número entero.")
+
+
 def seccion_resumen_final() -> None:
     _clear_screen()
     _print_titulo("Resumen de puntos fuertes del diseño")
@@ -250,6 +315,7 @@ def menu_principal() -> None:
         print("  2) Ver código de los módulos clave")
         print("  3) Ejecutar demo de simulación (con snapshots)")
         print("  4) Ver resumen para la defensa")
+        print("  5) Navegar la simulación (ir a t / evento, avanzar, retroceder)")
         print("  0) Salir")
 
         opcion = input("\nOpción: ").strip()
@@ -262,6 +328,8 @@ def menu_principal() -> None:
             seccion_demo_simulacion()
         elif opcion == "4":
             seccion_resumen_final()
+        elif opcion == "5":
+            seccion_navegar_simulacion()
         elif opcion == "0":
             break
         else:
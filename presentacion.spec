@@ -1,5 +1,27 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Perfil liviano: el ejecutable --onefile se descomprime entero en cada
+# arranque, así que todo lo que la presentación nunca carga (servicio,
+# paralelismo, red, caché/checkpoints/perfilado, codecs y extensiones
+# grandes) queda afuera. Sin UPX: descomprimir las bibliotecas en cada
+# arranque cuesta más de lo que ahorra en disco.
+EXCLUIDOS = [
+    # Módulos del simulador que la presentación no usa.
+    'cache_resultados', 'checkpoint', 'cluster', 'gantt', 'generador',
+    'importador_sched', 'indice_traza', 'main', 'metricas_streaming',
+    'perfilado', 'presupuesto_arranque', 'replicas', 'servicio',
+    'simulacion_en_linea', 'tuner',
+    # Biblioteca estándar que ninguno de los módulos usados importa.
+    'asyncio', 'concurrent', 'multiprocessing', 'ctypes', 'socket', 'ssl',
+    'http', 'email', 'xml', 'xmlrpc', 'pyexpat', 'sqlite3',
+    'decimal', '_decimal', 'lzma', 'bz2', 'tarfile', 'readline',
+    'tkinter', 'unittest', 'doctest', 'pydoc', 'pdb', 'cProfile', 'pstats',
+    'profile', 'tracemalloc', '_hashlib',
+    # Herramientas de desarrollo presentes en el entorno de build.
+    'pytest', '_pytest', 'setuptools', 'pkg_resources', 'distutils',
+    '_distutils_hack', 'certifi',
+]
+
 
 a = Analysis(
     ['presentacion.py'],
@@ -10,7 +32,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUIDOS,
     noarchive=False,
     optimize=0,
 )
@@ -26,7 +48,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=True,
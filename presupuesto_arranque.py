@@ -0,0 +1,148 @@
+"""
+Presupuesto de tiempo de arranque.
+
+Responsabilidades:
+    - Medir el costo de importar los módulos de entrada (main,
+      presentacion) con 'python -X importtime' en intérpretes nuevos, para
+      que la medición no dependa de lo que ya cargó el proceso actual.
+    - Compararlo (mediana de varias corridas) contra un presupuesto en ms.
+    - Verificar que ninguno arrastre módulos que solo hacen falta en
+      caminos puntuales (prettytable, pickle, el simulador en el menú...):
+      esos se importan al primer uso.
+
+Las cifras de -X importtime incluyen el tiempo de todos los módulos que el
+import carga por primera vez (columna "cumulative" de la fila del módulo).
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Presupuesto (ms) para importar cada módulo de entrada en frío. Con margen
+# sobre lo medido para no fallar por ruido de la máquina.
+PRESUPUESTOS_MS: Dict[str, float] = {
+    "main": 80.0,
+    "presentacion": 40.0,
+}
+
+# Módulos que importar el de entrada no debe cargar.
+PROHIBIDOS: Dict[str, Tuple[str, ...]] = {
+    "main": (
+        "prettytable",
+        "pickle",
+        "simulacion",
+        "cache_resultados",
+        "checkpoint",
+        "perfilado",
+        "cProfile",
+    ),
+    "presentacion": (
+        "prettytable",
+        "memoria",
+        "simulacion",
+        "io_metricas",
+        "registro_estados",
+    ),
+}
+
+
+@dataclass
+class MedicionArranque:
+    modulo: str
+    presupuesto_ms: float
+    corridas_ms: List[float] = field(default_factory=list)
+    # (módulo, ms acumulados) de las dependencias más caras
+    mas_caros: List[Tuple[str, float]] = field(default_factory=list)
+    prohibidos: List[str] = field(default_factory=list)
+
+    @property
+    def mediana_ms(self) -> float:
+        return statistics.median(self.corridas_ms)
+
+    @property
+    def ok(self) -> bool:
+        return self.mediana_ms <= self.presupuesto_ms and not self.prohibidos
+
+
+def _parsear_importtime(salida: str) -> List[Tuple[str, int, float]]:
+    """
+    Filas (módulo, profundidad, ms acumulados) de la salida de -X importtime.
+    """
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        if not acumulado.strip().isdigit():
+            continue  # cabecera
+        profundidad = (len(nombre) - len(nombre.lstrip(" ")) - 1) // 2
+        filas.append((nombre.strip(), profundidad, int(acumulado) / 1000.0))
+    return filas
+
+
+def medir_import(modulo: str, python: Optional[str] = None) -> List[Tuple[str, int, float]]:
+    """
+    Importa 'modulo' en un intérprete nuevo y devuelve las filas de
+    -X importtime posteriores al arranque del intérprete.
+    """
+    proceso = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True,
+        text=True,
+    )
+    if proceso.returncode != 0:
+        raise ValueError(f"No se pudo importar '{modulo}':\n{proceso.stderr.strip()}")
+
+    filas = _parsear_importtime(proceso.stderr)
+    # Lo anterior a la última fila de 'site' es el arranque del intérprete.
+    ultimo_site = max((i for i, (n, p, _) in enumerate(filas) if n == "site" and p == 0), default=-1)
+    return filas[ultimo_site + 1:]
+
+
+def verificar(
+    modulos: Sequence[str] = tuple(PRESUPUESTOS_MS),
+    corridas: int = 5,
+    presupuestos: Optional[Dict[str, float]] = None,
+) -> List[MedicionArranque]:
+    if corridas <= 0:
+        raise ValueError("corridas debe ser > 0")
+    presupuestos = {**PRESUPUESTOS_MS, **(presupuestos or {})}
+
+    mediciones = []
+    for modulo in modulos:
+        if modulo not in presupuestos:
+            raise KeyError(f"Sin presupuesto para '{modulo}'")
+        medicion = MedicionArranque(modulo=modulo, presupuesto_ms=presupuestos[modulo])
+        for _ in range(corridas):
+            filas = medir_import(modulo)
+            propia = [ms for nombre, p, ms in filas if nombre == modulo and p == 0]
+            medicion.corridas_ms.append(propia[-1] if propia else 0.0)
+
+        # Desglose y módulos cargados: de la última corrida.
+        cargados = {nombre for nombre, _, _ in filas}
+        medicion.prohibidos = [m for m in PROHIBIDOS.get(modulo, ()) if m in cargados]
+        medicion.mas_caros = sorted(
+            ((nombre, ms) for nombre, p, ms in filas if p == 1),
+            key=lambda x: -x[1],
+        )[:5]
+        mediciones.append(medicion)
+    return mediciones
+
+
+def imprimir(mediciones: Sequence[MedicionArranque]) -> None:
+    print("\n===== PRESUPUESTO DE ARRANQUE =====")
+    for m in mediciones:
+        estado = "OK" if m.ok else "EXCEDIDO"
+        print(
+            f"{m.modulo:<14} mediana {m.mediana_ms:7.1f} ms  "
+            f"(presupuesto {m.presupuesto_ms:.0f} ms, {len(m.corridas_ms)} corridas)  {estado}"
+        )
+        for nombre, ms in m.mas_caros:
+            print(f"    {nombre:<24}{ms:8.1f} ms")
+        if m.prohibidos:
+            print(f"    importa módulos diferibles: {', '.join(m.prohibidos)}")
+    print("===================================\n")
@@ -7,12 +7,16 @@ Responsabilidades:
         * instante de arribo al sistema
         * duración total de CPU (ráfaga)
         * memoria requerida
+    - Datos opcionales de tiempo real: plazo relativo (deadline) y
+      período de las tareas periódicas.
+    - Grupo (tenant) opcional para la planificación por fair-share.
     - Mantener el tiempo restante de CPU durante la simulación.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Optional
 
 
 @dataclass
@@ -32,6 +36,16 @@ class Proceso:
         memoria:
             Memoria requerida en KB
             (columna 'Memoria' del CSV).
+        deadline:
+            Plazo relativo al arribo (columna opcional 'Deadline'); None si
+            el proceso no tiene plazo.
+        periodo:
+            Período de una tarea periódica (columna opcional 'Periodo'): la
+            fila describe una tarea que libera una instancia cada 'periodo'
+            desde 'arribo' (ver tiempo_real.expandir_periodicos).
+        grupo:
+            Grupo o tenant (columna opcional 'Grupo'); los niveles de una
+            jerarquía se separan con '/' (p. ej. 'org/equipo').
         tiempo_restante:
             Tiempo de CPU que le falta al proceso.
             Se inicializa en rafaga_cpu y se va descontando.
@@ -41,6 +55,9 @@ class Proceso:
     arribo: int
     rafaga_cpu: int
     memoria: int
+    deadline: Optional[int] = None
+    periodo: Optional[int] = None
+    grupo: Optional[str] = None
     tiempo_restante: int = field(init=False)
 
     def __post_init__(self) -> None:
@@ -49,6 +66,13 @@ class Proceso:
         """
         self.tiempo_restante = int(self.rafaga_cpu)
 
+    @property
+    def vencimiento(self) -> Optional[int]:
+        """
+        Instante absoluto en el que vence el plazo (None si no tiene).
+        """
+        return None if self.deadline is None else self.arribo + self.deadline
+
     @classmethod
     def desde_csv(
         cls,
@@ -0,0 +1,244 @@
+"""
+Registro navegable del estado de la simulación (keyframes + deltas).
+
+Responsabilidades:
+    - Observar el Simulador y, después de cada evento, guardar solo lo que
+      cambió respecto del evento anterior (CPU, cola de listos, particiones
+      y cola de espera).
+    - Guardar cada 'cada_eventos' eventos una foto completa (keyframe).
+    - Reconstruir el estado en cualquier índice de evento o instante
+      aplicando como mucho 'cada_eventos' deltas sobre el keyframe previo,
+      sin volver a simular desde t=0.
+
+Lo usa el visor interactivo de presentacion.py.
+"""
+
+from __future__ import annotations
+
+import bisect
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Ocupante de una partición: (id del proceso, memoria pedida)
+Ocupante = Optional[Tuple[str, int]]
+
+
+@dataclass
+class FotoEstado:
+    """
+    Estado visible del sistema después de un evento.
+    """
+
+    indice: int
+    tiempo: int
+    evento: str
+    cpu: Optional[Tuple[str, int]]
+    listos: Dict[str, int] = field(default_factory=dict)
+    particiones: List[Ocupante] = field(default_factory=list)
+    espera: List[str] = field(default_factory=list)
+
+    def copiar(self) -> "FotoEstado":
+        return FotoEstado(
+            indice=self.indice,
+            tiempo=self.tiempo,
+            evento=self.evento,
+            cpu=self.cpu,
+            listos=dict(self.listos),
+            particiones=list(self.particiones),
+            espera=list(self.espera),
+        )
+
+
+@dataclass(slots=True)
+class DeltaEstado:
+    """
+    Cambios de un evento respecto del anterior.
+    """
+
+    tiempo: int
+    evento: str
+    cpu: Optional[Tuple[str, int]]
+    listos_cambiados: Tuple[Tuple[str, int], ...]
+    listos_quitados: Tuple[str, ...]
+    particiones: Tuple[Tuple[int, Ocupante], ...]
+    espera_quitados: Tuple[str, ...]
+    espera_agregados: Tuple[str, ...]
+
+
+class RegistroEstados:
+    """
+    Observador del Simulador (ver Simulador.agregar_observador).
+
+    La memoria crece con los cambios (no con el tamaño del estado) más un
+    keyframe cada 'cada_eventos'; un seek cuesta O(cada_eventos) deltas.
+    """
+
+    def __init__(self, cada_eventos: int = 256) -> None:
+        if cada_eventos <= 0:
+            raise ValueError("cada_eventos debe ser > 0")
+        self._cada = cada_eventos
+        self._keyframes: List[FotoEstado] = []
+        self._deltas: List[DeltaEstado] = []
+        self._tiempos = array("q")
+        self._anterior: Optional[FotoEstado] = None
+        self.particiones: List[Tuple[str, int, int]] = []
+
+    # ------------------------------------------------------------------
+    # Captura
+    # ------------------------------------------------------------------
+
+    def _capturar(self, simulador: Any, evento: str, tiempo: int) -> FotoEstado:
+        scheduler = simulador.scheduler
+        gestor = simulador.gestor_memoria
+
+        actual = scheduler.proceso_en_cpu()
+        cpu = None if actual is None else (actual.id, int(actual.tiempo_restante))
+
+        listos: Dict[str, int] = {}
+        if hasattr(scheduler, "listar_listos"):
+            listos = dict(scheduler.listar_listos())
+
+        particiones: List[Ocupante] = [
+            None if p.proceso is None else (p.proceso.id, int(p.proceso.memoria))
+            for p in gestor.particiones
+        ]
+        if not self.particiones:
+            self.particiones = [(p.id_particion, p.base, p.tamanio) for p in gestor.particiones]
+
+        return FotoEstado(
+            indice=len(self._tiempos),
+            tiempo=tiempo,
+            evento=evento,
+            cpu=cpu,
+            listos=listos,
+            particiones=particiones,
+            espera=[p.id for p in gestor.cola_espera],
+        )
+
+    @staticmethod
+    def _diferencia(anterior: FotoEstado, actual: FotoEstado) -> DeltaEstado:
+        listos_cambiados = tuple(
+            (pid, rest)
+            for pid, rest in actual.listos.items()
+            if anterior.listos.get(pid) != rest
+        )
+        listos_quitados = tuple(pid for pid in anterior.listos if pid not in actual.listos)
+
+        particiones = tuple(
+            (i, ocupante)
+            for i, (ocupante, previo) in enumerate(zip(actual.particiones, anterior.particiones))
+            if ocupante != previo
+        )
+
+        en_espera = set(actual.espera)
+        espera_quitados = tuple(pid for pid in anterior.espera if pid not in en_espera)
+        conservados = len(anterior.espera) - len(espera_quitados)
+        espera_agregados = tuple(actual.espera[conservados:])
+
+        return DeltaEstado(
+            tiempo=actual.tiempo,
+            evento=actual.evento,
+            cpu=actual.cpu,
+            listos_cambiados=listos_cambiados,
+            listos_quitados=listos_quitados,
+            particiones=particiones,
+            espera_quitados=espera_quitados,
+            espera_agregados=espera_agregados,
+        )
+
+    def despues_de_evento(self, simulador: Any, evento: str, tiempo: int) -> None:
+        actual = self._capturar(simulador, evento, tiempo)
+        indice = actual.indice
+
+        if indice % self._cada == 0:
+            self._keyframes.append(actual.copiar())
+        # El primer evento siempre es keyframe; su delta queda vacío para
+        # que _deltas[i] corresponda al evento i.
+        anterior = self._anterior if self._anterior is not None else actual
+        self._deltas.append(self._diferencia(anterior, actual))
+
+        self._tiempos.append(tiempo)
+        self._anterior = actual
+
+    # ------------------------------------------------------------------
+    # Navegación
+    # ------------------------------------------------------------------
+
+    @property
+    def cantidad_eventos(self) -> int:
+        return len(self._tiempos)
+
+    def tiempo_de_evento(self, indice: int) -> int:
+        return self._tiempos[indice]
+
+    def indice_en_tiempo(self, tiempo: int) -> int:
+        """
+        Índice del último evento ocurrido en o antes de 'tiempo'
+        (0 si 'tiempo' es anterior al primer evento).
+        """
+        if not self._tiempos:
+            raise ValueError("El registro está vacío.")
+        return max(0, bisect.bisect_right(self._tiempos, tiempo) - 1)
+
+    def estado_en_evento(self, indice: int) -> FotoEstado:
+        """
+        Reconstruye el estado después del evento 'indice' (0-based).
+        """
+        if not 0 <= indice < len(self._tiempos):
+            raise IndexError(f"Evento fuera de rango: {indice}")
+
+        foto = self._keyframes[indice // self._cada].copiar()
+        for i in range(foto.indice + 1, indice + 1):
+            self._aplicar(foto, self._deltas[i])
+        foto.indice = indice
+        return foto
+
+    def estado_en_tiempo(self, tiempo: int) -> FotoEstado:
+        return self.estado_en_evento(self.indice_en_tiempo(tiempo))
+
+    @staticmethod
+    def _aplicar(foto: FotoEstado, delta: DeltaEstado) -> None:
+        foto.tiempo = delta.tiempo
+        foto.evento = delta.evento
+        foto.cpu = delta.cpu
+        for pid in delta.listos_quitados:
+            del foto.listos[pid]
+        foto.listos.update(delta.listos_cambiados)
+        for i, ocupante in delta.particiones:
+            foto.particiones[i] = ocupante
+        if delta.espera_quitados:
+            quitados = set(delta.espera_quitados)
+            foto.espera = [pid for pid in foto.espera if pid not in quitados]
+        foto.espera.extend(delta.espera_agregados)
+
+    # ------------------------------------------------------------------
+    # Visualización
+    # ------------------------------------------------------------------
+
+    def imprimir_foto(self, foto: FotoEstado) -> None:
+        print(
+            f"\n===== EVENTO {foto.indice + 1}/{self.cantidad_eventos} "
+            f"t={foto.tiempo} evento={foto.evento} ====="
+        )
+        if foto.cpu is None:
+            print("CPU: libre")
+        else:
+            print(f"CPU: {foto.cpu[0]} (restante={foto.cpu[1]})")
+
+        if foto.listos:
+            orden = sorted(foto.listos.items(), key=lambda item: item[1])
+            print("Cola de listos (SRTF): " + ", ".join(f"{p}(rest={r})" for p, r in orden))
+        else:
+            print("Cola de listos (SRTF): <vacía>")
+
+        print("=== Estado de la memoria ===")
+        print(f"{'Partición':<10}{'Base':>6}{'Tamaño(K)':>11}  {'Proceso':<10}{'Frag.(K)':>9}")
+        for (id_particion, base, tamanio), ocupante in zip(self.particiones, foto.particiones):
+            proceso, frag = ("-", 0) if ocupante is None else (ocupante[0], tamanio - ocupante[1])
+            print(f"{id_particion:<10}{base:>6}{tamanio:>11}  {proceso:<10}{frag:>9}")
+        if foto.espera:
+            print(f"Cola de espera ({len(foto.espera)}): {', '.join(foto.espera)}")
+        else:
+            print("Cola de espera: <vacía>")
+        print("======================================")
@@ -0,0 +1,303 @@
+"""
+Réplicas Monte Carlo de una carga sintética con intervalos de confianza.
+
+Responsabilidades:
+    - Generar R trazas independientes desde las mismas especificaciones de
+      generador.py (cada réplica con su propia semilla derivada de la
+      semilla base) y simularlas en procesos paralelos, sin escribirlas a
+      disco.
+    - Resumir cada réplica en media, p95 y p99 de espera, retorno y
+      respuesta, más el throughput.
+    - Agregar las réplicas con intervalos t de Student y cortar en cuanto
+      las métricas objetivo alcanzan la precisión pedida (semiancho
+      relativo a la media).
+
+Reproducibilidad:
+    Las réplicas se evalúan en lotes de 'workers', pero el criterio de corte
+    se revisa réplica por réplica en orden: el resultado (y la cantidad de
+    réplicas) es el mismo con 1 o con N workers. Como mucho se descartan
+    workers - 1 réplicas ya calculadas del último lote.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import generador
+from memoria import TAMANIOS_USUARIO_DEFAULT, GestorMemoria
+from procesos import Proceso
+from simulacion import ResultadoSimulacion, Simulador
+
+METRICAS = (
+    "espera_media",
+    "espera_p95",
+    "espera_p99",
+    "retorno_media",
+    "retorno_p95",
+    "retorno_p99",
+    "respuesta_media",
+    "respuesta_p95",
+    "respuesta_p99",
+    "throughput",
+)
+
+
+@dataclass(frozen=True)
+class ConfigReplica:
+    cantidad: int
+    arribos: str = generador.ARRIBOS_DEFAULT
+    rafagas: str = generador.RAFAGAS_DEFAULT
+    memoria: str = generador.MEMORIA_DEFAULT
+    grado: int = 5
+    particiones: Tuple[int, ...] = TAMANIOS_USUARIO_DEFAULT
+    politica_espera: str = "fifo"
+
+
+@dataclass
+class Replica:
+    semilla: int
+    descartados: int
+    valores: Dict[str, float]
+
+
+@dataclass
+class Intervalo:
+    metrica: str
+    media: float
+    semiancho: float
+
+    @property
+    def relativo(self) -> float:
+        """
+        Semiancho sobre |media| (0 si ambos son 0, infinito si solo la
+        media lo es).
+        """
+        if self.media == 0:
+            return 0.0 if self.semiancho == 0 else math.inf
+        return self.semiancho / abs(self.media)
+
+
+@dataclass
+class ResultadoReplicas:
+    config: ConfigReplica
+    confianza: float
+    precision: float
+    objetivos: Tuple[str, ...]
+    replicas: List[Replica] = field(default_factory=list)
+    intervalos: List[Intervalo] = field(default_factory=list)
+    convergio: bool = False
+
+    def intervalo(self, metrica: str) -> Intervalo:
+        for i in self.intervalos:
+            if i.metrica == metrica:
+                return i
+        raise KeyError(metrica)
+
+    def imprimir(self) -> None:
+        print("\n===== RÉPLICAS MONTE CARLO =====")
+        print(
+            f"{len(self.replicas)} réplicas de {self.config.cantidad} procesos "
+            f"(arribos {self.config.arribos}, ráfagas {self.config.rafagas})"
+        )
+        estado = "alcanzada" if self.convergio else "NO alcanzada"
+        print(
+            f"Precisión ±{self.precision:.1%} en {', '.join(self.objetivos)}: {estado} "
+            f"(confianza {self.confianza:.0%})"
+        )
+        descartados = sum(r.descartados for r in self.replicas)
+        if descartados:
+            print(f"Procesos descartados en total: {descartados}")
+
+        print(f"\n  {'Métrica':<18}{'Media':>12}{'± Semiancho':>14}{'Relativo':>10}")
+        for i in self.intervalos:
+            marca = "*" if i.metrica in self.objetivos else " "
+            relativo = f"{i.relativo:>10.2%}" if math.isfinite(i.relativo) else f"{'-':>10}"
+            print(f"{marca} {i.metrica:<18}{i.media:>12.4f}{i.semiancho:>14.4f}{relativo}")
+        print("================================\n")
+
+
+# ---------------------------------------------------------------------------
+# Estadística
+# ---------------------------------------------------------------------------
+
+
+def cuantil_t(p: float, grados_libertad: int) -> float:
+    """
+    Cuantil p de la t de Student. Exacto para 1 y 2 grados de libertad;
+    desde 3, expansión de Cornish-Fisher alrededor de la normal (error
+    relativo por debajo del 1% con 3 grados y del 0.1% desde 6).
+    """
+    if not 0 < p < 1:
+        raise ValueError("p debe estar en (0, 1)")
+    if grados_libertad < 1:
+        raise ValueError("Se necesita al menos 1 grado de libertad")
+    if grados_libertad == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if grados_libertad == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    z = statistics.NormalDist().inv_cdf(p)
+    n = float(grados_libertad)
+    z2 = z * z
+    return (
+        z
+        + z * (z2 + 1) / (4 * n)
+        + z * (5 * z2 * z2 + 16 * z2 + 3) / (96 * n ** 2)
+        + z * (3 * z2 ** 3 + 19 * z2 * z2 + 17 * z2 - 15) / (384 * n ** 3)
+        + z * (79 * z2 ** 4 + 776 * z2 ** 3 + 1482 * z2 * z2 - 1920 * z2 - 945) / (92160 * n ** 4)
+    )
+
+
+def intervalo_confianza(valores: Sequence[float], confianza: float) -> Tuple[float, float]:
+    """
+    (media, semiancho) del intervalo t para la media de 'valores'. Con una
+    sola observación el semiancho es infinito.
+    """
+    n = len(valores)
+    if n == 0:
+        raise ValueError("No hay valores")
+    media = math.fsum(valores) / n
+    if n == 1:
+        return media, math.inf
+    desvio = statistics.stdev(valores)
+    return media, cuantil_t(0.5 + confianza / 2, n - 1) * desvio / math.sqrt(n)
+
+
+def _percentil(ordenados: Sequence[int], p: float) -> int:
+    if not ordenados:
+        return 0
+    return ordenados[max(0, math.ceil(len(ordenados) * p) - 1)]
+
+
+# ---------------------------------------------------------------------------
+# Réplicas (en el proceso actual o en trabajadores)
+# ---------------------------------------------------------------------------
+
+
+def semilla_replica(semilla: int, indice: int) -> int:
+    """
+    Semilla de la réplica 'indice'; sirve tal cual para
+    'main.py generate --seed' y reproducir esa traza.
+    """
+    return random.Random(f"{semilla}:replica:{indice}").getrandbits(32)
+
+
+def _replica(tarea: Tuple[ConfigReplica, int]) -> Replica:
+    config, semilla = tarea
+    procesos = [
+        Proceso(*fila)
+        for fila in generador.iterar_filas(
+            config.cantidad, semilla, config.arribos, config.rafagas, config.memoria
+        )
+    ]
+    gestor = GestorMemoria(
+        grado_multiprogramacion_max=config.grado,
+        politica_espera=config.politica_espera,
+        silencioso=True,
+        tamanios_usuario=config.particiones,
+    )
+    resultado = Simulador(procesos, gestor, registrar_linea_tiempo=False).simular()
+    return Replica(
+        semilla=semilla,
+        descartados=len(resultado.descartados),
+        valores=valores_resultado(resultado),
+    )
+
+
+def valores_resultado(resultado: ResultadoSimulacion) -> Dict[str, float]:
+    """
+    Las METRICAS de una corrida: media, p95 y p99 de cada tiempo y el
+    throughput.
+    """
+    valores: Dict[str, float] = {"throughput": resultado.throughput}
+    for nombre in ("espera", "retorno", "respuesta"):
+        datos = sorted(
+            v for v in (getattr(f, nombre) for f in resultado.filas) if v is not None
+        )
+        valores[f"{nombre}_media"] = math.fsum(datos) / len(datos) if datos else 0.0
+        valores[f"{nombre}_p95"] = float(_percentil(datos, 0.95))
+        valores[f"{nombre}_p99"] = float(_percentil(datos, 0.99))
+    return valores
+
+
+def _intervalos(replicas: Sequence[Replica], confianza: float) -> List[Intervalo]:
+    intervalos = []
+    for metrica in METRICAS:
+        media, semiancho = intervalo_confianza([r.valores[metrica] for r in replicas], confianza)
+        intervalos.append(Intervalo(metrica=metrica, media=media, semiancho=semiancho))
+    return intervalos
+
+
+def replicar(
+    config: ConfigReplica,
+    semilla: int = 0,
+    confianza: float = 0.95,
+    precision: float = 0.05,
+    objetivos: Sequence[str] = ("espera_media",),
+    min_replicas: int = 5,
+    max_replicas: int = 100,
+    workers: int = 1,
+    al_terminar_lote: Optional[Callable[[int, List[Intervalo]], None]] = None,
+) -> ResultadoReplicas:
+    """
+    Corre réplicas hasta que todas las métricas de 'objetivos' tengan un
+    semiancho <= precision * |media| (con al menos 'min_replicas'), o hasta
+    'max_replicas'.
+    """
+    if config.cantidad <= 0:
+        raise ValueError("La cantidad de procesos por réplica debe ser > 0")
+    if not 0 < confianza < 1:
+        raise ValueError("La confianza debe estar en (0, 1)")
+    if precision <= 0:
+        raise ValueError("La precisión debe ser > 0")
+    if min_replicas < 2 or max_replicas < min_replicas:
+        raise ValueError("Se requiere 2 <= min_replicas <= max_replicas")
+    desconocidas = [m for m in objetivos if m not in METRICAS]
+    if desconocidas or not objetivos:
+        raise ValueError(
+            f"Métricas objetivo inválidas: {', '.join(desconocidas) or '(ninguna)'} "
+            f"(opciones: {', '.join(METRICAS)})"
+        )
+    generador.validar_especificaciones(config.arribos, config.rafagas, config.memoria)
+
+    resultado = ResultadoReplicas(
+        config=config,
+        confianza=confianza,
+        precision=precision,
+        objetivos=tuple(objetivos),
+    )
+
+    def alcanzada(intervalos: List[Intervalo]) -> bool:
+        return all(i.relativo <= precision for i in intervalos if i.metrica in resultado.objetivos)
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while len(resultado.replicas) < max_replicas and not resultado.convergio:
+            hechas = len(resultado.replicas)
+            lote = max(min_replicas - hechas, workers, 1)
+            lote = min(lote, max_replicas - hechas)
+            tareas = [(config, semilla_replica(semilla, hechas + k)) for k in range(lote)]
+            if pool is None:
+                nuevas = map(_replica, tareas)
+            else:
+                nuevas = pool.map(_replica, tareas)
+
+            for replica in nuevas:
+                resultado.replicas.append(replica)
+                if len(resultado.replicas) >= min_replicas:
+                    resultado.intervalos = _intervalos(resultado.replicas, confianza)
+                    if alcanzada(resultado.intervalos):
+                        resultado.convergio = True
+                        break
+            if al_terminar_lote is not None and resultado.intervalos:
+                al_terminar_lote(len(resultado.replicas), resultado.intervalos)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return resultado
@@ -0,0 +1,565 @@
+"""
+Servicio local de simulación (HTTP sobre TCP o socket Unix).
+
+Responsabilidades:
+    - Mantener un pool de procesos ya calentado (módulos importados y una
+      corrida de prueba hecha) para no pagar el arranque del intérprete en
+      cada pedido.
+    - Aceptar pedidos POST /simular con la traza (texto CSV o ruta local) y
+      la configuración de memoria, y responder en streaming NDJSON.
+    - Guardar las trazas ya parseadas en un LRU (formato columnar, acotado
+      por cantidad de procesos) indexado por hash del contenido.
+    - Backpressure: una cola acotada de pedidos; si está llena se responde
+      503 con Retry-After en lugar de encolar sin límite.
+    - Cliente mínimo (solicitar) para scripts y pruebas locales.
+
+Protocolo:
+    POST /simular   cuerpo JSON:
+        {"traza": "ID,Arribo,RafagaCPU,Memoria\\n..."}   o   {"ruta": "/abs/traza.csv"}
+        y opcionalmente "config": {"grado": 5, "particiones": [250, 150, 50],
+                                   "politica_espera": "fifo"}
+    Respuesta (application/x-ndjson, chunked), una línea JSON por mensaje:
+        {"tipo": "inicio", "traza": HASH, "procesos": N, "cache": bool}
+        {"tipo": "filas", "filas": [[id, arribo, inicio_cpu, fin, retorno,
+                                     espera, respuesta, rafaga], ...]}  (varias)
+        {"tipo": "resumen", "descartados": [...], "promedio_retorno": ..., ...}
+    GET /estado     contadores del servicio (JSON).
+    Errores de datos: 400 con {"error": "..."}; cola llena: 503.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import http.client
+import io
+import json
+import os
+import signal
+import socket
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from io_metricas import ColumnasProcesos, cargar_procesos, leer_procesos_csv
+from memoria import TAMANIOS_USUARIO_DEFAULT, GestorMemoria
+from politicas_espera import POLITICAS_ESPERA
+from procesos import Proceso
+from simulacion import FilaResultado, ResultadoSimulacion, Simulador
+
+PUERTO_DEFAULT = 8765
+# Filas por mensaje "filas" de la respuesta.
+FILAS_POR_MENSAJE = 1000
+# Tope del cuerpo de un pedido.
+CUERPO_MAXIMO = 256 * 1024 * 1024
+TAMANIO_CABECERAS = 64 * 1024
+
+_MENSAJES_HTTP = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+@dataclass(frozen=True)
+class ConfigPedido:
+    grado: int = 5
+    particiones: Tuple[int, ...] = TAMANIOS_USUARIO_DEFAULT
+    politica_espera: str = "fifo"
+
+    @classmethod
+    def desde_dict(cls, datos: Dict[str, Any]) -> "ConfigPedido":
+        desconocidas = set(datos) - {"grado", "particiones", "politica_espera"}
+        if desconocidas:
+            raise ValueError(f"Claves de config desconocidas: {', '.join(sorted(desconocidas))}")
+        config = cls(
+            grado=datos.get("grado", cls.grado),
+            particiones=tuple(datos.get("particiones", cls.particiones)),
+            politica_espera=datos.get("politica_espera", cls.politica_espera),
+        )
+        if not isinstance(config.grado, int) or config.grado <= 0:
+            raise ValueError("'grado' debe ser un entero > 0")
+        if not config.particiones or not all(
+            isinstance(t, int) and t > 0 for t in config.particiones
+        ):
+            raise ValueError("'particiones' debe ser una lista de enteros > 0")
+        if config.politica_espera not in POLITICAS_ESPERA:
+            raise ValueError(
+                f"Política de espera desconocida: '{config.politica_espera}' "
+                f"(opciones: {', '.join(POLITICAS_ESPERA)})"
+            )
+        return config
+
+
+# ---------------------------------------------------------------------------
+# Trabajadores
+# ---------------------------------------------------------------------------
+
+
+def _calentar() -> None:
+    """
+    Inicializador del pool: importa lo que usa una corrida y hace una
+    corrida mínima para que el primer pedido no pague nada de eso.
+    """
+    gestor = GestorMemoria(silencioso=True)
+    Simulador([Proceso("P0", 0, 1, 1)], gestor, registrar_linea_tiempo=False).simular()
+
+
+def _nada() -> None:
+    return None
+
+
+def _a_columnas(procesos: List[Proceso]) -> ColumnasProcesos:
+    columnas = ColumnasProcesos()
+    for p in procesos:
+        columnas.ids.append(p.id)
+        columnas.arribo.append(p.arribo)
+        columnas.rafaga.append(p.rafaga_cpu)
+        columnas.memoria.append(p.memoria)
+    return columnas
+
+
+def _linea_json(datos: Dict[str, Any]) -> bytes:
+    return (json.dumps(datos, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+
+
+def _codificar(resultado: ResultadoSimulacion) -> List[bytes]:
+    """
+    Mensajes "filas" y "resumen" ya serializados: el trabajador hace el
+    JSON y el bucle del servicio solo copia bytes al socket.
+    """
+    filas = resultado.filas
+    mensajes = [
+        _linea_json({
+            "tipo": "filas",
+            "filas": [
+                [f.id, f.arribo, f.inicio_cpu, f.fin, f.retorno, f.espera, f.respuesta, f.rafaga]
+                for f in filas[i:i + FILAS_POR_MENSAJE]
+            ],
+        })
+        for i in range(0, len(filas), FILAS_POR_MENSAJE)
+    ]
+    mensajes.append(_linea_json({
+        "tipo": "resumen",
+        "descartados": resultado.descartados,
+        "promedio_retorno": resultado.promedio_retorno,
+        "promedio_espera": resultado.promedio_espera,
+        "promedio_respuesta": resultado.promedio_respuesta,
+        "throughput": resultado.throughput,
+        "tiempo_total": resultado.tiempo_total,
+    }))
+    return mensajes
+
+
+def _simular(
+    tarea: Tuple[Optional[str], Optional[str], Optional[ColumnasProcesos], ConfigPedido],
+) -> Tuple[int, List[bytes], Optional[ColumnasProcesos]]:
+    """
+    Corre un pedido. Devuelve (procesos, mensajes codificados) y, si hubo
+    que parsear la traza, sus columnas para guardarlas en el LRU del
+    servicio.
+    """
+    texto, ruta, columnas, config = tarea
+    nuevas = None
+    if columnas is not None:
+        procesos = columnas.a_procesos()
+    else:
+        if texto is not None:
+            procesos = leer_procesos_csv(io.StringIO(texto, newline=""))
+        else:
+            procesos = cargar_procesos(ruta)  # type: ignore[arg-type]
+        nuevas = _a_columnas(procesos)
+
+    gestor = GestorMemoria(
+        grado_multiprogramacion_max=config.grado,
+        politica_espera=config.politica_espera,
+        silencioso=True,
+        tamanios_usuario=config.particiones,
+    )
+    resultado = Simulador(procesos, gestor, registrar_linea_tiempo=False).simular()
+    return len(procesos), _codificar(resultado), nuevas
+
+
+# ---------------------------------------------------------------------------
+# LRU de trazas parseadas
+# ---------------------------------------------------------------------------
+
+
+class CacheTrazas:
+    """
+    LRU de ColumnasProcesos por hash, acotado por la suma de procesos.
+    """
+
+    def __init__(self, max_procesos: int) -> None:
+        self._max_procesos = max_procesos
+        self._entradas: "OrderedDict[str, ColumnasProcesos]" = OrderedDict()
+        self._procesos = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: str) -> Optional[ColumnasProcesos]:
+        columnas = self._entradas.get(clave)
+        if columnas is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return columnas
+
+    def guardar(self, clave: str, columnas: ColumnasProcesos) -> None:
+        if len(columnas) > self._max_procesos or clave in self._entradas:
+            return
+        self._entradas[clave] = columnas
+        self._procesos += len(columnas)
+        while self._procesos > self._max_procesos:
+            _, vieja = self._entradas.popitem(last=False)
+            self._procesos -= len(vieja)
+
+    def estado(self) -> Dict[str, int]:
+        return {
+            "trazas": len(self._entradas),
+            "procesos": self._procesos,
+            "max_procesos": self._max_procesos,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+        }
+
+
+def clave_traza(texto: Optional[str], ruta: Optional[str]) -> str:
+    """
+    Hash del contenido enviado; para una ruta, de (ruta, tamaño, mtime).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if texto is not None:
+        h.update(b"texto\0" + texto.encode())
+    else:
+        st = os.stat(ruta)  # type: ignore[arg-type]
+        h.update(f"ruta\0{os.path.abspath(ruta)}\0{st.st_size}\0{st.st_mtime_ns}".encode())  # type: ignore[type-var]
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Servidor
+# ---------------------------------------------------------------------------
+
+
+class _ErrorHttp(Exception):
+    def __init__(self, estado: int, mensaje: str) -> None:
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class ServicioSimulacion:
+    def __init__(
+        self,
+        pool: ProcessPoolExecutor,
+        workers: int,
+        max_cola: int,
+        cache: CacheTrazas,
+    ) -> None:
+        self._pool = pool
+        self._workers = workers
+        self._cola: "asyncio.Queue[Tuple[tuple, asyncio.Future]]" = asyncio.Queue(max_cola)
+        self._cache = cache
+        self._en_curso = 0
+        self._atendidos = 0
+        self._rechazados = 0
+
+    def iniciar(self) -> List["asyncio.Task[None]"]:
+        return [asyncio.create_task(self._despachar()) for _ in range(self._workers)]
+
+    async def _despachar(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            tarea, futuro = await self._cola.get()
+            self._en_curso += 1
+            try:
+                resultado = await loop.run_in_executor(self._pool, _simular, tarea)
+            except Exception as exc:  # se reporta al pedido
+                if not futuro.cancelled():
+                    futuro.set_exception(exc)
+            else:
+                if not futuro.cancelled():
+                    futuro.set_result(resultado)
+            finally:
+                self._en_curso -= 1
+                self._cola.task_done()
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            "workers": self._workers,
+            "en_cola": self._cola.qsize(),
+            "max_cola": self._cola.maxsize,
+            "en_curso": self._en_curso,
+            "atendidos": self._atendidos,
+            "rechazados": self._rechazados,
+            "cache": self._cache.estado(),
+        }
+
+    # -- HTTP ---------------------------------------------------------------
+
+    async def atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                await self._atender_pedido(lector, escritor)
+            except _ErrorHttp as e:
+                cabeceras = {"Retry-After": "1"} if e.estado == 503 else {}
+                await self._responder(escritor, e.estado, {"error": str(e)}, cabeceras)
+            except (KeyError, ValueError, OSError) as e:
+                await self._responder(escritor, 400, {"error": str(e)})
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                pass
+            except Exception as e:
+                await self._responder(escritor, 500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _atender_pedido(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        crudo = await lector.readuntil(b"\r\n\r\n")
+        primera, *lineas = crudo.decode("latin-1").split("\r\n")
+        try:
+            metodo, destino, _ = primera.split(" ", 2)
+        except ValueError:
+            raise _ErrorHttp(400, "Línea de pedido inválida") from None
+        cabeceras = {}
+        for linea in lineas:
+            nombre, sep, valor = linea.partition(":")
+            if sep:
+                cabeceras[nombre.strip().lower()] = valor.strip()
+
+        ruta = destino.split("?", 1)[0]
+        if ruta == "/estado":
+            if metodo != "GET":
+                raise _ErrorHttp(405, "Usar GET")
+            await self._responder(escritor, 200, self.estado())
+            return
+        if ruta != "/simular":
+            raise _ErrorHttp(404, f"Ruta desconocida: {ruta}")
+        if metodo != "POST":
+            raise _ErrorHttp(405, "Usar POST")
+
+        largo = int(cabeceras.get("content-length", "0"))
+        if largo > CUERPO_MAXIMO:
+            raise _ErrorHttp(413, f"Cuerpo mayor a {CUERPO_MAXIMO} bytes")
+        pedido = json.loads(await lector.readexactly(largo))
+        if not isinstance(pedido, dict):
+            raise ValueError("El cuerpo debe ser un objeto JSON")
+        texto, ruta_traza = pedido.get("traza"), pedido.get("ruta")
+        if (texto is None) == (ruta_traza is None):
+            raise ValueError("Indicar exactamente uno de 'traza' o 'ruta'")
+        config = ConfigPedido.desde_dict(pedido.get("config") or {})
+
+        clave = clave_traza(texto, ruta_traza)
+        columnas = self._cache.obtener(clave)
+        futuro: asyncio.Future = asyncio.get_running_loop().create_future()
+        tarea = (None if columnas else texto, None if columnas else ruta_traza, columnas, config)
+        try:
+            self._cola.put_nowait((tarea, futuro))
+        except asyncio.QueueFull:
+            self._rechazados += 1
+            raise _ErrorHttp(503, "Cola de pedidos llena") from None
+
+        procesos, mensajes, nuevas = await futuro
+        if nuevas is not None:
+            self._cache.guardar(clave, nuevas)
+        self._atendidos += 1
+        inicio = _linea_json({
+            "tipo": "inicio",
+            "traza": clave,
+            "procesos": procesos,
+            "cache": columnas is not None,
+        })
+        await self._transmitir(escritor, [inicio] + mensajes)
+
+    async def _responder(
+        self,
+        escritor: asyncio.StreamWriter,
+        estado: int,
+        cuerpo: Dict[str, Any],
+        extra: Optional[Dict[str, str]] = None,
+    ) -> None:
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode()
+        cabeceras = [
+            f"HTTP/1.1 {estado} {_MENSAJES_HTTP.get(estado, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(datos)}",
+            "Connection: close",
+        ]
+        cabeceras += [f"{k}: {v}" for k, v in (extra or {}).items()]
+        escritor.write(("\r\n".join(cabeceras) + "\r\n\r\n").encode() + datos)
+        await escritor.drain()
+
+    async def _transmitir(self, escritor: asyncio.StreamWriter, mensajes: List[bytes]) -> None:
+        escritor.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        for datos in mensajes:
+            escritor.write(b"%x\r\n%s\r\n" % (len(datos), datos))
+            await escritor.drain()
+        escritor.write(b"0\r\n\r\n")
+        await escritor.drain()
+
+
+def servir(
+    host: str = "127.0.0.1",
+    puerto: int = PUERTO_DEFAULT,
+    socket_unix: Optional[str] = None,
+    workers: int = 1,
+    max_cola: int = 16,
+    cache_procesos: int = 2_000_000,
+) -> None:
+    """
+    Levanta el pool (calentado antes de aceptar conexiones) y atiende
+    hasta recibir una interrupción.
+    """
+    if workers <= 0 or max_cola <= 0 or cache_procesos < 0:
+        raise ValueError("workers y max_cola deben ser > 0 y cache_procesos >= 0")
+
+    pool = ProcessPoolExecutor(workers, initializer=_calentar)
+    try:
+        # Fuerza el arranque (y el calentamiento) de todos los trabajadores.
+        for futuro in [pool.submit(_nada) for _ in range(workers)]:
+            futuro.result()
+
+        async def principal() -> None:
+            servicio = ServicioSimulacion(pool, workers, max_cola, CacheTrazas(cache_procesos))
+            despachadores = servicio.iniciar()
+            if socket_unix is not None:
+                servidor = await asyncio.start_unix_server(
+                    servicio.atender, path=socket_unix, limit=TAMANIO_CABECERAS
+                )
+                donde = socket_unix
+            else:
+                servidor = await asyncio.start_server(
+                    servicio.atender, host, puerto, limit=TAMANIO_CABECERAS
+                )
+                donde = f"http://{host}:{puerto}"
+            sys.stderr.write(f"Servicio escuchando en {donde} ({workers} workers)\n")
+
+            parada = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for senial in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(senial, parada.set)
+            try:
+                async with servidor:
+                    await parada.wait()
+            finally:
+                for d in despachadores:
+                    d.cancel()
+
+        asyncio.run(principal())
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if socket_unix is not None and os.path.exists(socket_unix):
+            os.remove(socket_unix)
+
+
+# ---------------------------------------------------------------------------
+# Cliente
+# ---------------------------------------------------------------------------
+
+
+class _ConexionUnix(http.client.HTTPConnection):
+    def __init__(self, ruta: str, timeout: Optional[float] = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._ruta = ruta
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self._ruta)
+
+
+def _conexion(direccion: str, timeout: Optional[float]) -> http.client.HTTPConnection:
+    """
+    'direccion' es "HOST:PUERTO" o la ruta de un socket Unix.
+    """
+    if os.sep in direccion or direccion.endswith(".sock"):
+        return _ConexionUnix(direccion, timeout)
+    host, _, puerto = direccion.rpartition(":")
+    return http.client.HTTPConnection(host or "127.0.0.1", int(puerto), timeout=timeout)
+
+
+def solicitar(
+    direccion: str,
+    traza: Optional[str] = None,
+    ruta: Optional[str] = None,
+    config: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Envía un pedido y devuelve los mensajes NDJSON a medida que llegan.
+    Un 400 se reporta como ValueError; un 503 (cola llena) o cualquier otro
+    estado como RuntimeError.
+    """
+    cuerpo: Dict[str, Any] = {"traza": traza} if traza is not None else {"ruta": ruta}
+    if config:
+        cuerpo["config"] = config
+    conexion = _conexion(direccion, timeout)
+    try:
+        conexion.request(
+            "POST",
+            "/simular",
+            body=json.dumps(cuerpo).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        respuesta = conexion.getresponse()
+        if respuesta.status != 200:
+            error = json.loads(respuesta.read() or b"{}").get("error", respuesta.reason)
+            if respuesta.status == 400:
+                raise ValueError(error)
+            raise RuntimeError(f"{respuesta.status}: {error}")
+        while True:
+            linea = respuesta.readline()
+            if not linea:
+                return
+            yield json.loads(linea)
+    finally:
+        conexion.close()
+
+
+def resultado_desde_mensajes(mensajes: Iterator[Dict[str, Any]]) -> ResultadoSimulacion:
+    """
+    Rearma el ResultadoSimulacion a partir de la respuesta de solicitar.
+    """
+    filas: List[FilaResultado] = []
+    resumen: Dict[str, Any] = {}
+    for mensaje in mensajes:
+        if mensaje["tipo"] == "filas":
+            filas.extend(FilaResultado(*f) for f in mensaje["filas"])
+        elif mensaje["tipo"] == "resumen":
+            resumen = mensaje
+    if not resumen:
+        raise ValueError("Respuesta incompleta: falta el resumen")
+    return ResultadoSimulacion(
+        filas=filas,
+        descartados=resumen["descartados"],
+        promedio_retorno=resumen["promedio_retorno"],
+        promedio_espera=resumen["promedio_espera"],
+        promedio_respuesta=resumen["promedio_respuesta"],
+        throughput=resumen["throughput"],
+        tiempo_total=resumen["tiempo_total"],
+    )
+
+
+def estado_servicio(direccion: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    conexion = _conexion(direccion, timeout)
+    try:
+        conexion.request("GET", "/estado")
+        return json.loads(conexion.getresponse().read())
+    finally:
+        conexion.close()
@@ -5,20 +5,29 @@ Responsabilidades:
     - Orquestar la simulación de ARRIBOS y FIN_CPU.
     - Coordinar:
         * Gestión de memoria (GestorMemoria).
-        * Planificación SRTF con desalojo (SrtfScheduler).
+        * Planificación SRTF con desalojo (SrtfScheduler) u otra
+          implementación de Scheduler (EDF / RM de tiempo_real.py).
         * Cálculo de métricas por proceso y globales.
         * Impresión de snapshots e informe final.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import bisect
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
+from io_metricas import huella_procesos
+from linea_tiempo import LineaTiempoCPU
 from memoria import GestorMemoria
 from procesos import Proceso
 from planificador_srtf import SrtfScheduler, Scheduler
 
+if TYPE_CHECKING:
+    from metricas_streaming import AgregadoPorGrupo, AgregadoVencimientos
+
 
 # ---------------------------------------------------------------------------
 # Estado por proceso
@@ -38,6 +47,152 @@ class EstadoSimulacion:
     tiempo_espera: Optional[int] = None
     # True si fue rechazado definitivamente (NO_CABE_EN_NINGUNA)
     descartado: bool = False
+    # True si el control de carga lo dejó fuera de la cola de espera
+    rechazado: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Resultado de una corrida
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class FilaResultado:
+    """
+    Métricas finales de un proceso ejecutado.
+    """
+
+    id: str
+    arribo: int
+    inicio_cpu: Optional[int]
+    fin: Optional[int]
+    retorno: Optional[int]
+    espera: Optional[int]
+    respuesta: Optional[int]
+    rafaga: int
+    # Instante absoluto del plazo (None si el proceso no tiene)
+    vencimiento: Optional[int] = None
+    grupo: Optional[str] = None
+
+
+@dataclass
+class ResultadoSimulacion:
+    """
+    Resumen de una corrida: métricas por proceso y globales.
+    """
+
+    filas: List[FilaResultado]
+    descartados: List[str]
+    promedio_retorno: float = 0.0
+    promedio_espera: float = 0.0
+    promedio_respuesta: float = 0.0
+    throughput: float = 0.0
+    tiempo_total: int = 0
+    # Rechazados por el control de carga (ver control_carga.py)
+    rechazados: List[str] = field(default_factory=list)
+
+    @classmethod
+    def desde_filas(
+        cls,
+        filas: List[FilaResultado],
+        descartados: List[str],
+        origen: int = 0,
+        rechazados: Optional[List[str]] = None,
+    ) -> "ResultadoSimulacion":
+        """
+        'origen' es el instante desde el que se mide el throughput (0 salvo
+        en corridas sobre una ventana de la traza).
+        """
+        rechazados = rechazados or []
+        n = len(filas)
+        if n == 0:
+            return cls(filas=filas, descartados=descartados, rechazados=rechazados)
+
+        suma_retorno = sum(f.retorno for f in filas if f.retorno is not None)
+        suma_espera = sum(f.espera for f in filas if f.espera is not None)
+        suma_respuesta = sum(f.respuesta for f in filas if f.respuesta is not None)
+
+        tiempo_total = max(f.fin for f in filas if f.fin is not None)
+        transcurrido = tiempo_total - origen
+        throughput = n / transcurrido if transcurrido > 0 else 0.0
+
+        return cls(
+            filas=filas,
+            descartados=descartados,
+            promedio_retorno=suma_retorno / n,
+            promedio_espera=suma_espera / n,
+            promedio_respuesta=suma_respuesta / n,
+            throughput=throughput,
+            tiempo_total=tiempo_total,
+            rechazados=rechazados,
+        )
+
+    def imprimir(self) -> None:
+        if not self.filas:
+            print("\n===== RESUMEN FINAL DE MÉTRICAS =====")
+            print("No hay procesos ejecutados (todos fueron descartados).")
+            if self.rechazados:
+                print(f"Rechazados por sobrecarga: {len(self.rechazados)}")
+            print("=====================================\n")
+            return
+
+        print("\n===== RESUMEN FINAL DE MÉTRICAS =====")
+        for f in self.filas:
+            print(
+                f"Proceso {f.id}: arribo={f.arribo}, "
+                f"inicio_cpu={f.inicio_cpu}, fin={f.fin}, "
+                f"retorno={f.retorno}, espera={f.espera}, "
+                f"respuesta={f.respuesta}"
+            )
+        print("-------------------------------------")
+        print(f"Promedio retorno   : {self.promedio_retorno:.2f}")
+        print(f"Promedio espera    : {self.promedio_espera:.2f}")
+        print(f"Promedio respuesta : {self.promedio_respuesta:.2f}")
+        print(f"Throughput         : {self.throughput:.3f} procesos/unidad de tiempo")
+        if self.rechazados:
+            ofrecidos = len(self.filas) + len(self.descartados) + len(self.rechazados)
+            print(
+                f"Rechazados         : {len(self.rechazados)} de {ofrecidos} por sobrecarga "
+                f"({', '.join(self.rechazados[:10])}{', ...' if len(self.rechazados) > 10 else ''})"
+            )
+        # Como el bloque por grupo: el agregado (metricas_streaming) solo se
+        # importa si hay plazos, así la presentación empaquetada no lo necesita.
+        if any(f.vencimiento is not None and f.fin is not None for f in self.filas):
+            print("-------------------------------------")
+            for linea in self.vencimientos().lineas_resumen():
+                print(linea)
+        if any(f.grupo is not None for f in self.filas):
+            print("-------------------------------------")
+            for linea in self.por_grupo().lineas_resumen():
+                print(linea)
+        print("=====================================\n")
+
+    def por_grupo(self) -> "AgregadoPorGrupo":
+        """
+        Métricas por grupo (los procesos sin grupo van a fair_share.SIN_GRUPO).
+        """
+        from fair_share import SIN_GRUPO
+        from metricas_streaming import AgregadoPorGrupo
+
+        agregado = AgregadoPorGrupo()
+        for f in self.filas:
+            if f.fin is not None:
+                agregado.registrar(
+                    SIN_GRUPO if f.grupo is None else f.grupo, f.arribo, f.inicio_cpu, f.fin, f.rafaga
+                )
+        return agregado
+
+    def vencimientos(self) -> "AgregadoVencimientos":
+        """
+        Incumplimiento de plazos y tardanza de las filas con vencimiento.
+        """
+        from metricas_streaming import AgregadoVencimientos
+
+        agregado = AgregadoVencimientos()
+        for f in self.filas:
+            if f.vencimiento is not None and f.fin is not None:
+                agregado.registrar(f.fin, f.vencimiento)
+        return agregado
 
 
 # ---------------------------------------------------------------------------
@@ -56,9 +211,21 @@ class Simulador:
         gestor_memoria: GestorMemoria,
         scheduler: Optional[Scheduler] = None,
         verbose: bool = False,
+        registrar_linea_tiempo: bool = True,
+        metricas_desde: int = 0,
     ) -> None:
+        """
+        metricas_desde:
+            Solo los procesos con arribo >= metricas_desde entran en el
+            resultado (los anteriores son calentamiento de una corrida por
+            ventana); el throughput se mide desde ese instante.
+        """
         self._gestor_memoria = gestor_memoria
         self._scheduler: Scheduler = scheduler or SrtfScheduler()
+        # Decisiones por tiempo del planificador (fair-share); None en SRTF.
+        self._proximo_desalojo: Optional[Any] = getattr(
+            self._scheduler, "proximo_desalojo", None
+        )
 
         self._procesos: List[Proceso] = sorted(procesos, key=lambda p: p.arribo)
         self._tiempo_actual: int = 0
@@ -67,14 +234,112 @@ class Simulador:
         self._estado_metricas: Dict[str, EstadoSimulacion] = {
             p.id: EstadoSimulacion(tiempo_arribo=p.arribo) for p in self._procesos
         }
+        if len(self._estado_metricas) != len(self._procesos):
+            vistos: Dict[str, int] = {}
+            for p in self._procesos:
+                if p.id in vistos:
+                    raise ValueError(
+                        f"ID de proceso duplicado: '{p.id}' (arribos {vistos[p.id]} y {p.arribo})"
+                    )
+                vistos[p.id] = p.arribo
 
+        self._metricas_desde = metricas_desde
         self._verbose = verbose
+        # Ver _ejecutar_analitico; las subclases con otra fuente de
+        # arribos y el perfilador lo desactivan.
+        self.usar_camino_analitico = True
+        self._observadores: List[Any] = []
+        self._huella: Optional[str] = None
+        self._resultado: Optional[ResultadoSimulacion] = None
+        self._linea_tiempo: Optional[LineaTiempoCPU] = (
+            LineaTiempoCPU() if registrar_linea_tiempo else None
+        )
 
     # ------------------------------------------------------------------
     # API pública
     # ------------------------------------------------------------------
 
+    def agregar_observador(self, observador: Any) -> None:
+        """
+        Registra un objeto con método despues_de_evento(simulador, evento, t),
+        invocado al terminar de procesar cada ARRIBO o FIN_CPU.
+        """
+        self._observadores.append(observador)
+
+    @property
+    def tiempo_actual(self) -> int:
+        return self._tiempo_actual
+
+    @property
+    def gestor_memoria(self) -> GestorMemoria:
+        return self._gestor_memoria
+
+    @property
+    def scheduler(self) -> Scheduler:
+        return self._scheduler
+
+    @property
+    def procesos(self) -> List[Proceso]:
+        """
+        Traza ordenada por arribo (la lista interna: no modificarla).
+        """
+        return self._procesos
+
+    @property
+    def arribados(self) -> int:
+        """
+        Procesos de la traza cuyo arribo ya se procesó.
+        """
+        return self._indice_siguiente_arribo
+
+    @property
+    def total_procesos(self) -> Optional[int]:
+        """
+        Largo de la traza (None si no se conoce de antemano).
+        """
+        return len(self._procesos)
+
+    @property
+    def metricas_desde(self) -> int:
+        return self._metricas_desde
+
+    @property
+    def linea_tiempo(self) -> Optional[LineaTiempoCPU]:
+        return self._linea_tiempo
+
+    def huella_traza(self) -> str:
+        """
+        Hash de la traza ordenada (se calcula una sola vez).
+        """
+        if self._huella is None:
+            self._huella = huella_procesos(self._procesos)
+        return self._huella
+
     def run(self) -> None:
+        self.ejecutar_hasta(None)
+        self._calcular_metricas_finales()
+        self._imprimir_resumen_final()
+
+    def simular(self) -> "ResultadoSimulacion":
+        """
+        Igual que run() pero sin imprimir el resumen; devuelve el resultado.
+        """
+        self.ejecutar_hasta(None)
+        self._calcular_metricas_finales()
+        self._resultado = self.construir_resultado()
+        return self._resultado
+
+    def ejecutar_hasta(self, horizonte: Optional[int]) -> None:
+        """
+        Procesa los eventos con instante < horizonte (todos si es None).
+
+        Los eventos en el horizonte quedan pendientes, así una fuente de
+        arribos incremental puede agregar los de ese instante antes de
+        seguir (ver cluster.py).
+        """
+        if horizonte is None and self._ejecutar_analitico():
+            return
+
         while self._hay_trabajo_pendiente():
             tiempo_proximo_arribo = self._tiempo_proximo_arribo()
             tiempo_proximo_fin_cpu = self._tiempo_proximo_fin_cpu()
@@ -82,6 +347,14 @@ class Simulador:
             tipo_evento, instante_evento = self._resolver_proximo_evento(
                 tiempo_proximo_arribo, tiempo_proximo_fin_cpu
             )
+            if self._proximo_desalojo is not None:
+                # Un arribo o fin de CPU en el mismo instante ya vuelve a
+                # decidir: solo cuenta si llega antes.
+                tiempo_desalojo = self._proximo_desalojo()
+                if tiempo_desalojo is not None and tiempo_desalojo < instante_evento:
+                    tipo_evento, instante_evento = "DESALOJO", tiempo_desalojo
+            if horizonte is not None and instante_evento >= horizonte:
+                return
 
             self._avanzar_tiempo_hasta(instante_evento)
 
@@ -89,27 +362,107 @@ class Simulador:
                 self._procesar_arribos_en_instante(instante_evento)
             elif tipo_evento == "FIN_CPU":
                 self._procesar_fin_cpu()
+            elif tipo_evento == "DESALOJO":
+                self._procesar_desalojo()
             else:
                 raise RuntimeError(f"Evento inválido: {tipo_evento}")
 
-        self._calcular_metricas_finales()
-        self._imprimir_resumen_final()
+            for observador in self._observadores:
+                observador.despues_de_evento(self, tipo_evento, instante_evento)
+
+    def _ejecutar_analitico(self) -> bool:
+        """
+        Resuelve con el barrido de srtf_analitico el tramo inicial de la
+        corrida sin presión de memoria (mismas métricas por proceso que el
+        motor de eventos). Si aparece presión, deja el simulador en ese
+        instante para que siga el ciclo de eventos.
+
+        Solo aplica a corridas sin efectos visibles por evento: sin
+        verbose, sin observadores, con el gestor silencioso y el
+        SrtfScheduler, desde t=0. Devuelve True si la corrida quedó
+        completa.
+        """
+        if not (
+            self.usar_camino_analitico
+            and not self._verbose
+            and not self._observadores
+            and getattr(self._gestor_memoria, "silencioso", False)
+            and type(self._scheduler) is SrtfScheduler
+            and self._indice_siguiente_arribo == 0
+            and self._tiempo_actual == 0
+            and self._scheduler.proceso_en_cpu() is None
+        ):
+            return False
+
+        from srtf_analitico import evaluar
+
+        tramos: Optional[List[Tuple[int, int, int]]] = (
+            [] if self._linea_tiempo is not None else None
+        )
+        resultado = evaluar(self._procesos, self._gestor_memoria, tramos)
+        if resultado is None:
+            return False
+        tiempos, estado = resultado
+
+        limite = len(self._procesos) if estado is None else estado["indice_siguiente_arribo"]
+        for proceso, (inicio, fin) in zip(self._procesos[:limite], tiempos):
+            metricas = self._estado_metricas[proceso.id]
+            metricas.tiempo_inicio_cpu = inicio
+            if fin is not None:
+                metricas.tiempo_fin = fin
+                proceso.tiempo_restante = 0
+                self._tiempo_actual = max(self._tiempo_actual, fin)
+                self._proceso_terminado(proceso, metricas)
+            elif inicio is None and not self._gestor_memoria.cabe_en_alguna_particion(
+                int(proceso.memoria)
+            ):
+                metricas.descartado = True
+
+        if self._linea_tiempo is not None and tramos is not None:
+            for inicio, fin, indice in tramos:
+                self._linea_tiempo.registrar(inicio, fin, self._procesos[indice].id)
+
+        self._indice_siguiente_arribo = limite
+        if estado is None:
+            return True
+
+        self._tiempo_actual = estado["tiempo_actual"]
+        self._scheduler.restaurar_estado(estado["scheduler"], self._procesos)
+        self._gestor_memoria.restaurar_estado(estado["memoria"], self._procesos)
+        return False
 
     # ------------------------------------------------------------------
     # Lógica de eventos
     # ------------------------------------------------------------------
 
     def _hay_trabajo_pendiente(self) -> bool:
-        quedan_arribos = self._indice_siguiente_arribo < len(self._procesos)
+        quedan_arribos = self._quedan_arribos()
         proceso_cpu = self._scheduler.proceso_en_cpu()
         hay_listos = self._scheduler.hay_listos()
         return quedan_arribos or proceso_cpu is not None or hay_listos
 
+    # Acceso a los arribos: una subclase puede reemplazar estos tres métodos
+    # para tomar los procesos de otra fuente (ver simulacion_en_linea.py).
+
+    def _quedan_arribos(self) -> bool:
+        return self._indice_siguiente_arribo < len(self._procesos)
+
     def _tiempo_proximo_arribo(self) -> Optional[int]:
         if self._indice_siguiente_arribo >= len(self._procesos):
             return None
         return self._procesos[self._indice_siguiente_arribo].arribo
 
+    def _extraer_arribos_en(self, instante: int) -> List[Proceso]:
+        """
+        Consume y devuelve todos los procesos que arriban en 'instante'.
+        """
+        inicio = self._indice_siguiente_arribo
+        fin = inicio
+        while fin < len(self._procesos) and self._procesos[fin].arribo == instante:
+            fin += 1
+        self._indice_siguiente_arribo = fin
+        return self._procesos[inicio:fin]
+
     def _tiempo_proximo_fin_cpu(self) -> Optional[int]:
         proceso_actual = self._scheduler.proceso_en_cpu()
         if proceso_actual is None:
@@ -162,6 +515,12 @@ class Simulador:
 
         delta = nuevo_tiempo - self._tiempo_actual
         if delta > 0:
+            if self._linea_tiempo is not None:
+                proceso_cpu = self._scheduler.proceso_en_cpu()
+                if proceso_cpu is not None:
+                    self._linea_tiempo.registrar(
+                        self._tiempo_actual, nuevo_tiempo, proceso_cpu.id
+                    )
             self._scheduler.avanzar_tiempo(delta)
 
         self._tiempo_actual = nuevo_tiempo
@@ -173,13 +532,20 @@ class Simulador:
     def _procesar_arribos_en_instante(self, instante: int) -> None:
         assert self._tiempo_actual == instante
 
-        while (
-            self._indice_siguiente_arribo < len(self._procesos)
-            and self._procesos[self._indice_siguiente_arribo].arribo == instante
+        grupo = self._extraer_arribos_en(instante)
+
+        # Camino por lotes para arribos simultáneos. En verbose se conserva
+        # el camino unitario para no alterar el intercalado de los mensajes.
+        if (
+            len(grupo) > 1
+            and not self._verbose
+            and hasattr(self._gestor_memoria, "intentar_admitir_lote")
+            and hasattr(self._scheduler, "agregar_lote")
         ):
-            proceso = self._procesos[self._indice_siguiente_arribo]
-            self._indice_siguiente_arribo += 1
+            self._admitir_lote(grupo)
+            return
 
+        for proceso in grupo:
             admitido, motivo = self._gestor_memoria.intentar_admitir_proceso(
                 proceso=proceso,
                 tiempo=self._tiempo_actual,
@@ -206,9 +572,56 @@ class Simulador:
                         f"[t={self._tiempo_actual}] ARRIBO {proceso.id} NO admitido: {motivo}"
                     )
 
+        self._retirar_rechazados()
+        self._registrar_ingreso_actual()
+
         if self._verbose:
             self._imprimir_snapshot(evento="ARRIBO", tiempo=self._tiempo_actual)
 
+    def _admitir_lote(self, grupo: List[Proceso]) -> None:
+        """
+        Admite en memoria todo el grupo en una pasada y lo entrega al
+        scheduler de una vez. Mismos resultados que el camino unitario.
+        """
+        resultados = self._gestor_memoria.intentar_admitir_lote(grupo, self._tiempo_actual)
+
+        admitidos: List[Proceso] = []
+        for proceso, (admitido, motivo) in zip(grupo, resultados):
+            if admitido:
+                if not hasattr(proceso, "tiempo_restante"):
+                    proceso.tiempo_restante = int(proceso.rafaga_cpu)
+                admitidos.append(proceso)
+            elif motivo == "NO_CABE_EN_NINGUNA":
+                self._estado_metricas[proceso.id].descartado = True
+
+        self._retirar_rechazados()
+        self._registrar_ingresos_cpu(
+            self._scheduler.agregar_lote(admitidos, self._tiempo_actual)  # type: ignore[attr-defined]
+        )
+        self._registrar_ingreso_actual()
+
+    def _retirar_rechazados(self) -> None:
+        for proceso in self._gestor_memoria.tomar_rechazados():
+            estado = self._estado_metricas[proceso.id]
+            estado.rechazado = True
+            self._proceso_rechazado(proceso, estado)
+
+    def _registrar_ingresos_cpu(self, procesos: List[Proceso]) -> None:
+        for proceso in procesos:
+            estado = self._estado_metricas[proceso.id]
+            if estado.tiempo_inicio_cpu is None:
+                estado.tiempo_inicio_cpu = self._tiempo_actual
+
+    def _registrar_ingreso_actual(self) -> None:
+        """
+        Un arribo puede poner en CPU a un proceso que ya estaba listo (en
+        SRTF solo entra el que arriba; en fair-share puede ganar otro
+        grupo): se registra su inicio si todavía no había ejecutado.
+        """
+        proceso_actual = self._scheduler.proceso_en_cpu()
+        if proceso_actual is not None:
+            self._registrar_ingresos_cpu([proceso_actual])
+
     # ------------------------------------------------------------------
     # FIN_CPU
     # ------------------------------------------------------------------
@@ -220,12 +633,23 @@ class Simulador:
 
         estado = self._estado_metricas[proceso_terminado.id]
         estado.tiempo_fin = self._tiempo_actual
+        self._proceso_terminado(proceso_terminado, estado)
 
         procesos_ahora_admitidos = self._gestor_memoria.liberar_y_reintentar(
             proceso_terminado=proceso_terminado,
             tiempo=self._tiempo_actual,
         )
 
+        if (
+            len(procesos_ahora_admitidos) > 1
+            and not self._verbose
+            and hasattr(self._scheduler, "agregar_lote")
+        ):
+            self._registrar_ingresos_cpu(
+                self._scheduler.agregar_lote(procesos_ahora_admitidos, self._tiempo_actual)  # type: ignore[attr-defined]
+            )
+            procesos_ahora_admitidos = []
+
         for proc in procesos_ahora_admitidos:
             if not hasattr(proc, "tiempo_restante"):
                 proc.tiempo_restante = int(proc.rafaga_cpu)
@@ -246,13 +670,117 @@ class Simulador:
         if self._verbose:
             self._imprimir_snapshot(evento="FIN_CPU", tiempo=self._tiempo_actual)
 
+    # ------------------------------------------------------------------
+    # DESALOJO (decisión por tiempo del planificador)
+    # ------------------------------------------------------------------
+
+    def _procesar_desalojo(self) -> None:
+        self._registrar_ingresos_cpu(
+            self._scheduler.replanificar(self._tiempo_actual)  # type: ignore[attr-defined]
+        )
+
+        if self._verbose:
+            self._imprimir_snapshot(evento="DESALOJO", tiempo=self._tiempo_actual)
+
+    def _proceso_terminado(self, proceso: Proceso, estado: EstadoSimulacion) -> None:
+        """
+        Punto de extensión: se invoca al registrar el fin de un proceso.
+        """
+
+    def _proceso_rechazado(self, proceso: Proceso, estado: EstadoSimulacion) -> None:
+        """
+        Punto de extensión: se invoca cuando el control de carga rechaza un
+        proceso (al llegar o ya en la cola de espera).
+        """
+
+    # ------------------------------------------------------------------
+    # Estado serializable (checkpoints)
+    # ------------------------------------------------------------------
+
+    def _indice_de(self, proceso: Proceso) -> int:
+        """
+        Posición de un proceso en la lista ordenada por arribo.
+        Usa bisect sobre el arribo y compara identidad dentro del empate.
+        """
+        i = bisect.bisect_left(self._procesos, proceso.arribo, key=lambda p: p.arribo)
+        while self._procesos[i] is not proceso:
+            i += 1
+        return i
+
+    def exportar_estado(self) -> Dict[str, Any]:
+        """
+        Estado completo del ciclo de eventos como tipos primitivos.
+
+        Solo se guardan métricas de los procesos que ya arribaron; el resto
+        conserva sus valores iniciales y se reconstruye desde la traza. La
+        línea de tiempo de CPU va solo si el Simulador la registra (Gantt).
+        """
+        arribados = self._procesos[: self._indice_siguiente_arribo]
+        inicio = array("q")
+        fin = array("q")
+        descartado = array("b")
+        rechazado = array("b")
+        for proceso in arribados:
+            estado = self._estado_metricas[proceso.id]
+            inicio.append(-1 if estado.tiempo_inicio_cpu is None else estado.tiempo_inicio_cpu)
+            fin.append(-1 if estado.tiempo_fin is None else estado.tiempo_fin)
+            descartado.append(1 if estado.descartado else 0)
+            rechazado.append(1 if estado.rechazado else 0)
+
+        return {
+            "linea_tiempo": (
+                None if self._linea_tiempo is None else self._linea_tiempo.exportar_estado()
+            ),
+            "tiempo_actual": self._tiempo_actual,
+            "indice_siguiente_arribo": self._indice_siguiente_arribo,
+            "inicio_cpu": inicio.tobytes(),
+            "fin": fin.tobytes(),
+            "descartado": descartado.tobytes(),
+            "rechazado": rechazado.tobytes(),
+            "scheduler": self._scheduler.exportar_estado(self._indice_de),  # type: ignore[attr-defined]
+            "memoria": self._gestor_memoria.exportar_estado(self._indice_de),
+        }
+
+    def restaurar_estado(self, estado: Dict[str, Any]) -> None:
+        """
+        Inverso de exportar_estado. Debe llamarse antes de run() sobre un
+        Simulador recién construido con la misma traza y configuración.
+        """
+        linea_tiempo = estado.get("linea_tiempo")
+        if self._linea_tiempo is not None and linea_tiempo is None and estado["tiempo_actual"] > 0:
+            raise ValueError(
+                "El estado guardado no incluye la línea de tiempo de CPU (se guardó sin Gantt)."
+            )
+        self._tiempo_actual = estado["tiempo_actual"]
+        self._indice_siguiente_arribo = estado["indice_siguiente_arribo"]
+
+        inicio = array("q", estado["inicio_cpu"])
+        fin = array("q", estado["fin"])
+        descartado = array("b", estado["descartado"])
+        rechazado = array("b", estado.get("rechazado", bytes(len(descartado))))
+        for i, proceso in enumerate(self._procesos[: self._indice_siguiente_arribo]):
+            metricas = self._estado_metricas[proceso.id]
+            metricas.tiempo_inicio_cpu = None if inicio[i] < 0 else inicio[i]
+            metricas.tiempo_fin = None if fin[i] < 0 else fin[i]
+            metricas.descartado = bool(descartado[i])
+            metricas.rechazado = bool(rechazado[i])
+            if metricas.tiempo_fin is not None:
+                proceso.tiempo_restante = 0
+
+        self._scheduler.restaurar_estado(estado["scheduler"], self._procesos)  # type: ignore[attr-defined]
+        self._gestor_memoria.restaurar_estado(estado["memoria"], self._procesos)
+
+        if self._linea_tiempo is not None and linea_tiempo is not None:
+            self._linea_tiempo.restaurar_estado(linea_tiempo)
+
     # ------------------------------------------------------------------
     # Métricas
     # ------------------------------------------------------------------
 
     def _calcular_metricas_finales(self) -> None:
         """
-        Calcula tiempos de retorno y espera para cada proceso NO descartado.
+        Calcula tiempos de retorno y espera para cada proceso NO descartado
+        ni rechazado.
 
         Fórmulas:
             retorno = tiempo_fin - tiempo_arribo
@@ -261,7 +789,7 @@ class Simulador:
         for proceso in self._procesos:
             estado = self._estado_metricas[proceso.id]
 
-            if estado.descartado:
+            if estado.descartado or estado.rechazado:
                 continue
 
             if estado.tiempo_fin is None:
@@ -270,16 +798,25 @@ class Simulador:
             estado.tiempo_retorno = estado.tiempo_fin - estado.tiempo_arribo
             estado.tiempo_espera = estado.tiempo_retorno - proceso.rafaga_cpu
 
-    def _imprimir_resumen_final(self) -> None:
+    def construir_resultado(self) -> "ResultadoSimulacion":
         """
-        Imprime resumen por proceso + métricas globales
-        (solo para procesos que realmente se ejecutaron).
+        Arma el ResultadoSimulacion (solo procesos que realmente se
+        ejecutaron). Requiere _calcular_metricas_finales().
         """
-        filas = []
+        filas: List[FilaResultado] = []
+        descartados: List[str] = []
+        rechazados: List[str] = []
         for proceso in self._procesos:
             estado = self._estado_metricas[proceso.id]
 
+            if estado.tiempo_arribo < self._metricas_desde:
+                continue
+
             if estado.descartado:
+                descartados.append(proceso.id)
+                continue
+            if estado.rechazado:
+                rechazados.append(proceso.id)
                 continue
 
             tiempo_respuesta = None
@@ -287,51 +824,38 @@ class Simulador:
                 tiempo_respuesta = estado.tiempo_inicio_cpu - estado.tiempo_arribo
 
             filas.append(
-                {
-                    "id": proceso.id,
-                    "arribo": estado.tiempo_arribo,
-                    "inicio_cpu": estado.tiempo_inicio_cpu,
-                    "fin": estado.tiempo_fin,
-                    "retorno": estado.tiempo_retorno,
-                    "espera": estado.tiempo_espera,
-                    "respuesta": tiempo_respuesta,
-                    "rafaga": proceso.rafaga_cpu,
-                }
+                FilaResultado(
+                    id=proceso.id,
+                    arribo=estado.tiempo_arribo,
+                    inicio_cpu=estado.tiempo_inicio_cpu,
+                    fin=estado.tiempo_fin,
+                    retorno=estado.tiempo_retorno,
+                    espera=estado.tiempo_espera,
+                    respuesta=tiempo_respuesta,
+                    rafaga=proceso.rafaga_cpu,
+                    vencimiento=proceso.vencimiento,
+                    grupo=proceso.grupo,
+                )
             )
 
-        n = len(filas)
-        if n == 0:
-            print("\n===== RESUMEN FINAL DE MÉTRICAS =====")
-            print("No hay procesos ejecutados (todos fueron descartados).")
-            print("=====================================\n")
-            return
-
-        suma_retorno = sum(f["retorno"] for f in filas if f["retorno"] is not None)
-        suma_espera = sum(f["espera"] for f in filas if f["espera"] is not None)
-        suma_respuesta = sum(
-            f["respuesta"] for f in filas if f["respuesta"] is not None
+        return ResultadoSimulacion.desde_filas(
+            filas, descartados, origen=self._metricas_desde, rechazados=rechazados
         )
-        promedio_retorno = suma_retorno / n if n > 0 else 0.0
-        promedio_espera = suma_espera / n if n > 0 else 0.0
-        promedio_respuesta = suma_respuesta / n if n > 0 else 0.0
 
-        tiempo_total = max(f["fin"] for f in filas if f["fin"] is not None)
-        throughput = n / tiempo_total if tiempo_total and tiempo_total > 0 else 0.0
+    @property
+    def resultado(self) -> Optional["ResultadoSimulacion"]:
+        """
+        Resultado de la última corrida (None si todavía no terminó).
+        """
+        return self._resultado
 
-        print("\n===== RESUMEN FINAL DE MÉTRICAS =====")
-        for f in filas:
-            print(
-                f"Proceso {f['id']}: arribo={f['arribo']}, "
-                f"inicio_cpu={f['inicio_cpu']}, fin={f['fin']}, "
-                f"retorno={f['retorno']}, espera={f['espera']}, "
-                f"respuesta={f['respuesta']}"
-            )
-        print("-------------------------------------")
-        print(f"Promedio retorno   : {promedio_retorno:.2f}")
-        print(f"Promedio espera    : {promedio_espera:.2f}")
-        print(f"Promedio respuesta : {promedio_respuesta:.2f}")
-        print(f"Throughput         : {throughput:.3f} procesos/unidad de tiempo")
-        print("=====================================\n")
+    def _imprimir_resumen_final(self) -> None:
+        """
+        Imprime resumen por proceso + métricas globales
+        (solo para procesos que realmente se ejecutaron).
+        """
+        self._resultado = self.construir_resultado()
+        self._resultado.imprimir()
 
     # ------------------------------------------------------------------
     # Snapshot
@@ -372,11 +896,117 @@ def ejecutar_simulacion(
     procesos: List[Proceso],
     gestor_memoria: GestorMemoria,
     verbose: bool = False,
-) -> None:
+    checkpoint: Optional[Any] = None,
+    reanudar_desde: Optional[str] = None,
+    perfilador: Optional[Any] = None,
+    ruta_pstats: Optional[str] = None,
+    cache: Optional[Any] = None,
+    ruta_gantt: Optional[str] = None,
+    ancho_gantt: int = 1200,
+    metricas_desde: int = 0,
+    scheduler: Optional[Scheduler] = None,
+    instantaneas: Optional[Any] = None,
+    observadores: Sequence[Any] = (),
+) -> Optional[ResultadoSimulacion]:
+    """
+    Arma el Simulador y lo ejecuta.
+
+    checkpoint:
+        Observador de checkpoints periódicos (checkpoint.CheckpointPeriodico).
+    reanudar_desde:
+        Ruta de un checkpoint a restaurar antes de correr.
+    perfilador:
+        perfilado.Perfilador; instrumenta las fases y reporta al final.
+    ruta_pstats:
+        Si se indica, la corrida se hace bajo cProfile y se guarda ahí.
+    cache:
+        cache_resultados.CacheResultados. Solo se usa en corridas completas
+        sin verbose, checkpoints ni perfilado; ante un acierto se imprime el
+        resumen guardado sin simular.
+    ruta_gantt:
+        Si se indica, exporta el diagrama de Gantt (SVG o HTML según la
+        extensión) con 'ancho_gantt' píxeles de ancho.
+    metricas_desde:
+        Ver Simulador; lo usan las corridas por ventana (--from/--to).
+    scheduler:
+        Planificador a usar (SrtfScheduler si es None).
+    instantaneas:
+        instantaneas.InstantaneasPrefijo. En corridas sin verbose,
+        checkpoints ni perfilado, reanuda desde el prefijo ya simulado más
+        largo de la traza y guarda instantáneas nuevas.
+    observadores:
+        Observadores extra (ver Simulador.agregar_observador), p. ej. el
+        tablero en vivo; con alguno no se toma el resultado de la caché.
+    """
     simulador = Simulador(
         procesos=procesos,
         gestor_memoria=gestor_memoria,
-        scheduler=SrtfScheduler(),
+        scheduler=scheduler or SrtfScheduler(),
         verbose=verbose,
+        # La línea de tiempo solo la usa el Gantt; sin él tampoco viaja en
+        # checkpoints ni instantáneas.
+        registrar_linea_tiempo=ruta_gantt is not None,
+        metricas_desde=metricas_desde,
+    )
+
+    # Corrida completa sin efectos por evento: admite caché e instantáneas.
+    corrida_simple = (
+        not verbose
+        and checkpoint is None
+        and reanudar_desde is None
+        and perfilador is None
+        and ruta_pstats is None
+    )
+    usar_cache = (
+        cache is not None and corrida_simple and ruta_gantt is None and not observadores
     )
-    simulador.run()
\ No newline at end of file
+    clave = None
+    if usar_cache:
+        from cache_resultados import clave_simulacion
+
+        clave = clave_simulacion(simulador)
+        guardado = cache.obtener(clave)  # type: ignore[union-attr]
+        if guardado is not None:
+            sys.stderr.write(f"Resultado tomado de la caché ({clave[:12]}).\n")
+            # La bitácora de admisiones y liberaciones no se guarda en la
+            # caché: se avisa en vez de omitirla en silencio.
+            print("(resultado desde caché; sin bitácora)")
+            guardado.imprimir()
+            return guardado
+
+    if reanudar_desde is not None:
+        from checkpoint import cargar_checkpoint
+
+        cargar_checkpoint(reanudar_desde, simulador)
+
+    if checkpoint is not None:
+        simulador.agregar_observador(checkpoint)
+    for observador in observadores:
+        simulador.agregar_observador(observador)
+
+    correr = simulador.run
+    if instantaneas is not None and corrida_simple:
+        correr = lambda: instantaneas.correr(simulador)  # noqa: E731
+    if perfilador is not None:
+        perfilador.instrumentar_simulador(simulador)
+        correr = lambda: perfilador.medir_corrida(simulador.run)  # noqa: E731
+
+    if ruta_pstats is not None:
+        from perfilado import correr_con_cprofile
+
+        correr_con_cprofile(correr, ruta_pstats)
+    else:
+        correr()
+
+    if perfilador is not None:
+        perfilador.imprimir_reporte()
+
+    if ruta_gantt is not None and simulador.linea_tiempo is not None:
+        from gantt import exportar_gantt
+
+        exportar_gantt(simulador.linea_tiempo, ruta_gantt, ancho=ancho_gantt)
+
+    if clave is not None and simulador.resultado is not None:
+        cache.guardar(clave, simulador.resultado)  # type: ignore[union-attr]
+
+    return simulador.resultado
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+Simulación en línea: arribos leídos a medida que el reloj los alcanza.
+
+Responsabilidades:
+    - Alimentar el Simulador desde un iterador de procesos (por ejemplo,
+      un CSV que llega por stdin desde 'tail -f'), con lookahead de uno.
+    - Mantener memoria acotada: los EstadoSimulacion de los procesos
+      terminados, descartados o rechazados por sobrecarga se pliegan en histogramas y se eliminan.
+    - Emitir métricas por ventana cada N unidades de tiempo simulado
+      (incluidos plazos incumplidos y tardanza si los procesos tienen
+      deadline); al final, métricas por grupo si la traza tiene grupos.
+
+Los arribos deben llegar en orden no decreciente de tiempo; a diferencia
+del modo por lotes, la simulación no puede ordenar lo que no leyó.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from memoria import GestorMemoria
+from fair_share import SIN_GRUPO
+from metricas_streaming import AgregadoPorGrupo, AgregadoTiempos, AgregadoVencimientos
+from planificador_srtf import Scheduler
+from procesos import Proceso
+from simulacion import EstadoSimulacion, Simulador
+
+
+class SimuladorEnLinea(Simulador):
+    """
+    Simulador que consume los arribos de un iterador de forma perezosa.
+
+    Parámetros extra:
+        fuente: iterable de Proceso ordenado por arribo.
+        ventana: si se indica, imprime métricas cada 'ventana' unidades de
+            tiempo simulado (sobre los procesos terminados en esa ventana).
+    """
+
+    def __init__(
+        self,
+        fuente: Iterable[Proceso],
+        gestor_memoria: GestorMemoria,
+        scheduler: Optional[Scheduler] = None,
+        verbose: bool = False,
+        ventana: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            procesos=[],
+            gestor_memoria=gestor_memoria,
+            scheduler=scheduler,
+            verbose=verbose,
+            registrar_linea_tiempo=False,
+        )
+        self.usar_camino_analitico = False
+        if ventana is not None and ventana <= 0:
+            raise ValueError("ventana debe ser > 0")
+
+        self._fuente: Iterator[Proceso] = iter(fuente)
+        self._proximo: Optional[Proceso] = None
+        self._fuente_agotada = False
+
+        self._agregado = AgregadoTiempos()
+        self._vencimientos = AgregadoVencimientos()
+        self._por_grupo = AgregadoPorGrupo()
+        self._hay_grupos = False
+        self._descartados = 0
+        self._rechazados = 0
+        self._arribados = 0
+        self._ultimo_grupo: List[Proceso] = []
+
+        self._ventana = ventana
+        self._agregado_ventana = AgregadoTiempos()
+        self._vencimientos_ventana = AgregadoVencimientos()
+        self._fin_ventana = ventana
+
+    @property
+    def arribados(self) -> int:
+        return self._arribados
+
+    @property
+    def total_procesos(self) -> Optional[int]:
+        return None
+
+    # ------------------------------------------------------------------
+    # Fuente de arribos (lookahead de un proceso)
+    # ------------------------------------------------------------------
+
+    def _espiar(self) -> Optional[Proceso]:
+        if self._proximo is None and not self._fuente_agotada:
+            self._proximo = next(self._fuente, None)
+            if self._proximo is None:
+                self._fuente_agotada = True
+        return self._proximo
+
+    def _quedan_arribos(self) -> bool:
+        return self._espiar() is not None
+
+    def _tiempo_proximo_arribo(self) -> Optional[int]:
+        proximo = self._espiar()
+        return None if proximo is None else proximo.arribo
+
+    def _extraer_arribos_en(self, instante: int) -> List[Proceso]:
+        grupo: List[Proceso] = []
+        while True:
+            proximo = self._espiar()
+            if proximo is None or proximo.arribo != instante:
+                break
+            self._proximo = None
+            if proximo.id in self._estado_metricas:
+                raise ValueError(f"ID de proceso duplicado en el sistema: {proximo.id}")
+            self._estado_metricas[proximo.id] = EstadoSimulacion(tiempo_arribo=proximo.arribo)
+            grupo.append(proximo)
+
+        self._arribados += len(grupo)
+        self._ultimo_grupo = grupo
+        return grupo
+
+    # ------------------------------------------------------------------
+    # Plegado de procesos terminados / descartados / rechazados
+    # ------------------------------------------------------------------
+
+    def _procesar_arribos_en_instante(self, instante: int) -> None:
+        super()._procesar_arribos_en_instante(instante)
+        for proceso in self._ultimo_grupo:
+            estado = self._estado_metricas.get(proceso.id)
+            if estado is not None and estado.descartado:
+                self._descartados += 1
+                del self._estado_metricas[proceso.id]
+        self._ultimo_grupo = []
+
+    def _proceso_rechazado(self, proceso: Proceso, estado: EstadoSimulacion) -> None:
+        self._rechazados += 1
+        del self._estado_metricas[proceso.id]
+
+    def _proceso_terminado(self, proceso: Proceso, estado: EstadoSimulacion) -> None:
+        assert estado.tiempo_fin is not None
+        self._emitir_ventanas_hasta(estado.tiempo_fin)
+
+        if proceso.grupo is not None and not self._hay_grupos:
+            # Hasta acá todos los terminados eran sin grupo: se parte del
+            # agregado global en vez de registrar por grupo desde el inicio.
+            self._hay_grupos = True
+            if self._agregado.completados:
+                sin_grupo = self._por_grupo.grupos[SIN_GRUPO] = AgregadoTiempos()
+                sin_grupo.combinar(self._agregado)
+        if self._hay_grupos:
+            self._por_grupo.registrar(
+                SIN_GRUPO if proceso.grupo is None else proceso.grupo,
+                estado.tiempo_arribo,
+                estado.tiempo_inicio_cpu,
+                estado.tiempo_fin,
+                proceso.rafaga_cpu,
+            )
+        for agregado in (self._agregado, self._agregado_ventana):
+            agregado.registrar(
+                arribo=estado.tiempo_arribo,
+                inicio_cpu=estado.tiempo_inicio_cpu,
+                fin=estado.tiempo_fin,
+                rafaga=proceso.rafaga_cpu,
+            )
+        if proceso.deadline is not None:
+            for vencimientos in (self._vencimientos, self._vencimientos_ventana):
+                vencimientos.registrar(estado.tiempo_fin, proceso.vencimiento)
+        del self._estado_metricas[proceso.id]
+
+    def _emitir_ventanas_hasta(self, tiempo: int) -> None:
+        """
+        Cierra todas las ventanas que terminan en o antes de 'tiempo'.
+        Las ventanas vacías se saltean sin imprimir.
+        """
+        if self._ventana is None or self._fin_ventana is None:
+            return
+        while tiempo >= self._fin_ventana:
+            inicio = self._fin_ventana - self._ventana
+            if self._agregado_ventana.completados:
+                self._imprimir_ventana(inicio, self._fin_ventana)
+                self._agregado_ventana.reiniciar()
+                self._vencimientos_ventana.reiniciar()
+                self._fin_ventana += self._ventana
+            else:
+                saltos = (tiempo - self._fin_ventana) // self._ventana + 1
+                self._fin_ventana += saltos * self._ventana
+
+    def _imprimir_ventana(self, inicio: int, fin: int) -> None:
+        completados = self._agregado_ventana.completados
+        print(
+            f"[ventana t={inicio}..{fin}) completados={completados} "
+            f"throughput={completados / self._ventana:.3f} "  # type: ignore[operator]
+            f"en_sistema={len(self._estado_metricas)}"
+        )
+        for linea in self._agregado_ventana.lineas_resumen():
+            print(f"    {linea}")
+        for linea in self._vencimientos_ventana.lineas_resumen():
+            print(f"    {linea}")
+
+    # ------------------------------------------------------------------
+    # Métricas finales
+    # ------------------------------------------------------------------
+
+    @property
+    def agregado(self) -> AgregadoTiempos:
+        return self._agregado
+
+    @property
+    def vencimientos(self) -> AgregadoVencimientos:
+        return self._vencimientos
+
+    @property
+    def por_grupo(self) -> AgregadoPorGrupo:
+        return self._por_grupo
+
+    def _calcular_metricas_finales(self) -> None:
+        if self._estado_metricas:
+            pendiente = next(iter(self._estado_metricas))
+            raise RuntimeError(f"Proceso {pendiente} no terminó")
+        if self._ventana is not None and self._agregado_ventana.completados:
+            assert self._fin_ventana is not None
+            self._imprimir_ventana(self._fin_ventana - self._ventana, self._fin_ventana)
+
+    def _imprimir_resumen_final(self) -> None:
+        completados = self._agregado.completados
+        print("\n===== RESUMEN FINAL DE MÉTRICAS (en línea) =====")
+        print(f"Procesos arribados : {self._arribados}")
+        print(f"Completados        : {completados}")
+        print(f"Descartados        : {self._descartados}")
+        if self._rechazados:
+            print(f"Rechazados         : {self._rechazados} (sobrecarga)")
+        if completados == 0:
+            print("No hay procesos ejecutados (todos fueron descartados).")
+            print("================================================\n")
+            return
+
+        print("------------------------------------------------")
+        for linea in self._agregado.lineas_resumen():
+            print(linea)
+        tiempo_total = self._agregado.ultimo_fin
+        throughput = completados / tiempo_total if tiempo_total > 0 else 0.0
+        print(f"Throughput         : {throughput:.3f} procesos/unidad de tiempo")
+        if self._vencimientos.con_plazo:
+            print("------------------------------------------------")
+            for linea in self._vencimientos.lineas_resumen():
+                print(linea)
+        if self._hay_grupos:
+            print("------------------------------------------------")
+            for linea in self._por_grupo.lineas_resumen():
+                print(linea)
+        print("================================================\n")
+
+
+def ejecutar_simulacion_en_linea(
+    fuente: Iterable[Proceso],
+    gestor_memoria: GestorMemoria,
+    verbose: bool = False,
+    ventana: Optional[int] = None,
+    scheduler: Optional[Scheduler] = None,
+    observadores: Sequence[Any] = (),
+) -> None:
+    simulador = SimuladorEnLinea(
+        fuente=fuente,
+        gestor_memoria=gestor_memoria,
+        scheduler=scheduler,
+        verbose=verbose,
+        ventana=ventana,
+    )
+    for observador in observadores:
+        simulador.agregar_observador(observador)
+    simulador.run()
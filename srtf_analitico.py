@@ -0,0 +1,288 @@
+"""
+Camino rápido para los tramos de una corrida en los que la memoria no
+restringe.
+
+Mientras todo proceso que cabe en alguna partición entra apenas arriba
+(hay partición libre adecuada y no se alcanzó el grado de
+multiprogramación), la corrida es SRTF puro sobre una CPU: se puede
+calcular con un barrido sobre los arribos ordenados y un heap, sin
+eventos, sin GestorMemoria y sin el Scheduler.
+
+Responsabilidades:
+    - Pre-chequeo barato: un proceso sigue en el sistema al menos hasta
+      arribo + ráfaga, así que en cada arribo hay una cota inferior de los
+      presentes. Si ya en los primeros arribos esos superan el grado o no
+      caben juntos en las particiones (condición de Hall), no vale la pena
+      intentar el barrido.
+    - Barrido SRTF con exactamente las mismas reglas de desempate que
+      SrtfScheduler (FIN_CPU antes que ARRIBO, desalojo solo con restante
+      estrictamente menor, heap por (restante, instante, secuencia)),
+      reproduciendo en línea la admisión Best-Fit.
+    - En el primer grupo de arribos que no entraría directo, devolver el
+      estado en el formato de Simulador.exportar_estado para que el motor
+      general siga desde ese instante.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from procesos import Proceso
+
+# (inicio_cpu, fin) por proceso; inicio o fin en None si todavía no ocurrió
+Tiempos = List[Tuple[Optional[int], Optional[int]]]
+# (inicio, fin, índice del proceso)
+Tramo = Tuple[int, int, int]
+
+# Si la presión de memoria es segura antes de este arribo, no se intenta.
+ARRIBOS_MINIMOS = 64
+
+
+def _tamanios_usuario(gestor: Any) -> List[int]:
+    return [p.tamanio for p in gestor.particiones if not p.es_so]
+
+
+def arribos_sin_presion_segura(
+    procesos: Sequence[Proceso],
+    gestor: Any,
+    limite: Optional[int] = None,
+) -> int:
+    """
+    Cantidad de arribos iniciales antes del primero en el que la presión de
+    memoria es segura: los procesos que seguro siguen presentes
+    (arribo_j <= t < arribo_j + rafaga_j) superan el grado o no caben a la
+    vez. Con "cabe si tamaño >= memoria" Hall se reduce a: para la k-ésima
+    partición más grande, a lo sumo k presentes piden más que ella.
+    Se detiene al llegar a 'limite'. 'procesos' debe estar ordenado por
+    arribo.
+    """
+    tamanios = sorted(_tamanios_usuario(gestor), reverse=True)
+    maximo = tamanios[0]
+    capacidad = min(gestor.grado_multiprogramacion_max, len(tamanios))
+    # exceso[k] = presentes que no caben en la (k+1)-ésima más grande
+    exceso = [0] * len(tamanios)
+    presentes: List[Tuple[int, int]] = []
+
+    fin = len(procesos) if limite is None else min(limite, len(procesos))
+    for i in range(fin):
+        p = procesos[i]
+        memoria = int(p.memoria)
+        if memoria > maximo:
+            continue
+        while presentes and presentes[0][0] <= p.arribo:
+            _, m = heapq.heappop(presentes)
+            for k, t in enumerate(tamanios):
+                if m > t:
+                    exceso[k] -= 1
+        heapq.heappush(presentes, (p.arribo + int(p.rafaga_cpu), memoria))
+        if len(presentes) > capacidad:
+            return i
+        for k, t in enumerate(tamanios):
+            if memoria > t:
+                exceso[k] += 1
+                if exceso[k] > k:
+                    return i
+    return fin
+
+
+def _admitir_grupo(
+    memorias: Sequence[int],
+    libres: List[Tuple[int, int]],
+    en_memoria: int,
+    grado: int,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Best-Fit de un grupo de arribos simultáneos sobre 'libres' (ordenada
+    por (tamaño, orden)). Devuelve la partición de cada uno, o None (sin
+    modificar 'libres') si alguno no entraría directo.
+    """
+    if en_memoria + len(memorias) > grado:
+        return None
+    if len(memorias) == 1:
+        j = bisect.bisect_left(libres, (memorias[0], -1))
+        return None if j == len(libres) else [libres.pop(j)]
+
+    disponibles = list(libres)
+    asignadas = []
+    for memoria in memorias:
+        j = bisect.bisect_left(disponibles, (memoria, -1))
+        if j == len(disponibles):
+            return None
+        asignadas.append(disponibles.pop(j))
+    libres[:] = disponibles
+    return asignadas
+
+
+def barrido_srtf(
+    procesos: Sequence[Proceso],
+    gestor: Any,
+    tramos: Optional[List[Tramo]] = None,
+) -> Tuple[Tiempos, Optional[Dict[str, Any]]]:
+    """
+    SRTF con desalojo sobre una CPU con admisión inmediata. Replica el
+    orden de eventos del Simulador con SrtfScheduler y la elección
+    Best-Fit del GestorMemoria (desempate por orden de partición).
+
+    Devuelve (tiempos, estado): 'estado' es None si la corrida terminó; si
+    no, es el estado del simulador justo antes del primer grupo de arribos
+    que no entraría directo (ver Simulador.restaurar_estado), sin métricas
+    ni línea de tiempo, que quedan en 'tiempos' y 'tramos'.
+    """
+    n = len(procesos)
+    inicio: List[Optional[int]] = [None] * n
+    fin: List[Optional[int]] = [None] * n
+
+    grado = gestor.grado_multiprogramacion_max
+    tamanios = _tamanios_usuario(gestor)
+    maximo = max(tamanios)
+    libres = sorted((t, k) for k, t in enumerate(tamanios))
+    particion: Dict[int, Tuple[int, int]] = {}
+    en_memoria = 0
+
+    cola: List[Tuple[int, int, int, int]] = []
+    secuencia = 0
+    actual = -1
+    restante = 0
+    t = 0
+    i = 0
+    heappush, heappop = heapq.heappush, heapq.heappop
+    bisect_left, insort = bisect.bisect_left, bisect.insort
+
+    while i < n or actual >= 0:
+        if actual >= 0 and (i >= n or t + restante <= procesos[i].arribo):
+            if tramos is not None:
+                tramos.append((t, t + restante, actual))
+            t += restante
+            fin[actual] = t
+            insort(libres, particion.pop(actual))
+            en_memoria -= 1
+            if cola:
+                # La clave es el restante: en la cola nadie ejecuta.
+                restante, _, _, actual = heappop(cola)
+                if inicio[actual] is None:
+                    inicio[actual] = t
+            else:
+                actual = -1
+            continue
+
+        llegada = procesos[i].arribo
+        if actual >= 0:
+            if tramos is not None and llegada > t:
+                tramos.append((t, llegada, actual))
+            restante -= llegada - t
+        t = llegada
+
+        fin_grupo = i + 1
+        while fin_grupo < n and procesos[fin_grupo].arribo == llegada:
+            fin_grupo += 1
+        asignadas: Optional[Sequence[Tuple[int, int]]]
+        if fin_grupo == i + 1:
+            # Caso común: un solo arribo en el instante.
+            memoria = int(procesos[i].memoria)
+            grupo: Sequence[int] = ()
+            asignadas = ()
+            if memoria <= maximo:
+                grupo = (i,)
+                k = bisect_left(libres, (memoria, -1))
+                asignadas = (
+                    None if en_memoria >= grado or k == len(libres) else (libres.pop(k),)
+                )
+        else:
+            grupo = [j for j in range(i, fin_grupo) if int(procesos[j].memoria) <= maximo]
+            asignadas = _admitir_grupo(
+                [int(procesos[j].memoria) for j in grupo], libres, en_memoria, grado
+            )
+        if asignadas is None:
+            estado = _estado_simulador(
+                gestor, t, i, actual, restante, cola, secuencia, particion
+            )
+            return list(zip(inicio[:i], fin[:i])), estado
+
+        for j, asignada in zip(grupo, asignadas):
+            particion[j] = asignada
+            en_memoria += 1
+            rafaga = int(procesos[j].rafaga_cpu)
+            if actual < 0:
+                actual, restante = j, rafaga
+                inicio[j] = t
+            elif rafaga < restante:
+                secuencia += 1
+                heappush(cola, (restante, t, secuencia, actual))
+                actual, restante = j, rafaga
+                inicio[j] = t
+            else:
+                secuencia += 1
+                heappush(cola, (rafaga, t, secuencia, j))
+        i = fin_grupo
+
+    return list(zip(inicio, fin)), None
+
+
+def _estado_simulador(
+    gestor: Any,
+    tiempo: int,
+    siguiente: int,
+    actual: int,
+    restante: int,
+    cola: List[Tuple[int, int, int, int]],
+    secuencia: int,
+    particion: Dict[int, Tuple[int, int]],
+) -> Dict[str, Any]:
+    """
+    Estado en el formato de Simulador.exportar_estado (sin las columnas de
+    métricas, que completa el Simulador).
+    """
+    ocupantes: Dict[int, int] = {k: j for j, (_, k) in particion.items()}
+    particiones = []
+    k = 0
+    for p in gestor.particiones:
+        ocupante = None
+        if not p.es_so:
+            ocupante = ocupantes.get(k)
+            k += 1
+        particiones.append((p.id_particion, p.base, p.tamanio, p.es_so, ocupante))
+
+    return {
+        "linea_tiempo": None,
+        "tiempo_actual": tiempo,
+        "indice_siguiente_arribo": siguiente,
+        "scheduler": {
+            "nombre": "srtf",
+            "actual": None if actual < 0 else actual,
+            "actual_restante": None if actual < 0 else restante,
+            "cola": [
+                (clave, orden, sec, indice, clave)
+                for clave, orden, sec, indice in cola
+            ],
+            "tiempo_actual": tiempo,
+            "secuencia": secuencia,
+        },
+        "memoria": {
+            "grado_max": gestor.grado_multiprogramacion_max,
+            "politica_espera": gestor.politica_espera,
+            "en_memoria_usuario": len(particion),
+            "particiones": particiones,
+            "cola_espera": [],
+        },
+    }
+
+
+def evaluar(
+    procesos: Sequence[Proceso],
+    gestor: Any,
+    tramos: Optional[List[Tramo]] = None,
+) -> Optional[Tuple[Tiempos, Optional[Dict[str, Any]]]]:
+    """
+    Resultado de barrido_srtf, o None si la presión de memoria es segura
+    desde los primeros arribos y conviene usar directamente el motor
+    general. 'procesos' debe estar ordenado por arribo (como
+    Simulador._procesos) y 'gestor' sin procesos asignados ni en espera.
+    """
+    if not procesos or gestor.grado_multiprogramacion_actual or gestor.cola_espera:
+        return None
+    minimo = min(ARRIBOS_MINIMOS, len(procesos))
+    if arribos_sin_presion_segura(procesos, gestor, limite=minimo) < minimo:
+        return None
+    return barrido_srtf(procesos, gestor, tramos)
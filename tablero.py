@@ -0,0 +1,294 @@
+"""
+Tablero en vivo de una simulación, servido por HTTP con Server-Sent Events.
+
+Responsabilidades:
+    - Observar el Simulador (agregar_observador) sin frenarlo: por evento
+      solo se cuentan eventos y fines de CPU; cada MUESTREO eventos se mira
+      el reloj y, si pasó el intervalo, se arma un cuadro chico (reloj,
+      CPU, particiones, cola de espera, avance) y se agrega a un deque
+      acotado. deque.append es atómico y nunca bloquea: si el renderizador
+      se atrasa, los cuadros viejos se caen solos.
+    - En un hilo aparte, un loop asyncio sirve la página (GET /) y el flujo
+      de eventos (GET /eventos). Cada intervalo toma solo el último cuadro
+      (los intermedios se descartan) y lo envía a cada cliente; a un
+      cliente con el buffer de envío lleno se le salta el cuadro en vez de
+      esperarlo.
+
+La simulación nunca espera al tablero; con el tablero activo se pierde el
+camino analítico de SRTF (que no ve eventos), como con cualquier observador.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+PUERTO_DEFAULT = 8766
+# Eventos entre dos lecturas del reloj (potencia de 2, se usa como máscara).
+MUESTREO = 64
+# Bytes pendientes de envío a partir de los cuales se saltea a un cliente.
+BUFFER_MAXIMO = 64 * 1024
+
+_PAGINA = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Simulador SO</title>
+<style>
+body{font-family:monospace;margin:2em;background:#fafafa}
+td,th{padding:2px 10px;text-align:left}
+.barra{width:400px;height:12px;background:#ddd}.barra div{height:100%;background:#4a7}
+</style></head><body>
+<h2>Simulación en vivo</h2>
+<div id="estado">esperando datos...</div>
+<div class="barra"><div id="avance" style="width:0"></div></div>
+<table><thead><tr><th>Partición</th><th>Tamaño</th><th>Proceso</th></tr></thead>
+<tbody id="particiones"></tbody></table>
+<script>
+const fuente = new EventSource("/eventos");
+fuente.onmessage = (e) => {
+  const c = JSON.parse(e.data);
+  const cpu = c.cpu ? `${c.cpu} (restante ${c.restante})` : "libre";
+  document.getElementById("estado").textContent =
+    `t=${c.t}  eventos=${c.eventos}  eventos/s=${c.eventos_por_segundo}  CPU=${cpu}  ` +
+    `en memoria=${c.en_memoria}  en espera=${c.en_espera}  terminados=${c.terminados}  ` +
+    `arribados=${c.arribados}${c.total ? "/" + c.total : ""}${c.fin ? "  (FIN)" : ""}`;
+  if (c.total) document.getElementById("avance").style.width = (100 * c.arribados / c.total) + "%";
+  document.getElementById("particiones").innerHTML = c.particiones
+    .map(([id, tam, p]) => `<tr><td>${id}</td><td>${tam}K</td><td>${p ?? "-"}</td></tr>`).join("");
+  if (c.fin) fuente.close();
+};
+</script></body></html>
+"""
+
+
+class Tablero:
+    """
+    Observador del Simulador + servidor SSE en un hilo propio.
+
+    iniciar() levanta el servidor (OSError si el puerto está ocupado);
+    finalizar() publica el cuadro final y lo detiene.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        puerto: int = PUERTO_DEFAULT,
+        intervalo: float = 0.1,
+        max_cuadros: int = 64,
+    ) -> None:
+        if intervalo <= 0 or max_cuadros <= 0:
+            raise ValueError("intervalo y max_cuadros deben ser > 0")
+        self.host = host
+        self.puerto = puerto
+        self._intervalo = intervalo
+        self._cuadros: Deque[Dict[str, Any]] = deque(maxlen=max_cuadros)
+
+        self._eventos = 0
+        self._terminados = 0
+        self._proximo = 0.0
+        self._inicio = time.monotonic()
+        self._simulador: Optional[Any] = None
+
+        self._hilo: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._parada: Optional[asyncio.Event] = None
+        self._listo = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._clientes: Set[asyncio.StreamWriter] = set()
+        self._atenciones: Set["asyncio.Task[None]"] = set()
+        self._ultimo: Optional[bytes] = None
+        # Cuadros que no llegaron a enviarse (coalescidos o salteados)
+        self.descartados = 0
+        self.enviados = 0
+
+    # ------------------------------------------------------------------
+    # Lado de la simulación
+    # ------------------------------------------------------------------
+
+    def despues_de_evento(self, simulador: Any, evento: str, tiempo: int) -> None:
+        self._eventos += 1
+        self._simulador = simulador
+        if evento == "FIN_CPU":
+            self._terminados += 1
+        if self._eventos & (MUESTREO - 1):
+            return
+        ahora = time.monotonic()
+        if ahora < self._proximo:
+            return
+        self._proximo = ahora + self._intervalo
+        self._cuadros.append(self._cuadro(simulador, tiempo, ahora))
+
+    def _cuadro(self, simulador: Any, tiempo: int, ahora: float, fin: bool = False) -> Dict[str, Any]:
+        proceso_cpu = simulador.scheduler.proceso_en_cpu()
+        gestor = simulador.gestor_memoria
+        transcurrido = ahora - self._inicio
+        return {
+            "t": tiempo,
+            "eventos": self._eventos,
+            "eventos_por_segundo": round(self._eventos / transcurrido) if transcurrido > 0 else 0,
+            "cpu": None if proceso_cpu is None else proceso_cpu.id,
+            "restante": None if proceso_cpu is None else proceso_cpu.tiempo_restante,
+            "particiones": [
+                [p.id_particion, p.tamanio, None if p.proceso is None else p.proceso.id]
+                for p in gestor.particiones
+                if not p.es_so
+            ],
+            "en_memoria": gestor.grado_multiprogramacion_actual,
+            "en_espera": gestor.cantidad_en_espera,
+            "terminados": self._terminados,
+            "arribados": simulador.arribados,
+            "total": simulador.total_procesos,
+            "fin": fin,
+        }
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def iniciar(self) -> None:
+        self._inicio = time.monotonic()
+        self._hilo = threading.Thread(target=self._correr, name="tablero", daemon=True)
+        self._hilo.start()
+        self._listo.wait()
+        if isinstance(self._error, OSError):
+            raise OSError(f"no se pudo abrir el tablero: {self._error}")
+        if self._error is not None:
+            raise self._error
+        sys.stderr.write(f"Tablero en http://{self.host}:{self.puerto}/\n")
+
+    def finalizar(self, espera: float = 1.0) -> None:
+        """
+        Publica el estado final (si se llegó a observar algún evento) y,
+        tras dar hasta 'espera' segundos para enviarlo, detiene el servidor.
+        """
+        if self._hilo is None or self._loop is None or self._parada is None:
+            return
+        simulador = self._simulador
+        if simulador is not None:
+            self._cuadros.append(
+                self._cuadro(simulador, simulador.tiempo_actual, time.monotonic(), fin=True)
+            )
+        self._loop.call_soon_threadsafe(self._parada.set)
+        self._hilo.join(espera + 2 * self._intervalo)
+
+    def _correr(self) -> None:
+        try:
+            asyncio.run(self._servir())
+        except BaseException as e:  # noqa: BLE001 (se relanza en iniciar)
+            self._error = e
+            self._listo.set()
+
+    async def _servir(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._parada = asyncio.Event()
+        servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+        self.puerto = servidor.sockets[0].getsockname()[1]
+        self._listo.set()
+        async with servidor:
+            while not self._parada.is_set():
+                try:
+                    await asyncio.wait_for(self._parada.wait(), self._intervalo)
+                except asyncio.TimeoutError:
+                    pass
+                self._difundir()
+            # Último cuadro (fin): se da un momento para vaciar los buffers
+            # y se espera a que terminen las conexiones abiertas.
+            for escritor in list(self._clientes):
+                try:
+                    await asyncio.wait_for(escritor.drain(), 1.0)
+                except (asyncio.TimeoutError, ConnectionError):
+                    pass
+                escritor.close()
+            if self._atenciones:
+                await asyncio.wait(self._atenciones, timeout=1.0)
+
+    # ------------------------------------------------------------------
+    # Lado del renderizador (hilo del tablero)
+    # ------------------------------------------------------------------
+
+    def _difundir(self) -> None:
+        cuadro = None
+        while True:
+            try:
+                siguiente = self._cuadros.popleft()
+            except IndexError:
+                break
+            if cuadro is not None:
+                self.descartados += 1
+            cuadro = siguiente
+        if cuadro is None:
+            return
+
+        datos = f"data: {json.dumps(cuadro, separators=(',', ':'))}\n\n".encode()
+        self._ultimo = datos
+        for escritor in list(self._clientes):
+            if escritor.is_closing():
+                self._clientes.discard(escritor)
+            elif escritor.transport.get_write_buffer_size() > BUFFER_MAXIMO:
+                self.descartados += 1
+            else:
+                escritor.write(datos)
+                self.enviados += 1
+
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        tarea = asyncio.current_task()
+        assert tarea is not None
+        self._atenciones.add(tarea)
+        try:
+            await self._responder(lector, escritor)
+        finally:
+            self._atenciones.discard(tarea)
+
+    async def _responder(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        try:
+            primera = (await lector.readuntil(b"\r\n\r\n")).split(b"\r\n", 1)[0].decode("latin-1")
+            partes = primera.split(" ")
+            ruta = partes[1].split("?", 1)[0] if len(partes) > 1 else ""
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            escritor.close()
+            return
+
+        if ruta == "/":
+            cuerpo = _PAGINA.encode()
+            escritor.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(cuerpo), cuerpo)
+            )
+            await escritor.drain()
+            escritor.close()
+            return
+        if ruta != "/eventos":
+            escritor.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            escritor.close()
+            return
+
+        escritor.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+        )
+        if self._ultimo is not None:
+            escritor.write(self._ultimo)
+        self._clientes.add(escritor)
+        try:
+            # El cliente no manda nada más: se espera a que cierre.
+            await lector.read()
+        except ConnectionError:
+            pass
+        finally:
+            self._clientes.discard(escritor)
+            escritor.close()
+
+
+def direccion_tablero(texto: str) -> List[Any]:
+    """
+    'PUERTO' o 'HOST:PUERTO' -> [host, puerto] (ValueError si no es válida).
+    """
+    host, _, puerto = texto.rpartition(":")
+    try:
+        numero = int(puerto)
+    except ValueError:
+        raise ValueError(f"Dirección del tablero inválida: '{texto}' (se esperaba [HOST:]PUERTO)") from None
+    return [host or "127.0.0.1", numero]
@@ -0,0 +1,80 @@
+"""
+La simulación aproximada contra una corrida completa de la misma traza.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import aproximado
+import generador
+from io_metricas import cargar_procesos
+from memoria import GestorMemoria
+from replicas import valores_resultado
+from simulacion import Simulador
+
+CUBIERTAS = (
+    "espera_media",
+    "espera_p95",
+    "retorno_media",
+    "retorno_p95",
+    "respuesta_media",
+    "respuesta_p95",
+    "throughput",
+)
+
+
+@pytest.fixture(scope="module")
+def traza(tmp_path_factory: pytest.TempPathFactory) -> str:
+    # Carga ofrecida ~0.6: sistema estable, donde el muestreo aplica.
+    ruta = str(tmp_path_factory.mktemp("aproximado") / "traza.csv")
+    generador.generar_traza(
+        ruta, 50_000, semilla=11, arribos="poisson:0.1", rafagas="exponencial:6"
+    )
+    return ruta
+
+
+@pytest.fixture(scope="module")
+def exactos(traza: str) -> dict:
+    simulador = Simulador(
+        cargar_procesos(traza),
+        GestorMemoria(grado_multiprogramacion_max=5, silencioso=True),
+        registrar_linea_tiempo=False,
+    )
+    simulador.run()
+    assert simulador.resultado is not None
+    return valores_resultado(simulador.resultado)
+
+
+@pytest.fixture(scope="module")
+def aproximacion(traza: str) -> aproximado.ResultadoAproximado:
+    return aproximado.aproximar(
+        traza, estratos=10, tajada=2_500, calentamiento=1_000, min_grupos=6, max_grupos=6
+    )
+
+
+@pytest.mark.parametrize("metrica", CUBIERTAS)
+def test_intervalo_cubre_la_corrida_completa(
+    aproximacion: aproximado.ResultadoAproximado, exactos: dict, metrica: str
+) -> None:
+    intervalo = aproximacion.intervalo(metrica)
+    assert abs(intervalo.media - exactos[metrica]) <= intervalo.semiancho
+
+
+def test_simula_solo_una_parte_de_la_traza(aproximacion: aproximado.ResultadoAproximado) -> None:
+    assert len(aproximacion.grupos) == 6
+    assert aproximacion.simulados < aproximacion.procesos
+    assert aproximacion.carga < aproximado.CARGA_SATURACION
+
+
+def test_no_depende_de_workers(traza: str, aproximacion: aproximado.ResultadoAproximado) -> None:
+    en_paralelo = aproximado.aproximar(
+        traza,
+        estratos=10,
+        tajada=2_500,
+        calentamiento=1_000,
+        min_grupos=6,
+        max_grupos=6,
+        workers=2,
+    )
+    assert en_paralelo.intervalos == aproximacion.intervalos
@@ -0,0 +1,72 @@
+"""
+Reanudación de checkpoints con el mismo planificador y con otro.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, List
+
+import pytest
+
+from checkpoint import cargar_checkpoint, guardar_checkpoint
+from fair_share import FairShareScheduler
+from memoria import GestorMemoria
+from planificador_srtf import SrtfScheduler
+from procesos import Proceso
+from simulacion import Simulador
+from tiempo_real import EdfScheduler, RmScheduler
+
+
+def _traza() -> List[Proceso]:
+    rng = random.Random(5)
+    t = 0
+    procesos = []
+    for i in range(300):
+        t += rng.randint(0, 4)
+        procesos.append(
+            Proceso(
+                f"P{i}",
+                t,
+                rng.randint(1, 20),
+                rng.randint(10, 240),
+                deadline=rng.randint(10, 80),
+                grupo=rng.choice(("a", "b", "org/x")),
+            )
+        )
+    return procesos
+
+
+def _simulador(planificador: Any) -> Simulador:
+    return Simulador(_traza(), GestorMemoria(silencioso=True), scheduler=planificador)
+
+
+PLANIFICADORES: List[Callable[[], Any]] = [
+    SrtfScheduler,
+    EdfScheduler,
+    RmScheduler,
+    FairShareScheduler,
+    lambda: FairShareScheduler(pesos={"a": 3.0}),
+    lambda: FairShareScheduler(intra="fcfs"),
+]
+
+
+@pytest.mark.parametrize("guardado", range(len(PLANIFICADORES)))
+@pytest.mark.parametrize("reanudado", range(len(PLANIFICADORES)))
+def test_solo_reanuda_con_el_mismo_planificador(
+    tmp_path: Any, guardado: int, reanudado: int
+) -> None:
+    ruta = str(tmp_path / "ck.bin")
+    simulador = _simulador(PLANIFICADORES[guardado]())
+    simulador.ejecutar_hasta(300)
+    guardar_checkpoint(simulador, ruta)
+
+    nuevo = _simulador(PLANIFICADORES[reanudado]())
+    if guardado != reanudado:
+        with pytest.raises(ValueError, match="planificador|configuración"):
+            cargar_checkpoint(ruta, nuevo)
+        return
+
+    cargar_checkpoint(ruta, nuevo)
+    completo = _simulador(PLANIFICADORES[guardado]())
+    assert nuevo.simular().filas == completo.simular().filas
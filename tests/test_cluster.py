@@ -0,0 +1,29 @@
+"""
+Despacho del cluster después de un hueco sin arribos.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from cluster import simular_cluster
+from procesos import Proceso
+
+
+def _traza() -> list:
+    procesos = []
+    # Antes de t=100: tres trabajos largos al nodo 0 y tres cortos al nodo 1.
+    for i in range(3):
+        procesos.append(Proceso(f"L{i}", 0, 1000, 10))
+        procesos.append(Proceso(f"C{i}", 0, 1, 10))
+    # Mucho después, con los dos nodos ociosos: cuatro arribos simultáneos.
+    procesos.extend(Proceso(f"N{i}", 10_000, 10, 10) for i in range(4))
+    return procesos
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_hueco_despacha_con_la_carga_al_inicio_de_la_ventana(workers: int) -> None:
+    resultado = simular_cluster(_traza(), nodos=2, despacho="menos-cargado", workers=workers)
+    assert [n.asignados for n in resultado.nodos] == [5, 5]
+    # En el nodo 1 solo los dos últimos esperan (0 y 10), no 0/10/20.
+    assert resultado.nodos[1].agregado.histogramas["espera"].maximo == 10
@@ -0,0 +1,56 @@
+"""
+Fair-share con un proceso largo de un grupo y arribos continuos de otro.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import pytest
+
+from fair_share import FairShareScheduler
+from memoria import GestorMemoria
+from procesos import Proceso
+from simulacion import Simulador
+
+
+def _simular(pesos: Optional[Dict[str, float]] = None) -> Simulador:
+    # b: un trabajo de 200 en t=0. a: 100 trabajos de 2, uno cada 2
+    # unidades, que en buena parte esperan memoria y no llegan al
+    # planificador como arribos.
+    procesos = [Proceso("B0", 0, 200, 10, grupo="b")]
+    procesos += [Proceso(f"A{i}", 2 * i, 2, 10, grupo="a") for i in range(100)]
+    simulador = Simulador(
+        procesos, GestorMemoria(silencioso=True), scheduler=FairShareScheduler(pesos)
+    )
+    simulador.simular()
+    return simulador
+
+
+def _cpu_hasta(simulador: Simulador, limite: int) -> Dict[str, int]:
+    linea = simulador.linea_tiempo
+    assert linea is not None
+    cpu: Dict[str, int] = {}
+    for a, b, p in zip(linea.inicio, linea.fin, linea.pid):
+        grupo = linea.ids[p][0]
+        cpu[grupo] = cpu.get(grupo, 0) + max(0, min(b, limite) - a)
+    return cpu
+
+
+def test_un_proceso_largo_no_retiene_la_cpu() -> None:
+    simulador = _simular()
+    # Pesos iguales: mitad y mitad mientras los dos grupos tienen trabajo
+    # (sin decisiones por tiempo, B0 corría de t=4 a t=202).
+    for limite in (50, 100, 200):
+        cpu = _cpu_hasta(simulador, limite)
+        assert abs(cpu["A"] - cpu["B"]) <= 2
+    resultado = simulador.resultado
+    assert resultado is not None
+    esperas = [f.espera for f in resultado.filas if f.id.startswith("A")]
+    assert sum(esperas) / len(esperas) < 110
+
+
+@pytest.mark.parametrize("peso", [3.0, 1 / 3])
+def test_reparte_segun_los_pesos(peso: float) -> None:
+    cpu = _cpu_hasta(_simular({"a": peso}), 200)
+    assert abs(cpu["A"] - 200 * peso / (peso + 1)) <= 2
@@ -0,0 +1,81 @@
+"""
+agregar_lote contra agregar_proceso llamado una vez por proceso.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, List, Tuple
+
+import pytest
+
+from planificador_srtf import SrtfScheduler
+from procesos import Proceso
+from tiempo_real import EdfScheduler
+
+
+def _estado(planificador: SrtfScheduler) -> Tuple[Any, ...]:
+    actual = planificador.proceso_en_cpu()
+    return (
+        None if actual is None else (actual.id, actual.tiempo_restante),
+        # heapify y heappush dejan el heap en distinto orden físico; lo que
+        # debe coincidir son las entradas (y con ellas el orden de salida).
+        sorted(
+            (e.tiempo_restante, e.orden_llegada, e.secuencia, e.proceso.id)
+            for e in planificador._cola_listos
+        ),
+        planificador._secuencia,
+        planificador.tiempo_actual,
+        planificador.historial_cambios,
+    )
+
+
+def _lotes(semilla: int) -> List[List[Proceso]]:
+    rng = random.Random(semilla)
+    lotes = []
+    t = 0
+    for i in range(60):
+        t += rng.randint(0, 4)
+        lotes.append(
+            [
+                Proceso(
+                    id=f"P{i}_{j}",
+                    arribo=t,
+                    rafaga_cpu=rng.randint(1, 20),
+                    memoria=10,
+                    deadline=rng.randint(5, 60),
+                )
+                for j in range(rng.choice((1, 2, 3, 8, 40)))
+            ]
+        )
+    return lotes
+
+
+def _correr(clase: type, semilla: int, en_lote: bool) -> List[Tuple[Any, ...]]:
+    planificador = clase()
+    estados = []
+    anterior = 0
+    for lote in _lotes(semilla):
+        t = lote[0].arribo
+        planificador.avanzar_tiempo(t - anterior)
+        anterior = t
+        actual = planificador.proceso_en_cpu()
+        if actual is not None and actual.tiempo_restante == 0:
+            planificador.sacar_proceso_actual()
+        if en_lote:
+            entraron = [p.id for p in planificador.agregar_lote(lote, t)]
+        else:
+            entraron = []
+            for proceso in lote:
+                previo = planificador.proceso_en_cpu()
+                planificador.agregar_proceso(proceso, t)
+                if planificador.proceso_en_cpu() is not previo:
+                    entraron.append(planificador.proceso_en_cpu().id)
+        estados.append((entraron, _estado(planificador)))
+    return estados
+
+
+@pytest.mark.parametrize("clase", [SrtfScheduler, EdfScheduler])
+@pytest.mark.parametrize("semilla", range(5))
+def test_lote_equivale_a_agregar_de_a_uno(clase: type, semilla: int) -> None:
+    assert _correr(clase, semilla, en_lote=True) == _correr(clase, semilla, en_lote=False)
@@ -0,0 +1,57 @@
+"""
+El camino analítico de SRTF contra el motor de eventos en la misma traza.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, List, Tuple
+
+import pytest
+
+from memoria import GestorMemoria
+from procesos import Proceso
+from simulacion import Simulador
+from srtf_analitico import evaluar
+
+
+def _traza(semilla: int, con_presion: bool) -> List[Proceso]:
+    rng = random.Random(semilla)
+    procesos = []
+    t = 0
+    # Tramo inicial liviano: procesos chicos y espaciados, sin presión.
+    for i in range(150):
+        t += rng.randint(3, 12)
+        procesos.append(Proceso(f"L{i}", t, rng.randint(1, 6), rng.randint(1, 50)))
+    if con_presion:
+        # Ráfaga de arribos pesados: aparece la presión de memoria a mitad
+        # de la corrida (y algunos no caben en ninguna partición).
+        for i in range(150):
+            t += rng.randint(0, 3)
+            procesos.append(Proceso(f"P{i}", t, rng.randint(1, 30), rng.randint(10, 270)))
+    return procesos
+
+
+def _correr(procesos: List[Proceso], analitico: bool) -> Tuple[Any, ...]:
+    simulador = Simulador(procesos, GestorMemoria(silencioso=True))
+    simulador.usar_camino_analitico = analitico
+    resultado = simulador.simular()
+    linea = simulador.linea_tiempo
+    assert linea is not None
+    tramos = [(a, b, linea.ids[p]) for a, b, p in zip(linea.inicio, linea.fin, linea.pid)]
+    return resultado.filas, resultado.descartados, tramos
+
+
+@pytest.mark.parametrize("con_presion", [False, True])
+@pytest.mark.parametrize("semilla", range(6))
+def test_mismas_metricas_que_el_motor_de_eventos(semilla: int, con_presion: bool) -> None:
+    evaluado = evaluar(_traza(semilla, con_presion), GestorMemoria(silencioso=True))
+    assert evaluado is not None
+    # Sin presión el barrido resuelve toda la corrida; con presión entrega
+    # el estado al motor de eventos a mitad de camino.
+    assert (evaluado[1] is not None) == con_presion
+
+    filas, descartados, tramos = _correr(_traza(semilla, con_presion), analitico=True)
+    assert (filas, descartados, tramos) == _correr(_traza(semilla, con_presion), analitico=False)
+    assert filas
+    assert bool(descartados) == con_presion
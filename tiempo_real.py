@@ -0,0 +1,183 @@
+"""
+Planificación de tiempo real: tareas periódicas, EDF y Rate-Monotonic.
+
+Responsabilidades:
+    - Expandir las filas periódicas de una traza (columna 'Periodo') en
+      instancias (jobs) a medida que se consumen: un heap con la próxima
+      liberación de cada tarea, sin generar el hiperperíodo por adelantado.
+    - EdfScheduler: desalojo por vencimiento absoluto más cercano
+      (Earliest Deadline First).
+    - RmScheduler: prioridad fija por período más corto (Rate-Monotonic);
+      los procesos aperiódicos con plazo usan su plazo relativo
+      (Deadline-Monotonic).
+    - PLANIFICADORES / crear_scheduler: registro de los planificadores que
+      ofrece la CLI (incluye SRTF y el fair-share de fair_share.py).
+
+Ambos planificadores reutilizan la cola de SrtfScheduler cambiando solo la
+clave (ver SrtfScheduler._clave), así que exportan y restauran el mismo
+estado para checkpoints. Los procesos sin plazo (EDF) o sin período ni
+plazo (RM) quedan detrás de todos los demás, en orden de llegada.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import sys
+from dataclasses import replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fair_share import FairShareScheduler
+from planificador_srtf import ProcesoLike, Scheduler, SrtfScheduler
+from procesos import Proceso
+
+# Clave de los procesos sin prioridad de tiempo real.
+SIN_PRIORIDAD = sys.maxsize
+
+
+class EdfScheduler(SrtfScheduler):
+    """
+    Earliest Deadline First con desalojo: ejecuta el proceso con el
+    vencimiento absoluto más cercano.
+    """
+
+    nombre = "edf"
+
+    def _clave(self, proceso: ProcesoLike) -> int:
+        vencimiento = getattr(proceso, "vencimiento", None)
+        return SIN_PRIORIDAD if vencimiento is None else int(vencimiento)
+
+
+class RmScheduler(SrtfScheduler):
+    """
+    Rate-Monotonic con desalojo: prioridad fija, menor período primero.
+    """
+
+    nombre = "rm"
+
+    def _clave(self, proceso: ProcesoLike) -> int:
+        periodo = getattr(proceso, "periodo", None)
+        if periodo is not None:
+            return int(periodo)
+        deadline = getattr(proceso, "deadline", None)
+        return SIN_PRIORIDAD if deadline is None else int(deadline)
+
+
+# Planificadores elegibles desde la CLI (--planificador).
+PLANIFICADORES: Dict[str, Any] = {
+    p.nombre: p for p in (SrtfScheduler, EdfScheduler, RmScheduler, FairShareScheduler)
+}
+
+
+def crear_scheduler(nombre: str, **opciones: Any) -> Scheduler:
+    """
+    Instancia el planificador 'nombre'; 'opciones' van al constructor (p.
+    ej. pesos e intra para 'fair').
+    """
+    try:
+        clase = PLANIFICADORES[nombre]
+    except KeyError:
+        raise ValueError(
+            f"Planificador desconocido: '{nombre}' (opciones: {', '.join(PLANIFICADORES)})"
+        ) from None
+    return clase(**opciones)
+
+
+# ---------------------------------------------------------------------------
+# Tareas periódicas
+# ---------------------------------------------------------------------------
+
+
+def hiperperiodo(periodos: Sequence[int]) -> int:
+    """
+    Mínimo común múltiplo de los períodos.
+    """
+    if not periodos:
+        raise ValueError("No hay tareas periódicas")
+    return math.lcm(*periodos)
+
+
+def horizonte_por_defecto(procesos: Sequence[Proceso]) -> Optional[int]:
+    """
+    Instante hasta el que se liberan instancias si no se indica otro.
+
+    Con todas las tareas periódicas liberadas a la vez alcanza un
+    hiperperíodo desde esa liberación; con desfasajes, el planificador
+    recién se repite después de max(desfasaje) + 2 * hiperperíodo
+    (Leung y Whitehead). None si no hay tareas periódicas.
+    """
+    periodicas = [p for p in procesos if p.periodo is not None]
+    if not periodicas:
+        return None
+    h = hiperperiodo([int(p.periodo) for p in periodicas])  # type: ignore[arg-type]
+    desfasajes = {p.arribo for p in periodicas}
+    if len(desfasajes) == 1:
+        return periodicas[0].arribo + h
+    return max(desfasajes) + 2 * h
+
+
+def _instancia(tarea: Proceso, k: int) -> Proceso:
+    """
+    k-ésima instancia (desde 1) de una tarea periódica. Conserva el período
+    de la tarea (RM lo usa como prioridad); el plazo por defecto es el
+    período (plazo implícito).
+    """
+    return replace(
+        tarea,
+        id=f"{tarea.id}#{k}",
+        arribo=tarea.arribo + (k - 1) * int(tarea.periodo),  # type: ignore[arg-type]
+        deadline=tarea.deadline if tarea.deadline is not None else tarea.periodo,
+    )
+
+
+def expandir_periodicos(
+    procesos: Iterable[Proceso],
+    horizonte: Optional[int] = None,
+) -> Iterator[Proceso]:
+    """
+    Recorre 'procesos' (ordenados por arribo) reemplazando cada tarea
+    periódica por sus instancias con arribo < horizonte, en orden de
+    arribo (y, a igual arribo, en el orden de las tareas en la traza).
+
+    Las instancias se crean al consumirlas: en memoria solo hay una
+    pendiente por tarea, así que el generador se puede pasar directo a
+    SimuladorEnLinea aunque el hiperperíodo sea largo.
+
+    Sin 'horizonte' se usa horizonte_por_defecto, que necesita ver todas
+    las tareas: si 'procesos' no es una secuencia (p. ej. stdin), una tarea
+    periódica sin horizonte es un error.
+    """
+    if horizonte is not None and horizonte <= 0:
+        raise ValueError("El horizonte debe ser > 0")
+    if horizonte is None and isinstance(procesos, Sequence):
+        horizonte = horizonte_por_defecto(procesos)
+
+    # (arribo, orden de la tarea en la traza, número de instancia, tarea)
+    pendientes: List[Tuple[int, int, int, Proceso]] = []
+    for orden, proceso in enumerate(procesos):
+        while pendientes and pendientes[0][0] <= proceso.arribo:
+            yield from _liberar(pendientes, horizonte)
+        heapq.heappush(pendientes, (proceso.arribo, orden, 1, proceso))
+    while pendientes:
+        yield from _liberar(pendientes, horizonte)
+
+
+def _liberar(
+    pendientes: List[Tuple[int, int, int, Proceso]],
+    horizonte: Optional[int],
+) -> Iterator[Proceso]:
+    arribo, orden, k, tarea = heapq.heappop(pendientes)
+    if tarea.periodo is None:
+        yield tarea
+        return
+    if horizonte is None:
+        raise ValueError(
+            f"Tarea periódica '{tarea.id}' sin horizonte: indicar hasta qué "
+            f"instante liberar instancias"
+        )
+    if arribo >= horizonte:
+        return
+    yield _instancia(tarea, k)
+    siguiente = arribo + int(tarea.periodo)
+    if siguiente < horizonte:
+        heapq.heappush(pendientes, (siguiente, orden, k + 1, tarea))
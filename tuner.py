@@ -0,0 +1,271 @@
+"""
+Ajuste automático del grado de multiprogramación y de las particiones.
+
+Responsabilidades:
+    - Enumerar configuraciones de GestorMemoria (grado máximo + tamaños de
+      particiones de usuario) con una memoria de usuario total fija.
+    - Buscar la mejor para un objetivo (espera media, espera p99 o
+      throughput) con successive halving: todas las candidatas se prueban
+      sobre un prefijo corto de la traza, sobrevive 1/eta, y así hasta
+      correr las finalistas sobre la traza completa.
+    - Evaluar las candidatas en procesos paralelos (cada trabajador carga la
+      traza una sola vez).
+    - Reportar el frente de Pareto de las finalistas.
+
+Las configuraciones que descartan procesos (alguno no cabe en ninguna
+partición) siempre quedan detrás de las que no descartan.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from io_metricas import cargar_procesos
+from memoria import GestorMemoria
+from procesos import Proceso
+from simulacion import Simulador
+
+OBJETIVOS = ("espera-media", "espera-p99", "throughput")
+
+# (id, arribo, rafaga, memoria)
+FilaProceso = Tuple[str, int, int, int]
+
+
+@dataclass(frozen=True)
+class ConfigMemoria:
+    grado: int
+    particiones: Tuple[int, ...]
+
+    def etiqueta(self) -> str:
+        return f"grado={self.grado} particiones={','.join(map(str, self.particiones))}"
+
+
+@dataclass
+class Evaluacion:
+    config: ConfigMemoria
+    procesos: int
+    descartados: int
+    espera_media: float
+    espera_p99: int
+    throughput: float
+
+    def valor(self, objetivo: str) -> float:
+        """
+        Valor a minimizar para 'objetivo'.
+        """
+        if objetivo == "espera-media":
+            return self.espera_media
+        if objetivo == "espera-p99":
+            return float(self.espera_p99)
+        return -self.throughput
+
+    def clave(self, objetivo: str) -> Tuple[int, float, str]:
+        return (self.descartados, self.valor(objetivo), self.config.etiqueta())
+
+    def domina_a(self, otra: "Evaluacion") -> bool:
+        propias = (self.descartados, self.espera_media, self.espera_p99, -self.throughput)
+        ajenas = (otra.descartados, otra.espera_media, otra.espera_p99, -otra.throughput)
+        return all(a <= b for a, b in zip(propias, ajenas)) and propias != ajenas
+
+
+@dataclass
+class ResultadoAjuste:
+    objetivo: str
+    rondas: List[Tuple[int, List[Evaluacion]]] = field(default_factory=list)
+    pareto: List[Evaluacion] = field(default_factory=list)
+
+    @property
+    def finalistas(self) -> List[Evaluacion]:
+        return self.rondas[-1][1] if self.rondas else []
+
+    @property
+    def mejor(self) -> Optional[Evaluacion]:
+        finalistas = self.finalistas
+        return finalistas[0] if finalistas else None
+
+    def imprimir(self) -> None:
+        print("\n===== AJUSTE DE MEMORIA =====")
+        for i, (procesos, evaluaciones) in enumerate(self.rondas, start=1):
+            print(
+                f"Ronda {i}: {len(evaluaciones)} candidatas sobre {procesos} procesos "
+                f"(mejor: {evaluaciones[0].config.etiqueta()})"
+            )
+
+        print(f"\nFinalistas (objetivo: {self.objetivo}; * = frente de Pareto)")
+        print(f"  {'Configuración':<40}{'Descart.':>9}{'Espera media':>14}"
+              f"{'Espera p99':>12}{'Throughput':>12}")
+        en_frente = {id(e) for e in self.pareto}
+        for e in self.finalistas:
+            marca = "*" if id(e) in en_frente else " "
+            print(
+                f"{marca} {e.config.etiqueta():<40}{e.descartados:>9}"
+                f"{e.espera_media:>14.2f}{e.espera_p99:>12}{e.throughput:>12.4f}"
+            )
+        if self.mejor is not None:
+            print(f"\nMejor: {self.mejor.config.etiqueta()}")
+        print("=============================\n")
+
+
+# ---------------------------------------------------------------------------
+# Espacio de búsqueda
+# ---------------------------------------------------------------------------
+
+
+def _particiones_enteras(n: int, partes: int, maximo: int) -> Iterator[Tuple[int, ...]]:
+    """
+    Formas de escribir n como suma de 'partes' enteros >= 1, no crecientes
+    y <= maximo.
+    """
+    if partes == 1:
+        if 1 <= n <= maximo:
+            yield (n,)
+        return
+    for primero in range(min(n - partes + 1, maximo), 0, -1):
+        for resto in _particiones_enteras(n - primero, partes - 1, primero):
+            yield (primero,) + resto
+
+
+def espacio_configuraciones(
+    memoria_total: int,
+    paso: int,
+    max_particiones: int,
+    grado_max: int,
+) -> List[ConfigMemoria]:
+    """
+    Todas las configuraciones con particiones múltiplo de 'paso' que suman
+    'memoria_total'. Un grado mayor que la cantidad de particiones equivale
+    a ese mismo número, así que no se repite.
+    """
+    if paso <= 0 or memoria_total <= 0 or memoria_total % paso:
+        raise ValueError("memoria_total debe ser un múltiplo positivo de paso")
+    if max_particiones <= 0 or grado_max <= 0:
+        raise ValueError("max_particiones y grado_max deben ser > 0")
+
+    unidades = memoria_total // paso
+    configuraciones = []
+    for k in range(1, max_particiones + 1):
+        for forma in _particiones_enteras(unidades, k, unidades):
+            tamanios = tuple(u * paso for u in forma)
+            for grado in range(1, min(grado_max, k) + 1):
+                configuraciones.append(ConfigMemoria(grado=grado, particiones=tamanios))
+    return configuraciones
+
+
+# ---------------------------------------------------------------------------
+# Evaluación (en el proceso actual o en trabajadores)
+# ---------------------------------------------------------------------------
+
+_TRAZA: List[FilaProceso] = []
+
+
+def _inicializar(ruta: str) -> None:
+    global _TRAZA
+    procesos = sorted(cargar_procesos(ruta), key=lambda p: p.arribo)
+    _TRAZA = [(p.id, p.arribo, p.rafaga_cpu, p.memoria) for p in procesos]
+
+
+def _evaluar(tarea: Tuple[ConfigMemoria, int]) -> Evaluacion:
+    config, cantidad = tarea
+    procesos = [Proceso(*fila) for fila in _TRAZA[:cantidad]]
+    gestor = GestorMemoria(
+        grado_multiprogramacion_max=config.grado,
+        silencioso=True,
+        tamanios_usuario=config.particiones,
+    )
+    resultado = Simulador(procesos, gestor, registrar_linea_tiempo=False).simular()
+
+    esperas = sorted(f.espera for f in resultado.filas if f.espera is not None)
+    p99 = esperas[max(0, math.ceil(len(esperas) * 0.99) - 1)] if esperas else 0
+    return Evaluacion(
+        config=config,
+        procesos=cantidad,
+        descartados=len(resultado.descartados),
+        espera_media=resultado.promedio_espera,
+        espera_p99=p99,
+        throughput=resultado.throughput,
+    )
+
+
+def frente_de_pareto(evaluaciones: Sequence[Evaluacion]) -> List[Evaluacion]:
+    return [
+        e for e in evaluaciones
+        if not any(otra.domina_a(e) for otra in evaluaciones if otra is not e)
+    ]
+
+
+def ajustar(
+    ruta: str,
+    candidatas: Sequence[ConfigMemoria],
+    objetivo: str = "espera-media",
+    eta: int = 3,
+    prefijo_minimo: int = 500,
+    workers: int = 1,
+    al_terminar_ronda: Optional[Callable[[int, List[Evaluacion]], None]] = None,
+) -> ResultadoAjuste:
+    """
+    Successive halving sobre prefijos de la traza en 'ruta'.
+
+    La cantidad de rondas se elige para que la primera use al menos
+    'prefijo_minimo' procesos y para que eta^rondas no supere la cantidad
+    de candidatas.
+    """
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo desconocido: '{objetivo}' (opciones: {', '.join(OBJETIVOS)})")
+    if eta < 2:
+        raise ValueError("eta debe ser >= 2")
+    if not candidatas:
+        raise ValueError("No hay configuraciones candidatas")
+
+    _inicializar(ruta)
+    total = len(_TRAZA)
+    if total == 0:
+        raise ValueError(f"La traza '{ruta}' no contiene procesos.")
+
+    rondas = 0
+    while (
+        eta ** (rondas + 1) <= len(candidatas)
+        and total // eta ** (rondas + 1) >= prefijo_minimo
+    ):
+        rondas += 1
+
+    resultado = ResultadoAjuste(objetivo=objetivo)
+    vivas = list(candidatas)
+    pool = ProcessPoolExecutor(workers, initializer=_inicializar, initargs=(ruta,)) if workers > 1 else None
+    try:
+        for r in range(rondas + 1):
+            cantidad = total // eta ** (rondas - r)
+            tareas = [(c, cantidad) for c in vivas]
+            if pool is None:
+                evaluaciones = [_evaluar(t) for t in tareas]
+            else:
+                evaluaciones = list(pool.map(_evaluar, tareas))
+            evaluaciones.sort(key=lambda e: e.clave(objetivo))
+
+            resultado.rondas.append((cantidad, evaluaciones))
+            if al_terminar_ronda is not None:
+                al_terminar_ronda(cantidad, evaluaciones)
+            vivas = [e.config for e in evaluaciones[: max(1, math.ceil(len(evaluaciones) / eta))]]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    resultado.pareto = frente_de_pareto(resultado.finalistas)
+    return resultado
+
+
+def muestrear(
+    configuraciones: Sequence[ConfigMemoria],
+    cantidad: int,
+    semilla: int = 0,
+) -> List[ConfigMemoria]:
+    """
+    Subconjunto reproducible de 'cantidad' configuraciones (todas si
+    cantidad <= 0 o si no hay tantas).
+    """
+    if cantidad <= 0 or cantidad >= len(configuraciones):
+        return list(configuraciones)
+    return random.Random(semilla).sample(list(configuraciones), cantidad)